@@ -93,104 +93,23 @@ echo "******************************************"
 python manage.py makemigrations website
 python manage.py migrate website
 
+# Creates the DatabaseCache table (CACHES in settings.py) if it doesn't exist.
+# Idempotent, and a no-op when ML_CACHE_BACKEND selects a non-database cache.
+python manage.py createcachetable
+
+# The data/media maintenance commands (file cleanup, backfills, url_name
+# de-collision, admin groups, artifact renames, API thumbnail warming, ...) used
+# to each run here as their own `python manage.py <command>`, in series. They now
+# run in one process: each step is skipped when nothing it reads has changed
+# since its last successful run, and independent steps run concurrently. The
+# step list, their ordering constraints, and the notes on each (#1269, #1390,
+# #1401/#1404, #1432, ...) live in website/utils/startup_maintenance.py; per-step
+# timings are recorded in the StartupStepRun table. To force a single step by
+# hand: python manage.py run_startup_maintenance --only <step> --force
 echo "****************** STEP 4/5: docker-entrypoint.sh ************************"
-echo "4.0 Running 'python manage.py delete_unused_files' to delete unused files in file system"
+echo "4. Running 'python manage.py run_startup_maintenance' to run the startup data/media maintenance steps"
 echo "******************************************"
-python manage.py delete_unused_files
-
-echo "****************** STEP 4.1/5: docker-entrypoint.sh ************************"
-echo "4.1 Running 'python manage.py thumbnail_cleanup' to delete unused thumbnails"
-echo "******************************************"
-python manage.py thumbnail_cleanup
-
-echo "****************** STEP 4.2/5: docker-entrypoint.sh ************************"
-echo "4.2 Running 'python manage.py generate_slugs_for_old_news_items' to generate slugs for old news items"
-echo "******************************************"
-python manage.py generate_slugs_for_old_news_items
-
-echo "****************** STEP 4.2b/5: docker-entrypoint.sh ************************"
-echo "4.2b Running 'python manage.py normalize_news_image_styles' to make legacy news images responsive (#1269)"
-echo "******************************************"
-python manage.py normalize_news_image_styles
-
-echo "****************** STEP 4.3/5: docker-entrypoint.sh ************************"
-echo "4.3 Running 'python manage.py auto_close_project_roles' to auto-close project roles"
-echo "******************************************"
-python manage.py auto_close_project_roles
-
-echo "****************** STEP 4.4/5: docker-entrypoint.sh ************************"
-echo "4.4 Running 'python manage.py remove_year_from_forum_name' to strip trailing years from Talk/Poster/Publication forum names (#1390)"
-echo "******************************************"
-python manage.py remove_year_from_forum_name
-
-echo "****************** STEP 4.5/5: docker-entrypoint.sh ************************"
-echo "3.1 Running 'python manage.py fix_sortedm2m_columns' to fix any missing sort_value columns"
-echo "******************************************"
-python manage.py fix_sortedm2m_columns
-
-echo "****************** STEP 4.6/5: docker-entrypoint.sh ************************"
-echo "4.6 Running 'python manage.py backfill_num_pages' to fill missing publication page counts"
-echo "******************************************"
-python manage.py backfill_num_pages
-
-echo "****************** STEP 4.7/5: docker-entrypoint.sh ************************"
-echo "4.7 Running 'python manage.py backfill_project_visibility' to resolve is_visible for legacy projects"
-echo "******************************************"
-python manage.py backfill_project_visibility
-
-echo "****************** STEP 4.7b/5: docker-entrypoint.sh ************************"
-echo "4.7b Running 'python manage.py backfill_original_filenames' to recover original upload filenames for never-renamed artifacts (#1391)"
-echo "******************************************"
-python manage.py backfill_original_filenames
-
-echo "****************** STEP 4.8/5: docker-entrypoint.sh ************************"
-echo "4.8 Running 'python manage.py recompute_url_names' to de-collide historical url_names (#1206)"
-echo "******************************************"
-python manage.py recompute_url_names
-
-echo "****************** STEP 4.8b/5: docker-entrypoint.sh ************************"
-echo "4.8b Running 'python manage.py seed_project_aliases' to redirect renamed project slugs (#944)"
-echo "******************************************"
-python manage.py seed_project_aliases
-
-echo "****************** STEP 4.9/5: docker-entrypoint.sh ************************"
-echo "4.9 Running 'python manage.py propagate_publication_projects' to link talks/videos/posters to their publication's projects (#649)"
-echo "******************************************"
-python manage.py propagate_publication_projects
-
-echo "****************** STEP 4.10/5: docker-entrypoint.sh ************************"
-echo "4.10 Running 'python manage.py setup_admin_groups' to create/refresh the Editors and Contributors admin groups (#1125)"
-echo "******************************************"
-python manage.py setup_admin_groups
-
-echo "****************** STEP 4.10b/5: docker-entrypoint.sh ************************"
-echo "4.10b Running 'python manage.py restandardize_artifact_filenames' to rename legacy talk/poster/pub files to the standardized scheme (#1401/#1404)"
-echo "******************************************"
-# The #1404 type-suffix migration ran here as a --dry-run first (2.29.0) so the
-# scope could be reviewed in prod's debug.log (188 talks + 11 posters, zero
-# publications); the one-time corpus rename went live in 2.29.1. Idempotent —
-# on-scheme rows are skipped — so this stays in place for future rows.
-python manage.py restandardize_artifact_filenames
-
-echo "****************** STEP 4.10c/5: docker-entrypoint.sh ************************"
-echo "4.10c Running 'python manage.py repair_diverged_artifact_filenames' to recover artifacts whose files were renamed on disk but not in the DB (#1390 dotted-name bug)"
-echo "******************************************"
-# Promoted from --dry-run in 2.29.1 after reviewing prod's inventory (#1390):
-# 3 recoverable orphans; truly-missing files are logged as unrecoverable
-# warnings for manual review. Divergence-gated and idempotent, so it stays.
-python manage.py repair_diverged_artifact_filenames
-
-echo "****************** STEP 4.10d/5: docker-entrypoint.sh ************************"
-echo "4.10d Running 'python manage.py seed_sidewalk_participants' to backfill Project Sidewalk contributors from the NSF Crowd+AI annual reports"
-echo "******************************************"
-python manage.py seed_sidewalk_participants
-
-echo "****************** STEP 4.10e/5: docker-entrypoint.sh ************************"
-echo "4.10e Running 'python manage.py warm_api_thumbnails' to pre-generate the cropped thumbnails the public API serves (#1432)"
-echo "******************************************"
-# Idempotent: after the first run this is a couple of stat calls per row. Without
-# it, the first API request after a deploy generates every derivative inline.
-python manage.py warm_api_thumbnails
+python manage.py run_startup_maintenance --workers "${STARTUP_MAINTENANCE_WORKERS:-4}"
 
 # echo "****************** STEP 4.3/5: docker-entrypoint.sh ************************"
 # echo "4.3 Running 'python manage.py rename_person_images' to rename person images"
@@ -393,6 +393,10 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
 
+    # Trigram lookups/indexes for Person.objects.search() (pg_trgm is installed by
+    # ensure_pg_trgm_extension in website/signals.py)
+    'django.contrib.postgres',
+
     'django.contrib.humanize', # for humanizing numbers in templates: https://docs.djangoproject.com/en/4.2/ref/contrib/humanize/
 
     # Generates a dynamic /sitemap.xml from our querysets for SEO (issue #1252).
@@ -530,6 +534,102 @@ else:
     }
 }
 
+# ---------------------------------------------------------------------------
+# Database connection reuse
+# ---------------------------------------------------------------------------
+# Django's default (CONN_MAX_AGE=0) opens a fresh Postgres connection for every
+# request and closes it at the end, so each Gunicorn worker paid a TCP + auth
+# handshake to the `db` container on every page view. Persistent connections
+# keep one connection per worker open for ML_DB_CONN_MAX_AGE seconds (0 restores
+# the old behavior, -1 is "forever"); CONN_HEALTH_CHECKS pings a reused
+# connection before a request uses it, so a db container restart costs one
+# reconnect instead of a 500.
+#
+# ML_DB_POOL optionally switches to pooled connections instead:
+#   psycopg    Django's native psycopg 3 pool (needs `psycopg[pool]` installed;
+#              we ship psycopg2, so this is opt-in). Persistent connections must
+#              be off in this mode -- the pool does the reuse.
+#   pgbouncer  route through the pgbouncer sidecar in docker-compose.yml (start
+#              it with `--profile pooled`). It pools in transaction mode, which
+#              can't hold server-side cursors open across transactions.
+# /version.json reports which mode is live and the connection counts.
+DB_CONN_MAX_AGE = int(os.environ.get('ML_DB_CONN_MAX_AGE', '60'))
+DB_CONN_HEALTH_CHECKS = os.environ.get('ML_DB_CONN_HEALTH_CHECKS', 'true').lower() in ('1', 'true', 'yes')
+DB_POOL = os.environ.get('ML_DB_POOL', '').lower()
+
+DATABASES['default']['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+DATABASES['default']['CONN_HEALTH_CHECKS'] = DB_CONN_HEALTH_CHECKS
+if DB_POOL == 'psycopg':
+    DATABASES['default']['ENGINE'] = 'django.db.backends.postgresql'
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.environ.get('ML_DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.environ.get('ML_DB_POOL_MAX_SIZE', '4')),
+        'timeout': int(os.environ.get('ML_DB_POOL_TIMEOUT', '10')),
+    }
+elif DB_POOL == 'pgbouncer':
+    DATABASES['default']['HOST'] = os.environ.get('ML_PGBOUNCER_HOST', 'pgbouncer')
+    DATABASES['default']['PORT'] = int(os.environ.get('ML_PGBOUNCER_PORT', '6432'))
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+elif DB_POOL:
+    print(f"WARNING: unknown ML_DB_POOL={DB_POOL!r} (expected 'psycopg' or 'pgbouncer'); "
+          f"using persistent connections.")
+    DB_POOL = ''
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+# Without CACHES, Django falls back to a per-process LocMemCache: anything one of
+# Gunicorn's 3 workers caches is invisible to the other two and gone on restart.
+# The default is now Postgres-backed (DatabaseCache), which every worker shares
+# and which needs no extra service -- the `website_cache` table is created by
+# `createcachetable` in docker-entrypoint.sh. ML_CACHE_BACKEND picks another:
+#   redis   Django's RedisCache at ML_REDIS_URL (needs the `redis` package, which
+#           we don't ship; falls back to the DB cache without it)
+#   file    FileBasedCache under ML_CACHE_DIR (default /tmp, i.e. inside the
+#           container -- never under media/, which Apache serves publicly)
+#   locmem  the old per-process behavior
+# Code should go through website/utils/cache.py (versioned keys, stampede
+# protection, hit/miss counters) rather than the raw cache. /version.json
+# reports the live backend.
+try:
+    import redis  # noqa: F401  (imported only to probe availability)
+    _HAS_REDIS = True
+except ImportError:
+    _HAS_REDIS = False
+
+CACHE_BACKEND = os.environ.get('ML_CACHE_BACKEND', 'db').lower()
+if CACHE_BACKEND == 'redis' and not _HAS_REDIS:
+    print("WARNING: ML_CACHE_BACKEND=redis but the redis package isn't installed; "
+          "using the database cache.")
+    CACHE_BACKEND = 'db'
+
+if CACHE_BACKEND == 'redis':
+    _default_cache = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('ML_REDIS_URL', 'redis://redis:6379/1'),
+    }
+elif CACHE_BACKEND == 'file':
+    _default_cache = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('ML_CACHE_DIR', '/tmp/makeabilitylab-cache'),
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+elif CACHE_BACKEND == 'locmem':
+    _default_cache = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+else:
+    CACHE_BACKEND = 'db'
+    _default_cache = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'website_cache',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+_default_cache['KEY_PREFIX'] = 'mlw'
+_default_cache['TIMEOUT'] = 60 * 5
+CACHES = {'default': _default_cache}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.9/ref/settings/#auth-password-validators
@@ -575,6 +675,34 @@ USE_TZ = True
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# Uploads stream through website/utils/upload_handlers.py, which checks each
+# file's magic bytes on its first chunk, drops it once it passes its size limit,
+# and writes it to a temporary file inside MEDIA_ROOT (dotted, like the content
+# store, and skipped by migrate_media_to_content_store) so saving it is a
+# same-filesystem rename rather than a copy out of /tmp. Limits are in MB, per
+# model field name, with ML_UPLOAD_MAX_SIZE_MB for every other field.
+FILE_UPLOAD_HANDLERS = ['website.utils.upload_handlers.StreamingUploadHandler']
+FILE_UPLOAD_TEMP_DIR = os.path.join(MEDIA_ROOT, '.upload-tmp')
+UPLOAD_MAX_SIZE_MB = float(os.environ.get('ML_UPLOAD_MAX_SIZE_MB', '250'))
+UPLOAD_FIELD_MAX_SIZE_MB = {
+    'image': 25, 'easter_egg': 25, 'picture': 25, 'badge': 25,
+    'icon': 25, 'gallery_image': 25, 'thumbnail': 25, 'upload': 25,
+    'pdf_file': 100,
+}
+
+# Optional content-addressed media store (website/utils/content_store.py): each
+# distinct file is stored once, by SHA-256, under MEDIA_ROOT/.content-store/, and
+# the usual media paths become hardlinks to it, so identical uploads share disk,
+# renames never copy data, and /media/ is still served straight from disk. Run
+# 'python manage.py migrate_media_to_content_store' before turning it on so the
+# existing files get references too.
+MEDIA_CONTENT_ADDRESSED = os.environ.get('ML_MEDIA_CONTENT_ADDRESSED', 'false').lower() in ('1', 'true', 'yes')
+if MEDIA_CONTENT_ADDRESSED:
+    STORAGES = {
+        'default': {'BACKEND': 'website.utils.content_store.ContentAddressedStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    }
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/1.9/howto/static-files/
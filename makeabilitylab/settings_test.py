@@ -44,5 +44,10 @@ LOGGING["handlers"]["file"] = {"class": "logging.NullHandler"}  # noqa: F405
 # up, and /version.json reports it (#1439).
 LOG_ROTATION = "NullHandler"
 
+# Per-process cache so tests never share entries through the DB cache table and
+# each test can start from cache.clear().
+CACHE_BACKEND = "locmem"
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "KEY_PREFIX": "mlw"}}
+
 # Speed up the auth tests (Data Health suite creates real superuser rows).
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
@@ -101,16 +101,21 @@ class MakeabilityLabAdminSite(admin.AdminSite):
 
     def get_urls(self):
         """
-        Prepend the read-only Data Health pages to the admin URLconf.
+        Prepend the read-only Data Health pages and the person search behind
+        the sorted author pickers to the admin URLconf.
 
         Each view is wrapped in ``self.admin_view`` (enforces staff + login,
-        adds the admin context) and additionally checks ``is_superuser``
-        inside the view because the checks expose personal data. The
-        data_health views are imported lazily to avoid import-time cycles.
+        adds the admin context). The Data Health views additionally check
+        ``is_superuser`` inside the view because the checks expose personal
+        data. The views are imported lazily to avoid import-time cycles.
         """
         from website.admin.data_health import views as data_health_views
+        from website.admin.person_search import person_search
 
         custom_urls = [
+            path('person-search/',
+                 self.admin_view(person_search),
+                 name='person_search'),
             path('data-health/',
                  self.admin_view(data_health_views.dashboard),
                  name='data_health_dashboard'),
@@ -2,7 +2,8 @@ from django.contrib import admin
 from website.models import Artifact
 from django.contrib.admin import widgets
 from django.utils.html import format_html, format_html_join
-from sortedm2m_filter_horizontal_widget.forms import SortedFilteredSelectMultiple
+from website.admin.widgets import SortedAutocompleteSelectMultiple
+from website.utils.artifact_side_effects import defer_artifact_side_effects
 from website.utils.upload_validators import PDF_EXTENSIONS, RAW_FILE_EXTENSIONS
 from easy_thumbnails.files import get_thumbnailer
 import os
@@ -188,7 +189,9 @@ class ArtifactAdmin(admin.ModelAdmin):
         widget of the formfield is customized based on the name of the db_field.
         """
         if db_field.name == "authors":
-            kwargs['widget'] = SortedFilteredSelectMultiple()
+            # Renders only the chosen authors and searches the rest over AJAX
+            kwargs['widget'] = SortedAutocompleteSelectMultiple(db_field, self.admin_site,
+                                                                using=kwargs.get('using'))
         elif db_field.name == "projects":
             kwargs["widget"] = widgets.FilteredSelectMultiple("projects", is_stacked=False)
         elif db_field.name == "keywords":
@@ -237,4 +240,15 @@ class ArtifactAdmin(admin.ModelAdmin):
             _logger.debug(f"Looks like we are creating a new artifact, so calling super().save_model()")
             # Call the superclass method, which calls the model.save() as well but
             # doesn't support the update_fields
-            super().save_model(request, obj, form, change)
\ No newline at end of file
+            super().save_model(request, obj, form, change)
+    
+    def save_related(self, request, form, formsets, change):
+        """
+        Saves the m2m fields and inlines with the authors_changed file
+        reconciliation deferred (website/utils/artifact_side_effects.py): setting
+        the authors can send several post_add signals, each of which would
+        otherwise re-run the whole Artifact.save() and rename the files again.
+        Instead the artifact is reconciled once, when the admin's transaction commits.
+        """
+        with defer_artifact_side_effects():
+            super().save_related(request, form, formsets, change)
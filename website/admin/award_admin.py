@@ -10,6 +10,7 @@ from website.models import Award
 from website.admin.admin_site import ml_admin_site
 from website.utils.fileutils import pad_image_to_square
 from sortedm2m_filter_horizontal_widget.forms import SortedFilteredSelectMultiple
+from website.admin.widgets import SortedAutocompleteSelectMultiple
 
 
 class AwardAdminForm(forms.ModelForm):
@@ -139,12 +140,16 @@ class AwardAdmin(ImageCroppingMixin, admin.ModelAdmin):
 
     def formfield_for_manytomany(self, db_field, request, **kwargs):
         """
-        Use the two-panel sorted filter widget for the recipients and projects fields.
+        Use sorted widgets for the recipients and projects fields.
 
-        This replaces the default sortedm2m checkbox list with a filter_horizontal
-        style interface that's much easier to use with 100s of recipients and projects.
+        Recipients get the sortable autocomplete widget (only the chosen people
+        are rendered; the rest are searched over AJAX). Projects, a much
+        shorter list, keep the two-panel sorted filter widget.
         """
-        if db_field.name == 'recipients' or db_field.name == 'projects':
+        if db_field.name == 'recipients':
+            kwargs['widget'] = SortedAutocompleteSelectMultiple(db_field, self.admin_site,
+                                                                using=kwargs.get('using'))
+        elif db_field.name == 'projects':
             kwargs['widget'] = SortedFilteredSelectMultiple()
         return super().formfield_for_manytomany(db_field, request, **kwargs)
 
@@ -10,9 +10,11 @@ cluster, with relation counts to support the merge / keep / delete decision
 
 from collections import defaultdict
 
+from django.db.models import Count
+
 from website.admin.data_health.registry import HealthCheck, register_check
 from website.models import Person, Position
-from website.utils.name_utils import normalize_person_name, is_default_person_image
+from website.utils.name_utils import is_default_person_image
 
 
 def _reverse_count(person, attr):
@@ -43,10 +45,17 @@ class DuplicatePeopleCheck(HealthCheck):
     ]
 
     def get_rows(self):
-        # Group all people by their normalized name key.
+        # Find the shared name keys in the database (Person.name_key is
+        # normalize_person_name, stored and indexed by Person.save()), then load
+        # only the people in those clusters rather than everyone.
+        shared_keys = (Person.objects.exclude(name_key='')
+                       .values('name_key')
+                       .annotate(size=Count('pk'))
+                       .filter(size__gt=1)
+                       .values('name_key'))
         clusters = defaultdict(list)
-        for p in Person.objects.all().prefetch_related('position_set'):
-            clusters[normalize_person_name(p.first_name, p.last_name)].append(p)
+        for p in Person.objects.filter(name_key__in=shared_keys).prefetch_related('position_set'):
+            clusters[p.name_key].append(p)
 
         rows = []
         for key, members in clusters.items():
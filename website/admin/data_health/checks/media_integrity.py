@@ -20,6 +20,7 @@ from django.urls import reverse
 
 from website.admin.data_health.registry import HealthCheck, register_check
 from website.models import Poster, Publication, Talk
+from website.utils.cache import cached
 
 # (model, file-field name, extensions to scan for orphans in UPLOAD_DIR)
 _FILE_FIELDS = [
@@ -54,6 +55,13 @@ class MediaIntegrityCheck(HealthCheck):
             rows.extend(self._orphan_files(model))
         return rows
 
+    # The dashboard renders every check's count on each visit, and this one stats
+    # every artifact file and globs every upload dir. Cache the count briefly
+    # (shared by all workers); the detail page and CSV still scan live.
+    @cached('data_health_media_integrity_count', timeout=60 * 5)
+    def count(self):
+        return super().count()
+
     def row_link(self, row):
         """Deep-link a ``missing-file`` row to its artifact's admin edit page so
         the editor can re-upload the file or clear the dead reference right
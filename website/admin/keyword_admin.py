@@ -1,11 +1,11 @@
 from django.contrib import admin, messages
 from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
-from django.db import transaction
 from django.shortcuts import render
 from website.models import (Keyword, Publication, Talk, Poster, Grant,
                             Project, ProjectUmbrella)
 from website.admin.utils import related_count_subquery
 from website.admin.admin_site import ml_admin_site
+from website.utils.object_merge import merge_objects
 
 # Every model that has a `keywords` M2M to Keyword. Used to compute a keyword's
 # *total* usage so the "Unused" filter is trustworthy: keywords lives on Artifact
@@ -13,8 +13,8 @@ from website.admin.admin_site import ml_admin_site
 # Artifact, so it has no keywords.)
 KEYWORD_USERS = (Publication, Talk, Poster, Grant, Project, ProjectUmbrella)
 
-# Reverse accessor on Keyword for each model in KEYWORD_USERS — the relations a
-# merge must walk to reattach the target keyword before deleting the sources.
+# Reverse accessor on Keyword for each model in KEYWORD_USERS, used to show each
+# candidate's usage on the merge confirmation page.
 KEYWORD_REVERSE_ACCESSORS = (
     'publication_set', 'talk_set', 'poster_set',
     'grant_set', 'project_set', 'projectumbrella_set',
@@ -39,60 +39,25 @@ class KeywordUsageFilter(admin.SimpleListFilter):
         return queryset
 
 
-def _parent_fk_field_name(through_model):
-    """Name of the FK on a keywords-through model that points to the *owning*
-    object (Publication/Talk/…) — i.e. the relation that isn't the Keyword side.
-    """
-    for field in through_model._meta.get_fields():
-        if field.many_to_one and field.related_model is not Keyword:
-            return field.name
-    raise RuntimeError(f"No owning FK found on {through_model.__name__}")
-
-
-@transaction.atomic
 def merge_keywords_into_target(target, sources):
     """Reassign every reference from ``sources`` onto ``target``, then delete the
     sources. Returns the number of source keywords removed.
 
-    Works at the M2M *through-table* level: each existing ``(object, source)``
-    row is repointed to ``(object, target)`` rather than calling
-    ``obj.keywords.add(target)``. This is deliberate — the deployed
+    Uses the generic merge engine (website/utils/object_merge.py), which finds
+    the keyword link table of every keyword-holding model through ``_meta`` and
+    rewrites each with one DELETE (for the rows that would duplicate a link the
+    object already has, e.g. an object tagged with the target, or with two
+    sources at once) and one UPDATE repointing the rest to ``target``. Rows are
+    repointed rather than re-inserted on purpose — the deployed
     ``website_*_keywords`` tables carry a legacy NOT-NULL ``sort_value`` column
     (the field used to be a SortedManyToManyField), so *inserting* a fresh row
     via .add() violates that constraint, whereas *updating* an existing row
-    preserves its sort_value. When the object is already tagged with the target,
-    the source row is deleted instead, so no duplicate ``(object, keyword)`` pair
-    is created (this also covers an object tagged with two different sources at
-    once). ``target`` is ignored if present in ``sources``.
+    preserves its sort_value. ``target`` is ignored if present in ``sources``.
 
     Runs in a transaction: a failure mid-merge rolls back rather than leaving the
     taxonomy half-merged.
     """
-    sources = [s for s in sources if s.pk != target.pk]
-
-    for model in KEYWORD_USERS:
-        through = model.keywords.through
-        owner_id_field = f"{_parent_fk_field_name(through)}_id"
-        # Snapshot the source rows first; we mutate/delete as we go.
-        for row in list(through.objects.filter(keyword__in=sources)):
-            owner_id = getattr(row, owner_id_field)
-            target_already_present = (
-                through.objects
-                .filter(keyword=target, **{owner_id_field: owner_id})
-                .exclude(pk=row.pk)
-                .exists()
-            )
-            if target_already_present:
-                row.delete()
-            else:
-                row.keyword = target
-                row.save(update_fields=['keyword'])
-
-    removed = len(sources)
-    for source in sources:
-        # Any stray through rows are CASCADE-dropped with the keyword.
-        source.delete()
-    return removed
+    return len(merge_objects(target, sources).source_pks)
 
 
 @admin.register(Keyword, site=ml_admin_site)
@@ -190,9 +190,17 @@ class PersonAdmin(ImageCroppingMixin, admin.ModelAdmin):
         would offer every person (e.g. undergrads as co-advisors). We narrow the
         queryset to the same role-appropriate sets used for the plain dropdowns,
         keyed off the requesting Position field passed by the autocomplete view.
+
+        The search itself is ``Person.objects.search()`` (accent-folded prefix
+        and fuzzy matching on the trigram index) rather than ``icontains`` over
+        ``search_fields``, which Postgres can't index. ``search_fields`` stays
+        set because it's what turns on the search box and autocomplete.
         """
-        queryset, may_have_duplicates = super().get_search_results(
-            request, queryset, search_term)
+        if search_term.strip():
+            queryset, may_have_duplicates = queryset.search(search_term), False
+        else:
+            queryset, may_have_duplicates = super().get_search_results(
+                request, queryset, search_term)
 
         if request.GET.get('model_name') == 'position':
             field_name = request.GET.get('field_name')
@@ -0,0 +1,49 @@
+"""
+Paginated person search for the admin's sorted author/recipient pickers
+(``SortedAutocompleteSelectMultiple`` in website/admin/widgets.py).
+
+Wired into the admin URLconf as ``admin:person_search`` by
+``MakeabilityLabAdminSite.get_urls()``, wrapped in ``self.admin_view`` (staff +
+login). Responds in the format select2 expects, the same as Django's own
+``AutocompleteJsonView``::
+
+    {"results": [{"id": "12", "text": "Jon Froehlich"}, ...],
+     "pagination": {"more": true}}
+
+Django's view isn't reused directly because it searches
+``PersonAdmin.get_queryset()``, which annotates and prefetches everything the
+People changelist shows (#1346) -- wasted work for a list of names. This runs
+the same ``PersonAdmin.get_search_results`` (``Person.objects.search()``, best
+matches first) over a bare, name-only queryset.
+"""
+
+from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+
+from website.models import Person
+
+# Matches AutocompleteJsonView.paginate_by
+PERSON_SEARCH_PAGE_SIZE = 20
+
+
+def person_search(request):
+    """Returns one page of people matching ``?term=``, best match first (by name when empty)."""
+    person_admin = admin.site._registry[Person]
+    if not person_admin.has_view_permission(request):
+        raise PermissionDenied
+
+    term = request.GET.get('term', '').strip()
+    queryset = (Person.objects
+                .only('pk', 'first_name', 'middle_name', 'last_name')
+                .order_by('last_name', 'first_name', 'pk'))
+    queryset, may_have_duplicates = person_admin.get_search_results(request, queryset, term)
+    if may_have_duplicates:
+        queryset = queryset.distinct()
+
+    page = Paginator(queryset, PERSON_SEARCH_PAGE_SIZE).get_page(request.GET.get('page'))
+    return JsonResponse({
+        'results': [{'id': str(person.pk), 'text': str(person)} for person in page.object_list],
+        'pagination': {'more': page.has_next()},
+    })
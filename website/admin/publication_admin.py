@@ -9,7 +9,7 @@ from easy_thumbnails.files import get_thumbnailer # for generating thumbnails
 import os # for checking if thumbnail file exists
 
 from sortedm2m.fields import SortedManyToManyField
-from sortedm2m_filter_horizontal_widget.forms import SortedFilteredSelectMultiple
+from website.admin.widgets import SortedAutocompleteSelectMultiple
 from website.admin import ArtifactAdmin
 
 from django.urls import reverse
@@ -131,13 +131,16 @@ class PublicationAdmin(ArtifactAdmin):
     
     def formfield_for_manytomany(self, db_field, request, **kwargs):
         """
-        Use the two-panel sorted filter widget for the authors field.
-        
-        This replaces the default sortedm2m checkbox list with a filter_horizontal
-        style interface that's much easier to use with 100s of authors.
+        Use the sortable autocomplete widget for the authors field.
+
+        This replaces the default sortedm2m checkbox list (and the two-panel
+        filter widget, which rendered every person in the database on each
+        change form) with a search box whose chosen authors can be dragged
+        into order. Only the selected authors are rendered server-side.
         """
         if db_field.name == 'authors':
-            kwargs['widget'] = SortedFilteredSelectMultiple()
+            kwargs['widget'] = SortedAutocompleteSelectMultiple(db_field, self.admin_site,
+                                                                using=kwargs.get('using'))
         return super().formfield_for_manytomany(db_field, request, **kwargs)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
@@ -189,9 +192,9 @@ class PublicationAdmin(ArtifactAdmin):
     @admin.action(description='Export selected publications as BibTeX (.bib)')
     def export_as_bibtex(self, request, queryset):
         """Download the selected publications as a single .bib file. Uses the
-        model's get_citation_as_bibtex with plain newlines and no HTML hyperlinks
-        so the output is a valid BibTeX file rather than admin display markup."""
-        entries = [pub.get_citation_as_bibtex(newline="\n", use_hyperlinks=False)
+        model's stored plain-text BibTeX (plain newlines, no HTML hyperlinks) so
+        the output is a valid BibTeX file rather than admin display markup."""
+        entries = [pub.get_cached_citation_as_bibtex(newline="\n", use_hyperlinks=False)
                    for pub in queryset]
         response = HttpResponse("\n\n".join(entries),
                                 content_type='application/x-bibtex; charset=utf-8')
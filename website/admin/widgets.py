@@ -0,0 +1,57 @@
+"""
+Admin widgets shared across the artifact/award admins.
+"""
+
+from django import forms
+from django.contrib.admin.widgets import AutocompleteSelectMultiple
+from django.urls import reverse
+
+
+class SortedAutocompleteSelectMultiple(AutocompleteSelectMultiple):
+    """
+    An ordered, AJAX-backed replacement for ``SortedFilteredSelectMultiple`` on
+    sortedm2m person fields (authors, award recipients).
+
+    ``SortedFilteredSelectMultiple`` renders an ``<option>`` for every Person in
+    the database on every change form (thousands of rows, plus the JS that
+    builds the two-panel filter from them). This renders only the currently
+    selected people -- one query, in their saved order -- and fetches
+    candidates on demand from the paginated ``admin:person_search`` endpoint
+    (``website/admin/person_search.py``), which reuses ``PersonAdmin``'s search.
+
+    Order is the point of a sortedm2m field: the browser submits selected
+    options in DOM order, and sortedm2m's ``SortedMultipleChoiceField.clean``
+    keeps that order. ``sorted_autocomplete.js`` makes the chosen names
+    draggable and reorders the underlying options to match.
+    """
+
+    url_name = "%s:person_search"
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs=extra_attrs)
+        attrs["class"] += " sorted-autocomplete"
+        return attrs
+
+    def get_url(self):
+        return reverse(self.url_name % self.admin_site.name)
+
+    def optgroups(self, name, value, attr=None):
+        """
+        Returns the selected options in the order of ``value`` (the saved
+        sortedm2m order, or the order the user submitted), rather than the
+        queryset's default ordering that AutocompleteMixin leaves them in.
+        """
+        groups = super().optgroups(name, value, attr)
+        position = {str(v): i for i, v in enumerate(value)}
+        options = groups[0][1]
+        options.sort(key=lambda option: position.get(str(option["value"]), len(position)))
+        for index, option in enumerate(options):
+            option["index"] = str(index)
+        return groups
+
+    @property
+    def media(self):
+        return super().media + forms.Media(
+            js=("website/js/sorted_autocomplete.js",),
+            css={"screen": ("website/css/sorted_autocomplete.css",)},
+        )
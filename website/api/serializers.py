@@ -20,7 +20,8 @@ helpers, ``Project.get_display_short_name``, ``Grant.start_date`` / ``grant_url`
 from django.urls import NoReverseMatch, reverse
 from rest_framework import serializers
 
-from website.models import Grant, Person, Project, ProjectRole, Publication
+from website.models import Grant, Person, Project, ProjectRole, Publication, SearchEntry
+from website.utils.search_index import highlight_html
 from website.utils.thumbnail_utils import get_cropped_thumbnail
 
 # Sizes for the cropped derivatives the API serves as ``thumbnail`` (#1432).
@@ -339,12 +340,12 @@ class PublicationDetailSerializer(PublicationListSerializer):
         ]
 
     def get_citation_html(self, obj):
-        return obj.get_citation_as_html()
+        return obj.get_cached_citation_as_html()
 
     def get_bibtex(self, obj):
         # Plain newlines + no HTML hyperlinks: consumers want raw BibTeX, not
         # the HTML-decorated variant used on the site.
-        return obj.get_citation_as_bibtex(newline="\n", use_hyperlinks=False)
+        return obj.get_cached_citation_as_bibtex(newline="\n", use_hyperlinks=False)
 
 
 class ProjectRoleSerializer(serializers.ModelSerializer):
@@ -396,3 +397,34 @@ class ProjectRoleSerializer(serializers.ModelSerializer):
     def get_position_school_abbreviated(self, obj):
         position = obj.position_during_role
         return position.get_school_abbreviated() if position else None
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    """One ranked site-search hit (a SearchEntry from ``search_index.search``).
+
+    ``title_html`` / ``snippet_html`` wrap matched words in ``<mark>``; the
+    rest of the text is HTML-escaped, so they're safe to insert as HTML.
+    ``url`` is absolute, like every other link the API returns.
+    """
+
+    id = serializers.IntegerField(source="object_id")
+    url = serializers.SerializerMethodField()
+    rank = serializers.FloatField()
+    title_html = serializers.SerializerMethodField()
+    snippet_html = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SearchEntry
+        fields = ["kind", "id", "title", "date", "url", "rank", "title_html", "snippet_html"]
+
+    def get_url(self, obj):
+        request = self.context.get("request")
+        if not obj.url or request is None:
+            return obj.url or None
+        return request.build_absolute_uri(obj.url)
+
+    def get_title_html(self, obj):
+        return str(highlight_html(obj.title_headline))
+
+    def get_snippet_html(self, obj):
+        return str(highlight_html(obj.snippet_headline))
@@ -15,6 +15,7 @@ from .views import (
     PersonViewSet,
     ProjectViewSet,
     PublicationViewSet,
+    SearchViewSet,
 )
 
 app_name = "api"
@@ -24,6 +25,7 @@ router.register(r"publications", PublicationViewSet, basename="publication")
 router.register(r"people", PersonViewSet, basename="person")
 router.register(r"projects", ProjectViewSet, basename="project")
 router.register(r"grants", GrantViewSet, basename="grant")
+router.register(r"search", SearchViewSet, basename="search")
 
 urlpatterns = [
     path("v1/", include(router.urls)),
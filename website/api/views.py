@@ -11,13 +11,17 @@ Visibility: projects are gated to ``is_visible=True`` (so unpublished projects
 one Position), not every co-author in the database.
 """
 
+from django.db.models import prefetch_related_objects
 from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from rest_framework.viewsets import ReadOnlyModelViewSet
+from rest_framework.mixins import ListModelMixin
+from rest_framework.viewsets import GenericViewSet, ReadOnlyModelViewSet
 
-from website.models import Grant, Person, Project, ProjectRole, Publication
+from website.models import Grant, Person, Position, Project, ProjectRole, Publication, SearchEntry
+from website.models.project import LEADERSHIP_KEY_SUFFIXES
 from website.models.project_role import LeadProjectRoleTypes
+from website.utils.search_index import search
 
 from .serializers import (
     GrantSerializer,
@@ -26,6 +30,7 @@ from .serializers import (
     PersonSerializer,
     PublicationDetailSerializer,
     PublicationListSerializer,
+    SearchResultSerializer,
 )
 
 # Ordering values we accept on ?ordering= for publications. Whitelisted so a
@@ -115,7 +120,11 @@ class PublicationViewSet(ReadOnlyModelViewSet):
 
 
 class PersonViewSet(ReadOnlyModelViewSet):
-    """Lab members (people with at least one Position), looked up by ``url_name``."""
+    """Lab members (people with at least one Position), looked up by ``url_name``.
+
+    Filters (query params): ``?q=`` name search (accent-folded prefix/fuzzy,
+    best match first, see ``Person.objects.search``).
+    """
 
     serializer_class = PersonSerializer
     pagination_class = ApiPagination
@@ -125,6 +134,15 @@ class PersonViewSet(ReadOnlyModelViewSet):
         # position_set is prefetched because current_title/current_school/
         # current_department all funnel through Person.get_latest_position,
         # which resolves in Python off position_set.all().
+        query = self.request.query_params.get("q", "").strip()
+        if query:
+            # Membership as a subquery rather than a join, so the ranked search
+            # needs no DISTINCT
+            return (
+                Person.objects.search(query)
+                .filter(pk__in=Position.objects.values("person"))
+                .prefetch_related("position_set")
+            )
         return (
             Person.objects.filter(position__isnull=False)
             .prefetch_related("position_set")
@@ -211,26 +229,29 @@ class ProjectViewSet(_PaginatedActionMixin, ReadOnlyModelViewSet):
     @action(detail=True, methods=["get"])
     def leadership(self, request, short_name=None):
         # Returns *all* leadership roles for all time -- current and past --
-        # grouped by lead type. We query ProjectRole directly rather than reuse
-        # Project.get_project_leadership(): that helper is built for the public
-        # page's current-vs-past display and computes "inactive" per *person*,
-        # so it drops a person's past lead roles once they hold any active role.
-        # Each returned role carries its own is_active flag, so a consumer can
-        # still separate current from past leadership client-side.
+        # grouped by lead type. We read the all_* buckets of
+        # Project.get_leadership_for_projects() rather than its active/inactive
+        # ones: those are built for the public page's current-vs-past display and
+        # compute "inactive" per *person*, so they drop a person's past lead
+        # roles once they hold any active role. Each returned role carries its
+        # own is_active flag, so a consumer can still separate current from past
+        # leadership client-side.
         project = self.get_object()
-        roles = (
-            ProjectRole.objects.filter(
-                project=project, lead_project_role__in=list(_LEAD_BUCKETS)
-            )
-            .select_related("person")
-            .prefetch_related("person__position_set")
-            .order_by("-start_date")
-        )
+        leadership = Project.get_leadership_for_projects(
+            [project], order_by=("-start_date", "pk")
+        )[project.pk]
         context = self.get_serializer_context()
 
-        grouped = {key: [] for key in _LEAD_BUCKETS.values()}
-        for role in roles:
-            grouped[_LEAD_BUCKETS[role.lead_project_role]].append(role)
+        grouped = {
+            key: leadership[f"all_{LEADERSHIP_KEY_SUFFIXES[role_type]}"]
+            for role_type, key in _LEAD_BUCKETS.items()
+        }
+        # ProjectRoleSerializer reads the person's positions; one batched prefetch
+        # across every bucket instead of one per role.
+        prefetch_related_objects(
+            [role for items in grouped.values() for role in items],
+            "person__position_set",
+        )
 
         return Response(
             {
@@ -238,3 +259,20 @@ class ProjectViewSet(_PaginatedActionMixin, ReadOnlyModelViewSet):
                 for key, items in grouped.items()
             }
         )
+
+
+class SearchViewSet(ListModelMixin, GenericViewSet):
+    """Ranked full-text search over publications, talks, projects, and news.
+
+    Query params: ``?q=`` (web-search syntax: quoted phrases, ``or``,
+    ``-word``), optional ``?kind=`` (``publication``, ``talk``, ``project``,
+    ``news``). An empty ``q`` returns no results. Best match first.
+    """
+
+    serializer_class = SearchResultSerializer
+    pagination_class = ApiPagination
+
+    def get_queryset(self):
+        kind = self.request.query_params.get("kind")
+        kinds = [kind] if kind in SearchEntry.Kind.values else None
+        return search(self.request.query_params.get("q", ""), kinds)
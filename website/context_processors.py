@@ -7,15 +7,34 @@
          https://stackoverflow.com/questions/36093221/how-to-put-variable-from-database-into-base-html-template
 """
 
-from .models import News
+from .models import ContentVersion, News
+from .utils.cache import cached
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+# Number of news items in the footer's "Recent News" column (base.html)
+RECENT_NEWS_COUNT = 3
+
+# Only changes when a news item is saved or deleted (which bumps the 'news'
+# ContentVersion), so the timeout is just a backstop.
+RECENT_NEWS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+@cached('recent_news', scopes=[ContentVersion.NEWS], timeout=RECENT_NEWS_CACHE_TIMEOUT)
+def get_recent_news():
+    """Returns the newest RECENT_NEWS_COUNT news items, with just the fields the footer shows."""
+    return list(News.objects.only('title', 'slug', 'date').order_by('-date')[:RECENT_NEWS_COUNT])
+
 
 def recent_news(request):
-    """ context processors returning recent news """
-    news_items_num = 3  # Defines the number of news items that will be selected
-    news_items = News.objects.order_by('-date')[:news_items_num]
+    """ context processors returning recent news
 
-    return { 'recent_news': news_items, }
+    This runs for every RequestContext render, including admin pages, the 404
+    page, and AJAX fragments that never show the footer, so it's lazy: the cache
+    (and, on a miss, the News query) is only touched when a template actually
+    reads ``recent_news``.
+    """
+    return { 'recent_news': SimpleLazyObject(get_recent_news), }
 
 def admin_version_info(request):
     """
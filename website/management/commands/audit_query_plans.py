@@ -0,0 +1,66 @@
+import json
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from website.utils.query_audit import HOT_QUERIES, audit_hot_queries
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN (ANALYZE, BUFFERS) over the registry of hot-path querysets "
+        "in website/utils/query_audit.py (the publications and people pages, the "
+        "landing page, member/project lookups, serve_pdf) and flags any that "
+        "need a sequential scan. By default sequential scans are disabled for "
+        "the audit, so a flagged query is one that no index can serve: on our "
+        "small tables the planner would otherwise (rightly) seq-scan everything. "
+        "Use --fail-on-seqscan in CI to catch a dropped or unusable index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="names",
+            choices=[hot_query.name for hot_query in HOT_QUERIES],
+            help="Audit only this hot query (repeatable). Default: all of them.",
+        )
+        parser.add_argument(
+            "--allow-seqscan",
+            action="store_true",
+            help="Leave enable_seqscan on, to see the plans the planner picks on its own.",
+        )
+        parser.add_argument(
+            "--fail-on-seqscan",
+            action="store_true",
+            help="Exit with an error if any audited query uses a sequential scan.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the results as JSON instead of a table.",
+        )
+
+    def handle(self, *args, **options):
+        results = audit_hot_queries(names=options["names"], disable_seqscan=not options["allow_seqscan"])
+        flagged = [result for result in results if result["seq_scans"]]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.stdout.write(f"{'query':<28} {'time':>10} {'hit':>6} {'read':>6}  seq scans")
+            for result in results:
+                seq_scans = ", ".join(f"{relation} ({rows} rows)" for relation, rows in result["seq_scans"]) or "-"
+                self.stdout.write(f"{result['name']:<28} {result['execution_ms']:7.2f} ms "
+                                  f"{result['shared_hit']:>6} {result['shared_read']:>6}  {seq_scans}")
+
+        _logger.info(f"audit_query_plans: Explained {len(results)} hot query(ies); "
+                     f"{len(flagged)} use a sequential scan.")
+        for result in flagged:
+            _logger.warning(f"audit_query_plans: {result['name']} ({result['source']}) seq-scans "
+                            f"{', '.join(relation for relation, _ in result['seq_scans'])}")
+
+        if flagged and options["fail_on_seqscan"]:
+            raise CommandError(f"{len(flagged)} hot query(ies) use a sequential scan: "
+                               f"{', '.join(result['name'] for result in flagged)}")
@@ -1,47 +1,73 @@
 import logging
+import time
+from datetime import date
 from django.core.management.base import BaseCommand
-from website.models import Person, ProjectRole
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
+from website.models import Person, Position, ProjectRole
 
 # Get an instance of a logger
 _logger = logging.getLogger(__name__)
 
+_BATCH_SIZE = 1000
+
+
 class Command(BaseCommand):
     help = """This command automatically closes ProjectRoles for people who have left the lab
-              by setting null end_dates of ProjectRoles to the date they left the lab.
+              by setting null end_dates of ProjectRoles to the date they left the lab (or the
+              project's end date, if that is earlier). Set-based: one query finds who has left,
+              one loads their open roles, and one bulk_update closes them, so the query count
+              stays constant however many people there are.
            """
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report which roles would be closed without changing anything.",
+        )
+
+    def get_departed_people(self, today):
+        """
+        Returns {person id: date they left} for everyone whose latest Position
+        (by start date, as Person.get_latest_position picks it) has an end date
+        and who isn't active, i.e. that position has ended or hasn't started yet.
+        """
+        latest_position = Position.objects.filter(person=OuterRef('pk')).order_by('-start_date', 'pk')
+        departed = (Person.objects
+                    .annotate(latest_start=Subquery(latest_position.values('start_date')[:1]),
+                              latest_end=Subquery(latest_position.values('end_date')[:1]))
+                    .filter(latest_end__isnull=False)
+                    .filter(Q(latest_end__lt=today) | Q(latest_start__gt=today))
+                    .values_list('pk', 'latest_end'))
+        return dict(departed)
+
     def handle(self, *args, **options):
-        _logger.debug("Running auto_close_project_roles.py command to close project roles for people who have left the lab...")
-       
-        # Iterate over all Person instances
-        list_persons_updated = []
-        list_project_roles_updated = []
-        for person in Person.objects.all():
-            # Get the latest end_date among the person's positions
-            latest_position = person.get_latest_position
-            
-            # If the person has a latest_position and it has an end_date and the person is no longer active
-            if latest_position and latest_position.end_date is not None and person.is_active == False:
-                
-                # Get ProjectRoles related to the Person that have a null end_date
-                project_roles_to_close = ProjectRole.objects.filter(person=person, end_date__isnull=True)
-
-                # Log and update the ProjectRoles that will be automatically closed
-                for project_role in project_roles_to_close:
-                    # Use the earlier of the project's end_date and the position's end_date
-                    end_date = min(project_role.project.end_date, latest_position.end_date) if project_role.project.end_date else latest_position.end_date
-                    
-                    _logger.info(f"Automatically closing ProjectRole: {project_role} for Person: {person} with end_date: {end_date}")
-                    
-                    # Update end_date of the ProjectRole
-                    project_role.end_date = end_date
-
-                    # NEED TO UNCOMMENT THIS AFTER WE TEST
-                    project_role.save()
-
-                    list_project_roles_updated.append(project_role)
-
-                    # Track who has been updated
-                    list_persons_updated.append(person)
-
-        _logger.info(f"Updated {len(list_persons_updated)} Person instances and {len(list_project_roles_updated)} ProjectRole instances")
+        dry_run = options["dry_run"]
+        _logger.debug(f"Running auto_close_project_roles.py (dry_run={dry_run}) to close project roles for people who have left the lab...")
+        start_time = time.perf_counter()
+
+        with transaction.atomic():
+            departed = self.get_departed_people(date.today())
+            open_roles = list(ProjectRole.objects
+                              .filter(person_id__in=departed, end_date__isnull=True)
+                              .select_related('person', 'project')
+                              .select_for_update(of=('self',)))
+
+            for project_role in open_roles:
+                # Use the earlier of the project's end_date and the date the person left
+                left_on = departed[project_role.person_id]
+                project_end = project_role.project.end_date
+                project_role.end_date = min(project_end, left_on) if project_end else left_on
+                # Not str(project_role): its title index costs queries per row
+                _logger.info(f"{'[dry-run] Would close' if dry_run else 'Automatically closing'} ProjectRole "
+                             f"{project_role.pk} on '{project_role.project.name}' for Person: {project_role.person} "
+                             f"with end_date: {project_role.end_date}")
+
+            if not dry_run:
+                ProjectRole.objects.bulk_update(open_roles, ['end_date'], batch_size=_BATCH_SIZE)
+
+        num_people = len({project_role.person_id for project_role in open_roles})
+        _logger.info(f"auto_close_project_roles: {'[dry-run] Would update' if dry_run else 'Updated'} "
+                     f"{num_people} Person instances and {len(open_roles)} ProjectRole instances "
+                     f"({len(departed)} people have left) in {time.perf_counter() - start_time:0.2f}s")
@@ -1,11 +1,15 @@
 import logging
+import os
+import time
 from django.core.management.base import BaseCommand
 from website.models import Publication
-import website.utils.fileutils as ml_fileutils
+from website.utils.pdf_page_cache import get_pdf_page_counts
 
 # This retrieves a Python logging instance (or creates it)
 _logger = logging.getLogger(__name__)
 
+_BATCH_SIZE = 500
+
 
 class Command(BaseCommand):
     help = (
@@ -13,7 +17,10 @@ class Command(BaseCommand):
         "PDF but no page count, by reading the page count directly from the PDF "
         "(issue #1298). Only fills empty values, so manually entered counts are "
         "never overwritten. Idempotent: once a publication has a count it is "
-        "skipped, so this is safe to run on every container start."
+        "skipped, so this is safe to run on every container start. Page counts "
+        "are cached per file (PdfPageCount), so PDFs that couldn't be read last "
+        "time aren't reparsed unless they change; new ones are parsed in a "
+        "process pool."
     )
 
     def add_arguments(self, parser):
@@ -22,6 +29,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Report what would change without writing to the database.",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help="Processes to parse uncached PDFs with. Default: up to 4.",
+        )
 
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
@@ -29,16 +42,22 @@ class Command(BaseCommand):
             f"Running backfill_num_pages.py (dry_run={dry_run}) to populate "
             f"num_pages for publications missing it."
         )
+        start_time = time.perf_counter()
 
         # Only publications that have a PDF but no page count yet.
-        candidates = Publication.objects.filter(
+        candidates = list(Publication.objects.filter(
             num_pages__isnull=True
-        ).exclude(pdf_file="").exclude(pdf_file__isnull=True)
+        ).exclude(pdf_file="").exclude(pdf_file__isnull=True).only("pk", "title", "pdf_file"))
 
-        num_updated = 0
+        # Counts come from the page-count cache (website/utils/pdf_page_cache.py):
+        # only new or changed PDFs are opened, in parallel across --workers.
+        page_counts, num_parsed = get_pdf_page_counts(
+            [pub.pdf_file for pub in candidates], workers=options["workers"], update_cache=not dry_run)
+
+        pubs_to_update = []
         num_skipped = 0
         for pub in candidates:
-            page_count = ml_fileutils.get_pdf_page_count(pub.pdf_file)
+            page_count = page_counts.get(pub.pdf_file.name)
             if not page_count:
                 # Couldn't read the PDF (missing on disk, corrupt, etc.).
                 # Leave num_pages empty and move on.
@@ -49,24 +68,28 @@ class Command(BaseCommand):
                 num_skipped += 1
                 continue
 
-            if dry_run:
-                _logger.debug(
-                    f"[dry-run] Would set num_pages={page_count} for pub "
-                    f"id={pub.pk} '{pub.title}'"
-                )
-            else:
-                # Write directly via the queryset so this stays a pure data
-                # backfill — no thumbnail regeneration or file-rename side
-                # effects from the model's save().
-                Publication.objects.filter(pk=pub.pk).update(num_pages=page_count)
-                _logger.debug(
-                    f"Set num_pages={page_count} for pub id={pub.pk} '{pub.title}'"
-                )
-            num_updated += 1
+            pub.num_pages = page_count
+            pubs_to_update.append(pub)
+            _logger.debug(
+                f"{'[dry-run] Would set' if dry_run else 'Set'} num_pages={page_count} "
+                f"for pub id={pub.pk} '{pub.title}'"
+            )
+
+        if pubs_to_update and not dry_run:
+            # Write directly via bulk_update so this stays a pure data
+            # backfill — no thumbnail regeneration or file-rename side
+            # effects from the model's save().
+            Publication.objects.bulk_update(pubs_to_update, ["num_pages"], batch_size=_BATCH_SIZE)
+
+            # numpages={...} is part of the stored BibTeX, so rebuild the citation
+            # cache for the rows we just touched (one batched pass, not per row).
+            Publication.refresh_citation_caches(
+                Publication.objects.filter(pk__in=[pub.pk for pub in pubs_to_update]))
 
         verb = "Would update" if dry_run else "Updated"
         _logger.info(
-            f"backfill_num_pages: {verb} {num_updated} publication(s); "
-            f"skipped {num_skipped} (PDF unreadable/missing)."
+            f"backfill_num_pages: {verb} {len(pubs_to_update)} publication(s); "
+            f"skipped {num_skipped} (PDF unreadable/missing); parsed {num_parsed} "
+            f"PDF(s), the rest from cache; in {time.perf_counter() - start_time:0.2f}s."
         )
         _logger.debug("Completed backfill_num_pages.py")
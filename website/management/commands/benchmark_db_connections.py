@@ -0,0 +1,97 @@
+import logging
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import Client
+from django.urls import reverse
+from website.utils import db_connections
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the per-request cost of opening a database connection: fetches "
+        "the home page and the public API N times with a new connection per "
+        "request (CONN_MAX_AGE=0, the old default) and again with one persistent "
+        "connection, and reports connections opened and mean time per request for "
+        "each. Read-only GETs through Django's test client, so it's safe against "
+        "a live database. Run inside the website container, where the db host and "
+        "round trip match production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=50,
+            help="Requests per URL per mode. Default: 50.",
+        )
+        parser.add_argument(
+            "--url",
+            action="append",
+            dest="urls",
+            help="URL path to fetch (repeatable). Default: the home page and /api/v1/publications/.",
+        )
+
+    def handle(self, *args, **options):
+        if settings.DB_POOL == 'psycopg':
+            # Django refuses CONN_MAX_AGE together with a pool, so there's no
+            # persistent mode to compare against; the pool's own wait counters
+            # are in /version.json instead.
+            raise CommandError("ML_DB_POOL=psycopg is set; unset it to compare per-request and "
+                               "persistent connections.")
+
+        num_requests = options["requests"]
+        urls = options["urls"] or [reverse("website:index"), "/api/v1/publications/"]
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        client = Client(HTTP_HOST=host)
+        connection = connections["default"]
+        configured_max_age = settings.DATABASES["default"].get("CONN_MAX_AGE") or 60
+
+        _logger.info(f"benchmark_db_connections: {num_requests} request(s) per URL per mode "
+                     f"(connection mode in settings: {db_connections.get_connection_mode()})")
+
+        for url in urls:
+            # Warm caches and templates so both modes measure the same work
+            client.get(url)
+
+            results = {}
+            for mode, max_age in (("per-request", 0), ("persistent", configured_max_age)):
+                connection.close()
+                connection.settings_dict["CONN_MAX_AGE"] = max_age
+                opened_before = db_connections.get_connection_counters()["opened"]
+
+                start_time = time.perf_counter()
+                for _ in range(num_requests):
+                    # The test client disconnects close_old_connections from
+                    # request_started/request_finished, so do what the WSGI
+                    # handler does around each request here; without it both
+                    # modes would reuse one connection.
+                    close_old_connections()
+                    response = client.get(url)
+                    close_old_connections()
+                    if response.status_code != 200:
+                        _logger.warning(f"benchmark_db_connections: {url} returned {response.status_code}")
+                elapsed = time.perf_counter() - start_time
+
+                opened = db_connections.get_connection_counters()["opened"] - opened_before
+                results[mode] = elapsed / num_requests * 1000
+                self.stdout.write(f"{url:<32} {mode:<12} {results[mode]:8.2f} ms/request, "
+                                  f"{opened} connection(s) opened")
+                if mode == "per-request" and opened != num_requests:
+                    # Anything else means requests shared a connection, and the
+                    # comparison below would measure nothing.
+                    raise CommandError(f"{url} opened {opened} connection(s) for {num_requests} "
+                                       f"per-request request(s); expected one each.")
+
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = settings.DATABASES["default"].get("CONN_MAX_AGE", 0)
+
+            saving = results["per-request"] - results["persistent"]
+            self.stdout.write(f"{url:<32} saving       {saving:8.2f} ms/request "
+                              f"({saving / results['per-request']:.0%})")
+            _logger.info(f"benchmark_db_connections: {url} per-request {results['per-request']:0.2f}ms, "
+                         f"persistent {results['persistent']:0.2f}ms, saving {saving:0.2f}ms/request")
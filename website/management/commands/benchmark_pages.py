@@ -0,0 +1,142 @@
+import json
+import logging
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from website.utils.page_benchmark import (BENCHMARK_PAGE_NAMES, build_report, find_baseline_regressions,
+                                          get_benchmark_targets, measure_targets)
+from website.utils.search_index import rebuild_search_index
+from website.utils.synthetic_lab import PRODUCTION_SIZE, seed_synthetic_lab, write_placeholder_media
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+# A private, per-process cache for the run: measurements clear the cache before
+# each request, which must never touch the shared cache the site is using
+_BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark_pages',
+        'KEY_PREFIX': 'mlw',
+    },
+}
+
+
+def _parse_scales(value):
+    scales = []
+    for part in value.split(','):
+        scale = float(part)
+        if scale <= 0:
+            raise CommandError(f"Scales must be positive, got {part!r}")
+        scales.append(int(scale) if scale.is_integer() else scale)
+    if scales != sorted(scales):
+        raise CommandError("Scales must be in increasing order")
+    return scales
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks every public page and /api/v1/ route at several data sizes: "
+        "seeds synthetic data (website/utils/synthetic_lab.py) at each scale "
+        "times production size (default 1x, 10x, 100x), then records each "
+        "page's query count, wall time, and peak memory on a cold cache "
+        "(website/utils/page_benchmark.py). Writes a JSON report that can be "
+        "compared across commits, and fails if any page's query count grows "
+        "with data size (or, with --baseline, went up since an earlier report). "
+        "Everything runs in one transaction that is rolled back at the end; run "
+        "it against a development database anyway, since it holds locks for "
+        "the duration."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            default="1,10,100",
+            help="Comma-separated multiples of production size, increasing. Default: 1,10,100.",
+        )
+        parser.add_argument(
+            "--page",
+            action="append",
+            dest="pages",
+            choices=BENCHMARK_PAGE_NAMES,
+            help="Benchmark only this page (repeatable). Default: all of them.",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark-pages.json",
+            help="Where to write the JSON report. Default: benchmark-pages.json.",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="An earlier report to compare query counts against.",
+        )
+        parser.add_argument(
+            "--query-tolerance",
+            type=int,
+            default=0,
+            help="Extra queries a page may issue at a larger scale before it counts as growing. Default: 0.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=1,
+            help="Random seed for the synthetic data, so runs are comparable. Default: 1.",
+        )
+
+    def handle(self, *args, **options):
+        scales = _parse_scales(options["scales"])
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+
+        # Shared by every synthetic row (and left in place, like any seeded media)
+        write_placeholder_media()
+
+        results_by_scale = {}
+        with override_settings(CACHES=_BENCHMARK_CACHES, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            with transaction.atomic():
+                seeded_scale = 0
+                for scale in scales:
+                    start_time = time.perf_counter()
+                    counts = seed_synthetic_lab(scale - seeded_scale, seed=options["seed"] + len(results_by_scale))
+                    seeded_scale = scale
+                    rebuild_search_index()
+                    self.stdout.write(f"Seeded {scale}x ({sum(counts.values())} new rows) "
+                                      f"in {time.perf_counter() - start_time:0.1f}s")
+
+                    results_by_scale[scale] = measure_targets(get_benchmark_targets(), names=options["pages"])
+                    self._write_table(scale, results_by_scale[scale])
+
+                transaction.set_rollback(True)
+
+        report = build_report(results_by_scale, PRODUCTION_SIZE, tolerance=options["query_tolerance"])
+        with open(options["output"], "w") as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f"Wrote {options['output']} (rolled back the synthetic data).")
+
+        failures = []
+        if report["query_growth"]:
+            failures.append(f"query count grows with data size: {', '.join(report['query_growth'])}")
+        errors = sorted({name for results in results_by_scale.values()
+                         for name, result in results.items() if result["status"] >= 500})
+        if errors:
+            failures.append(f"server errors: {', '.join(errors)}")
+        if baseline is not None:
+            regressions = find_baseline_regressions(report, baseline)
+            if regressions:
+                failures.append("more queries than the baseline: " + ", ".join(
+                    f"{name}@{scale}x {before}->{after}" for name, scale, before, after in regressions))
+
+        _logger.info(f"benchmark_pages: Measured {len(report['pages'])} page(s) at scales {scales}; "
+                     f"{len(failures)} problem(s).")
+        if failures:
+            raise CommandError("; ".join(failures))
+
+    def _write_table(self, scale, results):
+        self.stdout.write(f"{'page':<26} {'status':>6} {'queries':>8} {'time':>11} {'peak':>10}   @ {scale}x")
+        for name, result in results.items():
+            self.stdout.write(f"{name:<26} {result['status']:>6} {result['queries']:>8} "
+                              f"{result['ms']:8.1f} ms {result['peak_kb']:>7} kB")
@@ -0,0 +1,111 @@
+import logging
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from website.models import Person, Publication
+from website.utils.search_index import rebuild_search_index, search
+from website.utils.synthetic_lab import PRODUCTION_SIZE, seed_synthetic_lab
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the site search on a synthetic corpus: seeds synthetic lab "
+        "data (website/utils/synthetic_lab.py) at a multiple of production "
+        "size (default 150x, about 50,000 publications), rebuilds the search "
+        "index, and compares the first page of full-text results against the "
+        "icontains query the site would otherwise need. Everything runs in one transaction that is "
+        "rolled back at the end, so the database is left untouched; run it "
+        "against a development database anyway, since it holds locks for the "
+        "duration."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=150,
+            help=f"Multiple of production size to seed ({PRODUCTION_SIZE['publications']} publications "
+                 f"at 1x). Default: 150.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per query (the median is reported). Default: 5.",
+        )
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="queries",
+            help="Query to time (repeatable). Default: words and an author name drawn from the corpus.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=1,
+            help="Random seed, so runs are comparable. Default: 1.",
+        )
+
+    def handle(self, *args, **options):
+        if options["scale"] <= 0:
+            raise CommandError("--scale must be positive")
+        rng = random.Random(options["seed"])
+
+        with transaction.atomic():
+            start_time = time.perf_counter()
+            seeded = seed_synthetic_lab(scale=options["scale"], seed=options["seed"])
+            self.stdout.write(f"Seeded {seeded['publications']} publication(s) and {seeded['people']} "
+                              f"person(s) in {time.perf_counter() - start_time:0.1f}s")
+
+            start_time = time.perf_counter()
+            counts = rebuild_search_index()
+            index_seconds = time.perf_counter() - start_time
+            self.stdout.write(f"Indexed {sum(counts.values())} entries in {index_seconds:0.1f}s")
+
+            queries = options["queries"] or self._sample_queries(rng)
+            self.stdout.write(f"{'query':<28} {'full-text':>12} {'icontains':>12} {'hits':>8}")
+            for query in queries:
+                fts_ms, hits = self._time(lambda: self._full_text_page(query), options["repeat"])
+                like_ms, _ = self._time(lambda: self._icontains_page(query), options["repeat"])
+                self.stdout.write(f"{query[:28]:<28} {fts_ms:9.1f} ms {like_ms:9.1f} ms {hits:>8}")
+                _logger.info(f"benchmark_search: {query!r} full-text {fts_ms:0.1f}ms, "
+                             f"icontains {like_ms:0.1f}ms, {hits} hit(s)")
+
+            transaction.set_rollback(True)
+        self.stdout.write("Rolled back the synthetic corpus.")
+
+    def _sample_queries(self, rng):
+        """Single title words, a two-word title phrase, and an author's last name."""
+        titles = sorted(Publication.objects.values_list('title', flat=True))
+        titles = [title.rstrip('.').lower().split() for title in rng.sample(titles, 4)]
+        words = [title[0] for title in titles[:3]]
+        phrase = f'"{" ".join(titles[3][:2])}"'
+        return words + [phrase, rng.choice(sorted(Person.objects.values_list('last_name', flat=True)))]
+
+    def _full_text_page(self, query):
+        page = list(search(query)[:20])
+        return len(page)
+
+    def _icontains_page(self, query):
+        query = query.strip('"')
+        matches = (Publication.objects
+                   .filter(Q(title__icontains=query) | Q(forum_name__icontains=query)
+                           | Q(authors__last_name__icontains=query))
+                   .distinct()
+                   .order_by('-date'))
+        return len(list(matches[:20]))
+
+    def _time(self, func, repeat):
+        timings = []
+        result = None
+        for _ in range(max(repeat, 1)):
+            start_time = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - start_time) * 1000)
+        return statistics.median(timings), result
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand, CommandError
 from website.models import Publication, Talk, Poster
 from django.conf import settings
+from website.utils.content_store import is_content_addressed, prune_dangling_references, sweep_unreferenced_blobs
 import os
 import glob
 
@@ -11,13 +12,16 @@ _logger = logging.getLogger(__name__)
 
 class Command(BaseCommand):
 
-    help = 'Looks for old publication, talk, and poster files and thumbnails no longer used'
+    help = ('Looks for old publication, talk, and poster files and thumbnails no longer used. '
+            'With the content-addressed media store on, also sweeps up blobs no file references any more')
 
     def handle(self, *args, **options):
         _logger.debug("Running delete_unused_files.py command to search for and delete unused files in filesystem")
         self.delete_unused_pubs()
         self.delete_unused_talks()
         self.delete_unused_posters()
+        if is_content_addressed():
+            self.sweep_content_store()
 
         print("\n------------")
         print("Make sure to also run 'python manage.py thumbnail_cleanup', which will execute easy-thumbnail's cleanup")
@@ -231,6 +235,15 @@ class Command(BaseCommand):
         else:
             _logger.debug("There are no unused pub thumbnails to delete")
 
+    def sweep_content_store(self):
+        # With the content-addressed media store (website/utils/content_store.py), the
+        # names deleted above are only hardlinks: drop their references, then free
+        # every blob that no reference points at any more
+        num_pruned = prune_dangling_references(settings.MEDIA_ROOT)
+        (num_files_deleted, bytes_deleted) = sweep_unreferenced_blobs(settings.MEDIA_ROOT)
+        _logger.info("delete_unused_files: Pruned {} dangling media references; deleted {} unreferenced blobs ({} bytes total)".format(
+            num_pruned, num_files_deleted, bytes_deleted))
+
     def delete_unused_files(self, files):
         bytes_deleted = 0
         num_files_deleted = 0     
@@ -20,7 +20,12 @@ Safety model:
   * **Atomic per row.** Each merge runs in ``transaction.atomic()``.
   * **Generic relation walk.** Relations are discovered via
     ``Person._meta.get_fields()`` rather than hardcoded, so a new FK/M2M to
-    Person can't silently orphan data.
+    Person can't silently orphan data. The rewrite itself is set-based (the
+    shared engine in ``website/utils/object_merge.py``): a few statements per
+    relation however prolific the duplicate, and no per-row m2m signals, so
+    merging an author never saves/renames their artifacts one at a time.
+  * **Preview diff.** The dry-run lists, per relation, how many rows the merge
+    would repoint and how many duplicate links it would drop.
 
 Decisions file: CSV with columns ``source_id, action, target_id, note``.
   * ``merge``  — relocate everything from ``source_id`` onto ``target_id``, then
@@ -43,6 +48,7 @@ from django.db import transaction
 
 from website.models import Person
 from website.utils.name_utils import normalize_person_name
+from website.utils.object_merge import get_merge_relations, merge_objects, preview_merge
 
 _logger = logging.getLogger(__name__)
 
@@ -58,36 +64,10 @@ SCALAR_BACKFILL_FIELDS = [
 ]
 
 
-def _person_reverse_relations():
-    """
-    Return ``(fk_rels, m2m_rels)`` — the auto-created reverse relations that
-    point at ``Person``, discovered generically from the model meta.
-
-    ``fk_rels`` are reverse foreign keys / one-to-ones (``ManyToOneRel`` /
-    ``OneToOneRel``), including the three Position advisor self-references.
-    ``m2m_rels`` are reverse many-to-manys (``ManyToManyRel``), e.g. the sorted
-    ``authors`` / ``recipients`` sets and the plain ``News.people`` set.
-    """
-    fk_rels, m2m_rels = [], []
-    for field in Person._meta.get_fields():
-        if not (field.is_relation and field.auto_created and not field.concrete):
-            continue
-        if field.many_to_many:
-            m2m_rels.append(field)
-        elif field.one_to_many or field.one_to_one:
-            fk_rels.append(field)
-    return fk_rels, m2m_rels
-
-
 def count_references(person):
     """Total number of objects across all relations pointing at ``person``."""
-    fk_rels, m2m_rels = _person_reverse_relations()
-    total = 0
-    for field in fk_rels:
-        total += field.related_model.objects.filter(**{field.field.name: person}).count()
-    for field in m2m_rels:
-        total += getattr(person, field.get_accessor_name()).count()
-    return total
+    return sum(change.field.model._base_manager.filter(**{change.field.attname: person.pk}).count()
+               for change in get_merge_relations(Person))
 
 
 class Command(BaseCommand):
@@ -204,6 +184,8 @@ class Command(BaseCommand):
                 f"  merge  {source.pk} ({source.get_full_name()}, refs={count_references(source)}) "
                 f"-> {target.pk} ({target.get_full_name()}, refs={count_references(target)})"
                 f"{self._note(row)}")
+            for line in preview_merge(target, [source]).get_diff_lines():
+                self.stdout.write(f"           {line}")
             return
 
         with transaction.atomic():
@@ -236,42 +218,10 @@ class Command(BaseCommand):
 
     def _merge(self, source, target):
         """
-        Relocate every relation from ``source`` onto ``target``, backfill blank
-        scalar fields, then delete ``source``. Returns ``(summary, backfilled)``.
-        Must run inside an atomic block.
+        Backfill blank scalar fields on ``target`` from ``source``, then relocate
+        every relation from ``source`` onto ``target`` and delete ``source``.
+        Returns ``(summary, backfilled)``. Must run inside an atomic block.
         """
-        fk_rels, m2m_rels = _person_reverse_relations()
-        summary = {}
-
-        # Reverse FKs (incl. advisor / co_advisor / grad_mentor self-refs): just
-        # repoint the foreign key. SET_NULL/CASCADE on_delete is irrelevant once
-        # nothing points at source.
-        for field in fk_rels:
-            model, fk = field.related_model, field.field.name
-            n = model.objects.filter(**{fk: source}).update(**{fk: target})
-            if n:
-                summary[f"{model.__name__}.{fk}"] = n
-
-        # Reverse M2Ms: rebuild each related object's ordered author/recipient/
-        # people list with source swapped for target (dropping source if target
-        # is already present — dedup). For SortedManyToManyField, .set() assigns
-        # sort_value by list position, so author order is preserved.
-        for field in m2m_rels:
-            forward = field.field.name  # 'authors' / 'recipients' / 'people'
-            moved = 0
-            for obj in list(getattr(source, field.get_accessor_name()).all()):
-                manager = getattr(obj, forward)
-                new_members, seen = [], set()
-                for member in manager.all():  # ordered for sorted M2M
-                    replacement = target if member.pk == source.pk else member
-                    if replacement.pk not in seen:
-                        seen.add(replacement.pk)
-                        new_members.append(replacement)
-                manager.set(new_members)
-                moved += 1
-            if moved:
-                summary[f"{field.related_model.__name__}.{forward}"] = moved
-
         # Scalar backfill: fill target's blanks from source; never overwrite.
         backfilled = []
         for fld in SCALAR_BACKFILL_FIELDS:
@@ -284,10 +234,14 @@ class Command(BaseCommand):
             Person.objects.filter(pk=target.pk).update(
                 **{fld: getattr(target, fld) for fld in backfilled})
 
-        # Delete the now-orphaned source. Its pre_delete signal removes source's
-        # own image file (target's image is untouched, so nothing shared breaks).
-        source.delete()
-        return summary, backfilled
+        # Reverse FKs (incl. advisor / co_advisor / grad_mentor self-refs) are
+        # repointed; author/recipient/people link rows are repointed in place, so
+        # target takes source's slot in an ordered author list (dropping source's
+        # row where target is already present -- dedup). Deleting the now-orphaned
+        # source runs its pre_delete signal, which removes source's own image file
+        # (target's image is untouched, so nothing shared breaks).
+        result = merge_objects(target, [source])
+        return result.summary, backfilled
 
     @staticmethod
     def _get_person(pk):
@@ -0,0 +1,106 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from website.models import MediaReference
+from website.utils.content_store import BLOB_DIR_NAME, get_blob_path, link_name_to_blob
+from website.utils.fileutils import get_file_sha256
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves the existing media tree into the content-addressed media store "
+        "(website/utils/content_store.py): hashes every file in MEDIA_ROOT's "
+        "subdirectories (not the logs at its top level) in a process pool, stores "
+        "one blob per distinct SHA-256, turns each file into a hardlink to its "
+        "blob (so identical files stop taking space twice), and "
+        "records a MediaReference per name. Files already referenced are skipped, "
+        "so it is safe to re-run, e.g. to pick up thumbnails written straight to "
+        "disk. Run it before setting ML_MEDIA_CONTENT_ADDRESSED=true."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Hash the files and report the savings without changing anything.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help="Processes to hash files with. Default: up to 4.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        start_time = time.perf_counter()
+        media_root = settings.MEDIA_ROOT
+
+        already_referenced = set(MediaReference.objects.values_list('name', flat=True))
+        names = [name for name in self.get_media_names(media_root) if name not in already_referenced]
+        paths = [os.path.join(media_root, name) for name in names]
+        _logger.debug(f"Hashing {len(paths)} unreferenced media files with {options['workers']} worker(s)")
+        hashes = self.hash_files(paths, options["workers"])
+
+        references = []
+        blobs_seen = set()
+        bytes_deduplicated = 0
+        for name, path, sha256 in zip(names, paths, hashes):
+            size = os.path.getsize(path)
+            blob_path = get_blob_path(media_root, sha256)
+            if sha256 in blobs_seen or os.path.exists(blob_path):
+                if not (os.path.exists(blob_path) and os.path.samefile(path, blob_path)):
+                    bytes_deduplicated += size
+                    if not dry_run:
+                        link_name_to_blob(blob_path, path)
+            elif not dry_run:
+                # First copy of this content: it becomes the blob, no data copied
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.link(path, blob_path)
+            blobs_seen.add(sha256)
+            references.append(MediaReference(name=name, sha256=sha256, size=size))
+
+        if references and not dry_run:
+            MediaReference.objects.bulk_create(
+                references, batch_size=_BATCH_SIZE, update_conflicts=True, unique_fields=['name'],
+                update_fields=['sha256', 'size'])
+
+        verb = "Would reference" if dry_run else "Referenced"
+        _logger.info(f"migrate_media_to_content_store: {verb} {len(references)} file(s) as {len(blobs_seen)} "
+                     f"distinct blob(s); {bytes_deduplicated} bytes deduplicated; "
+                     f"in {time.perf_counter() - start_time:0.2f}s")
+
+    def get_media_names(self, media_root):
+        """
+        Yields the storage name of every regular file in the subdirectories of
+        media_root, except the blob store itself and the in-progress uploads in
+        FILE_UPLOAD_TEMP_DIR. Files at the top level are left out: that's where
+        debug.log (LOG_DIR) and its rotations live, and a file that keeps
+        growing must never become a blob.
+        """
+        skipped_dirs = {BLOB_DIR_NAME, os.path.basename(settings.FILE_UPLOAD_TEMP_DIR or '')}
+        for dir_path, dir_names, filenames in os.walk(media_root):
+            if dir_path == media_root:
+                dir_names[:] = [name for name in dir_names if name not in skipped_dirs]
+                continue
+            for filename in filenames:
+                path = os.path.join(dir_path, filename)
+                if os.path.isfile(path) and not os.path.islink(path):
+                    yield os.path.relpath(path, media_root).replace(os.sep, '/')
+
+    def hash_files(self, paths, workers):
+        """Returns the SHA-256 of each path, in order, hashing across a spawned process pool."""
+        if workers <= 1 or len(paths) <= 1:
+            return [get_file_sha256(path) for path in paths]
+        # Spawned, not forked: a forked worker would share (and close) our DB connection
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+            return list(pool.map(get_file_sha256, paths, chunksize=max(1, len(paths) // (workers * 4))))
@@ -16,17 +16,34 @@ Safety properties:
   is why it is safe to run on every container start from ``docker-entrypoint.sh``
   (it self-heals future papers whose children are added without a project).
 
+By default only the publications logged in ``PublicationProjectsChange`` since
+the last pass are looked at: the receivers in ``website/signals.py`` log a
+publication when it is saved, when it gains a project, and when one of its
+children loses one. The pass then deletes the log rows it has handled, which is
+its checkpoint, so a start with nothing changed costs a couple of queries
+instead of a walk over the whole archive. ``--full`` looks at every publication
+(e.g. after loading data with signals off). Either way, the links are written
+with one ``bulk_create(ignore_conflicts=True)`` per child through table.
+
 Run manually with ``--dry-run`` to preview without writing.
 """
 
 import logging
+import time
+from collections import defaultdict
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
 
-from website.models import Publication
+from website.models import Publication, PublicationProjectsChange, SearchEntry, Talk
+from website.utils.search_index import schedule_search_index_update
 
+# This retrieves a Python logging instance (or creates it)
 _logger = logging.getLogger(__name__)
 
+_BATCH_SIZE = 1000
+
 # Publication FK fields pointing at its child artifacts (all nullable).
 CHILD_FIELDS = ('talk', 'video', 'poster')
 
@@ -34,7 +51,8 @@ CHILD_FIELDS = ('talk', 'video', 'poster')
 class Command(BaseCommand):
     help = ("Copy each publication's projects onto its own talk/video/poster "
             "children that currently have no project (#649). Additive and "
-            "idempotent.")
+            "idempotent. Only looks at publications changed since the last run "
+            "(see PublicationProjectsChange) unless --full is given.")
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -42,41 +60,92 @@ class Command(BaseCommand):
             action='store_true',
             help="Report what would change without writing to the database.",
         )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help="Look at every publication, not just those changed since the last run.",
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
+        full = options['full']
         prefix = '[dry-run] ' if dry_run else ''
-        _logger.info("%sRunning propagate_publication_projects (#649)...", prefix)
-
-        children_updated = 0
-        pubs = (Publication.objects
-                .prefetch_related('projects', 'talk__projects',
-                                  'video__projects', 'poster__projects'))
-        for pub in pubs:
-            parent_projects = list(pub.projects.all())
-            if not parent_projects:
-                continue  # nothing to propagate
-
-            for field in CHILD_FIELDS:
-                child = getattr(pub, field, None)
-                if child is None:
-                    continue
-                if child.projects.exists():
+        _logger.info("%sRunning propagate_publication_projects (#649, full=%s)...", prefix, full)
+        start_time = time.perf_counter()
+
+        # Everything logged up to here is handled by this pass; later entries
+        # (made while it runs) wait for the next one.
+        checkpoint = PublicationProjectsChange.objects.aggregate(checkpoint=Max('pk'))['checkpoint']
+        publications = Publication.objects.order_by('pk')
+        if not full:
+            publications = publications.filter(pk__in=PublicationProjectsChange.objects
+                                               .filter(pk__lte=checkpoint or 0).values('publication_id'))
+
+        with transaction.atomic():
+            num_publications, children_updated, rows_touched = self._propagate(publications, dry_run, prefix)
+            if checkpoint is not None and not dry_run:
+                PublicationProjectsChange.objects.filter(pk__lte=checkpoint).delete()
+
+        summary = (f"{prefix}Linked {children_updated} child artifact(s) to their "
+                   f"publication's projects ({rows_touched} project link(s)) from "
+                   f"{num_publications} publication(s) in "
+                   f"{time.perf_counter() - start_time:0.2f}s.")
+        _logger.info(summary)
+        self.stdout.write(summary)
+
+    def _propagate(self, publications, dry_run, prefix):
+        """
+        Links every childless talk/video/poster of publications to its parent's
+        projects. Returns (publications considered, children linked, link rows
+        written).
+        """
+        pub_rows = list(publications.values_list('pk', *(f'{field}_id' for field in CHILD_FIELDS)))
+        if not pub_rows:
+            return 0, 0, 0
+
+        parent_projects = defaultdict(list)
+        for pub_id, project_id in (Publication.projects.through.objects
+                                   .filter(publication_id__in=[row[0] for row in pub_rows])
+                                   .order_by('project_id')
+                                   .values_list('publication_id', 'project_id')):
+            parent_projects[pub_id].append(project_id)
+
+        children_updated = rows_touched = 0
+        for index, field in enumerate(CHILD_FIELDS, start=1):
+            projects_field = Publication._meta.get_field(field).related_model._meta.get_field('projects')
+            through = projects_field.remote_field.through
+            child_column, project_column = projects_field.m2m_column_name(), projects_field.m2m_reverse_name()
+
+            # A child shared by several publications inherits from the earliest
+            # one (lowest pk) that has projects.
+            parents = {}
+            for row in pub_rows:
+                if row[index] is not None and row[0] in parent_projects:
+                    parents.setdefault(row[index], row[0])
+            if not parents:
+                continue
+            already_linked = set(through.objects.filter(**{f'{child_column}__in': list(parents)})
+                                 .values_list(child_column, flat=True).distinct())
+
+            links = []
+            for child_id, pub_id in parents.items():
+                if child_id in already_linked:
                     continue  # already linked -- leave it alone
-
                 _logger.info(
-                    "%sLinking %s id=%s ('%s') to projects %s (from publication "
-                    "id=%s)",
-                    prefix, field, child.pk, child.title,
-                    [p.pk for p in parent_projects], pub.pk,
+                    "%sLinking %s id=%s to projects %s (from publication id=%s)",
+                    prefix, field, child_id, parent_projects[pub_id], pub_id,
                 )
-                if not dry_run:
-                    child.projects.add(*parent_projects)
+                links.extend(through(**{child_column: child_id, project_column: project_id})
+                             for project_id in parent_projects[pub_id])
                 children_updated += 1
 
-        _logger.info("%sLinked %d child artifact(s) to their publication's "
-                     "projects.", prefix, children_updated)
-        self.stdout.write(
-            f"{prefix}Linked {children_updated} child artifact(s) "
-            f"to their publication's projects."
-        )
+            if links and not dry_run:
+                # bulk_create sends no m2m_changed, so queue the re-index the
+                # search receivers would have (talks are indexed with their projects).
+                through.objects.bulk_create(links, batch_size=_BATCH_SIZE, ignore_conflicts=True)
+                if projects_field.model is Talk:
+                    schedule_search_index_update(SearchEntry.Kind.TALK,
+                                                 {getattr(link, child_column) for link in links})
+            rows_touched += len(links)
+
+        return len(pub_rows), children_updated, rows_touched
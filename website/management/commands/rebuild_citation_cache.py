@@ -0,0 +1,54 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from website.models import Publication
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the stored citation/BibTeX strings on Publication "
+        "(citation_html_cache, bibtex_cache, bibtex_html_cache). By default only "
+        "rows whose cache is still NULL are built (rows that predate the columns, "
+        "or were written by a raw queryset update), so this is cheap and safe to "
+        "run on every container start. Pass --all to rebuild every publication, "
+        "e.g. after changing the citation format in code."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild the cache for every publication, not just missing ones.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many rows would be rebuilt without writing to the database.",
+        )
+
+    def handle(self, *args, **options):
+        rebuild_all = options["all"]
+        dry_run = options["dry_run"]
+        _logger.debug(
+            f"Running rebuild_citation_cache.py (all={rebuild_all}, dry_run={dry_run})"
+        )
+
+        start_time = time.perf_counter()
+        candidates = Publication.objects.all()
+        if not rebuild_all:
+            candidates = candidates.filter(bibtex_cache__isnull=True)
+
+        if dry_run:
+            num_updated = candidates.count()
+        else:
+            num_updated = Publication.refresh_citation_caches(candidates)
+
+        verb = "Would rebuild" if dry_run else "Rebuilt"
+        _logger.info(
+            f"rebuild_citation_cache: {verb} {num_updated} publication citation(s) "
+            f"in {time.perf_counter() - start_time:0.2f}s."
+        )
+        _logger.debug("Completed rebuild_citation_cache.py")
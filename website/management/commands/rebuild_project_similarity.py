@@ -0,0 +1,44 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from website.models import ProjectSimilarity
+from website.utils.project_similarity import rebuild_project_similarities
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the ProjectSimilarity table (the project page's 'Related "
+        "projects') from scratch: a weighted Jaccard over each pair of projects' "
+        "shared umbrellas, publications, grants, keywords, and people. The "
+        "signal receivers in website/signals.py keep the table current as links "
+        "change; this full pass catches anything written behind their back (raw "
+        "queryset updates, fixtures, a restored backup). Cheap and idempotent, "
+        "so it is safe to run on every container start."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the current row count without rebuilding.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        _logger.debug(f"Running rebuild_project_similarity.py (dry_run={dry_run})")
+
+        start_time = time.perf_counter()
+        num_before = ProjectSimilarity.objects.count()
+        if dry_run:
+            _logger.info(f"rebuild_project_similarity: [dry-run] {num_before} row(s) currently stored.")
+            return
+
+        num_rows = rebuild_project_similarities()
+        _logger.info(
+            f"rebuild_project_similarity: Rebuilt {num_rows} similarity row(s) "
+            f"(was {num_before}) in {time.perf_counter() - start_time:0.2f}s."
+        )
+        _logger.debug("Completed rebuild_project_similarity.py")
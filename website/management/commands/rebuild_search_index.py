@@ -0,0 +1,44 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from website.models import SearchEntry
+from website.utils.search_index import rebuild_search_index
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the site search index (SearchEntry rows and their weighted "
+        "tsvectors) for every publication, talk, public project, and news item. "
+        "The signal receivers in website/signals.py keep it current as content "
+        "changes; this full pass catches anything written behind their back "
+        "(raw queryset updates, bulk imports, a restored backup). Idempotent, so "
+        "it is safe to run on every container start."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the current entry counts without rebuilding.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        _logger.debug(f"Running rebuild_search_index.py (dry_run={dry_run})")
+
+        start_time = time.perf_counter()
+        num_before = SearchEntry.objects.count()
+        if dry_run:
+            _logger.info(f"rebuild_search_index: [dry-run] {num_before} entr(ies) currently stored.")
+            return
+
+        counts = rebuild_search_index()
+        summary = ", ".join(f"{count} {kind}" for kind, count in counts.items())
+        _logger.info(
+            f"rebuild_search_index: Indexed {summary} (was {num_before} entries) "
+            f"in {time.perf_counter() - start_time:0.2f}s."
+        )
+        _logger.debug("Completed rebuild_search_index.py")
@@ -15,9 +15,16 @@ earliest record keeps the bare url_name (e.g. ``jasminezhang``) and later ones
 get differentiated (``jasminexzhang`` / ``jasminezhang2``). Assignment is
 deterministic, so the command is idempotent — re-running changes nothing.
 
-Writes use ``.update()`` to set only the url_name column, deliberately bypassing
-Person.save() (no Star Wars image fallback, no bio_datetime_modified churn).
-Runs on every container start (docker-entrypoint.sh) and is safe to re-run.
+It also refreshes the derived search columns (``name_key`` / ``search_name``,
+see ``Person.objects.search``), so rows created before those existed become
+searchable.
+
+Every url_name is resolved in memory (``assign_unique_url_names``) from one read
+of the table, and the changed rows are written with one ``bulk_update`` of only
+the derived columns, deliberately bypassing Person.save() (no Star Wars image
+fallback, no bio_datetime_modified churn) -- a constant number of queries however
+many people or collisions there are. Runs on every container start
+(docker-entrypoint.sh) and is safe to re-run.
 
 Usage:
     python manage.py recompute_url_names            # apply
@@ -25,14 +32,19 @@ Usage:
 """
 
 import logging
+import time
 
 from django.core.management.base import BaseCommand
 
 from website.models import Person
-from website.utils.name_utils import build_unique_url_name
+from website.utils.name_utils import (assign_unique_url_names, build_person_search_name,
+                                      normalize_person_name)
 
+# This retrieves a Python logging instance (or creates it)
 _logger = logging.getLogger(__name__)
 
+_BATCH_SIZE = 1000
+
 
 class Command(BaseCommand):
     help = "Re-derive a unique url_name for every Person (de-collides historical duplicates, #1206)."
@@ -45,29 +57,41 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
-        assigned = set()
-        changes = []  # (pk, old, new) for rows whose url_name actually changes
+        start_time = time.perf_counter()
 
+        people = list(Person.objects.order_by('pk').only(
+            'pk', 'first_name', 'middle_name', 'last_name', 'url_name', 'name_key', 'search_name'))
         # Ascending pk = creation order, so the earliest row in a name cluster
         # keeps the bare url_name and later namesakes get differentiated.
-        for person in Person.objects.order_by('pk').only(
-                'pk', 'first_name', 'middle_name', 'last_name', 'url_name'):
-            new_url_name = build_unique_url_name(
-                person.first_name, person.middle_name, person.last_name,
-                is_taken=assigned.__contains__,
-            )
-            assigned.add(new_url_name)
-            if new_url_name != person.url_name:
-                changes.append((person.pk, person.url_name, new_url_name))
-
-        for pk, old, new in changes:
-            _logger.debug("recompute_url_names: %s -> %s (pk=%s)", old, new, pk)
-            self.stdout.write(f"  {old or '(blank)'} -> {new}  (pk={pk})")
-            if not dry_run:
-                Person.objects.filter(pk=pk).update(url_name=new)
+        url_names = assign_unique_url_names(people)
+
+        changed_people = []
+        num_url_names = num_search_names = 0
+        for person in people:
+            new_url_name = url_names[id(person)]
+            new_name_key = normalize_person_name(person.first_name, person.last_name)
+            new_search_name = build_person_search_name(person.first_name, person.middle_name, person.last_name)
+            url_name_changed = new_url_name != person.url_name
+            search_changed = (new_name_key, new_search_name) != (person.name_key, person.search_name)
+            if url_name_changed:
+                num_url_names += 1
+                _logger.debug("recompute_url_names: %s -> %s (pk=%s)", person.url_name, new_url_name, person.pk)
+                self.stdout.write(f"  {person.url_name or '(blank)'} -> {new_url_name}  (pk={person.pk})")
+            if search_changed:
+                num_search_names += 1
+            if url_name_changed or search_changed:
+                person.url_name = new_url_name
+                person.name_key = new_name_key
+                person.search_name = new_search_name
+                changed_people.append(person)
+
+        if not dry_run and changed_people:
+            Person.objects.bulk_update(changed_people, ['url_name', 'name_key', 'search_name'],
+                                       batch_size=_BATCH_SIZE)
 
         verb = 'would change' if dry_run else 'changed'
-        summary = f"recompute_url_names: {verb} {len(changes)} url_name(s)."
+        summary = (f"recompute_url_names: {verb} {num_url_names} url_name(s) and "
+                   f"{num_search_names} search name(s) in {time.perf_counter() - start_time:0.2f}s.")
         self.stdout.write(self.style.SUCCESS(summary))
         if not dry_run:
             _logger.info(summary)
@@ -65,6 +65,7 @@ class Command(BaseCommand):
         thumbnail work ``save()`` would otherwise do for a forum-name-only edit.
         """
         num_changed = 0
+        changed_ids = []
         for obj in model.objects.all():
             old_forum_name = obj.forum_name
             new_forum_name = ml_utils.clean_forum_name(old_forum_name)
@@ -85,6 +86,13 @@ class Command(BaseCommand):
             )
             if not dry_run:
                 model.objects.filter(pk=obj.pk).update(forum_name=new_forum_name)
+                changed_ids.append(obj.pk)
             num_changed += 1
 
+        # Publications store their formatted citation (which embeds the forum
+        # name), so rebuild those for the rows we just renamed.
+        if model is Publication and changed_ids:
+            Publication.refresh_citation_caches(
+                Publication.objects.filter(pk__in=changed_ids))
+
         return num_changed
@@ -1,10 +1,14 @@
 import os
+import json
 import logging
+import time
 
 from django.core.management.base import BaseCommand
+from django.utils.text import get_valid_filename
 
 from website.models import Artifact, Talk, Poster, Publication
 from website.utils import fileutils as ml_fileutils
+from website.utils.artifact_renames import RenamePlanner
 
 # This retrieves a Python logging instance (or creates it)
 _logger = logging.getLogger(__name__)
@@ -54,9 +58,13 @@ class Command(BaseCommand):
         "name; this finds that orphan (by matching the standardized base and "
         "confirming its content type, since the orphan has no usable "
         "extension), renames it to the correct standardized name, and repoints "
-        "the DB. Divergence-gated and idempotent: a row whose files already "
-        "exist on disk is skipped, so this is a safe no-op once repaired. Run "
-        "with --dry-run first to review exactly what it would touch."
+        "the DB. Each upload directory is listed once and the repairs are "
+        "planned up front, then applied as batched renames plus one bulk_update "
+        "per model in a transaction (website/utils/artifact_renames.py), with "
+        "missing thumbnails regenerated. Divergence-gated and idempotent: a row "
+        "whose files already exist on disk is skipped, so this is a safe no-op "
+        "once repaired. Run with --dry-run (or --plan-only, for JSON) first to "
+        "review exactly what it would touch."
     )
 
     MODELS = (Talk, Poster, Publication)
@@ -67,65 +75,63 @@ class Command(BaseCommand):
             action="store_true",
             help="Report what would be repaired without touching disk or DB.",
         )
+        parser.add_argument(
+            "--plan-only",
+            action="store_true",
+            help="Print the repair plan as JSON without touching disk or DB.",
+        )
 
     def handle(self, *args, **options):
-        dry_run = options["dry_run"]
+        dry_run = options["dry_run"] or options["plan_only"]
         _logger.info(
             f"Running repair_diverged_artifact_filenames (dry_run={dry_run})."
         )
+        start_time = time.perf_counter()
 
-        repaired = unrecoverable = 0
+        planner = RenamePlanner()
         for model in self.MODELS:
             for artifact in model.objects.prefetch_related("authors").all():
-                result = self._repair_artifact(artifact, dry_run)
-                repaired += result["repaired"]
-                unrecoverable += result["unrecoverable"]
+                self._plan_artifact(planner, artifact, dry_run)
+        plan = planner.plan
+
+        if options["plan_only"]:
+            self.stdout.write(json.dumps(plan.to_dict(), indent=2))
+        elif not dry_run and plan.renames:
+            # The repaired pdf's thumbnail went missing along with it; render
+            # it again, as the save() this replaces did.
+            plan.apply(regenerate_thumbnails=True)
 
         verb = "Would repair" if dry_run else "Repaired"
         _logger.info(
-            f"repair_diverged_artifact_filenames: {verb} {repaired} file(s); "
-            f"{unrecoverable} diverged file(s) could not be matched to an "
-            f"orphan on disk and were left untouched."
+            f"repair_diverged_artifact_filenames: {verb} {len(plan.renames)} file(s); "
+            f"{plan.num_unrecoverable} diverged file(s) could not be matched to an "
+            f"orphan on disk and were left untouched; in "
+            f"{time.perf_counter() - start_time:0.2f}s."
         )
 
-    def _repair_artifact(self, artifact, dry_run):
+    def _plan_artifact(self, planner, artifact, dry_run):
         model_name = type(artifact).__name__
-        repaired = unrecoverable = 0
-        fixed_any = False
 
         for field_name in ("pdf_file", "raw_file"):
             file_field = getattr(artifact, field_name)
             if not file_field:
                 continue
             # Only act on a true divergence: the DB names a file that is gone.
-            if file_field.storage.exists(file_field.name):
+            if planner.exists(file_field.name):
                 continue
 
-            outcome = self._repair_field(artifact, field_name, dry_run)
-            if outcome == "repaired":
-                repaired += 1
-                fixed_any = True
-            elif outcome == "unrecoverable":
-                unrecoverable += 1
+            if not self._plan_field(planner, artifact, field_name, dry_run):
+                planner.plan.num_unrecoverable += 1
                 _logger.warning(
                     f"{model_name} id={artifact.pk}: {field_name} points at "
                     f"missing '{file_field.name}' and no matching orphan was "
                     f"found on disk; left untouched for manual review."
                 )
 
-        # If we repointed any files for real, persist + regenerate the thumbnail
-        # via a normal save(). With the extension bug fixed the names are already
-        # standardized, so save() does no further renaming; it just writes the
-        # corrected field names and rebuilds the (now-missing) thumbnail.
-        if fixed_any and not dry_run:
-            artifact.save()
-
-        return {"repaired": repaired, "unrecoverable": unrecoverable}
-
-    def _repair_field(self, artifact, field_name, dry_run):
-        """Locate the orphaned file for one diverged field and fix it.
+    def _plan_field(self, planner, artifact, field_name, dry_run):
+        """Locate the orphaned file for one diverged field and plan its repair.
 
-        Returns "repaired", "unrecoverable", or "noop".
+        Returns True if a repair was planned, False if it's unrecoverable.
         """
         model_name = type(artifact).__name__
         file_field = getattr(artifact, field_name)
@@ -136,14 +142,13 @@ class Command(BaseCommand):
         correct_base = Artifact.generate_filename(artifact)
         # get_valid_filename is applied by the rename path; mirror it so our
         # on-disk comparisons match what the buggy rename actually wrote.
-        from django.utils.text import get_valid_filename
         valid_base = get_valid_filename(correct_base)
         correct_basename = get_valid_filename(correct_base + ext)
 
-        directory = os.path.dirname(file_field.path)
         rel_dir = os.path.dirname(file_field.name)
+        directory = os.path.dirname(file_field.path)
         if not os.path.isdir(directory):
-            return "unrecoverable"
+            return False
 
         expected_kind = _expected_kind_for_ext(ext)
 
@@ -154,10 +159,11 @@ class Command(BaseCommand):
         # The pre-#1404 base (no trailing "_Talk"/"_Poster") is searched too: the
         # bug predates that scheme change, so an orphan it left behind on disk
         # carries the old base even though the repair target uses the new one.
+        # Candidates come from the planner's one listing of the directory.
         legacy_base = get_valid_filename(
             Artifact.generate_filename(artifact, include_type_suffix=False))
         candidates = []
-        for entry in os.listdir(directory):
+        for entry in sorted(planner.listing(rel_dir)):
             if any(ml_fileutils.matches_standardized_basename(entry, base)
                    for base in {valid_base, legacy_base}):
                 full = os.path.join(directory, entry)
@@ -176,40 +182,25 @@ class Command(BaseCommand):
                 f"{expected_kind}; candidates={candidates}; content-matches="
                 f"{matches} (need exactly 1)."
             )
-            return "unrecoverable"
+            return False
 
         orphan = matches[0]
-        target_full = os.path.join(directory, correct_basename)
-        target_rel = os.path.join(rel_dir, correct_basename)
-
-        _logger.info(
-            f"[{'dry-run' if dry_run else 'apply'}] {model_name} "
-            f"id={artifact.pk}: {field_name} '{file_field.name}' (missing) -> "
-            f"on-disk orphan '{orphan}' renamed to '{correct_basename}' and "
-            f"repointed."
-        )
-
-        if dry_run:
-            return "repaired"
 
         # If the target name is somehow already taken by a different file, don't
-        # clobber it — bail out for manual review.
-        if os.path.exists(target_full) and orphan != correct_basename:
+        # clobber it — leave it for manual review.
+        if orphan != correct_basename and correct_basename in planner.listing(rel_dir):
             _logger.warning(
                 f"{model_name} id={artifact.pk}: target '{correct_basename}' "
                 f"already exists; not overwriting. Left for manual review."
             )
-            return "unrecoverable"
-
-        os.rename(os.path.join(directory, orphan), target_full)
-        # Persist the corrected name directly with update() rather than relying
-        # on the caller's save(): save() may set update_fields=['thumbnail'] when
-        # it rebuilds the stale thumbnail, which would drop a pdf_file/raw_file
-        # write. update() guarantees the repointed name lands in the DB. We also
-        # set it in memory so the caller's save() regenerates the thumbnail from
-        # the now-correct pdf path.
-        type(artifact).objects.filter(pk=artifact.pk).update(
-            **{field_name: target_rel}
+            return False
+
+        _logger.info(
+            f"[{'dry-run' if dry_run else 'apply'}] {model_name} "
+            f"id={artifact.pk}: {field_name} '{file_field.name}' (missing) -> "
+            f"on-disk orphan '{orphan}' renamed to '{correct_basename}' and "
+            f"repointed."
         )
-        file_field.name = target_rel
-        return "repaired"
+        planner.add(artifact, field_name, os.path.join(rel_dir, orphan),
+                    os.path.join(rel_dir, correct_basename))
+        return True
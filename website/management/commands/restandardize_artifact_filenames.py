@@ -1,10 +1,13 @@
 import os
+import json
 import logging
+import time
 
 from django.core.management.base import BaseCommand
 
 from website.models import Artifact, Talk, Poster, Publication
 from website.utils import fileutils as ml_fileutils
+from website.utils.artifact_renames import RenamePlanner
 
 # This retrieves a Python logging instance (or creates it)
 _logger = logging.getLogger(__name__)
@@ -17,11 +20,13 @@ class Command(BaseCommand):
         "(issue #1401 — bulk-imported rows that never went through an authored "
         "Artifact.save()), and files standardized under a superseded scheme "
         "(issue #1404 added the trailing artifact-type segment, e.g. "
-        "'..._CHI2024_Talk'), which this migrates in one pass. It reuses the "
-        "existing, now-correct rename path: when Artifact.do_filenames_need_"
-        "updating() is True it calls artifact.save(), which renames the "
-        "pdf_file, raw_file, and thumbnail on disk AND in the DB together. The "
-        "original upload name is preserved (it was captured into "
+        "'..._CHI2024_Talk'), which this migrates in one pass. It plans every "
+        "rename up front (website/utils/artifact_renames.py) from one directory "
+        "listing per directory, with the same names and uniqueness suffixes "
+        "Artifact.save() would produce for the pdf_file, raw_file, and "
+        "thumbnail, then applies the plan as batched renames plus one "
+        "bulk_update per model in a transaction, undoing the renames if it "
+        "fails. The original upload name is preserved (it was captured into "
         "original_*_filename by backfill_original_filenames / #1391 before this "
         "runs). Idempotent: once a row matches the current scheme the check "
         "returns False, so re-runs do nothing. Safe to run on every container "
@@ -38,67 +43,76 @@ class Command(BaseCommand):
             action="store_true",
             help="Report what would be renamed without touching disk or DB.",
         )
+        parser.add_argument(
+            "--plan-only",
+            action="store_true",
+            help="Print the rename plan as JSON without touching disk or DB.",
+        )
 
     def handle(self, *args, **options):
-        dry_run = options["dry_run"]
+        dry_run = options["dry_run"] or options["plan_only"]
         _logger.debug(
             f"Running restandardize_artifact_filenames.py (dry_run={dry_run}) "
             f"to rename legacy artifact files to the standardized scheme."
         )
+        start_time = time.perf_counter()
 
-        total_renamed = 0
-        total_skipped = 0
-        total_errors = 0
+        planner = RenamePlanner()
         for model in self.MODELS:
-            renamed, skipped, errors = self._restandardize_model(model, dry_run)
-            total_renamed += renamed
-            total_skipped += skipped
-            total_errors += errors
+            self._plan_model(planner, model, dry_run)
+        plan = planner.plan
+
+        if options["plan_only"]:
+            self.stdout.write(json.dumps(plan.to_dict(), indent=2))
+        elif not dry_run and plan.renames:
+            plan.apply()
+            for artifact in plan.artifacts:
+                # INFO (not DEBUG) so the real rename is captured on prod, giving a
+                # per-file audit trail of the one-time backfill. Idempotent: once a row
+                # is standardized it stops matching, so this stays silent on later
+                # deploys rather than logging every artifact forever.
+                _logger.info(
+                    f"Re-standardized {type(artifact).__name__} id={artifact.pk} to "
+                    f"'{Artifact.generate_filename(artifact)}'."
+                )
 
         verb = "Would rename" if dry_run else "Renamed"
         _logger.info(
-            f"restandardize_artifact_filenames: {verb} {total_renamed} "
-            f"artifact(s); skipped {total_skipped} (already standardized or no "
-            f"usable name); {total_errors} row(s) errored and were skipped."
+            f"restandardize_artifact_filenames: {verb} {len(plan.artifacts)} "
+            f"artifact(s) ({len(plan.renames)} file(s)); skipped {plan.num_skipped} "
+            f"(already standardized or no usable name); {plan.num_errors} row(s) "
+            f"errored and were skipped; in {time.perf_counter() - start_time:0.2f}s."
         )
         _logger.debug("Completed restandardize_artifact_filenames.py")
 
-    def _restandardize_model(self, model, dry_run):
-        """Re-standardize one concrete artifact model.
+    def _plan_model(self, planner, model, dry_run):
+        """Plan the re-standardizing renames for one concrete artifact model.
 
-        Returns a ``(num_renamed, num_skipped, num_errors)`` tuple. Each row is
-        processed inside its own try/except so a single malformed row (e.g. a
-        null ``date``/``title``, which makes ``generate_filename`` raise via
-        ``date.year`` / ``title.title()``) can't abort the batch and leave the
-        rest of the dataset untouched. The entrypoint has no ``set -e``, so an
-        aborted run would fail silently.
+        Each row is planned inside its own try/except so a single malformed row
+        (e.g. a null ``date``/``title``, which makes ``generate_filename`` raise
+        via ``date.year`` / ``title.title()``) can't abort the batch and leave
+        the rest of the dataset untouched. The entrypoint has no ``set -e``, so
+        an aborted run would fail silently.
         """
-        num_renamed = 0
-        num_skipped = 0
-        num_errors = 0
-        # prefetch_related('authors') because the rename path reads the first
-        # author's last name (generate_filename) and the rename only fires when
-        # authors exist.
+        # prefetch_related('authors') because the new name reads the first
+        # author's last name (generate_filename) and a rename only happens
+        # when authors exist.
         for artifact in model.objects.prefetch_related("authors").all():
             try:
-                if self._restandardize_row(artifact, dry_run):
-                    num_renamed += 1
-                else:
-                    num_skipped += 1
+                if not self._plan_row(planner, artifact, dry_run):
+                    planner.plan.num_skipped += 1
             except Exception:
                 _logger.exception(
                     "restandardize_artifact_filenames: skipping %s id=%s due to "
                     "an error", model.__name__, getattr(artifact, "pk", "?"),
                 )
-                num_errors += 1
-
-        return num_renamed, num_skipped, num_errors
+                planner.plan.num_errors += 1
 
-    def _restandardize_row(self, artifact, dry_run):
-        """Re-standardize one artifact's files if needed.
+    def _plan_row(self, planner, artifact, dry_run):
+        """Plan one artifact's renames if it needs re-standardizing.
 
-        Returns True if it was (or would be) renamed, False if skipped. Raises
-        on malformed data — the caller isolates that.
+        Returns True if it was planned, False if skipped. Raises on malformed
+        data — the caller isolates that.
         """
         model_name = type(artifact).__name__
 
@@ -111,9 +125,9 @@ class Command(BaseCommand):
                 f"Skipping {model_name} id={artifact.pk}: missing title/date."
             )
             return False
-        if not artifact.authors.exists():
+        if not artifact.authors.all():
             # Artifact.save() only renames when authors exist (it needs the
-            # first author's last name), so a save() here would be a no-op.
+            # first author's last name). Reads the prefetch, not .exists().
             _logger.debug(
                 f"Skipping {model_name} id={artifact.pk}: no authors."
             )
@@ -122,33 +136,29 @@ class Command(BaseCommand):
         if not self._needs_restandardizing(artifact):
             return False
 
-        if dry_run:
-            new_name = Artifact.generate_filename(artifact)
+        # The same fields Artifact.save() renames. A file already matching the
+        # standardized name (uniqueness suffix included) is left as it is.
+        new_name = Artifact.generate_filename(artifact)
+        planned = False
+        for file_attr in ("pdf_file", "raw_file", "thumbnail"):
+            file_field = getattr(artifact, file_attr)
+            if not file_field:
+                continue
+            current_no_ext = os.path.splitext(os.path.basename(file_field.name))[0]
+            if ml_fileutils.matches_standardized_basename(current_no_ext, new_name):
+                continue
+            planned = planner.add_standardized(artifact, file_attr, new_name) is not None or planned
+
+        if planned and dry_run:
             # Log the per-row preview at INFO (not DEBUG) so it is captured on
             # prod, where the file handler logs at INFO when DEBUG is off. This
-            # is what makes the dry-run reviewable in prod's debug.log. The real
-            # (non-dry-run) path below stays at DEBUG to avoid noise.
+            # is what makes the dry-run reviewable in prod's debug.log.
             _logger.info(
                 f"[dry-run] Would re-standardize {model_name} id={artifact.pk} "
                 f"to '{new_name}' (pdf='{artifact.pdf_file.name if artifact.pdf_file else None}', "
                 f"raw='{artifact.raw_file.name if artifact.raw_file else None}')"
             )
-            return True
-
-        # Reuse the canonical rename path: save() renames pdf_file, raw_file,
-        # and thumbnail on disk and in the DB, and leaves original_*_filename
-        # untouched (it only captures on a new upload, not a no-update_fields
-        # save), so the provenance recorded by #1391 is preserved.
-        artifact.save()
-        # INFO (not DEBUG) so the real rename is captured on prod, giving a
-        # per-file audit trail of the one-time backfill. Idempotent: once a row
-        # is standardized it stops matching, so this stays silent on later
-        # deploys rather than logging every artifact forever.
-        _logger.info(
-            f"Re-standardized {model_name} id={artifact.pk} to "
-            f"'{Artifact.generate_filename(artifact)}'."
-        )
-        return True
+        return planned
 
     @staticmethod
     def _needs_restandardizing(artifact):
@@ -0,0 +1,97 @@
+import logging
+import time
+from django.core.management.base import BaseCommand, CommandError
+from website.models import StartupStepRun
+from website.utils.startup_maintenance import STARTUP_STEPS, run_startup_steps
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the container-startup maintenance commands (see STARTUP_STEPS in "
+        "website/utils/startup_maintenance.py) in one process. A step is skipped "
+        "when its fingerprint (row counts/max ids, inspected columns, media "
+        "directory mtimes, the command's source) is unchanged since its last "
+        "successful run, and steps that don't depend on each other run "
+        "concurrently. Each step's outcome and duration is recorded in "
+        "StartupStepRun. Called once from docker-entrypoint.sh."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run every selected step even if its fingerprint is unchanged.",
+        )
+        parser.add_argument(
+            "--only",
+            nargs="+",
+            metavar="STEP",
+            help="Run just these steps (dependency order among them is kept).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Maximum number of steps to run at once (1 runs them in series). Default: 4.",
+        )
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List the steps with their last recorded run and exit.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report which steps would run or be skipped without running any.",
+        )
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            self._list_steps()
+            return
+
+        steps = STARTUP_STEPS
+        if options["only"]:
+            known = {step.name for step in STARTUP_STEPS}
+            unknown = sorted(set(options["only"]) - known)
+            if unknown:
+                raise CommandError(f"Unknown startup step(s): {', '.join(unknown)}")
+            steps = [step for step in STARTUP_STEPS if step.name in options["only"]]
+
+        _logger.debug(f"Running run_startup_maintenance.py ({len(steps)} step(s), workers={options['workers']})")
+        start_time = time.perf_counter()
+        results = run_startup_steps(steps, workers=options["workers"],
+                                    force=options["force"], dry_run=options["dry_run"])
+        elapsed = time.perf_counter() - start_time
+
+        if options["dry_run"]:
+            to_run = [name for name, status in results.items() if status is None]
+            _logger.info(f"run_startup_maintenance: [dry-run] {len(to_run)} of {len(results)} step(s) "
+                         f"would run: {', '.join(to_run) or 'none'}")
+            return
+
+        runs = {run.name: run for run in StartupStepRun.objects.filter(name__in=results)}
+        for name, status in results.items():
+            run = runs.get(name)
+            duration = run.last_duration_seconds if run else 0
+            _logger.info(f"  {name:<40} {status:<10} {duration:7.2f}s")
+
+        counts = {status: list(results.values()).count(status) for status, _ in StartupStepRun.STATUS_CHOICES}
+        _logger.info(
+            f"run_startup_maintenance: {counts[StartupStepRun.STATUS_SUCCEEDED]} ran, "
+            f"{counts[StartupStepRun.STATUS_SKIPPED]} skipped (unchanged), "
+            f"{counts[StartupStepRun.STATUS_FAILED]} failed in {elapsed:0.2f}s."
+        )
+        _logger.debug("Completed run_startup_maintenance.py")
+
+    def _list_steps(self):
+        runs = {run.name: run for run in StartupStepRun.objects.all()}
+        for step in STARTUP_STEPS:
+            run = runs.get(step.name)
+            last = (f"{run.last_status} at {run.last_started_at:%Y-%m-%d %H:%M} "
+                    f"({run.last_duration_seconds:0.2f}s)") if run else "never run"
+            after = f" after {', '.join(step.after)}" if step.after else ""
+            self.stdout.write(f"{step.name}{after}: {last}")
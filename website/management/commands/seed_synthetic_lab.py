@@ -0,0 +1,75 @@
+import logging
+import time
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from website.utils.synthetic_lab import PRODUCTION_SIZE, seed_synthetic_lab, write_placeholder_media
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Local-dev / load-testing helper: adds --scale times production size "
+        "(see PRODUCTION_SIZE in website/utils/synthetic_lab.py) of synthetic "
+        "people, positions, projects and roles, publications and talks with "
+        "ordered authors, videos, grants and sponsors, news, awards, keywords, "
+        "and banners, written with bulk_create in batches. Every file field "
+        "points at one shared placeholder JPEG or PDF under media/synthetic/. "
+        "Additive: run it again to grow the data further. Refuses to run with "
+        "DEBUG off unless --force is given, since there is no undo short of "
+        "restoring a backup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiple of production size to add (fractions allowed). Default: 1.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=1,
+            help="Random seed, so two runs build the same data. Default: 1.",
+        )
+        parser.add_argument(
+            "--skip-media",
+            action="store_true",
+            help="Don't write the placeholder files (rows still reference them).",
+        )
+        parser.add_argument(
+            "--rebuild-derived",
+            action="store_true",
+            help="Afterwards, rebuild the search index and project similarities for the new rows.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run even though DEBUG is off.",
+        )
+
+    def handle(self, *args, **options):
+        scale = options["scale"]
+        if scale <= 0:
+            raise CommandError(f"--scale must be positive, got {scale}")
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError("DEBUG is off; this looks like a production database. Pass --force to seed anyway.")
+
+        start_time = time.perf_counter()
+        if not options["skip_media"]:
+            for path in write_placeholder_media():
+                self.stdout.write(f"Wrote placeholder {path}")
+
+        counts = seed_synthetic_lab(scale=scale, seed=options["seed"])
+        elapsed = time.perf_counter() - start_time
+        for kind, count in counts.items():
+            self.stdout.write(f"  {kind:<14} {count:>8}  (production: {PRODUCTION_SIZE[kind]})")
+        self.stdout.write(self.style.SUCCESS(f"Added {sum(counts.values())} rows at {scale}x in {elapsed:0.1f}s."))
+        _logger.info(f"seed_synthetic_lab: Added {sum(counts.values())} rows at scale {scale} in {elapsed:0.1f}s.")
+
+        if options["rebuild_derived"]:
+            call_command("rebuild_search_index")
+            call_command("rebuild_project_similarity")
@@ -19,4 +19,12 @@ from .talk import TalkType
 from .video import Video
 from .grant import Grant
 from .grant_tracking_link import GrantTrackingLink
-from .award import Award, AwardType
\ No newline at end of file
+from .award import Award, AwardType
+from .content_version import ContentVersion
+
+from .media_reference import MediaReference
+from .pdf_page_count import PdfPageCount
+from .project_similarity import ProjectSimilarity
+from .publication_projects_change import PublicationProjectsChange
+from .search_entry import SearchEntry
+from .startup_step_run import StartupStepRun
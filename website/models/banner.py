@@ -49,6 +49,14 @@ class Banner(models.Model):
     date_added = models.DateField(auto_now_add=True)
     date_added.help_text = "This is an automatically set, readonly field. When there are many banners specified for a page, we prioritize more recently added banners"
 
+    class Meta:
+        indexes = [
+            # get_landing_page_banners() in views/index.py: favorites first,
+            # newest first, among landing-page banners only
+            models.Index(fields=['favorite', '-date_added'], name='banner_landing_page_idx',
+                         condition=models.Q(landing_page=True)),
+        ]
+
     def __str__(self):
         return f"Title={self.title} Project={self.project} LandingPage={self.landing_page} Favorite={self.favorite}"
 
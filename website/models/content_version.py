@@ -0,0 +1,49 @@
+from django.db import models
+from uuid import uuid4
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class ContentVersion(models.Model):
+    """An opaque version token per content scope, used to key cached page data.
+
+    Public pages like /projects/ are derived entirely from a handful of models
+    and change only when an editor saves something in the admin. Rather than
+    expiring their cached data on a timer, we key each cache entry by the
+    current token of the content it depends on (e.g. ``projects``) and replace
+    that token whenever a relevant model changes (see the ``bump_content_version``
+    receivers in ``website/signals.py``). A stale entry is then simply never read
+    again.
+
+    The token lives in the database, not the cache, so every gunicorn worker
+    agrees on it even while the cache itself is per-process. It's a random
+    string rather than a counter so a rolled-back transaction (or a restored DB
+    backup) can never resurrect a token that was already used for stale data.
+    """
+
+    # The content scopes we version. Keep in sync with the receivers in signals.py.
+    PROJECTS = 'projects'
+    NEWS = 'news'
+    PUBLICATIONS = 'publications'
+
+    scope = models.CharField(max_length=64, unique=True)
+    token = models.CharField(max_length=32)
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.scope}: {self.token}"
+
+    @classmethod
+    def get_token(cls, scope):
+        """Returns the current token for scope ('initial' if it has never changed)."""
+        token = cls.objects.filter(scope=scope).values_list('token', flat=True).first()
+        return token or 'initial'
+
+    @classmethod
+    def bump(cls, *scopes):
+        """Replaces the token of each scope so cache entries keyed on it go stale."""
+        for scope in scopes:
+            cls.objects.update_or_create(scope=scope, defaults={'token': uuid4().hex})
+            _logger.debug(f"Bumped content version for scope '{scope}'")
@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class MediaReference(models.Model):
+    """One media file name and the content blob it points at.
+
+    Only used when the content-addressed media store is enabled
+    (``ML_MEDIA_CONTENT_ADDRESSED``, see ``website/utils/content_store.py``).
+    File contents are then stored once per SHA-256 under
+    ``MEDIA_ROOT/.content-store/``, and every name in the media tree is a
+    hardlink to its blob with a row here. A blob no row refers to is garbage,
+    which the ``delete_unused_files`` management command sweeps up.
+    """
+
+    name = models.CharField(max_length=512, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField()
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} -> {self.sha256[:12]}"
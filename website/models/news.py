@@ -73,6 +73,11 @@ class News(models.Model):
         sanitize=True,
     )
 
+    # SHA-256 of `content` as last checked by the normalize_news_image_styles
+    # command, which skips rows whose content still hashes to it instead of
+    # re-parsing their HTML. Any edit changes the hash, so the row is checked again.
+    content_fingerprint = models.CharField(max_length=64, blank=True, default='', editable=False)
+
     # Following the scheme of above thumbnails in other models
     image = models.ImageField(blank=True, upload_to=UniquePathAndRename("news", True), max_length=255, validators=[validate_image_upload])
     image.help_text = 'After choosing an image, crop it right here using the cropper below — no need to save first.'
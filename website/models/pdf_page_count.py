@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class PdfPageCount(models.Model):
+    """The page count last read from one PDF in media storage.
+
+    Counting pages means opening the PDF with pypdf, which is the slow part of
+    ``Publication.save`` and of the ``backfill_num_pages`` management command.
+    This table remembers the result per file, keyed by its storage name and
+    checked against the file's size and modification time, so an unchanged file
+    is never parsed twice. When only the mtime moved (a restore from backup, a
+    ``touch``), the file's SHA-256 is compared before reparsing. Unreadable PDFs
+    are remembered too, with ``num_pages`` left empty.
+
+    See ``website/utils/pdf_page_cache.py``.
+    """
+
+    path = models.CharField(max_length=512, unique=True)
+    size = models.BigIntegerField()
+    mtime_ns = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64)
+    num_pages = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['path']
+
+    def __str__(self):
+        return f"{self.path}: {self.num_pages} page(s)"
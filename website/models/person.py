@@ -7,12 +7,15 @@ from website.models.project_role import ProjectRole
 from django.core.files import File
 import website.utils.fileutils as ml_fileutils
 from website.utils.upload_validators import validate_image_upload
-from website.utils.name_utils import build_unique_url_name
+from website.utils.name_utils import (build_unique_url_name, build_person_search_name,
+                                      fold_search_words, get_url_name_candidates, normalize_person_name)
 
-from django.db.models.functions import Coalesce
+from django.db.models.functions import Coalesce, Upper
 from django.conf import settings
 
-from django.db.models import Count, Max, Value, F, Q, Sum, ExpressionWrapper, fields
+from django.db.models import Count, Max, Value, F, Q, Sum, ExpressionWrapper, fields, Case, When, IntegerField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import TrigramWordSimilarity
 from django.utils import timezone
 
 # For caching properties, see: https://docs.djangoproject.com/en/4.2/ref/utils/#django.utils.functional.cached_property
@@ -90,6 +93,39 @@ def get_upload_to_for_person_easter_egg(person, original_filename, force_unique=
 
     return get_unique_filename_for_person(person, original_filename, append_str, force_unique)
 
+class PersonQuerySet(models.QuerySet):
+
+    def search(self, query):
+        """
+        Returns the people matching ``query``, best first, using the trigram
+        index on ``search_name`` rather than ``icontains`` scans.
+
+        The query is folded like the stored names (``fold_search_words``), so
+        ``claudio`` finds Cláudio. A person matches when every query word
+        prefixes one of their name words (``jon froe``) or the whole query is a
+        close trigram match (``jon frohlich``). Results are ranked: exact
+        name-key / url_name hits, then prefix hits, then fuzzy hits, each by
+        trigram similarity and then name. An empty query matches nobody.
+        """
+        words = fold_search_words(query)
+        if not words:
+            return self.none()
+        folded = ' '.join(words)
+        compact = ''.join(words)
+
+        prefix = Q()
+        for word in words:
+            prefix &= Q(search_name__startswith=word) | Q(search_name__contains=f" {word}")
+        exact = Q(name_key=compact) | Q(url_name=compact)
+
+        return (self.filter(prefix | Q(search_name__trigram_word_similar=folded))
+                .annotate(
+                    search_tier=Case(When(exact, then=Value(0)), When(prefix, then=Value(1)),
+                                     default=Value(2), output_field=IntegerField()),
+                    search_similarity=TrigramWordSimilarity(folded, 'search_name'))
+                .order_by('search_tier', '-search_similarity', 'last_name', 'first_name', 'pk'))
+
+
 class Person(models.Model):
     UPLOAD_DIR = 'person/' # relative path
 
@@ -125,6 +161,14 @@ class Person(models.Model):
     middle_name = models.CharField(max_length=50, blank=True, null=True)
     last_name = models.CharField(max_length=50)
     url_name = models.CharField(editable=False, max_length=50, default='placeholder')
+
+    # Derived in save() for Person.objects.search() and the duplicate-people
+    # check: the bare accent-folded name key (normalize_person_name, e.g.
+    # 'claudiosilva') and the folded words searched by the trigram index
+    # ('claudio t silva claudiosilva'). Rows saved before these existed are
+    # filled in by recompute_url_names.
+    name_key = models.CharField(editable=False, max_length=90, blank=True, default='', db_index=True)
+    search_name = models.CharField(editable=False, max_length=255, blank=True, default='')
     email = models.EmailField(blank=True, null=True)
     
     # Website links
@@ -701,18 +745,31 @@ class Person(models.Model):
         # it prefers the bare key (jonfroehlich), then a readable middle-initial
         # differentiator for namesakes (jasminexzhang), then a numeric suffix
         # (jasminezhang2). We exclude this row by pk so re-saving keeps its name.
+        # Every candidate equals the middle-initial form or starts with the bare
+        # key, so one query fetches all the names that could collide and the
+        # resolution itself runs in memory.
+        base, middle_initial_name = get_url_name_candidates(self.first_name, self.middle_name, self.last_name)
+        colliding = Q(url_name__startswith=base)
+        if middle_initial_name:
+            colliding |= Q(url_name=middle_initial_name)
+        taken = set(Person.objects.filter(colliding).exclude(pk=self.pk).values_list('url_name', flat=True))
         self.url_name = build_unique_url_name(
-            self.first_name, self.middle_name, self.last_name,
-            is_taken=lambda candidate: (
-                Person.objects.filter(url_name=candidate).exclude(pk=self.pk).exists()
-            ),
+            self.first_name, self.middle_name, self.last_name, is_taken=taken.__contains__,
         )
+        self.name_key = normalize_person_name(self.first_name, self.last_name)
+        self.search_name = build_person_search_name(self.first_name, self.middle_name, self.last_name)
 
         # Next, automatically set the bio_date_modified field
+        name_changed = False
         if self.pk is not None: # checks if this is an existing object
             orig = Person.objects.get(pk=self.pk)
             if orig.bio != self.bio:
                 self.bio_datetime_modified = timezone.now().date()
+
+            # Publications store their citation strings (see Publication.citation_html_cache),
+            # so a rename has to rebuild the citations of everything this person authored
+            name_changed = ((orig.first_name, orig.middle_name, orig.last_name) !=
+                            (self.first_name, self.middle_name, self.last_name))
         else:
             self.bio_datetime_modified = timezone.now().date()
 
@@ -749,10 +806,30 @@ class Person(models.Model):
             for fh in files_to_close:
                 fh.close()
 
+        if name_changed:
+            Publication = apps.get_model('website', 'Publication')
+            Publication.refresh_citation_caches(self.publication_set.all())
+
+            # Author/member names are part of the site search index too
+            from website.utils.search_index import schedule_related_search_updates
+            schedule_related_search_updates(self)
+
+
+    objects = PersonQuerySet.as_manager()
 
     class Meta:
         ordering = ['last_name', 'first_name']
         verbose_name_plural = 'People'
+        indexes = [
+            # Serves the prefix (LIKE) and fuzzy (%>) matches in
+            # PersonQuerySet.search(); needs pg_trgm (see ensure_pg_trgm_extension
+            # in website/signals.py)
+            GinIndex(fields=['search_name'], name='person_search_name_trgm_idx',
+                     opclasses=['gin_trgm_ops']),
+            # Member pages and the ?author= filters match url_name__iexact,
+            # which Postgres runs as UPPER(url_name) = UPPER(%s)
+            models.Index(Upper('url_name'), name='person_url_name_upper_idx'),
+        ]
 
 
 @receiver(pre_delete, sender=Person)
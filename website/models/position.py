@@ -119,6 +119,13 @@ class Position(models.Model):
     PROFESSOR_TITLES = {Title.FULL_PROF, Title.ASSOCIATE_PROF, Title.ASSISTANT_PROF}
     GRAD_STUDENT_TITLES = {Title.MS_STUDENT, Title.PHD_STUDENT, Title.MEDICAL_STUDENT}
 
+    class Meta:
+        indexes = [
+            # The People page's current/past member queries (views/people.py)
+            # and the admin's current-member filters: role, then date range
+            models.Index(fields=['role', 'start_date', 'end_date'], name='position_role_dates_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         # Save the Position instance first
         super(Position, self).save(*args, **kwargs)  
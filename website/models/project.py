@@ -1,12 +1,13 @@
 from django.db import models
 from django.db.models import Max, Min
 from django.db.models import F, ExpressionWrapper, fields, Sum, Q, Value
-from django.db.models.functions import Coalesce
+from django.db.models.functions import Coalesce, Upper
 from django.core.exceptions import ValidationError
 
 from image_cropping import ImageRatioField
 from website.utils.upload_validators import validate_image_upload
 
+from collections import defaultdict
 from datetime import date, datetime, timedelta
 from django.utils import timezone
 
@@ -29,6 +30,17 @@ import os
 
 PROJECT_THUMBNAIL_SIZE = (500, 300) # 15 : 9 aspect ratio
 
+# Maps each lead-role type to the suffix of its keys in the leadership dict
+# returned by Project.get_project_leadership / get_leadership_for_projects
+# (e.g. PI -> 'all_PIs', 'active_PIs', 'inactive_PIs').
+LEADERSHIP_KEY_SUFFIXES = {
+    LeadProjectRoleTypes.PI: 'PIs',
+    LeadProjectRoleTypes.CO_PI: 'CoPIs',
+    LeadProjectRoleTypes.STUDENT_LEAD: 'student_leads',
+    LeadProjectRoleTypes.POSTDOC_LEAD: 'postdoc_leads',
+    LeadProjectRoleTypes.RESEARCH_SCIENTIST_LEAD: 'research_scientist_leads',
+}
+
 class Project(models.Model):
     UPLOAD_DIR = 'projects/' # relative path
     IMAGE_DIR = os.path.join(UPLOAD_DIR, 'images/') # relative path
@@ -117,6 +129,16 @@ class Project(models.Model):
 
     updated = models.DateField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Public active/completed projects (landing page, project gallery):
+            # only visible projects are ever listed, so index just those
+            models.Index(fields=['end_date'], name='project_visible_end_idx',
+                         condition=Q(is_visible=True)),
+            # views/project.py looks projects up by short_name__iexact
+            models.Index(Upper('short_name'), name='project_short_name_upper_idx'),
+        ]
+
     def clean(self):
         """
         Validate that short_name (the URL slug) is unique case-insensitively.
@@ -336,75 +358,82 @@ class Project(models.Model):
         Returns:
         dict: A dictionary containing lists of ProjectRole objects for PIs, active PIs, inactive PIs, 
             active Co-PIs, inactive Co-PIs, active student leads, inactive student leads, active postdoc leads, inactive postdoc leads,
-            active research scientist leads, and inactive research scientist leads.
+            active research scientist leads, and inactive research scientist leads (plus all_* lists of
+            every lead role of each type). See get_leadership_for_projects, which does the work.
+        """
+        return Project.get_leadership_for_projects([self], buffer_days=buffer_days)[self.pk]
+
+    @staticmethod
+    def get_leadership_for_projects(projects, buffer_days=timedelta(days=45), order_by=('pk',)):
+        """
+        Batch version of get_project_leadership: fetches every ProjectRole for all of the
+        given projects in ONE query and buckets them per project in a single pass, so a
+        grid of project cards (or an "all project leads" listing) costs one query rather
+        than one per project.
+
+        A role is active if it hasn't ended (end_date is None or in the future). For a
+        project that has already ended, roles that ran until within buffer_days of the
+        project's end also count as active, so the people who wrapped the project up
+        still show as its current leads. A role is inactive only if its person holds no
+        active role on that project (so someone who was a student lead and is now a
+        Co-PI shows once, as active).
+
+        Parameters:
+        projects (iterable of Project): The projects to resolve.
+        buffer_days (timedelta): The buffer period for determining active roles. Defaults to 45 days.
+        order_by (tuple): Ordering for the roles within each bucket. Defaults to pk (insertion) order.
+
+        Returns:
+        dict: Maps project pk -> the leadership dict documented on get_project_leadership.
         """
+        projects = list(projects)
         current_date = timezone.now().date()
 
-        # Fetch all ProjectRole objects for the project at once
-        # The .select_related('person') is a Django ORM method that can help optimize 
-        # your database queries when dealing with related objects.
-        # In Django, each time you access a foreign key, a new database query is executed. 
-        # This can lead to a significant number of queries and can slow down your application, 
-        # especially if you’re dealing with a lot of objects. This problem is often referred to 
-        # as the “N+1 selects problem”.
-        # 
-        # The select_related method solves this problem by performing a SQL join and 
-        # including the fields of the related object in the SELECT statement. This way,
-        # when you access the related object, Django doesn’t need to hit the database again, 
-        # because it has already fetched all the necessary data.
-        #
-        # In your case, select_related('person') will fetch the related Person objects at 
-        # the same time as it fetches the ProjectRole objects. So later, when you do role.person 
-        # in your code, Django won’t need to make an additional query to the database, because the 
-        # Person object data was fetched in the original query.
-        all_roles = ProjectRole.objects.filter(project=self).select_related('person')
-
-        # Use list comprehensions to create lists of active and inactive roles
-        active_roles = [role for role in all_roles if role.end_date is None or role.end_date >= current_date]
-        if self.end_date is not None and self.end_date <= current_date:
-            active_roles += [role for role in all_roles if role.end_date is not None and role.end_date >= self.end_date - buffer_days]
-
-        # Convert active_roles to a set for faster lookups
-        active_roles_set = set(active_roles)
-
-        # Create a set of persons in active roles
-        active_persons = {role.person for role in active_roles_set}
-
-        # Filter inactive roles to exclude those with persons in active roles
-        inactive_roles = [role for role in all_roles if role.person not in active_persons]
-
-        # Use list comprehensions to create lists of different types of roles
-        all_PIs = [role for role in all_roles if role.lead_project_role == LeadProjectRoleTypes.PI]
-        active_PIs = [role for role in active_roles if role.lead_project_role == LeadProjectRoleTypes.PI]
-        inactive_PIs = [role for role in inactive_roles if role.lead_project_role == LeadProjectRoleTypes.PI]
-
-        active_CoPIs = [role for role in active_roles if role.lead_project_role == LeadProjectRoleTypes.CO_PI]
-        inactive_CoPIs = [role for role in inactive_roles if role.lead_project_role == LeadProjectRoleTypes.CO_PI]
-        inactive_PIsAndCoPIs = inactive_PIs + inactive_CoPIs
-
-        active_student_leads = [role for role in active_roles if role.lead_project_role == LeadProjectRoleTypes.STUDENT_LEAD]
-        inactive_student_leads = [role for role in inactive_roles if role.lead_project_role == LeadProjectRoleTypes.STUDENT_LEAD]
-
-        active_postdoc_leads = [role for role in active_roles if role.lead_project_role == LeadProjectRoleTypes.POSTDOC_LEAD]
-        inactive_postdoc_leads = [role for role in inactive_roles if role.lead_project_role == LeadProjectRoleTypes.POSTDOC_LEAD]
-
-        active_research_scientist_leads = [role for role in active_roles if role.lead_project_role == LeadProjectRoleTypes.RESEARCH_SCIENTIST_LEAD]
-        inactive_research_scientist_leads = [role for role in inactive_roles if role.lead_project_role == LeadProjectRoleTypes.RESEARCH_SCIENTIST_LEAD]
-
-        return {
-            'all_PIs': all_PIs,
-            'active_PIs': active_PIs,
-            'inactive_PIs': inactive_PIs,
-            'active_CoPIs': active_CoPIs,
-            'inactive_CoPIs': inactive_CoPIs,
-            'inactive_PIsAndCoPIs': inactive_PIsAndCoPIs,
-            'active_student_leads': active_student_leads,
-            'inactive_student_leads': inactive_student_leads,
-            'active_postdoc_leads': active_postdoc_leads,
-            'inactive_postdoc_leads': inactive_postdoc_leads,
-            'active_research_scientist_leads': active_research_scientist_leads,
-            'inactive_research_scientist_leads': inactive_research_scientist_leads,
-        }
+        # Fetch all ProjectRole objects for the projects at once. We need every role
+        # (not just lead roles) because a person's current non-lead role still keeps
+        # their past lead roles out of the inactive lists. select_related('person')
+        # joins the Person row in so templates can read role.person without an
+        # extra query per role (the "N+1 selects problem").
+        roles_by_project_id = defaultdict(list)
+        all_roles = (ProjectRole.objects
+                     .filter(project__in=projects)
+                     .select_related('person')
+                     .order_by(*order_by))
+        for role in all_roles:
+            roles_by_project_id[role.project_id].append(role)
+
+        leadership_by_project_id = {}
+        for project in projects:
+            leadership = {f'{state}_{suffix}': []
+                          for suffix in LEADERSHIP_KEY_SUFFIXES.values()
+                          for state in ('all', 'active', 'inactive')}
+
+            roles = roles_by_project_id[project.pk]
+            project_has_ended = project.end_date is not None and project.end_date <= current_date
+
+            def is_active(role):
+                if role.end_date is None or role.end_date >= current_date:
+                    return True
+                return project_has_ended and role.end_date >= project.end_date - buffer_days
+
+            active_flags = [is_active(role) for role in roles]
+            active_person_ids = {role.person_id for role, active in zip(roles, active_flags) if active}
+
+            for role, active in zip(roles, active_flags):
+                suffix = LEADERSHIP_KEY_SUFFIXES.get(role.lead_project_role)
+                if suffix is None:
+                    continue
+
+                leadership[f'all_{suffix}'].append(role)
+                if active:
+                    leadership[f'active_{suffix}'].append(role)
+                elif role.person_id not in active_person_ids:
+                    leadership[f'inactive_{suffix}'].append(role)
+
+            leadership['inactive_PIsAndCoPIs'] = leadership['inactive_PIs'] + leadership['inactive_CoPIs']
+            leadership_by_project_id[project.pk] = leadership
+
+        return leadership_by_project_id
 
     
     def get_thumbnail_alt_text(self):
@@ -442,6 +471,12 @@ class Project(models.Model):
         Returns:
             bool: True if one or more publications have an award, False otherwise.
         """
+        # Listing views annotate this for every project in their one query (see
+        # views/project_listing.py); fall back to a per-project query otherwise.
+        annotated = getattr(self, 'has_award_publication', None)
+        if annotated is not None:
+            return annotated
+
         # Check if any publication has an award (not null and not an empty string)
         return self.publication_set.filter(award__isnull=False).exclude(award__exact='').exists()
 
@@ -39,6 +39,15 @@ class ProjectRole(models.Model):
                                    " In addition, for most projects, Jon Froehlich should be the PI. So make sure" 
                                    " to add him on his person page.")
 
+    class Meta:
+        indexes = [
+            # A project's current/past people (Project.get_current_member_count() etc.)
+            models.Index(fields=['project', 'end_date'], name='projectrole_project_end_idx'),
+            # The open roles closed when a person leaves or a project ends
+            models.Index(fields=['person'], name='projectrole_open_person_idx',
+                         condition=models.Q(end_date__isnull=True)),
+        ]
+
     def get_start_date_short(self):
         return self.start_date.strftime('%b %Y')
 
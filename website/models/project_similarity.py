@@ -0,0 +1,38 @@
+from django.db import models
+
+from .project import Project
+
+
+class ProjectSimilarity(models.Model):
+    """A precomputed, directed similarity score between two projects.
+
+    The project page's "Related projects" strip used to run an annotate/count
+    over every project (shared umbrellas only) and then filter in Python. We now
+    precompute a weighted Jaccard score over each pair's shared umbrellas,
+    publications, grants, keywords, and people (see
+    ``website/utils/project_similarity.py``) and store it here, so the page reads
+    its top-N related projects with one indexed query.
+
+    Each pair is stored in both directions (``project`` -> ``related_project``
+    and back) so the read is a plain filter on ``project``. Pairs with nothing in
+    common have no row. Rows are kept current incrementally by the receivers in
+    ``website/signals.py`` and rebuilt wholesale by the
+    ``rebuild_project_similarity`` management command.
+    """
+
+    project = models.ForeignKey(Project, related_name='similarities', on_delete=models.CASCADE)
+    related_project = models.ForeignKey(Project, related_name='+', on_delete=models.CASCADE)
+    score = models.FloatField()
+
+    class Meta:
+        verbose_name_plural = "Project similarities"
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'related_project'],
+                                    name='unique_project_similarity_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['project', '-score'], name='project_similarity_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} -> {self.related_project_id}: {self.score:0.3f}"
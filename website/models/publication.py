@@ -1,11 +1,14 @@
 import os
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from website.models import Artifact
 import logging # for logging
 from datetime import date # for date comparisons
 import re # for regular expressions
 import website.utils.timeutils as timeutils
-import website.utils.fileutils as ml_fileutils # for auto-counting PDF pages
+from website.utils.pdf_page_cache import get_cached_pdf_page_count # for auto-counting PDF pages
 
 class PubAwardType(models.TextChoices):
     BEST_ARTIFACT_AWARD = "Best Artifact Award"
@@ -99,6 +102,44 @@ class Publication(Artifact):
 
     award = models.CharField(max_length=50, choices=PubAwardType.choices, blank=True, null=True)
 
+    # Denormalized citation strings. Building a citation walks self.authors.all()
+    # and get_formatted_forum_name() on every call, and the publications page, the
+    # API detail serializer, the citation modal, and /publications.bib all ask for
+    # them. We store the three variants we actually render and rebuild them on
+    # save(), when the author list changes (signals.py), and when an author's
+    # name changes (Person.save). NULL means "not computed yet"; the
+    # get_cached_citation_as_* readers fall back to building the string on the
+    # fly. See refresh_citation_cache().
+    citation_html_cache = models.TextField(blank=True, null=True, editable=False)
+    bibtex_cache = models.TextField(blank=True, null=True, editable=False)
+    bibtex_html_cache = models.TextField(blank=True, null=True, editable=False)
+
+    # The (newline, use_hyperlinks) combinations we keep cached: plain-text BibTeX
+    # for exports/API and the <br/>-joined, hyperlinked variant for the site modal
+    BIBTEX_PLAIN_ARGS = ("\n", False)
+    BIBTEX_HTML_ARGS = ("<br/>", True)
+
+    CITATION_CACHE_FIELDS = ['citation_html_cache', 'bibtex_cache', 'bibtex_html_cache']
+
+    class Meta:
+        # The publications page, its lazily-loaded year fragments, the API, and
+        # /publications.bib all filter or order publications by date.
+        indexes = [
+            models.Index(fields=['date'], name='publication_date_idx'),
+            # The People page's dissertations and the ?venue_type= / ?type=
+            # filters (exact and iexact), newest first
+            models.Index(fields=['pub_venue_type', '-date'], name='publication_venue_date_idx'),
+            models.Index(Upper('pub_venue_type'), F('date').desc(), name='publication_venue_upper_idx'),
+            # serve_pdf's exact match is pdf_file__iendswith, a LIKE '%name'
+            # that no btree can serve; a trigram index can (needs pg_trgm, see
+            # ensure_pg_trgm_extension in website/signals.py)
+            GinIndex(OpClass(Upper('pdf_file'), name='gin_trgm_ops'), name='publication_pdf_file_trgm_idx'),
+            # serve_pdf's renamed-paper fallback (original_pdf_filename__iexact);
+            # most rows have no captured original name, so leave them out
+            models.Index(Upper('original_pdf_filename'), name='publication_orig_pdf_upper_idx',
+                         condition=Q(original_pdf_filename__isnull=False)),
+        ]
+
     def save(self, *args, **kwargs):
         """
         Extends Artifact.save() to auto-populate num_pages from the uploaded PDF
@@ -110,16 +151,80 @@ class Publication(Artifact):
         overwritten. The count is computed after super().save() because that's
         when the PDF is guaranteed to be on disk (Artifact.save() also defers
         thumbnail generation for the same reason). If we fill it, we persist with
-        a second, narrowly-scoped save(update_fields=['num_pages']).
+        a second, narrowly-scoped save(update_fields=['num_pages']). Counts are
+        cached per file (website/utils/pdf_page_cache.py), so re-saving with an
+        unchanged PDF, even one whose pages can't be read, doesn't reopen it.
         """
         super().save(*args, **kwargs)
 
         if self.pdf_file and not self.num_pages:
-            page_count = ml_fileutils.get_pdf_page_count(self.pdf_file)
+            page_count = get_cached_pdf_page_count(self.pdf_file)
             if page_count:
                 self.num_pages = page_count
                 super().save(update_fields=['num_pages'])
 
+        # Rebuild the stored citation last so it sees the final num_pages. On the
+        # very first save there are no authors yet; the m2m_changed receiver in
+        # signals.py refreshes again once they're attached.
+        self.refresh_citation_cache()
+
+    def _compute_citation_cache(self):
+        """Returns a dict of citation cache field -> freshly built string."""
+        return {
+            'citation_html_cache': self.get_citation_as_html(),
+            'bibtex_cache': self.get_citation_as_bibtex(*self.BIBTEX_PLAIN_ARGS),
+            'bibtex_html_cache': self.get_citation_as_bibtex(*self.BIBTEX_HTML_ARGS),
+        }
+
+    def refresh_citation_cache(self):
+        """
+        Rebuilds the stored citation/BibTeX strings for this publication.
+
+        Written with a queryset .update() rather than save() so we don't re-run
+        Artifact.save()'s file renaming and thumbnail logic (or recurse back into
+        this method).
+        """
+        if self.pk is None:
+            return
+
+        values = self._compute_citation_cache()
+        for field_name, value in values.items():
+            setattr(self, field_name, value)
+        Publication.objects.filter(pk=self.pk).update(**values)
+
+    @classmethod
+    def refresh_citation_caches(cls, queryset=None, batch_size=200):
+        """
+        Rebuilds the stored citations for every publication in queryset (all
+        publications by default) and returns the number of rows written.
+
+        Used when many citations go stale at once (an author renames, a backfill
+        rewrites forum names or page counts). Authors are prefetched per chunk and
+        the writes are batched, so this is a handful of queries rather than two
+        per publication.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        queryset = queryset.prefetch_related('authors')
+        pending = []
+        num_updated = 0
+        for pub in queryset.iterator(chunk_size=batch_size):
+            for field_name, value in pub._compute_citation_cache().items():
+                setattr(pub, field_name, value)
+            pending.append(pub)
+
+            if len(pending) >= batch_size:
+                cls.objects.bulk_update(pending, cls.CITATION_CACHE_FIELDS)
+                num_updated += len(pending)
+                pending = []
+
+        if pending:
+            cls.objects.bulk_update(pending, cls.CITATION_CACHE_FIELDS)
+            num_updated += len(pending)
+
+        return num_updated
+
     def get_upload_dir(self, filename):
         return os.path.join(self.UPLOAD_DIR, filename)
 
@@ -202,6 +307,25 @@ class Publication(Artifact):
         """Returns true if the publication date happens in the future (e.g., tomorrow or later)"""
         return self.date and self.date > date.today()
 
+    def get_cached_citation_as_html(self):
+        """Returns the stored html citation, building it on the fly if it hasn't been cached yet"""
+        if self.citation_html_cache is not None:
+            return self.citation_html_cache
+        return self.get_citation_as_html()
+
+    def get_cached_citation_as_bibtex(self, newline="<br/>", use_hyperlinks=True):
+        """
+        Returns the stored bibtex citation. The two variants we render (plain text
+        and the site's <br/>/hyperlinked form) come from the cache; any other
+        combination, or a row that hasn't been cached yet, is built on the fly.
+        """
+        args = (newline, use_hyperlinks)
+        if args == self.BIBTEX_PLAIN_ARGS and self.bibtex_cache is not None:
+            return self.bibtex_cache
+        if args == self.BIBTEX_HTML_ARGS and self.bibtex_html_cache is not None:
+            return self.bibtex_html_cache
+        return self.get_citation_as_bibtex(newline, use_hyperlinks)
+
     def get_citation_as_html(self):
         """Returns a human readable citation as html"""
         citation = ", ".join([author.get_citation_name(full_name=False) for author in self.authors.all()]) + " "
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class PublicationProjectsChange(models.Model):
+    """A publication whose projects, or whose talk/video/poster links, changed.
+
+    ``propagate_publication_projects`` copies a publication's projects onto its
+    children that have none. Rather than re-reading the whole archive on every
+    container start, it works through the publications logged here since its
+    last pass and then deletes the rows it has handled (its checkpoint). Rows are
+    written by the receivers in ``website/signals.py`` in the same transaction as
+    the change itself, so a rolled-back edit leaves no entry behind. A publication
+    may appear more than once; the command deduplicates.
+    """
+
+    publication = models.ForeignKey('Publication', on_delete=models.CASCADE, related_name='+')
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['pk']
+
+    def __str__(self):
+        return f"Publication {self.publication_id} changed at {self.created}"
+
+    @classmethod
+    def record(cls, publication_ids):
+        """Logs each of publication_ids as changed (one INSERT)."""
+        publication_ids = set(publication_ids)
+        if publication_ids:
+            cls.objects.bulk_create([cls(publication_id=pk) for pk in sorted(publication_ids)])
@@ -0,0 +1,49 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """One searchable document for the site search (``/search/``, ``/api/v1/search/``).
+
+    Publications, talks, public projects, and news items each get one row. The
+    text columns hold what's searched, already flattened from the source
+    object and its relations (author names, keyword and project names), and
+    ``vector`` is the weighted ``tsvector`` built from them in SQL (title A,
+    keywords/projects B, people C, body D; see ``website/utils/search_index.py``).
+    Searching is then a single GIN-indexed ``@@`` over this table instead of
+    ``icontains`` joins across four models.
+
+    Rows are kept current by the receivers in ``website/signals.py`` and
+    rebuilt wholesale by the ``rebuild_search_index`` management command.
+    """
+
+    class Kind(models.TextChoices):
+        PUBLICATION = 'publication', 'Publication'
+        TALK = 'talk', 'Talk'
+        PROJECT = 'project', 'Project'
+        NEWS = 'news', 'News'
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=255, blank=True)
+    date = models.DateField(null=True, blank=True)
+    url = models.CharField(max_length=512, blank=True)
+
+    keywords = models.TextField(blank=True)
+    people = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+
+    vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        verbose_name_plural = "Search entries"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_entry'),
+        ]
+        indexes = [
+            GinIndex(fields=['vector'], name='search_entry_vector_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.title}"
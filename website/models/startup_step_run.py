@@ -0,0 +1,41 @@
+from django.db import models
+
+
+class StartupStepRun(models.Model):
+    """The last recorded run of one container-startup maintenance step.
+
+    ``run_startup_maintenance`` (see ``website/utils/startup_maintenance.py``)
+    runs the data/media upkeep commands that docker-entrypoint.sh used to invoke
+    one ``python manage.py ...`` at a time. Each step computes a cheap fingerprint
+    of what it reads (row counts + max ids, media directory mtimes, the command's
+    own source) and is skipped when that fingerprint matches the one stored here
+    from its last successful run. The timings double as a record of where deploy
+    time goes.
+    """
+
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_SKIPPED = 'skipped'
+    STATUS_CHOICES = [
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_SKIPPED, 'Skipped (unchanged)'),
+    ]
+
+    name = models.CharField(max_length=100, unique=True)
+
+    # Fingerprint taken right after the last *successful* run, i.e. the state the
+    # step left behind. A later start with the same fingerprint has nothing to do.
+    success_fingerprint = models.CharField(max_length=64, blank=True, default='')
+    last_success_at = models.DateTimeField(null=True, blank=True)
+
+    last_status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    last_started_at = models.DateTimeField()
+    last_duration_seconds = models.FloatField(default=0)
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name}: {self.last_status} ({self.last_duration_seconds:0.2f}s)"
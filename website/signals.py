@@ -1,6 +1,17 @@
-from django.db.models.signals import post_save, m2m_changed
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
+from django.db import connections
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed, pre_migrate
 from django.dispatch import receiver
 from website.models import Artifact, Talk, Publication, Poster, Grant
+from website.models import ContentVersion, News, Project, ProjectUmbrella, ProjectRole
+from website.models import Keyword, Person, SearchEntry, PublicationProjectsChange, Video
+from website.utils.artifact_side_effects import (defer_artifact_reconciliation,
+                                                 is_deferring_artifact_side_effects)
+from website.utils.object_merge import objects_merged
+from website.utils.project_similarity import get_linked_project_ids, schedule_project_similarity_update
+from website.utils.search_index import schedule_search_index_update, schedule_related_search_updates
+from website.utils import db_connections
 from wand.image import Image, Color
 from django.conf import settings
 import os
@@ -65,12 +76,49 @@ def authors_changed(sender, instance, action, reverse, **kwargs):
         # the authors field is not yet set. It won't be set until after super.save() is completed the first time
         # So, we use this authors_changed signal to both listen for when the assigned author is
         # initially setup and for when it is changed (e.g., if the first author changes)
-        if Artifact.do_filenames_need_updating(instance):
+        # Inside defer_artifact_side_effects() (e.g. an admin save), the save is
+        # coalesced into one per artifact at commit instead
+        if is_deferring_artifact_side_effects():
+            defer_artifact_reconciliation(instance)
+        elif Artifact.do_filenames_need_updating(instance):
             _logger.debug("Filenames need to be updated, calling instance.save()")
             instance.save()
 
     _logger.debug(f"Completed authors_changed")
 
+
+@receiver(m2m_changed, sender=Publication.authors.through)
+def publication_authors_changed_refresh_citation(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keeps Publication's stored citation/BibTeX strings in sync with its author list.
+
+    Forward changes (pub.authors.add/remove/set/clear) refresh that one publication.
+    Reverse changes (person.publication_set.add(...)) refresh the publications in
+    pk_set. A reverse clear() doesn't carry a pk_set, so we stash the affected
+    publication ids on pre_clear and refresh them on post_clear.
+    """
+    if action not in ('pre_clear', 'post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        if action != 'pre_clear':
+            instance.refresh_citation_cache()
+        return
+
+    if action == 'pre_clear':
+        instance._citation_pub_ids_to_refresh = list(
+            instance.publication_set.values_list('pk', flat=True))
+        return
+
+    if action == 'post_clear':
+        pub_ids = getattr(instance, '_citation_pub_ids_to_refresh', [])
+        instance._citation_pub_ids_to_refresh = []
+    else:
+        pub_ids = pk_set or []
+
+    if pub_ids:
+        Publication.refresh_citation_caches(Publication.objects.filter(pk__in=pub_ids))
+
     
 @receiver(post_save, sender=Talk)
 def talk_post_save(sender, **kwargs):
@@ -103,4 +151,304 @@ def talk_post_save(sender, **kwargs):
     talk = kwargs['instance']
     _logger.debug(f"Speakers: {talk.authors.all()}")
 
-    _logger.debug(f"Completed talk_post_save with sender={sender} and kwargs={kwargs}")
\ No newline at end of file
+    _logger.debug(f"Completed talk_post_save with sender={sender} and kwargs={kwargs}")
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=ProjectUmbrella)
+@receiver(post_delete, sender=ProjectUmbrella)
+@receiver(post_save, sender=Publication)
+@receiver(post_delete, sender=Publication)
+@receiver(m2m_changed, sender=Publication.projects.through)
+@receiver(m2m_changed, sender=Project.project_umbrellas.through)
+def bump_projects_content_version(sender, **kwargs):
+    """
+    Invalidates cached project listing data (views/project_listing.py) whenever a
+    project, an umbrella, a publication (which drives each project's most recent
+    publication date and award banner), or the links between them change.
+    """
+    action = kwargs.get('action')
+    if action is not None and not action.startswith('post_'):
+        return
+    ContentVersion.bump(ContentVersion.PROJECTS)
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def bump_news_content_version(sender, **kwargs):
+    """Invalidates the cached footer news list (context_processors.recent_news)."""
+    ContentVersion.bump(ContentVersion.NEWS)
+
+
+@receiver(post_save, sender=Publication)
+@receiver(post_delete, sender=Publication)
+@receiver(m2m_changed, sender=Publication.authors.through)
+@receiver(m2m_changed, sender=Publication.projects.through)
+@receiver(m2m_changed, sender=Publication.keywords.through)
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Keyword)
+@receiver(post_delete, sender=Keyword)
+@receiver(post_save, sender=Talk)
+@receiver(post_delete, sender=Talk)
+@receiver(post_save, sender=Poster)
+@receiver(post_delete, sender=Poster)
+def bump_publications_content_version(sender, **kwargs):
+    """
+    Invalidates the cached publication listing fragments (views/publications.py)
+    whenever a publication, its author/project/keyword links, or anything its
+    rows show (author names, project names, keywords, the linked talk and
+    poster) change.
+    """
+    action = kwargs.get('action')
+    if action is not None and not action.startswith('post_'):
+        return
+    ContentVersion.bump(ContentVersion.PUBLICATIONS)
+
+
+@receiver(m2m_changed, sender=Project.project_umbrellas.through)
+@receiver(m2m_changed, sender=Project.keywords.through)
+@receiver(m2m_changed, sender=Publication.projects.through)
+@receiver(m2m_changed, sender=Grant.projects.through)
+def project_links_changed_update_similarity(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keeps the precomputed ProjectSimilarity table current when a project's
+    umbrellas, keywords, publications, or grants change. The affected projects
+    are the instance itself when the change was made from the Project side, or
+    the projects in pk_set when it was made from the other side (e.g.
+    pub.projects.add(...)). A clear() from the other side carries no pk_set, so
+    we stash the linked project ids on pre_clear.
+    """
+    if isinstance(instance, Project):
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            schedule_project_similarity_update([instance.pk])
+        return
+
+    if action == 'pre_clear':
+        instance._similarity_project_ids_to_update = list(
+            instance.projects.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        schedule_project_similarity_update(getattr(instance, '_similarity_project_ids_to_update', []))
+        instance._similarity_project_ids_to_update = []
+    elif action in ('post_add', 'post_remove'):
+        schedule_project_similarity_update(pk_set or [])
+
+
+@receiver(pre_delete, sender=ProjectUmbrella)
+@receiver(pre_delete, sender=Publication)
+@receiver(pre_delete, sender=Grant)
+@receiver(pre_delete, sender=Keyword)
+def project_link_source_deleted_update_similarity(sender, instance, **kwargs):
+    """
+    Deleting an umbrella, publication, grant, or keyword cascades its project
+    link rows without sending m2m_changed, so rescore the projects it was
+    linked to here, while the links can still be read.
+    """
+    schedule_project_similarity_update(get_linked_project_ids(instance))
+
+
+@receiver(post_save, sender=ProjectRole)
+@receiver(post_delete, sender=ProjectRole)
+def project_role_changed_update_similarity(sender, instance, **kwargs):
+    """People are one of the similarity features, so a role change rescores its project."""
+    schedule_project_similarity_update([instance.project_id])
+
+
+# The SearchEntry kind each searchable model is indexed as (website/utils/search_index.py)
+_SEARCH_KINDS = {
+    Publication: SearchEntry.Kind.PUBLICATION,
+    Talk: SearchEntry.Kind.TALK,
+    Project: SearchEntry.Kind.PROJECT,
+    News: SearchEntry.Kind.NEWS,
+}
+
+
+@receiver(post_save, sender=Publication)
+@receiver(post_delete, sender=Publication)
+@receiver(post_save, sender=Talk)
+@receiver(post_delete, sender=Talk)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def searchable_changed_update_search_index(sender, instance, **kwargs):
+    """Re-indexes a searchable object after it's saved (or drops its entry after a delete)."""
+    schedule_search_index_update(_SEARCH_KINDS[sender], [instance.pk])
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Keyword)
+@receiver(pre_delete, sender=Project)
+@receiver(pre_delete, sender=Keyword)
+@receiver(pre_delete, sender=Person)
+def name_source_changed_update_search_index(sender, instance, **kwargs):
+    """
+    Projects and keywords are indexed by name on the entries they're linked
+    to, and people by name on theirs, so a rename or delete re-indexes those
+    entries. (Person renames are caught in Person.save(), which already knows
+    whether the name changed.) Deletes are handled on pre_delete, while the
+    links still exist.
+    """
+    schedule_related_search_updates(instance)
+
+
+@receiver(m2m_changed, sender=Publication.authors.through)
+@receiver(m2m_changed, sender=Publication.keywords.through)
+@receiver(m2m_changed, sender=Publication.projects.through)
+@receiver(m2m_changed, sender=Talk.authors.through)
+@receiver(m2m_changed, sender=Talk.keywords.through)
+@receiver(m2m_changed, sender=Talk.projects.through)
+@receiver(m2m_changed, sender=Project.keywords.through)
+@receiver(m2m_changed, sender=News.project.through)
+@receiver(m2m_changed, sender=News.people.through)
+def search_links_changed_update_search_index(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    Re-indexes the searchable side of a changed link. From the forward side
+    (pub.authors.add(...)) that's the instance; from the reverse side
+    (person.publication_set.add(...)) it's the objects in pk_set. A reverse
+    clear() carries no pk_set, so we read the linked ids from the through
+    table on pre_clear.
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            schedule_search_index_update(_SEARCH_KINDS[type(instance)], [instance.pk])
+        return
+
+    kind = _SEARCH_KINDS[model]
+    if action == 'pre_clear':
+        fields = {field.related_model: field.attname for field in sender._meta.fields if field.is_relation}
+        instance._search_ids_to_update = list(
+            sender.objects.filter(**{fields[type(instance)]: instance.pk}).values_list(fields[model], flat=True))
+    elif action == 'post_clear':
+        schedule_search_index_update(kind, getattr(instance, '_search_ids_to_update', []))
+        instance._search_ids_to_update = []
+    elif action in ('post_add', 'post_remove'):
+        schedule_search_index_update(kind, pk_set or [])
+
+
+@receiver(post_save, sender=ProjectRole)
+@receiver(post_delete, sender=ProjectRole)
+def project_role_changed_update_search_index(sender, instance, **kwargs):
+    """Project members are part of a project's indexed people."""
+    schedule_search_index_update(SearchEntry.Kind.PROJECT, [instance.project_id])
+
+
+@receiver(post_save, sender=Publication)
+def publication_saved_record_projects_change(sender, instance, raw=False, **kwargs):
+    """
+    Logs the publication for propagate_publication_projects: a save may have
+    pointed its talk/video/poster at a child that has no project yet.
+    """
+    if not raw:
+        PublicationProjectsChange.record([instance.pk])
+
+
+@receiver(m2m_changed, sender=Publication.projects.through)
+def publication_projects_changed_record_projects_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Logs publications that gained a project (propagation is additive, so removals don't matter)."""
+    if action == 'post_add':
+        PublicationProjectsChange.record(pk_set if reverse else [instance.pk])
+
+
+# The Publication field pointing at each child artifact model
+_PUBLICATION_CHILD_FIELDS = {Talk: 'talk', Video: 'video', Poster: 'poster'}
+
+
+@receiver(m2m_changed, sender=Talk.projects.through)
+@receiver(m2m_changed, sender=Video.projects.through)
+@receiver(m2m_changed, sender=Poster.projects.through)
+def child_projects_changed_record_projects_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    A talk/video/poster that loses projects may be left with none, at which
+    point it should inherit its publication's again, so log the publications
+    that point at it. From the reverse side (project.talk_set.remove(...)) the
+    children are in pk_set; a reverse clear() carries no pk_set, so we read them
+    on pre_clear, while the links still exist.
+    """
+    if not reverse:
+        if action not in ('post_remove', 'post_clear'):
+            return
+        child_model, child_ids = type(instance), [instance.pk]
+    elif action == 'pre_clear':
+        child_model, child_ids = model, list(model.objects.filter(projects=instance).values_list('pk', flat=True))
+    elif action == 'post_remove':
+        child_model, child_ids = model, pk_set or []
+    else:
+        return
+
+    field_name = _PUBLICATION_CHILD_FIELDS[child_model]
+    PublicationProjectsChange.record(
+        Publication.objects.filter(**{f'{field_name}__in': child_ids}).values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Project)
+def project_deleted_record_projects_change(sender, instance, **kwargs):
+    """
+    Deleting a project cascades its talk/video/poster link rows without sending
+    m2m_changed, which may leave a child with no projects, so log the
+    publications that point at its children here, while the links can still be read.
+    """
+    publication_ids = set()
+    for child_model, field_name in _PUBLICATION_CHILD_FIELDS.items():
+        child_ids = child_model.objects.filter(projects=instance).values_list('pk', flat=True)
+        publication_ids.update(
+            Publication.objects.filter(**{f'{field_name}__in': child_ids}).values_list('pk', flat=True))
+    PublicationProjectsChange.record(publication_ids)
+
+
+@receiver(objects_merged)
+def objects_merged_refresh_derived_data(sender, target, changes, **kwargs):
+    """
+    A merge (website/utils/object_merge.py) rewrites links without firing the
+    per-row signals above, so refresh what they would have, once: the search
+    entries and stored citations of the objects whose links changed, the
+    similarity of the affected projects, and the projects content version.
+    Artifact files are deliberately not renamed here; restandardize_artifact_filenames
+    catches any whose first author changed.
+    """
+    affected = {}
+    for change in changes:
+        affected.setdefault(change.owner_model, set()).update(change.affected_ids)
+
+    role_project_ids = set(ProjectRole.objects.filter(pk__in=affected.get(ProjectRole, ()))
+                           .values_list('project_id', flat=True))
+    for model, kind in _SEARCH_KINDS.items():
+        schedule_search_index_update(kind, affected.get(model, ()))
+    schedule_search_index_update(SearchEntry.Kind.PROJECT, role_project_ids)
+    schedule_project_similarity_update(affected.get(Project, set()) | role_project_ids)
+
+    if sender is Person and affected.get(Publication):
+        Publication.refresh_citation_caches(Publication.objects.filter(pk__in=affected[Publication]))
+    if affected.keys() & {Project, ProjectUmbrella, Publication}:
+        ContentVersion.bump(ContentVersion.PROJECTS)
+
+
+@receiver(connection_created)
+def count_db_connection_opened(sender, connection, **kwargs):
+    """Counts new DB connections per worker for /version.json (see website/utils/db_connections.py)."""
+    db_connections.record_connection_opened()
+
+
+@receiver(request_finished)
+def count_request_finished(sender, **kwargs):
+    """Counts finished requests per worker, the denominator for connection reuse."""
+    db_connections.record_request_finished()
+
+
+@receiver(pre_migrate)
+def ensure_pg_trgm_extension(sender, app_config, using, **kwargs):
+    """
+    Installs pg_trgm before the website app's tables/indexes are created or
+    migrated: Person's search_name trigram index needs its gin_trgm_ops
+    operator class. website/migrations is gitignored and regenerated per
+    environment, so this can't live in a hand-written migration; pre_migrate
+    also runs before the test runner's syncdb. pg_trgm is a trusted extension,
+    so the database owner can create it.
+    """
+    connection = connections[using]
+    if app_config.label != 'website' or connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
@@ -0,0 +1,124 @@
+/**
+ * PublicationsLazyLoad — fills in the older year sections of /publications/.
+ *
+ * The publications view renders only the newest few years server-side
+ * (views/publications.py::INITIAL_YEARS_RENDERED). Each older year is emitted as
+ * a headed <section class="pub-year-deferred" data-pub-year="YYYY"> with an
+ * empty-ish ".pub-year-rows" container, so tocbot still lists every year. This
+ * script fetches a year's rows from website:publications_fragment when its
+ * section comes within a screen or so of the viewport, or immediately when the
+ * user jumps to it via the year nav / a #year-YYYY link.
+ *
+ * Fetched rows are the SAME snippet HTML the page renders on first paint, so we
+ * only re-run CitationPopover (idempotent) after each insert; thumbnailPreview.js
+ * is fully event-delegated and needs nothing.
+ *
+ * Progressive enhancement: each deferred section contains a plain link to
+ * /publications/?year=YYYY (a server-filtered page), which this script replaces
+ * with the rows. Without JS, or if IntersectionObserver is missing, that link
+ * keeps every year reachable.
+ *
+ * @author Makeability Lab
+ */
+const PublicationsLazyLoad = (function () {
+  'use strict';
+
+  const FRAGMENT_URL = '/publications/fragment/';
+
+  // Start fetching well before the section is on screen so a normal scroll
+  // rarely sees the placeholder.
+  const ROOT_MARGIN = '800px 0px';
+
+  let observer = null;
+
+  function reinitBehaviors() {
+    if (typeof CitationPopover !== 'undefined') {
+      CitationPopover.init('.publication-citation-link');
+    }
+  }
+
+  /** Fetch and insert one deferred year. Safe to call repeatedly. */
+  function loadSection(section) {
+    if (!section || section.dataset.loaded === 'true' || section.dataset.loading === 'true') {
+      return Promise.resolve();
+    }
+    section.dataset.loading = 'true';
+    section.setAttribute('aria-busy', 'true');
+    if (observer) {
+      observer.unobserve(section);
+    }
+
+    const url = FRAGMENT_URL + '?year=' + encodeURIComponent(section.dataset.pubYear);
+    return fetch(url, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error('Request failed: ' + response.status);
+        }
+        return response.json();
+      })
+      .then(function (data) {
+        const rows = section.querySelector('.pub-year-rows');
+        rows.innerHTML = data.html;
+        section.dataset.loaded = 'true';
+        section.classList.remove('pub-year-deferred');
+        reinitBehaviors();
+      })
+      .catch(function (error) {
+        // Leave the fallback link in place so the year is still reachable.
+        if (window.console && console.error) {
+          console.error('PublicationsLazyLoad:', error);
+        }
+      })
+      .then(function () {
+        section.dataset.loading = 'false';
+        section.setAttribute('aria-busy', 'false');
+      });
+  }
+
+  /** Loads the deferred section a #year-YYYY hash points at, then re-scrolls to
+   *  it (the rows inserted above it shift the layout). */
+  function loadFromHash() {
+    const match = /^#year-(\d{4})$/.exec(window.location.hash);
+    if (!match) {
+      return;
+    }
+    const section = document.querySelector('section[data-pub-year="' + match[1] + '"]');
+    if (!section || section.dataset.loaded === 'true') {
+      return;
+    }
+    loadSection(section).then(function () {
+      const heading = document.getElementById('year-' + match[1]);
+      if (heading) {
+        heading.scrollIntoView();
+      }
+    });
+  }
+
+  function init() {
+    const sections = document.querySelectorAll('section[data-pub-year]');
+    if (!sections.length) {
+      return;
+    }
+
+    if ('IntersectionObserver' in window) {
+      observer = new IntersectionObserver(function (entries) {
+        entries.forEach(function (entry) {
+          if (entry.isIntersecting) {
+            loadSection(entry.target);
+          }
+        });
+      }, { rootMargin: ROOT_MARGIN });
+
+      Array.prototype.forEach.call(sections, function (section) {
+        observer.observe(section);
+      });
+    }
+
+    loadFromHash();
+    window.addEventListener('hashchange', loadFromHash);
+  }
+
+  return {
+    init: init,
+  };
+})();
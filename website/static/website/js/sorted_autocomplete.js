@@ -0,0 +1,104 @@
+/**
+ * Drag-to-reorder for the sorted author / recipient pickers
+ * (SortedAutocompleteSelectMultiple in website/admin/widgets.py).
+ *
+ * Django's admin/js/autocomplete.js turns each <select class="admin-autocomplete">
+ * into a select2 box that searches admin:person_search. select2 lists the chosen
+ * people in the DOM order of the select's selected <option>s, and the browser
+ * submits them in that same order -- which sortedm2m saves as the author order.
+ * So reordering is just moving <option>s: a dropped name moves its option, and
+ * select2 re-renders from the new order. Newly picked people land at the end.
+ *
+ * Without JS the field is a plain multi-select of the current people; the saved
+ * order is still preserved.
+ */
+'use strict';
+{
+    const $ = django.jQuery;
+
+    function selectedOptions(select) {
+        return Array.from(select.options).filter(option => option.selected);
+    }
+
+    function choiceItems(container) {
+        return Array.from(container.querySelectorAll('.select2-selection__choice'));
+    }
+
+    function markDraggable(container) {
+        for (const item of choiceItems(container)) {
+            item.draggable = true;
+        }
+    }
+
+    function initSortable(select) {
+        const container = select.nextElementSibling;
+        if (!container || !container.classList.contains('select2-container') || select.dataset.sortable) {
+            return;
+        }
+        select.dataset.sortable = 'true';
+
+        // select2 rebuilds the chosen list on every change
+        const rendered = container.querySelector('.select2-selection__rendered');
+        new MutationObserver(() => markDraggable(container)).observe(rendered, {childList: true});
+        markDraggable(container);
+
+        let fromIndex = null;
+        container.addEventListener('dragstart', event => {
+            const item = event.target.closest('.select2-selection__choice');
+            if (!item) {
+                return;
+            }
+            fromIndex = choiceItems(container).indexOf(item);
+            item.classList.add('is-dragging');
+            event.dataTransfer.effectAllowed = 'move';
+            event.dataTransfer.setData('text/plain', item.title || '');
+        });
+        container.addEventListener('dragover', event => {
+            if (fromIndex !== null && event.target.closest('.select2-selection__choice')) {
+                event.preventDefault();
+            }
+        });
+        container.addEventListener('dragend', event => {
+            const item = event.target.closest('.select2-selection__choice');
+            if (item) {
+                item.classList.remove('is-dragging');
+            }
+            fromIndex = null;
+        });
+        container.addEventListener('drop', event => {
+            const target = event.target.closest('.select2-selection__choice');
+            if (fromIndex === null || !target) {
+                return;
+            }
+            event.preventDefault();
+            const toIndex = choiceItems(container).indexOf(target);
+            const options = selectedOptions(select);
+            if (toIndex < 0 || toIndex === fromIndex || !options[fromIndex]) {
+                return;
+            }
+            const rect = target.getBoundingClientRect();
+            const after = event.clientX > rect.left + rect.width / 2;
+            const anchor = options[toIndex];
+            anchor.parentNode.insertBefore(options[fromIndex], after ? anchor.nextSibling : anchor);
+            fromIndex = null;
+            $(select).trigger('change');
+        });
+    }
+
+    function initAll(root) {
+        root.querySelectorAll('select.sorted-autocomplete').forEach(select => {
+            if (!select.name.includes('__prefix__')) {
+                initSortable(select);
+            }
+        });
+    }
+
+    // Registered after admin/js/autocomplete.js (see the widget's Media), so
+    // select2 has already built its containers by the time this runs.
+    $(function() {
+        initAll(document);
+    });
+    document.addEventListener('formset:added', event => {
+        initAll(event.target);
+    });
+}
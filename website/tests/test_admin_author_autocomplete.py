@@ -0,0 +1,78 @@
+"""
+Tests for the sortable author autocomplete: SortedAutocompleteSelectMultiple
+renders only the chosen people, in their saved order, and admin:person_search
+pages through PersonAdmin's search results for staff only.
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+
+from website.admin.admin_site import ml_admin_site
+from website.admin.person_search import PERSON_SEARCH_PAGE_SIZE
+from website.admin.widgets import SortedAutocompleteSelectMultiple
+from website.models import Person, Publication
+from website.tests.base import DatabaseTestCase
+
+
+class SortedAutocompleteWidgetTests(DatabaseTestCase):
+
+    def setUp(self):
+        self.first = self.make_person(first_name="Zed", last_name="Zimmer")
+        self.second = self.make_person(first_name="Amy", last_name="Adams")
+        self.unselected = self.make_person(first_name="Bob", last_name="Brown")
+        self.publication = self.make_publication()
+        self.publication.authors.set([self.first, self.second])
+
+    def _render_authors_field(self):
+        model_admin = ml_admin_site._registry[Publication]
+        formfield = model_admin.formfield_for_manytomany(
+            Publication._meta.get_field('authors'), request=None)
+        self.assertIsInstance(formfield.widget, SortedAutocompleteSelectMultiple)
+        value = [person.pk for person in self.publication.authors.all()]
+        return formfield.widget.render('authors', value)
+
+    def test_renders_only_selected_authors_in_saved_order(self):
+        html = self._render_authors_field()
+        self.assertNotIn(str(self.unselected), html)
+        self.assertLess(html.index(str(self.first)), html.index(str(self.second)))
+        self.assertIn(reverse('admin:person_search'), html)
+
+
+class PersonSearchEndpointTests(DatabaseTestCase):
+
+    def setUp(self):
+        self.url = reverse('admin:person_search')
+        self.client = Client()
+        self.superuser = get_user_model().objects.create_superuser(
+            username="searchadmin", email="search@example.com", password="x")
+
+    def _search(self, **params):
+        self.client.force_login(self.superuser)
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_filters_by_search_fields(self):
+        match = self.make_person(first_name="Ada", last_name="Lovelace")
+        self.make_person(first_name="Alan", last_name="Turing")
+        data = self._search(term="lovelace")
+        self.assertEqual(data['results'], [{'id': str(match.pk), 'text': "Ada Lovelace"}])
+        self.assertFalse(data['pagination']['more'])
+
+    def test_paginates(self):
+        for i in range(PERSON_SEARCH_PAGE_SIZE + 1):
+            self.make_person(first_name=f"Pat{i}", last_name="Pager")
+        first_page = self._search(term="Pager")
+        self.assertEqual(len(first_page['results']), PERSON_SEARCH_PAGE_SIZE)
+        self.assertTrue(first_page['pagination']['more'])
+        second_page = self._search(term="Pager", page=2)
+        self.assertEqual(len(second_page['results']), 1)
+        self.assertFalse(second_page['pagination']['more'])
+        self.assertEqual(Person.objects.filter(last_name="Pager").count(), PERSON_SEARCH_PAGE_SIZE + 1)
+
+    def test_requires_staff_login(self):
+        response = self.client.get(self.url, {'term': "a"})
+        self.assertEqual(response.status_code, 302)
@@ -402,6 +402,13 @@ class ApiTestCase(DatabaseTestCase):
         self.assertIn("Jon Froehlich", names)  # has a Position
         self.assertNotIn("Ext Author", names)  # co-author only, no Position
 
+    def test_people_search_filter(self):
+        results = self.client.get("/api/v1/people/?q=jon froe").json()["results"]
+        self.assertEqual([p["name"] for p in results], ["Jon Froehlich"])
+        # Still scoped to members: the co-author matches the name but has no Position
+        results = self.client.get("/api/v1/people/?q=ext").json()["results"]
+        self.assertEqual(results, [])
+
     def test_person_detail_by_url_name(self):
         resp = self.client.get(f"/api/v1/people/{self.jon.url_name}/")
         self.assertEqual(resp.status_code, 200)
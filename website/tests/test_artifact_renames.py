@@ -0,0 +1,107 @@
+"""
+Tests for the artifact rename planner (website/utils/artifact_renames.py) behind
+restandardize_artifact_filenames and repair_diverged_artifact_filenames: the
+--plan-only JSON, in-memory collision handling, and the journaled rollback.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import override_settings
+
+from website.models import Artifact, Talk
+from website.tests.base import DatabaseTestCase
+from website.tests.factories import TalkFactory
+from website.utils.artifact_renames import RenamePlanner
+
+
+class ArtifactRenamePlannerTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        # Disposable MEDIA_ROOT: these tests rename real files
+        self.media_root = tempfile.mkdtemp(prefix="ml_media_test_")
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _legacy_talk(self, last_name="Kim", base="Original_Upload_v2"):
+        """A talk with authors whose pdf/raw sit on disk under a non-standard name."""
+        person = self.make_person(last_name=last_name)
+        talk = TalkFactory(title="My Talk", forum_name="CHI", date=date(2019, 1, 1),
+                           pdf_file=None, authors=[person])
+        pdf_name = default_storage.save(f"talks/{base}.pdf", ContentFile(b"%PDF-1.4 x"))
+        raw_name = default_storage.save(f"talks/{base}.pptx", ContentFile(b"PKx"))
+        Talk.objects.filter(pk=talk.pk).update(pdf_file=pdf_name, raw_file=raw_name)
+        talk.refresh_from_db()
+        return talk
+
+    def test_plan_only_prints_json_and_touches_nothing(self):
+        talk = self._legacy_talk()
+        out = StringIO()
+
+        call_command("restandardize_artifact_filenames", "--plan-only", stdout=out)
+
+        plan = json.loads(out.getvalue())
+        new_base = Artifact.generate_filename(talk)
+        self.assertEqual(plan["num_artifacts"], 1)
+        self.assertEqual({(r["field"], r["from"], r["to"]) for r in plan["renames"]},
+                         {("pdf_file", talk.pdf_file.name, f"talks/{new_base}.pdf"),
+                          ("raw_file", talk.raw_file.name, f"talks/{new_base}.pptx")})
+        talk_after = Talk.objects.get(pk=talk.pk)
+        self.assertEqual(talk_after.pdf_file.name, talk.pdf_file.name)
+        self.assertTrue(default_storage.exists(talk.pdf_file.name))
+
+    def test_collisions_get_a_uniqueness_suffix_without_touching_disk(self):
+        first = self._legacy_talk(base="First_Upload")
+        second = self._legacy_talk(base="Second_Upload")
+        new_base = Artifact.generate_filename(first)
+        self.assertEqual(new_base, Artifact.generate_filename(second))
+
+        planner = RenamePlanner()
+        planner.add_standardized(first, "pdf_file", new_base)
+        planner.add_standardized(second, "pdf_file", new_base)
+
+        first_to, second_to = (rename.new_name for rename in planner.plan.renames)
+        self.assertEqual(first_to, f"talks/{new_base}.pdf")
+        self.assertTrue(os.path.basename(second_to).startswith(f"{new_base}-"), second_to)
+        self.assertTrue(second_to.endswith(".pdf"))
+
+    def test_failed_database_write_rolls_the_renames_back(self):
+        talk = self._legacy_talk()
+        old_pdf, old_raw = talk.pdf_file.name, talk.raw_file.name
+
+        with patch("django.db.models.query.QuerySet.bulk_update", side_effect=DatabaseError("boom")):
+            with self.assertRaises(DatabaseError):
+                call_command("restandardize_artifact_filenames")
+
+        talk.refresh_from_db()
+        self.assertEqual((talk.pdf_file.name, talk.raw_file.name), (old_pdf, old_raw))
+        self.assertTrue(default_storage.exists(old_pdf))
+        self.assertTrue(default_storage.exists(old_raw))
+        talks_dir = os.path.join(self.media_root, "talks")
+        self.assertEqual(sorted(entry for entry in os.listdir(talks_dir)
+                                if os.path.isfile(os.path.join(talks_dir, entry))),
+                         sorted([os.path.basename(old_pdf), os.path.basename(old_raw)]))
+
+    def test_renames_are_one_bulk_update_not_a_save_per_row(self):
+        talks = [self._legacy_talk(last_name=name, base=f"{name}_Upload") for name in ("Kim", "Lee", "Park")]
+
+        with patch.object(Talk, "save") as save:
+            call_command("restandardize_artifact_filenames")
+        save.assert_not_called()
+
+        for talk in talks:
+            talk.refresh_from_db()
+            self.assertEqual(os.path.splitext(os.path.basename(talk.pdf_file.name))[0],
+                             Artifact.generate_filename(talk))
+            self.assertTrue(default_storage.exists(talk.pdf_file.name))
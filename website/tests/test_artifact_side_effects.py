@@ -0,0 +1,47 @@
+"""
+Tests for defer_artifact_side_effects() (website/utils/artifact_side_effects.py):
+authors_changed file reconciliation is coalesced into one save per artifact at
+commit inside the block, and stays immediate outside it.
+"""
+
+from unittest.mock import patch
+
+from website.models import Artifact, Talk
+from website.tests.base import DatabaseTestCase
+from website.utils.artifact_side_effects import defer_artifact_side_effects
+
+
+class DeferArtifactSideEffectsTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.talk = self.make_talk(title="Deferred Talk")
+        self.people = [self.make_person(last_name=name) for name in ("Kim", "Lee", "Park")]
+        # Every post_add would otherwise find the filenames stale and re-save
+        needs_updating = patch.object(Artifact, "do_filenames_need_updating", return_value=True)
+        needs_updating.start()
+        self.addCleanup(needs_updating.stop)
+
+    def test_authors_added_one_at_a_time_reconcile_once_at_commit(self):
+        with patch.object(Talk, "save") as save:
+            with self.captureOnCommitCallbacks(execute=True):
+                with defer_artifact_side_effects():
+                    for person in self.people:
+                        self.talk.authors.add(person)
+                    self.assertEqual(save.call_count, 0)
+        self.assertEqual(save.call_count, 1)
+
+    def test_outside_the_block_each_add_saves_immediately(self):
+        with patch.object(Talk, "save") as save:
+            for person in self.people:
+                self.talk.authors.add(person)
+        self.assertEqual(save.call_count, len(self.people))
+
+    def test_nothing_runs_when_the_block_raises(self):
+        with patch.object(Talk, "save") as save:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with self.assertRaises(ValueError):
+                    with defer_artifact_side_effects():
+                        self.talk.authors.add(self.people[0])
+                        raise ValueError("form error")
+        self.assertEqual(callbacks, [])
+        save.assert_not_called()
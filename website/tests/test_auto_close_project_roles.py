@@ -0,0 +1,102 @@
+"""
+Tests for the auto_close_project_roles management command: open ProjectRoles of
+people who have left the lab are closed in one set-based pass.
+
+Roles are created after their person's positions, since Position.save() closes
+roles itself when an ended position is saved for someone already gone.
+"""
+
+from datetime import date, timedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from website.models import Position, ProjectRole
+from website.models.position import Role, Title
+from website.tests.base import DatabaseTestCase
+
+TODAY = date.today()
+
+
+class AutoCloseProjectRolesTests(DatabaseTestCase):
+    def setUp(self):
+        self.project = self.make_project(name="Project Sidewalk", short_name="projectsidewalk")
+
+    def _person_with_position(self, first_name, start, end, role=Role.MEMBER):
+        person = self.make_person(first_name=first_name, last_name="Tester")
+        Position.objects.create(person=person, role=role, title=Title.PHD_STUDENT,
+                                school="University of Washington", start_date=start, end_date=end)
+        return person
+
+    def _open_role(self, person, project=None):
+        return ProjectRole.objects.create(person=person, project=project or self.project,
+                                          start_date=date(2015, 1, 1))
+
+    def _run(self, **kwargs):
+        call_command('auto_close_project_roles', **kwargs)
+
+    def test_closes_open_role_of_person_who_left(self):
+        left_on = TODAY - timedelta(days=30)
+        role = self._open_role(self._person_with_position("Ada", date(2015, 1, 1), left_on))
+
+        self._run()
+        role.refresh_from_db()
+        self.assertEqual(role.end_date, left_on)
+
+    def test_uses_project_end_date_when_it_is_earlier(self):
+        left_on = TODAY - timedelta(days=30)
+        project_end = left_on - timedelta(days=365)
+        ended_project = self.make_project(name="Old Project", short_name="oldproject", end_date=project_end)
+        role = self._open_role(self._person_with_position("Bo", date(2015, 1, 1), left_on),
+                               project=ended_project)
+
+        self._run()
+        role.refresh_from_db()
+        self.assertEqual(role.end_date, project_end)
+
+    def test_latest_position_decides_who_has_left(self):
+        """An ended old position doesn't close roles of someone still here."""
+        person = self._person_with_position("Cy", date(2015, 1, 1), date(2017, 1, 1))
+        Position.objects.create(person=person, role=Role.MEMBER, title=Title.FULL_PROF,
+                                school="University of Washington", start_date=date(2018, 1, 1))
+        current = self._open_role(person)
+        future_end = self._open_role(self._person_with_position("Di", date(2015, 1, 1), TODAY + timedelta(days=30)))
+
+        self._run()
+        current.refresh_from_db()
+        future_end.refresh_from_db()
+        self.assertIsNone(current.end_date)
+        self.assertIsNone(future_end.end_date)
+
+    def test_collaborator_who_left_is_closed_too(self):
+        left_on = TODAY - timedelta(days=1)
+        role = self._open_role(self._person_with_position("Ed", date(2020, 1, 1), left_on, role=Role.COLLABORATOR))
+
+        self._run()
+        role.refresh_from_db()
+        self.assertEqual(role.end_date, left_on)
+
+    def test_dry_run_changes_nothing(self):
+        role = self._open_role(self._person_with_position("Fay", date(2015, 1, 1), TODAY - timedelta(days=30)))
+
+        self._run(dry_run=True)
+        role.refresh_from_db()
+        self.assertIsNone(role.end_date)
+
+    def test_query_count_does_not_grow_with_people(self):
+        def add_departed_people(count, prefix):
+            for i in range(count):
+                self._open_role(self._person_with_position(f"{prefix}{i}", date(2015, 1, 1),
+                                                           TODAY - timedelta(days=30)))
+
+        add_departed_people(2, "Small")
+        with CaptureQueriesContext(connection) as small:
+            self._run()
+
+        add_departed_people(6, "Large")
+        with CaptureQueriesContext(connection) as large:
+            self._run()
+
+        self.assertEqual(ProjectRole.objects.filter(end_date__isnull=True).count(), 0)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
@@ -0,0 +1,23 @@
+"""
+Tests for the benchmark_db_connections command: per-request mode really opens
+one connection per request, and persistent mode reuses one.
+"""
+
+import re
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+
+class BenchmarkDbConnectionsTests(TransactionTestCase):
+    # Closes and reopens the connection, which a TestCase's wrapping
+    # transaction would not survive.
+
+    def test_per_request_mode_opens_a_connection_per_request(self):
+        out = StringIO()
+        call_command('benchmark_db_connections', '--requests', '4', '--url', '/version.json', stdout=out)
+
+        opened = dict(re.findall(r"(per-request|persistent)\s+[\d.]+ ms/request, (\d+) connection", out.getvalue()))
+        self.assertEqual(opened['per-request'], '4')
+        self.assertLessEqual(int(opened['persistent']), 1)
@@ -0,0 +1,141 @@
+"""
+Tests for the cache-aside helpers in website/utils/cache.py: versioned keys,
+stale-while-revalidate, the recompute lock, hit/miss counters, and the
+cached / cached_view decorators.
+"""
+
+import time
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory
+from django.utils.cache import patch_vary_headers
+
+from website.models import ContentVersion
+from website.tests.base import DatabaseTestCase
+from website.utils import cache as cache_utils
+from website.utils.cache import cached, cached_view, get_cache_stats, get_or_set, make_key
+
+
+class CacheUtilsTests(DatabaseTestCase):
+
+    def setUp(self):
+        cache.clear()
+        cache_utils.reset_cache_stats()
+        self.calls = 0
+
+    def _compute(self):
+        self.calls += 1
+        return f"value {self.calls}"
+
+    def test_get_or_set_computes_once(self):
+        self.assertEqual(get_or_set('ns:a', self._compute), "value 1")
+        self.assertEqual(get_or_set('ns:a', self._compute), "value 1")
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(get_cache_stats()['namespaces']['ns'], {'hits': 1, 'stale_hits': 0, 'misses': 1, 'waits': 0})
+
+    def test_caches_none(self):
+        get_or_set('ns:none', lambda: None)
+        self.assertIsNone(get_or_set('ns:none', self._compute))
+        self.assertEqual(self.calls, 0)
+
+    def test_key_changes_when_scope_is_bumped(self):
+        key = make_key('listing', 'x', scopes=[ContentVersion.PROJECTS])
+        ContentVersion.bump(ContentVersion.PROJECTS)
+        self.assertNotEqual(make_key('listing', 'x', scopes=[ContentVersion.PROJECTS]), key)
+
+    def test_long_key_parts_are_hashed(self):
+        key = make_key('ns', 'x' * 500)
+        self.assertLess(len(key), 60)
+
+    def test_stale_value_is_served_while_another_request_refreshes(self):
+        get_or_set('ns:stale', self._compute, timeout=60)
+        with mock.patch.object(cache_utils.time, 'time', return_value=time.time() + 61):
+            # Another worker holds the refresh lock: this request gets the stale value
+            cache.add('ns:stale:lock', 1)
+            self.assertEqual(get_or_set('ns:stale', self._compute, timeout=60), "value 1")
+            cache.delete('ns:stale:lock')
+            # With the lock free, this request refreshes it
+            self.assertEqual(get_or_set('ns:stale', self._compute, timeout=60), "value 2")
+        self.assertEqual(get_cache_stats()['namespaces']['ns']['stale_hits'], 1)
+
+    def test_should_cache_can_veto(self):
+        get_or_set('ns:veto', self._compute, should_cache=lambda value: False)
+        get_or_set('ns:veto', self._compute, should_cache=lambda value: False)
+        self.assertEqual(self.calls, 2)
+
+    def test_cached_decorator_keys_on_arguments(self):
+        @cached('double')
+        def double(x):
+            self.calls += 1
+            return x * 2
+
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(3), 6)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(double.uncached(5), 10)
+
+    def test_cached_view_skips_logged_in_users_and_errors(self):
+        responses = iter([HttpResponse("first"), HttpResponse("second"), HttpResponse("third")])
+
+        @cached_view('test_view')
+        def view(request):
+            return next(responses)
+
+        factory = RequestFactory()
+        anonymous = factory.get('/page/')
+        anonymous.user = AnonymousUser()
+        self.assertEqual(view(anonymous).content, b"first")
+        self.assertEqual(view(anonymous).content, b"first")
+
+        staff = factory.get('/page/')
+        staff.user = User.objects.create_user('editor')
+        self.assertEqual(view(staff).content, b"second")
+
+        post = factory.post('/page/')
+        post.user = AnonymousUser()
+        self.assertEqual(view(post).content, b"third")
+
+    def _anonymous_get(self, path, **headers):
+        request = RequestFactory().get(path, **headers)
+        request.user = AnonymousUser()
+        return request
+
+    def test_cached_view_honors_vary(self):
+        @cached_view('test_vary')
+        def view(request):
+            self.calls += 1
+            response = HttpResponse(f"theme {request.COOKIES.get('theme')}")
+            patch_vary_headers(response, ['Cookie'])
+            return response
+
+        self.assertEqual(view(self._anonymous_get('/page/', HTTP_COOKIE='theme=dark')).content, b"theme dark")
+        self.assertEqual(view(self._anonymous_get('/page/', HTTP_COOKIE='theme=light')).content, b"theme light")
+        self.assertEqual(view(self._anonymous_get('/page/', HTTP_COOKIE='theme=dark')).content, b"theme dark")
+        self.assertEqual(self.calls, 2)
+
+    def test_cached_view_never_stores_a_csrf_token(self):
+        @cached_view('test_csrf')
+        def view(request):
+            self.calls += 1
+            return HttpResponse(get_token(request))
+
+        first = view(self._anonymous_get('/form/')).content
+        second = view(self._anonymous_get('/form/')).content
+        self.assertEqual(self.calls, 2)
+        self.assertNotEqual(first, second)
+
+    def test_cached_view_is_invalidated_by_its_scopes(self):
+        @cached_view('test_scoped', scopes=[ContentVersion.NEWS])
+        def view(request):
+            self.calls += 1
+            return HttpResponse(f"render {self.calls}")
+
+        self.assertEqual(view(self._anonymous_get('/news/')).content, b"render 1")
+        self.assertEqual(view(self._anonymous_get('/news/')).content, b"render 1")
+        ContentVersion.bump(ContentVersion.NEWS)
+        self.assertEqual(view(self._anonymous_get('/news/')).content, b"render 2")
@@ -0,0 +1,120 @@
+"""
+Tests for the optional content-addressed media store (website/utils/content_store.py)
+and its commands: identical files share one blob, renames only re-point names,
+and unreferenced blobs are swept. Everything runs against a throwaway MEDIA_ROOT.
+"""
+
+import os
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import override_settings
+
+from website.models import MediaReference
+from website.tests.base import DatabaseTestCase
+from website.utils.content_store import (ContentAddressedStorage, get_blob_dir, get_blob_path,
+                                         prune_dangling_references, sweep_unreferenced_blobs)
+from website.utils.fileutils import get_file_sha256
+
+
+class ContentStoreTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp(prefix="ml_media_test_")
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.storage = ContentAddressedStorage()
+
+    def _blob_count(self):
+        return sum(len(filenames) for _, _, filenames in os.walk(get_blob_dir(self.media_root)))
+
+
+class ContentAddressedStorageTests(ContentStoreTestCase):
+    def test_identical_uploads_share_one_blob(self):
+        first = self.storage.save("people/a.jpg", ContentFile(b"same bytes"))
+        second = self.storage.save("people/b.jpg", ContentFile(b"same bytes"))
+
+        self.assertEqual(self._blob_count(), 1)
+        self.assertTrue(os.path.samefile(self.storage.path(first), self.storage.path(second)))
+        self.assertEqual(MediaReference.objects.filter(name__in=[first, second]).values('sha256').distinct().count(), 1)
+        with self.storage.open(second) as f:
+            self.assertEqual(f.read(), b"same bytes")
+
+    def test_taken_name_gets_another(self):
+        first = self.storage.save("talks/deck.pdf", ContentFile(b"one"))
+        second = self.storage.save("talks/deck.pdf", ContentFile(b"two"))
+        self.assertNotEqual(first, second)
+        self.assertEqual(MediaReference.objects.count(), 2)
+
+    def test_rename_only_repoints_the_name(self):
+        name = self.storage.save("publications/Old.pdf", ContentFile(b"%PDF-1.4 paper"))
+        inode = os.stat(self.storage.path(name)).st_ino
+
+        self.storage.rename(name, "publications/New.pdf")
+
+        self.assertFalse(self.storage.exists(name))
+        self.assertEqual(os.stat(self.storage.path("publications/New.pdf")).st_ino, inode)
+        self.assertEqual(list(MediaReference.objects.values_list('name', flat=True)), ["publications/New.pdf"])
+
+    def test_sweep_frees_blob_only_when_last_reference_is_gone(self):
+        first = self.storage.save("people/a.jpg", ContentFile(b"shared"))
+        second = self.storage.save("people/b.jpg", ContentFile(b"shared"))
+
+        self.storage.delete(first)
+        self.assertEqual(sweep_unreferenced_blobs(self.media_root, min_age_seconds=0), (0, 0))
+
+        self.storage.delete(second)
+        self.assertEqual(sweep_unreferenced_blobs(self.media_root, min_age_seconds=0), (1, len(b"shared")))
+        self.assertEqual(self._blob_count(), 0)
+
+    def test_sweep_spares_recent_blobs(self):
+        name = self.storage.save("people/a.jpg", ContentFile(b"fresh"))
+        self.storage.delete(name)
+        self.assertEqual(sweep_unreferenced_blobs(self.media_root), (0, 0))
+
+    def test_names_removed_outside_the_storage_are_pruned(self):
+        name = self.storage.save("posters/p.pdf", ContentFile(b"poster"))
+        os.remove(self.storage.path(name))
+
+        self.assertEqual(prune_dangling_references(self.media_root), 1)
+        self.assertFalse(MediaReference.objects.exists())
+
+
+class MigrateMediaToContentStoreTests(ContentStoreTestCase):
+    def _write(self, relpath, content):
+        full = os.path.join(self.media_root, relpath)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "wb") as fh:
+            fh.write(content)
+        return full
+
+    def test_existing_duplicates_are_deduplicated_and_referenced(self):
+        a = self._write("person/a.jpg", b"figure")
+        b = self._write("person/b.jpg", b"figure")
+        c = self._write("publications/p.pdf", b"%PDF-1.4 paper")
+
+        call_command("migrate_media_to_content_store", workers=1)
+
+        sha256 = get_file_sha256(a)
+        self.assertTrue(os.path.samefile(a, b))
+        self.assertTrue(os.path.samefile(a, get_blob_path(self.media_root, sha256)))
+        self.assertTrue(os.path.samefile(c, get_blob_path(self.media_root, get_file_sha256(c))))
+        self.assertEqual(set(MediaReference.objects.values_list('name', flat=True)),
+                         {"person/a.jpg", "person/b.jpg", "publications/p.pdf"})
+
+    def test_top_level_logs_are_left_alone(self):
+        log = self._write("debug.log", b"log line")
+        call_command("migrate_media_to_content_store", workers=1)
+        self.assertEqual(os.stat(log).st_nlink, 1)
+        self.assertFalse(MediaReference.objects.exists())
+
+    def test_dry_run_changes_nothing(self):
+        a = self._write("person/a.jpg", b"figure")
+        b = self._write("person/b.jpg", b"figure")
+        call_command("migrate_media_to_content_store", dry_run=True, workers=1)
+        self.assertFalse(os.path.samefile(a, b))
+        self.assertFalse(MediaReference.objects.exists())
@@ -6,10 +6,16 @@ Covers the url_name normalization key and the readable-URL derivation
 ``recompute_url_names`` command for the #1275 dedup / #1206 namesake work.
 """
 
+from types import SimpleNamespace
+
 from django.test import SimpleTestCase
 
 from website.utils.name_utils import (
+    assign_unique_url_names,
+    build_person_search_name,
     build_unique_url_name,
+    fold_search_words,
+    get_url_name_candidates,
     normalize_person_name,
 )
 
@@ -41,6 +47,19 @@ class NormalizePersonNameTests(SimpleTestCase):
         self.assertEqual(normalize_person_name(None, 'Zhang'), 'zhang')
 
 
+class SearchNameTests(SimpleTestCase):
+    def test_words_fold_like_the_name_key(self):
+        self.assertEqual(fold_search_words("Renée  O'Brien"), ['renee', 'obrien'])
+        self.assertEqual(''.join(fold_search_words("Cláudio Silva")),
+                         normalize_person_name('Cláudio', 'Silva'))
+
+    def test_search_name_ends_with_name_key(self):
+        self.assertEqual(build_person_search_name('Cláudio', 'T.', 'Silva'),
+                         'claudio t silva claudiosilva')
+        self.assertEqual(build_person_search_name('Jon', None, 'Froehlich'),
+                         'jon froehlich jonfroehlich')
+
+
 class BuildUniqueUrlNameTests(SimpleTestCase):
     def test_returns_bare_key_when_free(self):
         never_taken = lambda u: False
@@ -85,3 +104,26 @@ class BuildUniqueUrlNameTests(SimpleTestCase):
             build_unique_url_name('Jon', 'Über', 'Froehlich', taken),
             'jonufroehlich',
         )
+
+
+class AssignUniqueUrlNamesTests(SimpleTestCase):
+    @staticmethod
+    def _person(pk, first_name, last_name, middle_name=''):
+        return SimpleNamespace(pk=pk, first_name=first_name, middle_name=middle_name, last_name=last_name)
+
+    def test_candidates_are_base_then_middle_initial(self):
+        self.assertEqual(get_url_name_candidates('Jasmine', 'Xin', 'Zhang'), ('jasminezhang', 'jasminexzhang'))
+        self.assertEqual(get_url_name_candidates('Jasmine', None, 'Zhang'), ('jasminezhang', None))
+
+    def test_earliest_pk_keeps_the_bare_name_whatever_the_input_order(self):
+        a = self._person(1, 'Jiahao', 'Li')
+        b = self._person(2, 'Jiahao', 'Li')
+        c = self._person(3, 'Jiahao', 'Li', middle_name='Ming')
+        url_names = assign_unique_url_names([c, b, a])
+        self.assertEqual([url_names[id(p)] for p in (a, b, c)], ['jiahaoli', 'jiahaoli2', 'jiahaomli'])
+
+    def test_respects_names_taken_outside_the_batch(self):
+        a = self._person(1, 'Jiahao', 'Li')
+        unsaved = self._person(None, 'Jiahao', 'Li')
+        url_names = assign_unique_url_names([unsaved, a], taken={'jiahaoli'})
+        self.assertEqual((url_names[id(a)], url_names[id(unsaved)]), ('jiahaoli2', 'jiahaoli3'))
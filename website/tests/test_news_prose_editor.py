@@ -10,6 +10,7 @@ Regression tests for the django-ckeditor -> django-prose-editor migration (#1269
 
 import shutil
 import tempfile
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -19,6 +20,7 @@ from django.urls import reverse
 
 from website.models import News
 from website.management.commands.normalize_news_image_styles import (
+    get_content_fingerprint,
     normalize_image_dimensions,
 )
 from website.tests.base import DatabaseTestCase
@@ -176,3 +178,23 @@ class NormalizeNewsImageStylesTests(DatabaseTestCase):
         self.assertNotIn("style=", news.content)
         self.assertNotIn("width=", news.content)
         self.assertIn('src="/media/uploads/2024/01/01/CHU.JPG"', news.content)
+
+    def test_command_records_fingerprint_and_skips_unchanged_rows(self):
+        news = self.make_news_item(content=LEGACY_HTML)
+        call_command("normalize_news_image_styles")
+        news.refresh_from_db()
+        self.assertEqual(news.content_fingerprint, get_content_fingerprint(news.content))
+
+        target = "website.management.commands.normalize_news_image_styles.normalize_image_dimensions"
+        with patch(target) as normalize:
+            call_command("normalize_news_image_styles")
+        normalize.assert_not_called()
+
+    def test_edited_row_is_checked_again(self):
+        news = self.make_news_item(content="<p>clean</p>")
+        call_command("normalize_news_image_styles")
+        News.objects.filter(pk=news.pk).update(content=LEGACY_HTML)
+
+        call_command("normalize_news_image_styles")
+        news.refresh_from_db()
+        self.assertNotIn("style=", news.content)
@@ -0,0 +1,90 @@
+"""
+Tests for the generic merge engine (website/utils/object_merge.py) behind the
+keyword merge action and merge_duplicate_people: relations found through _meta,
+set-based rewrites, one aggregate signal instead of per-row m2m signals, the
+preview diff, and all-or-nothing transactions.
+"""
+
+from django.db import connection
+from django.db.models.signals import m2m_changed
+from django.test.utils import CaptureQueriesContext
+
+from website.models import Keyword, Person, Publication
+from website.tests.base import DatabaseTestCase
+from website.utils.object_merge import (get_merge_relations, merge_objects, objects_merged,
+                                        preview_merge)
+
+
+class ObjectMergeTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.target = self.make_person("Jennifer", "Mankoff")
+        self.source = self.make_person("Jennifer", "Mankoff")
+
+    def _listen(self, signal, **kwargs):
+        calls = []
+
+        def receiver(**signal_kwargs):
+            calls.append(signal_kwargs)
+        signal.connect(receiver, weak=False, **kwargs)
+        self.addCleanup(signal.disconnect, receiver, **kwargs)
+        return calls
+
+    def test_relations_include_fks_and_link_tables(self):
+        labels = {change.label for change in get_merge_relations(Person)}
+        self.assertTrue({"Position.advisor", "News.author", "Publication.authors",
+                         "News.people"} <= labels, labels)
+        self.assertIn("Talk.keywords", {change.label for change in get_merge_relations(Keyword)})
+
+    def test_one_aggregate_signal_and_no_per_row_m2m_signals(self):
+        for title in ("One", "Two"):
+            self.make_publication(title=title).authors.set([self.source])
+        m2m_calls = self._listen(m2m_changed, sender=Publication.authors.through)
+        merged_calls = self._listen(objects_merged, sender=Person)
+
+        merge_objects(self.target, [self.source])
+
+        self.assertEqual(m2m_calls, [])
+        self.assertEqual(len(merged_calls), 1)
+        change = next(c for c in merged_calls[0]["changes"] if c.label == "Publication.authors")
+        self.assertEqual(change.num_repointed, 2)
+
+    def test_query_count_does_not_grow_with_references(self):
+        def queries_to_merge(num_pubs):
+            target = self.make_person("Jiahao", "Li")
+            source = self.make_person("Jiahao", "Li")
+            for i in range(num_pubs):
+                self.make_publication(title=f"Paper {num_pubs}-{i}").authors.set([source])
+            with CaptureQueriesContext(connection) as ctx:
+                merge_objects(target, [source])
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries_to_merge(1), queries_to_merge(5))
+
+    def test_preview_reports_the_diff_and_changes_nothing(self):
+        pub = self.make_publication()
+        pub.authors.set([self.source, self.target])
+        news = self.make_news_item(author=self.source)
+
+        result = preview_merge(self.target, [self.source])
+
+        self.assertIn("Publication.authors: 0 repointed, 1 duplicate(s) dropped", result.get_diff_lines())
+        self.assertIn("News.author: 1 repointed", result.get_diff_lines())
+        self.assertTrue(Person.objects.filter(pk=self.source.pk).exists())
+        news.refresh_from_db()
+        self.assertEqual(news.author, self.source)
+
+    def test_failure_rolls_the_whole_merge_back(self):
+        news = self.make_news_item(author=self.source)
+
+        def fail(**kwargs):
+            raise RuntimeError("boom")
+        objects_merged.connect(fail, sender=Person, weak=False)
+        self.addCleanup(objects_merged.disconnect, fail, sender=Person)
+
+        with self.assertRaises(RuntimeError):
+            merge_objects(self.target, [self.source])
+
+        self.assertTrue(Person.objects.filter(pk=self.source.pk).exists())
+        news.refresh_from_db()
+        self.assertEqual(news.author, self.source)
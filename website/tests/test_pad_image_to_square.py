@@ -15,6 +15,7 @@ Two styles, per the repo convention:
 import io
 import shutil
 import tempfile
+from unittest.mock import patch
 
 from PIL import Image
 from django.conf import settings
@@ -96,6 +97,26 @@ class PadImageToSquareTests(SimpleTestCase):
         self.assertEqual(img.getpixel((100, 175))[3], 0)   # bottom margin
         self.assertEqual(img.getpixel((100, 100))[3], 255)  # centered content
 
+    @patch("website.utils.fileutils.PAD_MAX_SIDE", 100)
+    def test_large_jpeg_is_downscaled_before_padding(self):
+        """An oversized source is decoded at a reduced scale (draft/reduce), so
+        the padded square is at most PAD_MAX_SIDE on a side."""
+        result = pad_image_to_square(
+            _upload("big.jpg", (800, 400), (0, 0, 0), "RGB", "JPEG"))
+        content, box = result
+        self.assertEqual(box, "0,0,100,100")
+        self.assertEqual(self._open(content).size, (100, 100))
+
+    @patch("website.utils.fileutils.PAD_MAX_SIDE", 100)
+    def test_large_png_is_downscaled_before_padding(self):
+        result = pad_image_to_square(
+            _upload("big.png", (300, 900), (255, 0, 0, 255), "RGBA", "PNG"))
+        content, box = result
+        self.assertEqual(box, "0,0,100,100")
+        img = self._open(content)
+        self.assertEqual(img.size, (100, 100))
+        self.assertEqual(img.getpixel((50, 50)), (255, 0, 0, 255))
+
 
 # --- AwardAdmin.save_model wiring ------------------------------------------
 
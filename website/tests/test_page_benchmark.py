@@ -0,0 +1,59 @@
+"""
+Tests for the page benchmark (website/utils/page_benchmark.py, run by the
+benchmark_pages command): growth and baseline comparisons over the JSON report,
+and the measurement of a real page.
+"""
+
+from django.test import SimpleTestCase
+
+from website.tests.base import DatabaseTestCase
+from website.utils.page_benchmark import (BenchmarkTarget, find_baseline_regressions, find_query_growth,
+                                          measure_targets)
+
+
+def _report(pages, scales=(1, 10)):
+    return {'scales': list(scales), 'pages': pages}
+
+
+def _result(queries, status=200):
+    return {'url': '/', 'status': status, 'queries': queries, 'ms': 1.0, 'peak_kb': 1}
+
+
+class QueryGrowthTests(SimpleTestCase):
+
+    def test_flags_pages_whose_queries_grow(self):
+        report = _report({
+            'people': {'1': _result(12), '10': _result(40)},
+            'publications': {'1': _result(9), '10': _result(9)},
+        })
+        self.assertEqual(find_query_growth(report), ['people'])
+
+    def test_tolerance_and_fewer_queries(self):
+        report = _report({
+            'index': {'1': _result(20), '10': _result(21)},
+            'news_listing': {'1': _result(8), '10': _result(7)},
+        })
+        self.assertEqual(find_query_growth(report), ['index'])
+        self.assertEqual(find_query_growth(report, tolerance=1), [])
+
+    def test_skips_pages_that_errored(self):
+        report = _report({'awards': {'1': _result(5), '10': _result(50, status=500)}})
+        self.assertEqual(find_query_growth(report), [])
+
+    def test_baseline_regressions_compare_same_scale(self):
+        baseline = _report({'people': {'1': _result(12)}, 'awards': {'1': _result(5)}})
+        report = _report({'people': {'1': _result(13), '10': _result(13)}, 'awards': {'1': _result(4)}})
+        self.assertEqual(find_baseline_regressions(report, baseline), [('people', '1', 12, 13)])
+
+
+class MeasureTargetsTests(DatabaseTestCase):
+
+    def test_measures_a_page(self):
+        self.make_news_item(title="Benchmarked News")
+        results = measure_targets([BenchmarkTarget('news_listing', '/news/'), BenchmarkTarget('awards', '/awards/')],
+                                  names=['news_listing'])
+        self.assertEqual(list(results), ['news_listing'])
+        result = results['news_listing']
+        self.assertEqual(result['status'], 200)
+        self.assertGreater(result['queries'], 0)
+        self.assertGreaterEqual(result['peak_kb'], 0)
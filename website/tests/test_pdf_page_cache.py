@@ -0,0 +1,97 @@
+"""
+Tests for the PDF page-count cache (website/utils/pdf_page_cache.py): an
+unchanged PDF is never parsed twice, whether through backfill_num_pages or
+Publication.save.
+"""
+
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from website.models import PdfPageCount
+from website.tests.base import DatabaseTestCase
+from website.tests.test_publication import _make_pdf_bytes
+from website.utils.pdf_page_cache import get_cached_pdf_page_count, get_pdf_page_counts
+
+
+class PdfPageCacheTests(DatabaseTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _pdf_field(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        field = MagicMock()
+        field.name = f"publications/{name}"
+        field.path = path
+        return field
+
+    def test_unchanged_pdf_is_parsed_once(self):
+        field = self._pdf_field("paper.pdf", _make_pdf_bytes(6))
+        self.assertEqual(get_pdf_page_counts([field]), ({field.name: 6}, 1))
+
+        with patch("website.utils.fileutils.read_pdf_page_count") as read:
+            self.assertEqual(get_pdf_page_counts([field]), ({field.name: 6}, 0))
+        read.assert_not_called()
+
+    def test_touched_but_identical_pdf_is_rehashed_not_reparsed(self):
+        field = self._pdf_field("paper.pdf", _make_pdf_bytes(3))
+        get_pdf_page_counts([field])
+        stat = os.stat(field.path)
+        os.utime(field.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        with patch("website.utils.fileutils.read_pdf_page_count") as read:
+            self.assertEqual(get_pdf_page_counts([field]), ({field.name: 3}, 0))
+        read.assert_not_called()
+        self.assertEqual(PdfPageCount.objects.get(path=field.name).mtime_ns, stat.st_mtime_ns + 10 ** 9)
+
+    def test_changed_pdf_is_reparsed(self):
+        field = self._pdf_field("paper.pdf", _make_pdf_bytes(3))
+        get_pdf_page_counts([field])
+        self._pdf_field("paper.pdf", _make_pdf_bytes(9))
+
+        self.assertEqual(get_pdf_page_counts([field]), ({field.name: 9}, 1))
+        self.assertEqual(PdfPageCount.objects.get(path=field.name).num_pages, 9)
+
+    def test_unreadable_pdf_is_remembered(self):
+        field = self._pdf_field("broken.pdf", b"%PDF-1.4 not actually a real pdf")
+        self.assertIsNone(get_cached_pdf_page_count(field))
+
+        with patch("website.utils.fileutils.read_pdf_page_count") as read:
+            self.assertIsNone(get_cached_pdf_page_count(field))
+        read.assert_not_called()
+
+    def test_missing_and_non_pdf_files_are_skipped(self):
+        missing = self._pdf_field("gone.pdf", b"")
+        os.unlink(missing.path)
+        notes = self._pdf_field("notes.txt", b"hello")
+
+        self.assertEqual(get_pdf_page_counts([missing, notes]), ({}, 0))
+        self.assertFalse(PdfPageCount.objects.exists())
+
+    def test_dry_run_writes_nothing(self):
+        field = self._pdf_field("paper.pdf", _make_pdf_bytes(2))
+        self.assertEqual(get_pdf_page_counts([field], update_cache=False), ({field.name: 2}, 1))
+        self.assertFalse(PdfPageCount.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class PublicationSaveUsesPageCacheTests(DatabaseTestCase):
+    def test_resave_without_new_pdf_does_not_reopen_it(self):
+        upload = SimpleUploadedFile("cached.pdf", _make_pdf_bytes(4), content_type="application/pdf")
+        pub = self.make_publication(title="Cached Pages", pdf_file=upload)
+        pub.refresh_from_db()
+        self.assertEqual(pub.num_pages, 4)
+
+        # Cleared by hand, so save() has to look the count up again
+        pub.num_pages = None
+        with patch("website.utils.fileutils.read_pdf_page_count") as read:
+            pub.save()
+        read.assert_not_called()
+        pub.refresh_from_db()
+        self.assertEqual(pub.num_pages, 4)
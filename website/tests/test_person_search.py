@@ -0,0 +1,60 @@
+"""
+Tests for Person.objects.search(): accent-folded matching on the trigram
+index, the exact > prefix > fuzzy ranking, and its callers (the admin person
+search and the /member/<name>/ closest-match fallback).
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+
+from website.admin.admin_site import ml_admin_site
+from website.models import Person
+from website.tests.base import DatabaseTestCase
+from website.views.member import get_closest_urlname_in_database
+
+
+class PersonSearchTests(DatabaseTestCase):
+
+    def setUp(self):
+        self.claudio = self.make_person(first_name="Cláudio", last_name="Silva")
+        self.jon = self.make_person(first_name="Jon", last_name="Froehlich")
+        self.jonathan = self.make_person(first_name="Jonathan", last_name="Jones")
+
+    def test_save_derives_search_columns(self):
+        self.assertEqual(self.claudio.name_key, "claudiosilva")
+        self.assertEqual(self.claudio.search_name, "claudio silva claudiosilva")
+
+    def test_accent_folded_match(self):
+        self.assertEqual(list(Person.objects.search("claudio")), [self.claudio])
+        self.assertEqual(list(Person.objects.search("CLÁUDIO sil")), [self.claudio])
+
+    def test_prefix_on_any_name_word(self):
+        self.assertEqual(list(Person.objects.search("froe")), [self.jon])
+        self.assertEqual(list(Person.objects.search("jon froe")), [self.jon])
+
+    def test_exact_ranks_before_prefix(self):
+        # "jon" prefixes Jon, Jonathan and Jones; the exact-name hit comes first
+        exact = self.make_person(first_name="Jon", last_name="")
+        results = list(Person.objects.search("jon"))
+        self.assertEqual(results[0], exact)
+        self.assertCountEqual(results, [exact, self.jon, self.jonathan])
+
+    def test_fuzzy_match_on_misspelling(self):
+        self.assertIn(self.jon, Person.objects.search("jon froehlic"))
+
+    def test_empty_query_matches_nobody(self):
+        self.assertEqual(list(Person.objects.search("  '- ")), [])
+
+    def test_closest_urlname_uses_search(self):
+        self.assertEqual(get_closest_urlname_in_database("jonfroehlic"), "jonfroehlich")
+        self.assertIsNone(get_closest_urlname_in_database("zzzzzz"))
+
+    def test_admin_search_uses_index_search(self):
+        request = RequestFactory().get('/')
+        request.user = get_user_model().objects.create_superuser(
+            username="searcher", email="s@example.com", password="x")
+        person_admin = ml_admin_site._registry[Person]
+        queryset, may_have_duplicates = person_admin.get_search_results(
+            request, Person.objects.all(), "claudio")
+        self.assertEqual(list(queryset), [self.claudio])
+        self.assertFalse(may_have_duplicates)
@@ -261,3 +261,72 @@ class ProjectGetPisCoPisTests(DatabaseTestCase):
         self._add_role(pi, project, LeadProjectRoleTypes.PI)
 
         self.assertEqual(list(project.get_pis()), [pi])
+
+
+# --- Batch leadership resolution -------------------------------------------
+
+
+class ProjectLeadershipBatchTests(DatabaseTestCase):
+    """
+    Project.get_leadership_for_projects resolves the leadership buckets for
+    many projects with a single ProjectRole query; get_project_leadership is
+    the one-project wrapper the project page uses.
+    """
+
+    def _add_role(self, person, project, lead_role, start, end=None):
+        from website.models import ProjectRole
+        return ProjectRole.objects.create(
+            person=person, project=project, lead_project_role=lead_role,
+            start_date=start, end_date=end,
+        )
+
+    def setUp(self):
+        from website.models.project_role import LeadProjectRoleTypes
+        self.types = LeadProjectRoleTypes
+        today = date.today()
+        self.today = today
+
+        self.pi = self.make_person(first_name="Jon", last_name="Froehlich")
+        self.alum = self.make_person(first_name="Past", last_name="Lead")
+        self.promoted = self.make_person(first_name="Now", last_name="CoPI")
+
+        self.project_a = self.make_project(name="Project A")
+        self._add_role(self.pi, self.project_a, self.types.PI, today - timedelta(days=900))
+        self._add_role(self.alum, self.project_a, self.types.STUDENT_LEAD,
+                       today - timedelta(days=900), today - timedelta(days=400))
+        # A past student lead who is now an active Co-PI only shows as active
+        self._add_role(self.promoted, self.project_a, self.types.STUDENT_LEAD,
+                       today - timedelta(days=900), today - timedelta(days=400))
+        self._add_role(self.promoted, self.project_a, self.types.CO_PI,
+                       today - timedelta(days=300))
+
+        self.project_b = self.make_project(name="Project B")
+        self._add_role(self.pi, self.project_b, self.types.PI, today - timedelta(days=100))
+
+    def test_buckets_active_and_inactive_leads(self):
+        leadership = self.project_a.get_project_leadership()
+        self.assertEqual([r.person for r in leadership['active_PIs']], [self.pi])
+        self.assertEqual([r.person for r in leadership['active_CoPIs']], [self.promoted])
+        self.assertEqual([r.person for r in leadership['inactive_student_leads']], [self.alum])
+        self.assertEqual(leadership['active_student_leads'], [])
+        self.assertEqual(len(leadership['all_student_leads']), 2)
+
+    def test_ended_project_keeps_leads_within_buffer_active(self):
+        project = self.make_project(name="Ended Project",
+                                    end_date=self.today - timedelta(days=30))
+        self._add_role(self.alum, project, self.types.STUDENT_LEAD,
+                       self.today - timedelta(days=700), self.today - timedelta(days=50))
+        leadership = project.get_project_leadership()
+        self.assertEqual([r.person for r in leadership['active_student_leads']], [self.alum])
+
+    def test_batch_uses_one_query_for_many_projects(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        projects = [self.project_a, self.project_b]
+        with CaptureQueriesContext(connection) as ctx:
+            leadership = Project.get_leadership_for_projects(projects)
+            [r.person.get_full_name() for lead in leadership.values() for r in lead['active_PIs']]
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(set(leadership), {self.project_a.pk, self.project_b.pk})
+        self.assertEqual([r.person for r in leadership[self.project_b.pk]['active_PIs']], [self.pi])
@@ -0,0 +1,82 @@
+"""
+Tests for the /projects/ listing (views/project_listing.py): the page data is
+one Project query partitioned in Python, so the query count must not grow with
+the number of umbrellas, and it's cached per 'projects' ContentVersion, so an
+edit must show up on the next request.
+"""
+
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from website.models import ContentVersion, ProjectUmbrella
+from website.tests.base import DatabaseTestCase
+
+
+class ProjectListingTests(DatabaseTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def _seed(self, num_umbrellas):
+        start = ProjectUmbrella.objects.count()
+        for i in range(start, start + num_umbrellas):
+            umbrella = ProjectUmbrella.objects.create(name=f"Umbrella {i}", short_name=f"umbrella{i}")
+            project = self.make_project(name=f"Project {i}", is_visible=True,
+                                        start_date=date(2020, 1, 1))
+            project.project_umbrellas.add(umbrella)
+
+    def _count_uncached_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("website:projects"))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_umbrellas(self):
+        self._seed(2)
+        few = self._count_uncached_queries()
+        self._seed(6)
+        many = self._count_uncached_queries()
+        self.assertEqual(many, few,
+                         msg=f"{few} queries for 2 umbrellas vs {many} for 8")
+
+    def test_umbrella_map_is_sorted_by_project_count(self):
+        big = ProjectUmbrella.objects.create(name="Big", short_name="big")
+        small = ProjectUmbrella.objects.create(name="Small", short_name="small")
+        for name in ("Alpha", "Beta"):
+            self.make_project(name=name, is_visible=True,
+                              start_date=date(2020, 1, 1)).project_umbrellas.add(big)
+        self.make_project(name="Gamma", is_visible=True,
+                          start_date=date(2020, 1, 1)).project_umbrellas.add(small)
+
+        response = self.client.get(reverse("website:projects"))
+        umbrella_map = response.context["map_project_umbrella_to_projects"]
+        self.assertEqual(list(umbrella_map), ["big", "small"])
+        self.assertEqual(umbrella_map["big"], ["Alpha", "Beta"])
+
+    def test_second_request_is_served_from_cache(self):
+        self._seed(3)
+        self.client.get(reverse("website:projects"))
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("website:projects"))
+        project_queries = [q for q in ctx.captured_queries
+                           if 'FROM "website_project"' in q["sql"]]
+        self.assertEqual(project_queries, [])
+
+    def test_edit_invalidates_cached_listing(self):
+        project = self.make_project(name="Before Rename", is_visible=True,
+                                    start_date=date(2020, 1, 1))
+        self.assertContains(self.client.get(reverse("website:projects")), "Before Rename")
+
+        token = ContentVersion.get_token(ContentVersion.PROJECTS)
+        project.name = "After Rename"
+        project.save()
+        self.assertNotEqual(ContentVersion.get_token(ContentVersion.PROJECTS), token)
+
+        response = self.client.get(reverse("website:projects"))
+        self.assertContains(response, "After Rename")
+        self.assertNotContains(response, "Before Rename")
@@ -0,0 +1,135 @@
+"""
+Tests for the precomputed project similarity table
+(website/utils/project_similarity.py + ProjectSimilarity), which backs the
+project page's "Related projects" strip.
+"""
+
+from datetime import date
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+
+from website.models import Keyword, ProjectRole, ProjectSimilarity, ProjectUmbrella, Publication
+from website.tests.base import DatabaseTestCase
+from website.utils.project_similarity import (
+    get_related_projects,
+    rebuild_project_similarities,
+    update_project_similarities,
+    weighted_jaccard,
+)
+
+
+class WeightedJaccardTests(SimpleTestCase):
+
+    def test_identical_sets_score_one(self):
+        features = {'umbrellas': {1, 2}, 'people': {5}}
+        self.assertEqual(weighted_jaccard(features, features), 1.0)
+
+    def test_disjoint_sets_score_zero(self):
+        self.assertEqual(weighted_jaccard({'umbrellas': {1}}, {'umbrellas': {2}}), 0.0)
+
+    def test_kinds_empty_on_both_sides_are_ignored(self):
+        a = {'umbrellas': {1}, 'grants': set()}
+        b = {'umbrellas': {1}, 'grants': set()}
+        self.assertEqual(weighted_jaccard(a, b), 1.0)
+
+    def test_weights_favor_heavier_kinds(self):
+        weights = {'umbrellas': 3.0, 'keywords': 1.0}
+        a = {'umbrellas': {1}, 'keywords': {10}}
+        shares_umbrella = {'umbrellas': {1}, 'keywords': {11}}
+        shares_keyword = {'umbrellas': {2}, 'keywords': {10}}
+        self.assertGreater(weighted_jaccard(a, shares_umbrella, weights),
+                           weighted_jaccard(a, shares_keyword, weights))
+
+
+class ProjectSimilarityTableTests(DatabaseTestCase):
+
+    def setUp(self):
+        self.umbrella = ProjectUmbrella.objects.create(name="Accessibility", short_name="a11y")
+        self.other_umbrella = ProjectUmbrella.objects.create(name="Health", short_name="health")
+        self.project = self.make_project(name="Sidewalk", is_visible=True, with_thumbnail=True)
+        self.close = self.make_project(name="Sound Watch", is_visible=True, with_thumbnail=True)
+        self.far = self.make_project(name="Hand Sight", is_visible=True, with_thumbnail=True)
+        self.unrelated = self.make_project(name="Step Count", is_visible=True, with_thumbnail=True)
+
+        for project in (self.project, self.close, self.far):
+            project.project_umbrellas.add(self.umbrella)
+        self.unrelated.project_umbrellas.add(self.other_umbrella)
+
+        pub = self.make_publication(title="Shared Paper")
+        pub.projects.add(self.project, self.close)
+
+    def test_rebuild_ranks_by_shared_links(self):
+        rebuild_project_similarities()
+        self.assertEqual(get_related_projects(self.project), [self.close, self.far])
+        self.assertFalse(ProjectSimilarity.objects.filter(
+            project=self.project, related_project=self.unrelated).exists())
+
+    def test_rows_are_symmetric(self):
+        rebuild_project_similarities()
+        forward = ProjectSimilarity.objects.get(project=self.project, related_project=self.close)
+        backward = ProjectSimilarity.objects.get(project=self.close, related_project=self.project)
+        self.assertEqual(forward.score, backward.score)
+
+    def test_private_and_thumbnail_less_projects_are_skipped(self):
+        self.close.is_visible = False
+        self.close.save()
+        rebuild_project_similarities()
+        self.assertEqual(get_related_projects(self.project), [self.far])
+
+    def test_link_change_updates_table_on_commit(self):
+        rebuild_project_similarities()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unrelated.project_umbrellas.add(self.umbrella)
+        self.assertTrue(ProjectSimilarity.objects.filter(
+            project=self.project, related_project=self.unrelated).exists())
+
+    def test_role_change_updates_table_on_commit(self):
+        person = self.make_person(first_name="Ada", last_name="Lovelace")
+        rebuild_project_similarities()
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectRole.objects.create(person=person, project=self.far, start_date=date(2020, 1, 1))
+            ProjectRole.objects.create(person=person, project=self.unrelated, start_date=date(2020, 1, 1))
+        self.assertTrue(ProjectSimilarity.objects.filter(
+            project=self.far, related_project=self.unrelated).exists())
+
+    def _get_scores(self):
+        return dict(((row.project_id, row.related_project_id), row.score)
+                    for row in ProjectSimilarity.objects.all())
+
+    def test_links_changed_in_one_transaction_rescore_once(self):
+        keyword = Keyword.objects.create(keyword="Mapping")
+        with mock.patch('website.utils.project_similarity.update_project_similarities',
+                        wraps=update_project_similarities) as update:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.far.project_umbrellas.add(self.other_umbrella)
+                self.far.keywords.add(keyword)
+                ProjectRole.objects.create(person=self.make_person(), project=self.far,
+                                           start_date=date(2020, 1, 1))
+        update.assert_called_once()
+        self.assertIn(self.far.pk, update.call_args.args[0])
+
+    def test_incremental_update_matches_a_full_rebuild(self):
+        rebuild_project_similarities()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unrelated.project_umbrellas.add(self.umbrella)
+        incremental = self._get_scores()
+        rebuild_project_similarities()
+        self.assertEqual(incremental, self._get_scores())
+
+    def test_deleting_a_linked_publication_rescores_its_projects(self):
+        rebuild_project_similarities()
+        with self.captureOnCommitCallbacks(execute=True):
+            Publication.objects.get(title="Shared Paper").delete()
+        after_delete = self._get_scores()
+        rebuild_project_similarities()
+        self.assertEqual(after_delete, self._get_scores())
+
+    def test_related_projects_is_one_query(self):
+        rebuild_project_similarities()
+        with CaptureQueriesContext(connection) as ctx:
+            related = get_related_projects(self.project)
+            [p.name for p in related]
+        self.assertEqual(len(ctx.captured_queries), 1)
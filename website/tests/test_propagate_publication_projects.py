@@ -3,8 +3,11 @@ Tests for the propagate_publication_projects management command (#649):
 copy a publication's projects onto its childless talk/video/poster.
 """
 
+from io import StringIO
+
 from django.core.management import call_command
 
+from website.models import PublicationProjectsChange
 from website.tests.base import DatabaseTestCase
 
 
@@ -74,3 +77,61 @@ class PropagatePublicationProjectsTests(DatabaseTestCase):
         self._run()
         talk.refresh_from_db()
         self.assertEqual(set(talk.projects.all()), {project})
+
+
+class IncrementalPropagationTests(DatabaseTestCase):
+    """The default pass only looks at publications logged in PublicationProjectsChange."""
+
+    def _linked_pub(self, name):
+        project = self.make_project(name=f"{name} Project")
+        talk = self.make_talk(title=f"{name} talk", year=2024)
+        pub = self.make_publication(title=f"{name} paper", year=2024, talk=talk)
+        pub.projects.add(project)
+        return project, talk, pub
+
+    def test_signals_log_the_publication_and_a_pass_consumes_the_log(self):
+        _, _, pub = self._linked_pub("Logged")
+        self.assertTrue(PublicationProjectsChange.objects.filter(publication=pub).exists())
+
+        call_command('propagate_publication_projects')
+        self.assertFalse(PublicationProjectsChange.objects.exists())
+
+    def test_unlogged_publications_wait_for_full(self):
+        project, talk, _ = self._linked_pub("Unlogged")
+        PublicationProjectsChange.objects.all().delete()
+
+        call_command('propagate_publication_projects')
+        self.assertEqual(talk.projects.count(), 0)
+
+        call_command('propagate_publication_projects', full=True)
+        self.assertEqual(set(talk.projects.all()), {project})
+
+    def test_child_losing_its_project_inherits_again(self):
+        project, talk, _ = self._linked_pub("Relinked")
+        call_command('propagate_publication_projects')
+
+        project.talk_set.clear()
+        call_command('propagate_publication_projects')
+        self.assertEqual(set(talk.projects.all()), {project})
+
+    def test_deleting_a_childs_only_project_logs_the_publication(self):
+        project, talk, pub = self._linked_pub("Deleted")
+        talk.projects.add(project)
+        PublicationProjectsChange.objects.all().delete()
+
+        project.delete()
+        self.assertTrue(PublicationProjectsChange.objects.filter(publication=pub).exists())
+
+    def test_dry_run_keeps_the_log(self):
+        self._linked_pub("Dry")
+        call_command('propagate_publication_projects', dry_run=True)
+        self.assertTrue(PublicationProjectsChange.objects.exists())
+
+    def test_reports_rows_touched(self):
+        project, _, pub = self._linked_pub("Reported")
+        pub.projects.add(self.make_project(name="Second Project"))
+        out = StringIO()
+
+        call_command('propagate_publication_projects', stdout=out)
+        self.assertIn("Linked 1 child artifact(s) to their publication's projects (2 project link(s))",
+                      out.getvalue())
@@ -0,0 +1,125 @@
+"""
+Tests for the stored publication citation/BibTeX cache and the /publications.bib
+export built on top of it.
+
+Publication keeps citation_html_cache / bibtex_cache / bibtex_html_cache in sync
+on save(), on author-list changes (signals.py), and on author renames
+(Person.save). /publications.bib streams bibtex_cache with optional
+year/project/author filters.
+"""
+
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+
+from website.models import Publication
+from website.tests.base import DatabaseTestCase
+
+
+class PublicationCitationCacheTests(DatabaseTestCase):
+
+    def setUp(self):
+        self.author = self.make_person(first_name="Ada", last_name="Lovelace")
+        self.pub = self.make_publication(title="Analytical Engines", year=2020)
+        self.pub.authors.add(self.author)
+        self.pub.refresh_from_db()
+
+    def test_save_populates_cache(self):
+        self.assertEqual(self.pub.bibtex_cache,
+                         self.pub.get_citation_as_bibtex(newline="\n", use_hyperlinks=False))
+        self.assertEqual(self.pub.bibtex_html_cache, self.pub.get_citation_as_bibtex())
+        self.assertEqual(self.pub.citation_html_cache, self.pub.get_citation_as_html())
+
+    def test_adding_author_refreshes_cache(self):
+        self.assertIn("Lovelace, Ada", self.pub.bibtex_cache)
+        second = self.make_person(first_name="Charles", last_name="Babbage")
+        self.pub.authors.add(second)
+        self.pub.refresh_from_db()
+        self.assertIn("Lovelace, Ada and Babbage, Charles", self.pub.bibtex_cache)
+
+    def test_removing_author_refreshes_cache(self):
+        self.pub.authors.remove(self.author)
+        self.pub.refresh_from_db()
+        self.assertNotIn("Lovelace", self.pub.bibtex_cache)
+
+    def test_reverse_clear_refreshes_cache(self):
+        self.author.publication_set.clear()
+        self.pub.refresh_from_db()
+        self.assertNotIn("Lovelace", self.pub.bibtex_cache)
+
+    def test_author_rename_refreshes_cache(self):
+        self.author.last_name = "King"
+        self.author.save()
+        self.pub.refresh_from_db()
+        self.assertIn("King, Ada", self.pub.bibtex_cache)
+        self.assertIn("King, A.", self.pub.citation_html_cache)
+
+    def test_cached_reader_does_not_query_authors(self):
+        pub = Publication.objects.get(pk=self.pub.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            pub.get_cached_citation_as_html()
+            pub.get_cached_citation_as_bibtex()
+            pub.get_cached_citation_as_bibtex(newline="\n", use_hyperlinks=False)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_cached_reader_falls_back_when_cache_missing(self):
+        Publication.objects.filter(pk=self.pub.pk).update(
+            citation_html_cache=None, bibtex_cache=None, bibtex_html_cache=None)
+        pub = Publication.objects.get(pk=self.pub.pk)
+        self.assertIn("Lovelace, Ada",
+                      pub.get_cached_citation_as_bibtex(newline="\n", use_hyperlinks=False))
+
+    def test_refresh_citation_caches_fills_missing_rows(self):
+        Publication.objects.filter(pk=self.pub.pk).update(bibtex_cache=None)
+        num_updated = Publication.refresh_citation_caches(
+            Publication.objects.filter(bibtex_cache__isnull=True))
+        self.assertEqual(num_updated, 1)
+        self.pub.refresh_from_db()
+        self.assertIn("Lovelace, Ada", self.pub.bibtex_cache)
+
+
+class PublicationsBibtexViewTests(DatabaseTestCase):
+
+    def setUp(self):
+        self.ada = self.make_person(first_name="Ada", last_name="Lovelace")
+        self.grace = self.make_person(first_name="Grace", last_name="Hopper")
+        self.project = self.make_project(name="Engines", is_visible=True)
+
+        self.pub_2020 = self.make_publication(title="Analytical Engines", year=2020)
+        self.pub_2020.authors.add(self.ada)
+        self.pub_2020.projects.add(self.project)
+
+        self.pub_2022 = self.make_publication(title="Compilers For Everyone", year=2022)
+        self.pub_2022.authors.add(self.grace)
+
+    def _get_bib(self, **params):
+        response = self.client.get(reverse("website:publications_bibtex"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("bibtex", response["Content-Type"])
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_returns_all_entries(self):
+        bib = self._get_bib()
+        self.assertIn("title={Analytical Engines}", bib)
+        self.assertIn("title={Compilers For Everyone}", bib)
+        self.assertNotIn("<br/>", bib)
+
+    def test_year_filter(self):
+        bib = self._get_bib(year="2022")
+        self.assertIn("Compilers For Everyone", bib)
+        self.assertNotIn("Analytical Engines", bib)
+
+    def test_project_filter(self):
+        bib = self._get_bib(project=self.project.short_name)
+        self.assertIn("Analytical Engines", bib)
+        self.assertNotIn("Compilers For Everyone", bib)
+
+    def test_author_filter(self):
+        bib = self._get_bib(author=self.grace.url_name)
+        self.assertIn("Compilers For Everyone", bib)
+        self.assertNotIn("Analytical Engines", bib)
+
+    def test_uncached_rows_are_still_exported(self):
+        Publication.objects.filter(pk=self.pub_2020.pk).update(bibtex_cache=None)
+        bib = self._get_bib()
+        self.assertIn("Analytical Engines", bib)
@@ -0,0 +1,117 @@
+"""
+Tests for the lazily-loaded /publications/ page: the view renders only the
+newest INITIAL_YEARS_RENDERED years, defers older years to
+website:publications_fragment, and supports server-side filters
+(keyword / project / venue_type / author / year), served from the shared
+cache until the publications content version changes.
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from website.models import Keyword
+from website.models.publication import PubType
+from website.tests.base import DatabaseTestCase
+from website.views.publications import INITIAL_YEARS_RENDERED, _get_fragment_key
+
+
+class PublicationsLazyLoadTests(DatabaseTestCase):
+
+    def setUp(self):
+        # One paper per year, newest first: 2024, 2023, ..., 2019
+        self.years = list(range(2024, 2024 - INITIAL_YEARS_RENDERED - 3, -1))
+        self.pubs = {
+            year: self.make_publication(title=f"Paper From {year}", year=year)
+            for year in self.years
+        }
+
+    def test_renders_only_newest_years_up_front(self):
+        response = self.client.get(reverse("website:publications"))
+        self.assertEqual(response.status_code, 200)
+
+        for year in self.years[:INITIAL_YEARS_RENDERED]:
+            self.assertContains(response, f"Paper From {year}")
+        for year in self.years[INITIAL_YEARS_RENDERED:]:
+            self.assertNotContains(response, f"Paper From {year}")
+            # The deferred year still gets a heading (for the year nav) and a
+            # placeholder the lazy-load script fills in.
+            self.assertContains(response, f'data-pub-year="{year}"')
+            self.assertContains(response, f'id="year-{year}"')
+
+    def test_fragment_returns_one_year(self):
+        oldest_year = self.years[-1]
+        response = self.client.get(reverse("website:publications_fragment"),
+                                   {"year": oldest_year})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["count"], 1)
+        self.assertIn(f"Paper From {oldest_year}", data["html"])
+        self.assertNotIn(f"Paper From {self.years[0]}", data["html"])
+
+    def test_year_filter_renders_that_year_on_the_page(self):
+        oldest_year = self.years[-1]
+        response = self.client.get(reverse("website:publications"), {"year": oldest_year})
+        self.assertContains(response, f"Paper From {oldest_year}")
+        self.assertNotContains(response, f"Paper From {self.years[0]}")
+        self.assertNotContains(response, "data-pub-year=")
+
+    def test_keyword_filter(self):
+        keyword = Keyword.objects.create(keyword="Accessibility")
+        self.pubs[self.years[-1]].keywords.add(keyword)
+        response = self.client.get(reverse("website:publications"), {"keyword": "accessibility"})
+        self.assertContains(response, f"Paper From {self.years[-1]}")
+        self.assertNotContains(response, f"Paper From {self.years[0]}")
+
+    def test_author_filter(self):
+        author = self.make_person(first_name="Ada", last_name="Lovelace")
+        self.pubs[self.years[1]].authors.add(author)
+        response = self.client.get(reverse("website:publications_fragment"),
+                                   {"author": author.url_name})
+        data = response.json()
+        self.assertEqual(data["count"], 1)
+        self.assertIn(f"Paper From {self.years[1]}", data["html"])
+
+    def test_venue_type_filter(self):
+        journal = self.make_publication(title="A Journal Article", year=2015,
+                                        pub_venue_type=PubType.JOURNAL)
+        response = self.client.get(reverse("website:publications_fragment"),
+                                   {"venue_type": "journal"})
+        data = response.json()
+        self.assertEqual(data["count"], 1)
+        self.assertIn(journal.title, data["html"])
+
+
+class PublicationsFragmentCacheTests(DatabaseTestCase):
+    """The fragment endpoint serves its rows from the shared cache until a
+    change bumps the publications content version."""
+
+    def setUp(self):
+        cache.clear()
+        self.pub = self.make_publication(title="Cached Paper", year=2018)
+
+    def _get_fragment(self, **params):
+        return self.client.get(reverse("website:publications_fragment"), params).json()
+
+    def test_repeat_request_is_served_from_the_cache(self):
+        self._get_fragment(year=2018)
+        with CaptureQueriesContext(connection) as ctx:
+            data = self._get_fragment(year=2018)
+        self.assertIn("Cached Paper", data["html"])
+        self.assertFalse(any("website_publication" in q["sql"] for q in ctx.captured_queries))
+
+    def test_filters_are_keyed_case_insensitively(self):
+        self.assertEqual(_get_fragment_key(RequestFactory().get("/", {"year": "2018", "keyword": "AR"})),
+                         _get_fragment_key(RequestFactory().get("/", {"keyword": "ar", "year": "2018"})))
+
+    def test_publication_and_author_changes_invalidate(self):
+        self._get_fragment(year=2018)
+        self.pub.title = "Renamed Paper"
+        self.pub.save()
+        self.assertIn("Renamed Paper", self._get_fragment(year=2018)["html"])
+
+        author = self.make_person(first_name="Grace", last_name="Hopper")
+        self.pub.authors.add(author)
+        self.assertIn("Hopper", self._get_fragment(year=2018)["html"])
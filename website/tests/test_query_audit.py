@@ -0,0 +1,51 @@
+"""
+Tests for the hot-query plan audit (website/utils/query_audit.py and the
+audit_query_plans command): the plan walker finds nested sequential scans, and
+with sequential scans disabled every registered hot query is index-backed.
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from website.tests.base import DatabaseTestCase
+from website.utils.query_audit import HOT_QUERIES, audit_hot_queries, find_seq_scans
+
+
+class FindSeqScansTests(SimpleTestCase):
+
+    def test_walks_nested_plans(self):
+        plan = {
+            'Node Type': 'Nested Loop',
+            'Plans': [
+                {'Node Type': 'Index Scan', 'Relation Name': 'website_person', 'Actual Rows': 1},
+                {'Node Type': 'Hash', 'Plans': [
+                    {'Node Type': 'Seq Scan', 'Relation Name': 'website_banner', 'Actual Rows': 7},
+                ]},
+            ],
+        }
+        self.assertEqual(find_seq_scans(plan), [('website_banner', 7)])
+
+    def test_index_only_plan_has_none(self):
+        self.assertEqual(find_seq_scans({'Node Type': 'Index Only Scan', 'Relation Name': 'website_person'}), [])
+
+
+class AuditHotQueriesTests(DatabaseTestCase):
+
+    def setUp(self):
+        person = self.make_person(first_name="Ada", last_name="Lovelace")
+        project = self.make_project(name="Sidewalk", is_visible=True)
+        publication = self.make_publication(title="Audited Paper", authors=[person])
+        publication.projects.add(project)
+
+    def test_every_hot_query_is_index_backed(self):
+        results = audit_hot_queries()
+        self.assertEqual({result['name'] for result in results}, {hot_query.name for hot_query in HOT_QUERIES})
+        self.assertEqual({result['name']: result['seq_scans'] for result in results if result['seq_scans']}, {})
+
+    def test_command_reports_each_query(self):
+        out = StringIO()
+        call_command('audit_query_plans', '--query', 'member_by_url_name', '--fail-on-seqscan', stdout=out)
+        self.assertIn('member_by_url_name', out.getvalue())
+        self.assertNotIn('dissertations', out.getvalue())
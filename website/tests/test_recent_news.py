@@ -0,0 +1,46 @@
+"""
+Tests for the recent_news context processor: it must not touch the database
+unless a template reads ``recent_news``, and the list is cached per 'news'
+ContentVersion, so a news edit shows up on the next render.
+"""
+
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from website.context_processors import RECENT_NEWS_COUNT, recent_news
+from website.tests.base import DatabaseTestCase
+
+
+class RecentNewsContextProcessorTests(DatabaseTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/')
+        for day in range(1, RECENT_NEWS_COUNT + 2):
+            self.make_news_item(title=f"News {day}", date=date(2024, 1, day))
+
+    def test_unread_processor_runs_no_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            recent_news(self.request)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_returns_newest_items(self):
+        titles = [item.title for item in recent_news(self.request)['recent_news']]
+        self.assertEqual(titles, [f"News {day}" for day in range(RECENT_NEWS_COUNT + 1, 1, -1)])
+
+    def test_second_read_skips_news_query(self):
+        list(recent_news(self.request)['recent_news'])
+        with CaptureQueriesContext(connection) as ctx:
+            list(recent_news(self.request)['recent_news'])
+        news_queries = [q for q in ctx.captured_queries if 'FROM "website_news"' in q['sql']]
+        self.assertEqual(news_queries, [])
+
+    def test_news_edit_invalidates_cached_list(self):
+        list(recent_news(self.request)['recent_news'])
+        self.make_news_item(title="Breaking", date=date(2025, 1, 1))
+        titles = [item.title for item in recent_news(self.request)['recent_news']]
+        self.assertEqual(titles[0], "Breaking")
@@ -7,6 +7,8 @@ Regression tests for url_name de-collision (#1206 / #1275):
 """
 
 from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from website.models import Person
@@ -55,6 +57,27 @@ class RecomputeUrlNamesCommandTests(DatabaseTestCase):
         second = list(Person.objects.order_by('pk').values_list('url_name', flat=True))
         self.assertEqual(first, second)
 
+    def test_query_count_does_not_grow_with_collisions(self):
+        def queries_for_cluster(first_name, size):
+            people = [self.make_person(first_name, "Li") for _ in range(size)]
+            _force_shared_url_name(*people, url_name=people[0].url_name)
+            Person.objects.update(search_name='')
+            with CaptureQueriesContext(connection) as ctx:
+                call_command('recompute_url_names')
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries_for_cluster("Jiahao", 2), queries_for_cluster("Wei", 6))
+
+    def test_refreshes_stale_search_columns(self):
+        a = self.make_person("Cláudio", "Silva")
+        Person.objects.filter(pk=a.pk).update(name_key='', search_name='')
+
+        call_command('recompute_url_names')
+
+        a.refresh_from_db()
+        self.assertEqual(a.name_key, "claudiosilva")
+        self.assertTrue(a.search_name.endswith("claudiosilva"))
+
     def test_dry_run_changes_nothing(self):
         a = self.make_person("Jiahao", "Li")
         b = self.make_person("Jiahao", "Li")
@@ -79,6 +102,22 @@ class PersonSaveUrlNameTests(DatabaseTestCase):
         b = self.make_person("Jiahao", "Li")
         self.assertEqual(b.url_name, "jiahaoli2")
 
+    def test_resave_keeps_its_own_url_name(self):
+        a = self.make_person("Jiahao", "Li")
+        self.make_person("Jiahao", "Li")
+        a.save()
+        self.assertEqual(a.url_name, "jiahaoli")
+
+    def test_url_name_is_resolved_with_one_lookup(self):
+        for _ in range(3):
+            self.make_person("Jiahao", "Li")
+        with CaptureQueriesContext(connection) as ctx:
+            person = self.make_person("Jiahao", "Li")
+        url_name_lookups = [q for q in ctx.captured_queries
+                            if '"url_name"' in q['sql'] and q['sql'].lstrip().upper().startswith('SELECT')]
+        self.assertEqual(len(url_name_lookups), 1)
+        self.assertEqual(person.url_name, "jiahaoli4")
+
 
 class MemberViewCollisionTests(DatabaseTestCase):
     def test_namesakes_each_resolve_200_after_recompute(self):
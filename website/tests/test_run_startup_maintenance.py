@@ -0,0 +1,139 @@
+"""
+Tests for run_startup_maintenance (website/utils/startup_maintenance.py), which
+replaced the per-command lines in docker-entrypoint.sh: a step is skipped while
+its fingerprint is unchanged since its last success, steps run after the steps
+they depend on, a failure doesn't stop the rest, and every outcome is recorded
+in StartupStepRun.
+"""
+
+from datetime import date
+from unittest import mock
+
+from django.core.management import call_command
+
+from website.models import StartupStepRun
+from website.tests.base import DatabaseTestCase
+from website.utils.startup_maintenance import STARTUP_STEPS, StartupStep, run_startup_steps
+
+
+class RecordingStep(StartupStep):
+    """A step that appends its name to ``log`` instead of calling a command."""
+
+    def __init__(self, name, log, fail=False, **kwargs):
+        super().__init__(name, **kwargs)
+        self.log = log
+        self.fail = fail
+
+    def run(self):
+        self.log.append(self.name)
+        if self.fail:
+            raise RuntimeError("boom")
+
+
+class RunStartupStepsTests(DatabaseTestCase):
+
+    def setUp(self):
+        self.log = []
+
+    def test_unchanged_step_is_skipped_on_second_run(self):
+        step = RecordingStep('news_step', self.log, models=('website.News',))
+        self.assertEqual(run_startup_steps([step], workers=1),
+                         {'news_step': StartupStepRun.STATUS_SUCCEEDED})
+        self.assertEqual(run_startup_steps([step], workers=1),
+                         {'news_step': StartupStepRun.STATUS_SKIPPED})
+        self.assertEqual(self.log, ['news_step'])
+
+    def test_new_row_reruns_step(self):
+        step = RecordingStep('people_step', self.log, models=('website.Person',))
+        run_startup_steps([step], workers=1)
+        self.make_person(first_name="Ada", last_name="Lovelace")
+        run_startup_steps([step], workers=1)
+        self.assertEqual(self.log, ['people_step', 'people_step'])
+
+    def test_edited_column_reruns_step(self):
+        person = self.make_person(first_name="Ada", last_name="Lovelace")
+        step = RecordingStep('names_step', self.log, models=('website.Person',),
+                             columns={'website.Person': ('last_name',)})
+        run_startup_steps([step], workers=1)
+        person.last_name = "Byron"
+        person.save()
+        run_startup_steps([step], workers=1)
+        self.assertEqual(self.log, ['names_step', 'names_step'])
+
+    def test_force_runs_unchanged_step(self):
+        step = RecordingStep('forced_step', self.log)
+        run_startup_steps([step], workers=1)
+        run_startup_steps([step], workers=1, force=True)
+        self.assertEqual(self.log, ['forced_step', 'forced_step'])
+
+    def test_steps_run_after_their_dependencies(self):
+        steps = [
+            RecordingStep('last', self.log, after=('middle',)),
+            RecordingStep('middle', self.log, after=('first',)),
+            RecordingStep('first', self.log),
+        ]
+        run_startup_steps(steps, workers=1)
+        self.assertEqual(self.log, ['first', 'middle', 'last'])
+
+    def test_failure_is_recorded_and_does_not_stop_later_steps(self):
+        steps = [
+            RecordingStep('broken', self.log, fail=True),
+            RecordingStep('after_broken', self.log, after=('broken',)),
+        ]
+        results = run_startup_steps(steps, workers=1)
+        self.assertEqual(results['broken'], StartupStepRun.STATUS_FAILED)
+        self.assertEqual(results['after_broken'], StartupStepRun.STATUS_SUCCEEDED)
+
+        run = StartupStepRun.objects.get(name='broken')
+        self.assertIn("boom", run.last_error)
+        self.assertEqual(run.success_fingerprint, '')
+
+        # A failed step has no recorded success, so it's retried next time
+        run_startup_steps(steps, workers=1)
+        self.assertEqual(self.log.count('broken'), 2)
+
+    def test_daily_step_fingerprint_includes_date(self):
+        step = StartupStep('auto_close_project_roles', daily=True)
+        self.assertIn(('date', date.today().isoformat()), step.get_fingerprint_parts())
+
+    def test_app_code_change_reruns_step(self):
+        step = RecordingStep('code_step', self.log)
+        run_startup_steps([step], workers=1)
+        with mock.patch('website.utils.startup_maintenance._get_app_source_hash', return_value='new'):
+            run_startup_steps([step], workers=1)
+        self.assertEqual(self.log, ['code_step', 'code_step'])
+
+    def test_dry_run_runs_and_records_nothing(self):
+        step = RecordingStep('dry_step', self.log)
+        self.assertEqual(run_startup_steps([step], workers=1, dry_run=True), {'dry_step': None})
+        self.assertEqual(self.log, [])
+        self.assertFalse(StartupStepRun.objects.exists())
+
+
+class StartupStepsRegistryTests(DatabaseTestCase):
+
+    def test_dependencies_name_known_steps(self):
+        names = {step.name for step in STARTUP_STEPS}
+        for step in STARTUP_STEPS:
+            self.assertTrue(set(step.after) <= names, msg=f"{step.name} after {step.after}")
+
+    def test_steps_reading_pdf_files_wait_for_the_renames(self):
+        steps = {step.name: step for step in STARTUP_STEPS}
+
+        def get_ancestors(name):
+            ancestors = set()
+            for parent in steps[name].after:
+                ancestors |= {parent} | get_ancestors(parent)
+            return ancestors
+
+        for name in ('backfill_num_pages', 'rebuild_citation_cache'):
+            self.assertIn('repair_diverged_artifact_filenames', get_ancestors(name), msg=name)
+
+    def test_every_step_fingerprints(self):
+        for step in STARTUP_STEPS:
+            self.assertEqual(len(step.get_fingerprint()), 64, msg=step.name)
+
+    def test_command_rejects_unknown_step(self):
+        from django.core.management.base import CommandError
+        with self.assertRaises(CommandError):
+            call_command('run_startup_maintenance', '--only', 'not_a_step', '--workers', '1')
@@ -0,0 +1,95 @@
+"""
+Tests for the site-wide full-text search: SearchEntry rows follow saves and
+renames through the on-commit index updates, title hits outrank body hits,
+highlights can't inject HTML, and /search/ and /api/v1/search/ serve results.
+"""
+
+from django.urls import reverse
+
+from website.models import SearchEntry
+from website.tests.base import DatabaseTestCase
+from website.utils.search_index import highlight_html, rebuild_search_index, search
+
+
+class SearchIndexTests(DatabaseTestCase):
+
+    def test_saving_a_publication_indexes_it(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            publication = self.make_publication(title="Mapping Sidewalk Accessibility")
+        entry = SearchEntry.objects.get(kind=SearchEntry.Kind.PUBLICATION, object_id=publication.pk)
+        self.assertEqual(entry.title, "Mapping Sidewalk Accessibility")
+        self.assertEqual([hit.object_id for hit in search("sidewalks")], [publication.pk])
+
+    def test_deleting_a_publication_removes_its_entry(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            publication = self.make_publication(title="Ephemeral Paper")
+        with self.captureOnCommitCallbacks(execute=True):
+            publication.delete()
+        self.assertFalse(SearchEntry.objects.filter(kind=SearchEntry.Kind.PUBLICATION).exists())
+
+    def test_title_hit_ranks_above_body_hit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            in_body = self.make_publication(title="A Study of Wheelchairs", forum_name="Haptics Symposium")
+            in_title = self.make_publication(title="Haptics for Everyone", forum_name="CHI")
+        self.assertEqual([hit.object_id for hit in search("haptics")], [in_title.pk, in_body.pk])
+
+    def test_author_rename_reindexes_their_publications(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            author = self.make_person(first_name="Ada", last_name="Lovelace")
+            publication = self.make_publication(title="Analytical Engines", authors=[author])
+        with self.captureOnCommitCallbacks(execute=True):
+            author.last_name = "Byron"
+            author.save()
+        self.assertEqual([hit.object_id for hit in search("byron")], [publication.pk])
+        self.assertFalse(search("lovelace").exists())
+
+    def test_private_projects_are_not_indexed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_project(name="Secret Prototype", is_visible=False)
+            visible = self.make_project(name="Public Prototype", is_visible=True)
+        self.assertEqual([hit.object_id for hit in search("prototype")], [visible.pk])
+
+    def test_rebuild_counts_each_kind(self):
+        self.make_publication(title="Rebuilt Paper")
+        self.make_news_item(title="Rebuilt News")
+        counts = rebuild_search_index()
+        self.assertEqual(counts[SearchEntry.Kind.PUBLICATION], 1)
+        self.assertEqual(counts[SearchEntry.Kind.NEWS], 1)
+        self.assertEqual(search("rebuilt").count(), 2)
+
+    def test_highlight_escapes_stored_text(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_publication(title="<script>alert(1)</script> Sensing")
+        hit = search("sensing").get()
+        html = highlight_html(hit.title_headline)
+        self.assertNotIn("<script>", html)
+        self.assertIn("&lt;script&gt;", html)
+        self.assertIn("<mark>Sensing</mark>", html)
+
+
+class SearchViewTests(DatabaseTestCase):
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publication = self.make_publication(title="Tactile Maps for Blind Travelers")
+
+    def test_search_page_renders_results(self):
+        response = self.client.get(reverse('website:search'), {'q': "tactile"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "<mark>Tactile</mark>", html=False)
+
+    def test_empty_query_renders_form_only(self):
+        response = self.client.get(reverse('website:search'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['page'])
+
+    def test_api_search(self):
+        body = self.client.get("/api/v1/search/", {'q': "tactile maps"}).json()
+        self.assertEqual(body["count"], 1)
+        result = body["results"][0]
+        self.assertEqual((result["kind"], result["id"]), ("publication", self.publication.pk))
+        self.assertIn("<mark>", result["title_html"])
+
+    def test_api_kind_filter(self):
+        body = self.client.get("/api/v1/search/", {'q': "tactile", 'kind': "talk"}).json()
+        self.assertEqual(body["count"], 0)
@@ -0,0 +1,87 @@
+"""
+Tests for the synthetic lab data generator (website/utils/synthetic_lab.py) and
+its seed_synthetic_lab command: row counts follow the scale, author lists are
+ordered through the sortedm2m through table, seeding is additive, and the
+placeholder files are real images/PDFs.
+"""
+
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from PIL import Image
+
+from website.models import ContentVersion, Grant, News, Person, Publication
+from website.tests.base import DatabaseTestCase
+from website.utils.fileutils import get_pdf_page_count
+from website.utils.page_benchmark import get_benchmark_targets
+from website.utils.synthetic_lab import (PLACEHOLDER_IMAGE, PLACEHOLDER_PDF, PRODUCTION_SIZE,
+                                         seed_synthetic_lab, write_placeholder_media)
+
+_SCALE = 0.02
+
+
+class SeedSyntheticLabTests(DatabaseTestCase):
+
+    def test_seeds_a_fraction_of_production_size(self):
+        counts = seed_synthetic_lab(scale=_SCALE)
+        self.assertEqual(counts['people'], round(PRODUCTION_SIZE['people'] * _SCALE))
+        self.assertEqual(Person.objects.count(), counts['people'])
+        self.assertEqual(Grant.objects.count(), counts['grants'])
+        self.assertEqual(News.objects.exclude(slug=None).count(), counts['news'])
+
+    def test_cached_content_versions_are_bumped(self):
+        scopes = (ContentVersion.PROJECTS, ContentVersion.NEWS, ContentVersion.PUBLICATIONS)
+        before = [ContentVersion.get_token(scope) for scope in scopes]
+        seed_synthetic_lab(scale=_SCALE)
+        after = [ContentVersion.get_token(scope) for scope in scopes]
+        for scope, old_token, new_token in zip(scopes, before, after):
+            self.assertNotEqual(old_token, new_token, msg=scope)
+
+    def test_author_lists_are_ordered(self):
+        seed_synthetic_lab(scale=_SCALE)
+        Through = Publication.authors.through
+        for publication in Publication.objects.all():
+            sort_values = list(Through.objects.filter(publication=publication)
+                               .order_by('sort_value').values_list('sort_value', flat=True))
+            self.assertEqual(sort_values, list(range(1, len(sort_values) + 1)))
+            self.assertTrue(sort_values)
+
+    def test_seeding_is_additive_and_benchmark_targets_are_stable(self):
+        seed_synthetic_lab(scale=_SCALE)
+        first_targets = {target.name: target.url for target in get_benchmark_targets()}
+        seed_synthetic_lab(scale=_SCALE, seed=2)
+        self.assertEqual(Person.objects.count(), 2 * round(PRODUCTION_SIZE['people'] * _SCALE))
+        self.assertEqual({target.name: target.url for target in get_benchmark_targets()}, first_targets)
+
+
+class PlaceholderMediaTests(DatabaseTestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix="ml_synthetic_")
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def test_writes_real_files_once(self):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            self.assertEqual(len(write_placeholder_media()), 3)
+            self.assertEqual(write_placeholder_media(), [])
+            with default_storage.open(PLACEHOLDER_IMAGE) as f:
+                self.assertEqual(Image.open(f).format, 'JPEG')
+            publication = Publication(pdf_file=PLACEHOLDER_PDF)
+            self.assertEqual(get_pdf_page_count(publication.pdf_file), 1)
+
+    def test_command_seeds_and_reports(self):
+        out = StringIO()
+        with override_settings(MEDIA_ROOT=self.media_root):
+            call_command('seed_synthetic_lab', '--scale', str(_SCALE), '--force', stdout=out)
+        self.assertIn('Added', out.getvalue())
+        self.assertEqual(Person.objects.count(), round(PRODUCTION_SIZE['people'] * _SCALE))
+
+    def test_command_refuses_without_debug(self):
+        with override_settings(DEBUG=False), self.assertRaises(CommandError):
+            call_command('seed_synthetic_lab', '--scale', str(_SCALE), stdout=StringIO())
+        self.assertFalse(Person.objects.exists())
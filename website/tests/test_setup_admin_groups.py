@@ -257,7 +257,11 @@ class DockerEntrypointWiringTests(DatabaseTestCase):
         return (REPO_ROOT / "docker-entrypoint.sh").read_text()
 
     def test_entrypoint_invokes_setup_admin_groups(self):
-        self.assertIn("manage.py setup_admin_groups", self._entrypoint())
+        # The entrypoint runs the startup steps through run_startup_maintenance
+        from website.utils.startup_maintenance import STARTUP_STEPS
+
+        self.assertIn("manage.py run_startup_maintenance", self._entrypoint())
+        self.assertIn("setup_admin_groups", [step.command for step in STARTUP_STEPS])
 
     def test_entrypoint_does_not_abort_on_error(self):
         for line in self._entrypoint().splitlines():
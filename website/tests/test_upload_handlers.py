@@ -0,0 +1,79 @@
+"""
+Tests for StreamingUploadHandler (website/utils/upload_handlers.py): uploads are
+checked on their first chunk, dropped once they pass their field's size limit,
+and otherwise land in a temporary file inside MEDIA_ROOT.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from website.utils.upload_handlers import get_upload_max_size
+
+
+def _png_bytes():
+    buf = io.BytesIO()
+    Image.new("RGB", (4, 4), (0, 0, 0)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class StreamingUploadHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.temp_dir = os.path.join(self.media_root, ".upload-tmp")
+        media_settings = override_settings(
+            MEDIA_ROOT=self.media_root,
+            FILE_UPLOAD_TEMP_DIR=self.temp_dir,
+            FILE_UPLOAD_HANDLERS=["website.utils.upload_handlers.StreamingUploadHandler"],
+            UPLOAD_MAX_SIZE_MB=1,
+            UPLOAD_FIELD_MAX_SIZE_MB={"picture": 0.001},
+        )
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+    def _post(self, **files):
+        request = RequestFactory().post("/admin/", data=files)
+        for upload in request.FILES.values():
+            self.addCleanup(upload.close)  # before the rmtree of media_root
+        return request.FILES
+
+    def test_valid_upload_is_streamed_into_media_root(self):
+        files = self._post(pdf_file=SimpleUploadedFile("paper.pdf", b"%PDF-1.7\n" + b"0" * 5000))
+        upload = files["pdf_file"]
+        self.assertIsInstance(upload, TemporaryUploadedFile)
+        self.assertEqual(os.path.dirname(upload.temporary_file_path()), self.temp_dir)
+        self.assertEqual(upload.size, 5009)
+
+    def test_mismatched_magic_bytes_are_rejected_on_the_first_chunk(self):
+        files = self._post(image=SimpleUploadedFile("headshot.png", b"<html><script>alert(1)</script>"))
+        self.assertNotIn("image", files)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_web_content_in_a_raw_file_is_rejected(self):
+        files = self._post(raw_file=SimpleUploadedFile("talk.key", b"<!DOCTYPE html><p>hi</p>"))
+        self.assertNotIn("raw_file", files)
+
+    def test_oversize_upload_is_dropped_and_its_partial_file_removed(self):
+        files = self._post(pdf_file=SimpleUploadedFile("huge.pdf", b"%PDF-1.7\n" + b"0" * (2 * 1024 * 1024)))
+        self.assertNotIn("pdf_file", files)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_a_rejected_file_does_not_discard_an_accepted_one(self):
+        files = self._post(
+            pdf_file=SimpleUploadedFile("paper.pdf", b"%PDF-1.7\n"),
+            image=SimpleUploadedFile("headshot.png", b"not an image"),
+        )
+        self.assertNotIn("image", files)
+        self.assertTrue(os.path.exists(files["pdf_file"].temporary_file_path()))
+
+    def test_limits_are_per_field_and_ignore_inline_prefixes(self):
+        self.assertEqual(get_upload_max_size("photo_set-0-picture"), get_upload_max_size("picture"))
+        self.assertLess(get_upload_max_size("picture"), get_upload_max_size("raw_file"))
+        files = self._post(**{"photo_set-0-picture": SimpleUploadedFile("p.png", _png_bytes() + b"0" * 2000)})
+        self.assertNotIn("photo_set-0-picture", files)
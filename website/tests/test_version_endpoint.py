@@ -18,7 +18,7 @@ import os
 import tempfile
 from datetime import datetime, timedelta, timezone
 
-from django.test import SimpleTestCase, override_settings
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import resolve, reverse
 
 import importlib
@@ -182,3 +182,24 @@ class VersionResponseTests(SimpleTestCase):
             os.remove(path)
         self.assertEqual(data["git_sha"], "abc1234")
         self.assertEqual(data["built_at"], "2026-06-21T18:30:00-07:00")
+
+
+class VersionDbConnectionTests(TestCase):
+    """``db_connections`` reports how connections are reused, so a deploy check
+    can confirm persistent/pooled connections are really live."""
+
+    def test_reports_connection_stats(self):
+        data = json.loads(self.client.get("/version/").content)
+        stats = data["db_connections"]
+        self.assertTrue(stats["available"])
+        self.assertIn(stats["mode"], ("persistent", "per-request", "psycopg-pool", "pgbouncer"))
+        self.assertIsNotNone(stats["probe_ms"])
+        self.assertGreaterEqual(stats["server"]["total"], 1)
+        self.assertGreater(stats["server"]["max_connections"], 0)
+
+    def test_counts_finished_requests(self):
+        from website.utils.db_connections import get_connection_counters
+
+        before = get_connection_counters()["requests"]
+        self.client.get("/version/")
+        self.assertEqual(get_connection_counters()["requests"], before + 1)
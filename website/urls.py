@@ -47,8 +47,23 @@ urlpatterns = [
     # Matches the URL "publications/" and routes it to the `publications` view.
     re_path(r'^publications/$', views.publications, name='publications'),
 
+    # AJAX endpoint that fills in the older year sections /publications/ defers
+    # on first paint. Accepts ?year= plus ?keyword=, ?project=, ?venue_type=, and
+    # ?author= filters and returns {html, count}. See
+    # website/views/publications.py::publications_fragment.
+    path('publications/fragment/', views.publications_fragment, name='publications_fragment'),
+
+    # The lab bibliography as a BibTeX file, streamed from each publication's
+    # stored bibtex_cache. Optional ?year=, ?project=<short_name>, and
+    # ?author=<url_name> filters. See views/publications.py::publications_bibtex.
+    path('publications.bib', views.publications_bibtex, name='publications_bibtex'),
+
     re_path(r'^awards/$', views.awards, name='awards'),
 
+    # Full-text site search over publications, talks, projects, and news (?q=).
+    # See website/views/search.py and website/utils/search_index.py.
+    path('search/', views.search, name='search'),
+
     # Matches the URL "projects/" and routes it to the `project_listing` view.
     re_path(r'^projects/$', views.project_listing, name='projects'),
 
@@ -0,0 +1,206 @@
+"""
+Planned, batched renames of artifact files, for the ``restandardize_artifact_filenames``
+and ``repair_diverged_artifact_filenames`` management commands.
+
+Renaming through ``Artifact.save()`` one row at a time reruns the whole save
+pipeline per artifact (old-file cleanup, thumbnail checks, signals) and stats
+or lists the upload directory for every file. Instead, a command:
+
+1. reads all rows of a model (authors prefetched);
+2. asks a :class:`RenamePlanner` to plan each rename. The planner lists each
+   directory once and keeps the listing current in memory as renames are
+   planned, so name collisions get the same ``-<timestamp>`` suffix
+   ``ensure_filename_is_unique`` would give them without touching the disk;
+3. applies the resulting :class:`RenamePlan`: the filesystem renames, then one
+   ``bulk_update`` per model, inside a transaction. Every completed rename is
+   journaled, and if anything fails (a name taken since it was planned, the
+   database write) the journal is played back in reverse so disk and database
+   stay in agreement.
+
+``RenamePlan.to_dict()`` is the ``--plan-only`` JSON.
+
+Because no ``save()`` runs, the receivers in signals.py don't either; the plan
+queues what they would have refreshed (search entries, the projects content
+version) itself. The citation caches don't mention file names.
+"""
+
+import os
+from collections import defaultdict
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from website.models import ContentVersion, Publication, SearchEntry, Talk
+from website.utils import fileutils as ml_fileutils
+from website.utils.search_index import schedule_search_index_update
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = 500
+
+# The SearchEntry kind of each model whose entry links to its files
+_SEARCH_KINDS = {
+    Publication: SearchEntry.Kind.PUBLICATION,
+    Talk: SearchEntry.Kind.TALK,
+}
+
+
+class PlannedRename:
+    """Renames one artifact file field from old_name to new_name (storage names)."""
+
+    def __init__(self, artifact, field_name, old_name, new_name):
+        self.artifact = artifact
+        self.field_name = field_name
+        self.old_name = old_name
+        self.new_name = new_name
+
+    def to_dict(self):
+        return {
+            'model': type(self.artifact).__name__,
+            'id': self.artifact.pk,
+            'field': self.field_name,
+            'from': self.old_name,
+            'to': self.new_name,
+        }
+
+    def __repr__(self):
+        return f"<PlannedRename {type(self.artifact).__name__} {self.artifact.pk} {self.field_name}: " \
+               f"{self.old_name} -> {self.new_name}>"
+
+
+class RenamePlan:
+    """The complete set of renames for one command run, plus what was left alone."""
+
+    def __init__(self):
+        self.renames = []
+        self.num_skipped = 0
+        self.num_errors = 0
+        self.num_unrecoverable = 0
+
+    @property
+    def artifacts(self):
+        """The distinct artifacts the plan touches, in plan order."""
+        return list({(type(rename.artifact), rename.artifact.pk): rename.artifact
+                     for rename in self.renames}.values())
+
+    def to_dict(self):
+        return {
+            'renames': [rename.to_dict() for rename in self.renames],
+            'num_artifacts': len(self.artifacts),
+            'num_skipped': self.num_skipped,
+            'num_errors': self.num_errors,
+            'num_unrecoverable': self.num_unrecoverable,
+        }
+
+    def apply(self, storage=default_storage, regenerate_thumbnails=False):
+        """
+        Performs the renames and writes the new names back (see the module
+        docstring). With regenerate_thumbnails, an artifact whose pdf_file was
+        renamed and whose thumbnail is missing gets one rendered, as
+        Artifact.save() would; a failed render is logged, never fatal.
+        """
+        journal = []
+        try:
+            with transaction.atomic():
+                fields_by_model = defaultdict(set)
+                for rename in self.renames:
+                    if rename.old_name != rename.new_name:
+                        if storage.exists(rename.new_name):
+                            raise FileExistsError(f"{rename.new_name} appeared since the plan was made")
+                        ml_fileutils.rename_file_in_storage(storage, rename.old_name, rename.new_name)
+                        journal.append(rename)
+                        _logger.info(f"Renamed {rename.old_name} to {rename.new_name}")
+                    getattr(rename.artifact, rename.field_name).name = rename.new_name
+                    fields_by_model[type(rename.artifact)].add(rename.field_name)
+
+                if regenerate_thumbnails:
+                    for artifact in self.artifacts:
+                        if self._regenerate_missing_thumbnail(artifact):
+                            fields_by_model[type(artifact)].add('thumbnail')
+
+                for model, field_names in fields_by_model.items():
+                    artifacts = [artifact for artifact in self.artifacts if type(artifact) is model]
+                    model.objects.bulk_update(artifacts, sorted(field_names), batch_size=_BATCH_SIZE)
+                    kind = _SEARCH_KINDS.get(model)
+                    if kind is not None:
+                        schedule_search_index_update(kind, [artifact.pk for artifact in artifacts])
+                if Publication in fields_by_model:
+                    ContentVersion.bump(ContentVersion.PROJECTS)
+        except Exception:
+            _logger.exception(f"Rename plan failed after {len(journal)} rename(s); rolling them back")
+            for rename in reversed(journal):
+                try:
+                    ml_fileutils.rename_file_in_storage(storage, rename.new_name, rename.old_name)
+                except OSError:
+                    _logger.exception(f"Could not roll back {rename.new_name} to {rename.old_name}")
+                getattr(rename.artifact, rename.field_name).name = rename.old_name
+            raise
+
+    @staticmethod
+    def _regenerate_missing_thumbnail(artifact):
+        if not artifact.pdf_file:
+            return False
+        pdf_filename_no_ext = os.path.splitext(os.path.basename(artifact.pdf_file.name))[0]
+        thumbnail_name = artifact.get_upload_thumbnail_dir(pdf_filename_no_ext + ".jpg")
+        if artifact.thumbnail.storage.exists(thumbnail_name):
+            return False
+        try:
+            return ml_fileutils.generate_thumbnail_for_pdf(
+                artifact.pdf_file, artifact.thumbnail, os.path.dirname(thumbnail_name)) is not None
+        except Exception:
+            _logger.exception(f"Thumbnail generation failed for {type(artifact).__name__} id={artifact.pk}; "
+                              f"continuing without it")
+            return False
+
+
+class RenamePlanner:
+    """
+    Builds a RenamePlan against one directory listing per directory, kept
+    current in memory as renames are planned.
+    """
+
+    def __init__(self, storage=default_storage):
+        self.storage = storage
+        self.plan = RenamePlan()
+        self._listings = {}
+
+    def listing(self, rel_dir):
+        """The set of entry names in rel_dir (relative to the storage), listed once."""
+        if rel_dir not in self._listings:
+            try:
+                self._listings[rel_dir] = set(os.listdir(self.storage.path(rel_dir)))
+            except OSError:
+                self._listings[rel_dir] = set()
+        return self._listings[rel_dir]
+
+    def exists(self, name):
+        """Whether a file with this storage name is (or, per the plan, will be) on disk."""
+        return os.path.basename(name) in self.listing(os.path.dirname(name))
+
+    def add(self, artifact, field_name, old_name, new_name):
+        """Plans a rename between two storage names in the same directory, updating the listing."""
+        taken = self.listing(os.path.dirname(new_name))
+        taken.discard(os.path.basename(old_name))
+        taken.add(os.path.basename(new_name))
+        rename = PlannedRename(artifact, field_name, old_name, new_name)
+        self.plan.renames.append(rename)
+        return rename
+
+    def add_standardized(self, artifact, field_name, new_filename_no_ext):
+        """
+        Plans renaming an artifact's file to new_filename_no_ext (plus its
+        extension), as fileutils.rename_artifact_on_filesystem would, with a
+        uniqueness suffix if the name is taken. Returns the PlannedRename, or
+        None if the file isn't on disk to rename.
+        """
+        old_name = getattr(artifact, field_name).name
+        rel_dir = os.path.dirname(old_name)
+        if not self.exists(old_name):
+            _logger.error(f"The file {old_name} does not exist and cannot be renamed to {new_filename_no_ext}")
+            return None
+        new_basename = ml_fileutils.get_renamed_basename(old_name, new_filename_no_ext)
+        new_basename = ml_fileutils.get_unique_basename(new_basename, self.listing(rel_dir))
+        return self.add(artifact, field_name, old_name, os.path.join(rel_dir, new_basename))
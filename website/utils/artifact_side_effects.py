@@ -0,0 +1,91 @@
+"""
+Coalesces the file reconciliation ``authors_changed`` (website/signals.py)
+triggers, so it runs once per artifact instead of once per m2m signal.
+
+When an artifact gains authors, the standardized filename may change
+(``Artifact.generate_filename`` reads the first author), so the receiver calls
+``instance.save()``, which renames the pdf/raw/thumbnail files and regenerates
+a missing thumbnail. Every ``post_add`` re-runs that whole save: an admin form
+that adds authors across several m2m writes, or an import that adds them one at
+a time, renames the same files repeatedly.
+
+Inside ``with defer_artifact_side_effects():`` the receiver only records the
+artifact. When the outermost block exits, the recorded artifacts are
+reconciled once each (reloaded, then saved if their filenames still need
+updating) at ``transaction.on_commit`` -- after the surrounding transaction
+commits, or straight away when there is none. Nothing runs if the block raises,
+or if the transaction rolls back. Outside the block the receiver saves
+immediately, as it always has.
+"""
+
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from website.models import Artifact
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+
+def _get_state():
+    if not hasattr(_state, 'depth'):
+        _state.depth = 0
+        _state.pending = defaultdict(set)
+    return _state
+
+
+@contextmanager
+def defer_artifact_side_effects():
+    """
+    Defers the authors_changed file reconciliation of every artifact touched in
+    the block to one pass at transaction.on_commit (see the module docstring).
+    Blocks may nest; the outermost one schedules the pass.
+    """
+    state = _get_state()
+    state.depth += 1
+    try:
+        yield
+    except BaseException:
+        if state.depth == 1:
+            state.pending.clear()
+        raise
+    finally:
+        state.depth -= 1
+
+    if state.depth == 0 and state.pending:
+        pending = {model: set(pks) for model, pks in state.pending.items()}
+        state.pending.clear()
+        transaction.on_commit(lambda: reconcile_artifacts(pending))
+
+
+def is_deferring_artifact_side_effects():
+    """Whether the current thread is inside defer_artifact_side_effects()."""
+    return _get_state().depth > 0
+
+
+def defer_artifact_reconciliation(artifact):
+    """Records artifact for the reconciliation pass of the enclosing block."""
+    _get_state().pending[type(artifact)].add(artifact.pk)
+
+
+def reconcile_artifacts(pks_by_model):
+    """
+    Saves each artifact in ``{model: pks}`` whose filenames no longer match its
+    standardized name, so Artifact.save() renames its files (and regenerates a
+    missing thumbnail) once. Returns the number of artifacts saved.
+    """
+    num_saved = 0
+    for model, pks in pks_by_model.items():
+        for artifact in model.objects.filter(pk__in=pks).prefetch_related('authors'):
+            if Artifact.do_filenames_need_updating(artifact):
+                _logger.debug(f"Reconciling filenames of {model.__name__} id={artifact.pk}")
+                artifact.save()
+                num_saved += 1
+    return num_saved
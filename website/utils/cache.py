@@ -0,0 +1,264 @@
+"""
+Cache-aside helpers over the shared ``default`` cache (see CACHES in settings.py).
+
+Use these rather than ``django.core.cache.cache`` directly. They add three
+things every cached page or computation here needs:
+
+* **Versioned keys.** :func:`make_key` folds the current
+  :class:`~website.models.ContentVersion` token of each scope the value depends
+  on into the key, so an editor's save (which bumps the token, see
+  ``website/signals.py``) makes every dependent entry unreachable at once --
+  no per-key invalidation, no guessing which keys a save affects.
+* **Stampede protection.** Each entry is stored with a *fresh-until* time and
+  kept ``stale_timeout`` seconds longer. Past fresh-until, the first request to
+  take the entry's lock (``cache.add``) recomputes it while everyone else keeps
+  getting the stale value (stale-while-revalidate). On a cold miss, requests
+  that lose the lock wait briefly for the winner's result instead of all
+  running the same expensive query at once.
+* **Hit/miss counters**, per namespace and per process, reported by
+  ``/version.json`` -- enough to tell whether an opt-in is paying for itself.
+
+Opting in is one decorator. For a plain function, or a method on a
+registry-style singleton like a Data Health check (arguments with a ``pk`` are
+keyed by pk; other objects by their class)::
+
+    @cached('project_listing', scopes=[ContentVersion.PROJECTS], timeout=60 * 60 * 24)
+    def get_project_listing_data(today): ...
+
+For a public view, :func:`cached_view` keys the response on its URL and the
+request headers it ``Vary``-s on, bypasses the cache for logged-in users and
+non-GET requests, and never stores a response that is per-visitor (cookies,
+a CSRF token, ``Cache-Control: private``)::
+
+    @cached_view('news_listing', scopes=[ContentVersion.NEWS])
+    def news_listing(request): ...
+
+Serializers can wrap ``to_representation`` with :func:`cached` and a ``key``
+that returns the instance's pk.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.utils.cache import get_cache_key, has_vary_header, learn_cache_key
+
+from website.models import ContentVersion
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+# How long a computed value is served as fresh, and how much longer it may then
+# be served stale while one request recomputes it.
+DEFAULT_TIMEOUT = 60 * 5
+DEFAULT_STALE_TIMEOUT = 60
+
+# How long the recompute lock is held at most (in case the holder dies), and
+# how long a request that lost the lock on a cold miss waits for the winner.
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 5
+LOCK_POLL_INTERVAL = 0.05
+
+# DatabaseCache keys are a varchar(255) including KEY_PREFIX and the version;
+# longer raw keys are hashed.
+MAX_RAW_KEY_LENGTH = 200
+
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {'hits': 0, 'stale_hits': 0, 'misses': 0, 'waits': 0})
+
+
+def _count(namespace, counter):
+    with _stats_lock:
+        _stats[namespace][counter] += 1
+
+
+def get_cache_stats():
+    """
+    Returns this process's counters as {'backend': ..., 'namespaces': {namespace:
+    {'hits', 'stale_hits', 'misses', 'waits'}}}. A miss is any recompute: a cold
+    entry, or a stale one whose lock this request took.
+    """
+    with _stats_lock:
+        namespaces = {namespace: dict(counts) for namespace, counts in _stats.items()}
+    return {'backend': getattr(settings, 'CACHE_BACKEND', 'unknown'), 'namespaces': namespaces}
+
+
+def reset_cache_stats():
+    """Clears this process's counters."""
+    with _stats_lock:
+        _stats.clear()
+
+
+def make_key(namespace, *parts, scopes=()):
+    """
+    Returns ``namespace:<scope tokens>:<parts>``. ``scopes`` are ContentVersion
+    scopes whose current token is folded in (one small query each), so a bump
+    of any of them changes the key. Over-long or non-ASCII parts are hashed.
+    """
+    tokens = [ContentVersion.get_token(scope) for scope in scopes]
+    raw = ':'.join(str(part) for part in parts)
+    if len(raw) > MAX_RAW_KEY_LENGTH or not raw.isascii() or any(c.isspace() for c in raw):
+        raw = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return ':'.join([namespace] + tokens + ([raw] if raw else []))
+
+
+def get_or_set(key, compute, timeout=DEFAULT_TIMEOUT, stale_timeout=DEFAULT_STALE_TIMEOUT,
+               namespace=None, should_cache=None):
+    """
+    Returns the cached value for key, calling ``compute()`` to build it on a miss
+    (see the module docstring for the stale/lock behavior). ``should_cache(value)``
+    may veto storing a result (e.g. an error response). Values may be None.
+    """
+    namespace = namespace or key.split(':', 1)[0]
+    entry = cache.get(key)
+
+    if entry is not None:
+        fresh_until, value = entry
+        if fresh_until > time.time():
+            _count(namespace, 'hits')
+            return value
+        if not _acquire_lock(key):
+            # Someone else is already refreshing it
+            _count(namespace, 'stale_hits')
+            return value
+        return _compute_and_store(key, compute, timeout, stale_timeout, namespace, should_cache)
+
+    if _acquire_lock(key):
+        return _compute_and_store(key, compute, timeout, stale_timeout, namespace, should_cache)
+
+    # Cold miss while another request computes it: wait for its result rather
+    # than piling the same work onto the database.
+    _count(namespace, 'waits')
+    deadline = time.time() + LOCK_WAIT
+    while time.time() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            _count(namespace, 'hits')
+            return entry[1]
+    _logger.debug(f"Gave up waiting for cache key {key}; computing it here")
+    _count(namespace, 'misses')
+    return compute()
+
+
+def _acquire_lock(key):
+    return cache.add(f"{key}:lock", 1, LOCK_TIMEOUT)
+
+
+def _compute_and_store(key, compute, timeout, stale_timeout, namespace, should_cache):
+    _count(namespace, 'misses')
+    try:
+        value = compute()
+        if should_cache is None or should_cache(value):
+            _store(key, value, timeout, stale_timeout)
+        return value
+    finally:
+        cache.delete(f"{key}:lock")
+
+
+def _store(key, value, timeout, stale_timeout):
+    cache.set(key, (time.time() + timeout, value), timeout + stale_timeout)
+
+
+def _default_key_part(value):
+    """Keys model instances by pk, requests by path, and other objects by class name."""
+    if isinstance(value, HttpRequest):
+        return value.get_full_path()
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return repr(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'pk'):
+        return f"{type(value).__name__}-{value.pk}"
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(_default_key_part(v) for v in value) + ']'
+    return type(value).__qualname__
+
+
+def cached(namespace, timeout=DEFAULT_TIMEOUT, stale_timeout=DEFAULT_STALE_TIMEOUT, scopes=(),
+           key=None, should_cache=None):
+    """
+    Decorator: caches the function's return value via :func:`get_or_set`.
+    ``key(*args, **kwargs)`` returns the key parts (a value or a tuple); by
+    default they're derived from the arguments (see ``_default_key_part``).
+    The undecorated function stays available as ``.uncached``.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if key is not None:
+                parts = key(*args, **kwargs)
+                parts = parts if isinstance(parts, tuple) else (parts,)
+            else:
+                parts = tuple(_default_key_part(arg) for arg in args)
+                parts += tuple(f"{name}={_default_key_part(value)}" for name, value in sorted(kwargs.items()))
+            return get_or_set(make_key(namespace, *parts, scopes=scopes),
+                              lambda: func(*args, **kwargs),
+                              timeout=timeout, stale_timeout=stale_timeout,
+                              namespace=namespace, should_cache=should_cache)
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+def _is_cacheable_response(request, response):
+    """
+    Whether a rendered response is safe to replay to other anonymous visitors:
+    a plain 200 that sets no cookies, isn't marked private/no-store or
+    ``Vary: *``, and didn't put a CSRF token in the page (the CSRF middleware
+    only adds its ``Vary: Cookie`` after the view returns, so it's checked on
+    the request instead).
+    """
+    cache_control = response.get('Cache-Control', '')
+    return (response.status_code == 200 and not response.streaming and not response.cookies
+            and 'private' not in cache_control and 'no-store' not in cache_control
+            and not has_vary_header(response, '*')
+            and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE'))
+
+
+def cached_view(namespace, timeout=DEFAULT_TIMEOUT, stale_timeout=DEFAULT_STALE_TIMEOUT, scopes=()):
+    """
+    Decorator for public function views: caches the rendered response per URL
+    and per value of each request header the response ``Vary``-s on, learned
+    the way Django's cache middleware does (``learn_cache_key`` records the
+    header list per URL; ``get_cache_key`` reads it back). Logged-in users (who
+    see admin links) and non-GET/HEAD requests always get a fresh response, as
+    does anything ``_is_cacheable_response`` rejects.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+
+            def render_view():
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render') and not response.is_rendered:
+                    response.render()
+                return response
+
+            key_prefix = make_key(namespace, scopes=scopes)
+            page_key = get_cache_key(request, key_prefix, request.method, cache=cache)
+            if page_key is None:
+                # First request for this URL (or its header list expired): the
+                # response has to be rendered to learn what it varies on.
+                _count(namespace, 'misses')
+                response = render_view()
+                if _is_cacheable_response(request, response):
+                    page_key = learn_cache_key(request, response, timeout + stale_timeout, key_prefix,
+                                               cache=cache)
+                    _store(page_key, response, timeout, stale_timeout)
+                return response
+            return get_or_set(page_key, render_view, timeout=timeout, stale_timeout=stale_timeout,
+                              namespace=namespace,
+                              should_cache=lambda response: _is_cacheable_response(request, response))
+        wrapper.uncached = view
+        return wrapper
+    return decorator
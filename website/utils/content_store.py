@@ -0,0 +1,193 @@
+"""
+An optional content-addressed backend for media files, turned on with
+``ML_MEDIA_CONTENT_ADDRESSED=true`` (see ``MEDIA_CONTENT_ADDRESSED`` in
+settings.py).
+
+Every distinct file is stored once, as a blob named by its SHA-256::
+
+    MEDIA_ROOT/.content-store/ab/cd/abcd1234...
+
+and each name the models know it by (``publications/Froehlich_...pdf``) is a
+hardlink to that blob plus a :class:`~website.models.MediaReference` row. The
+media tree looks exactly as before -- Apache serves ``/media/`` from disk,
+``FieldFile.path`` works for pypdf and ImageMagick -- but:
+
+* identical uploads share one blob (every Person without a photo gets a copy
+  of one of a handful of Star Wars figures; with this store they cost nothing);
+* renaming an artifact (``fileutils.rename_artifact_in_db_and_filesystem``)
+  only re-points a link and a row, no data is copied;
+* deleting a name only drops a reference. Blobs no reference points at are
+  removed by :func:`sweep_unreferenced_blobs`, which ``delete_unused_files``
+  runs, so freeing space is a reference-count sweep rather than guesswork
+  about which files on disk are still used.
+
+Files written straight to disk rather than through the storage (PDF
+thumbnails rendered by ImageMagick, easy_thumbnails' cache) have no reference
+and are left alone by the sweep; ``migrate_media_to_content_store`` picks them
+up. On a filesystem without hardlinks a name falls back to a plain copy.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.files.storage import FileSystemStorage, default_storage
+
+from website.models.media_reference import MediaReference
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+# Under the storage location (MEDIA_ROOT); dotted so it stays out of the way of
+# the upload directories and their globs
+BLOB_DIR_NAME = '.content-store'
+
+# Prefix of in-progress uploads inside the blob directory
+_INCOMING_PREFIX = '.incoming-'
+
+
+def get_blob_dir(location):
+    """Returns the blob directory for a media root."""
+    return os.path.join(location, BLOB_DIR_NAME)
+
+
+def get_blob_path(location, sha256):
+    """Returns where the blob with this SHA-256 lives, two directory levels deep."""
+    return os.path.join(get_blob_dir(location), sha256[:2], sha256[2:4], sha256)
+
+
+def link_name_to_blob(blob_path, full_path):
+    """
+    Makes full_path a hardlink to blob_path, replacing whatever is there
+    (atomically, via a temporary link beside it). Falls back to a copy where
+    hardlinks aren't supported.
+    """
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    temp_path = f"{full_path}{_INCOMING_PREFIX}{os.getpid()}"
+    try:
+        os.link(blob_path, temp_path)
+    except OSError as e:
+        _logger.warning(f"Could not hardlink {full_path} to its blob ({e}); copying instead")
+        shutil.copyfile(blob_path, temp_path)
+    os.replace(temp_path, full_path)
+
+
+def is_content_addressed(storage=default_storage):
+    """Returns True if the storage (default: the site's) is a ContentAddressedStorage."""
+    return isinstance(storage, ContentAddressedStorage)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that keeps one blob per distinct content (see the module docstring)."""
+
+    def _save(self, name, content):
+        blob_dir = get_blob_dir(self.location)
+        os.makedirs(blob_dir, exist_ok=True)
+
+        # Stream the upload into the store, hashing as it goes
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=blob_dir, prefix=_INCOMING_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            blob_path = get_blob_path(self.location, sha256)
+            if os.path.exists(blob_path):
+                _logger.debug(f"{name} has the same content as existing blob {sha256}; deduplicated")
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, blob_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        # Claim the name. Like FileSystemStorage._save, pick another if someone
+        # else took it between get_available_name() and now.
+        while True:
+            full_path = self.path(name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            try:
+                os.link(blob_path, full_path)
+                break
+            except FileExistsError:
+                name = self.get_available_name(name)
+            except OSError as e:
+                _logger.warning(f"Could not hardlink {full_path} to its blob ({e}); copying instead")
+                link_name_to_blob(blob_path, full_path)
+                break
+
+        name = str(name).replace('\\', '/')
+        MediaReference.objects.update_or_create(name=name, defaults={'sha256': sha256, 'size': size})
+        return name
+
+    def delete(self, name):
+        """Removes the name; its blob stays until sweep_unreferenced_blobs finds nothing points at it."""
+        super().delete(name)
+        MediaReference.objects.filter(name=name).delete()
+
+    def rename(self, old_name, new_name):
+        """
+        Renames a file without touching its content: moves the hardlink and
+        re-points the reference. Returns the new name.
+        """
+        os.makedirs(os.path.dirname(self.path(new_name)), exist_ok=True)
+        os.rename(self.path(old_name), self.path(new_name))
+        MediaReference.objects.filter(name=old_name).update(name=new_name)
+        _logger.debug(f"Renamed {old_name} to {new_name} (metadata only)")
+        return new_name
+
+
+def prune_dangling_references(location, dry_run=False):
+    """
+    Deletes MediaReference rows whose name is gone from the media tree (removed
+    with os.remove rather than through the storage). Returns how many.
+    """
+    dangling = [pk for pk, name in MediaReference.objects.values_list('pk', 'name')
+                if not os.path.exists(os.path.join(location, name))]
+    if dangling and not dry_run:
+        MediaReference.objects.filter(pk__in=dangling).delete()
+    return len(dangling)
+
+
+def sweep_unreferenced_blobs(location, min_age_seconds=3600, dry_run=False):
+    """
+    Deletes every blob no MediaReference points at, and abandoned in-progress
+    uploads. Blobs (and uploads) younger than min_age_seconds are spared, since
+    an upload writes its blob a moment before its reference.
+
+    Returns (number of files deleted, bytes freed).
+    """
+    blob_dir = get_blob_dir(location)
+    referenced = set(MediaReference.objects.values_list('sha256', flat=True).distinct())
+    cutoff = time.time() - min_age_seconds
+
+    num_deleted = 0
+    bytes_deleted = 0
+    for dir_path, _, filenames in os.walk(blob_dir):
+        for filename in filenames:
+            if filename in referenced:
+                continue
+            path = os.path.join(dir_path, filename)
+            stat = os.stat(path)
+            if stat.st_mtime > cutoff:
+                continue
+            _logger.debug(f"{'[dry-run] Would delete' if dry_run else 'Deleting'} unreferenced blob {path}")
+            if not dry_run:
+                os.remove(path)
+            num_deleted += 1
+            bytes_deleted += stat.st_size
+    return num_deleted, bytes_deleted
@@ -0,0 +1,124 @@
+"""
+Database connection reuse stats for ``/version.json``.
+
+settings.py keeps one persistent connection per Gunicorn worker (or hands them
+out from a pool, see ``ML_DB_POOL``). Whether that's actually working is
+invisible from outside: a misconfigured ``CONN_MAX_AGE`` just quietly goes back
+to a handshake per request. This module reports what's live:
+
+* ``mode`` / ``conn_max_age`` / ``health_checks`` -- the effective settings.
+* ``opened_by_worker`` / ``requests_by_worker`` -- per-process counters since
+  this worker started (see the ``connection_created`` / ``request_finished``
+  receivers in ``website/signals.py``). With persistent connections the ratio
+  should be many requests per connection; ~1 means every request reconnects.
+* ``probe_ms`` / ``probe_reused`` -- how long it took this request to get a
+  usable connection and run ``SELECT 1``, and whether it already had one open.
+* ``server`` -- connection counts by state for our database, from
+  ``pg_stat_activity``, plus ``max_connections``.
+* ``pool`` -- psycopg pool counters (``requests_wait_ms`` etc.) in psycopg mode.
+
+Like ``backup_status``, this must never raise: a database hiccup should show up
+as ``available: false`` in the version payload, not as a 500 from it.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_counters = {'opened': 0, 'requests': 0}
+
+
+def record_connection_opened():
+    """Counts a new DB connection opened by this process."""
+    with _lock:
+        _counters['opened'] += 1
+
+
+def record_request_finished():
+    """Counts a finished request handled by this process."""
+    with _lock:
+        _counters['requests'] += 1
+
+
+def get_connection_counters():
+    """Returns a copy of this process's {'opened': n, 'requests': n} counters."""
+    with _lock:
+        return dict(_counters)
+
+
+def get_connection_mode():
+    """Returns 'psycopg-pool', 'pgbouncer', 'persistent', or 'per-request'."""
+    if settings.DB_POOL == 'psycopg':
+        return 'psycopg-pool'
+    if settings.DB_POOL == 'pgbouncer':
+        return 'pgbouncer'
+    return 'persistent' if settings.DATABASES['default'].get('CONN_MAX_AGE') else 'per-request'
+
+
+def _get_pool_stats(connection):
+    """Returns the psycopg pool's counters, or None when not pooling."""
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    return {key: stats.get(key) for key in
+            ('pool_size', 'pool_available', 'requests_waiting', 'requests_num',
+             'requests_wait_ms', 'requests_errors', 'connections_num')}
+
+
+def get_connection_stats(alias='default'):
+    """
+    Returns the connection stats dict described in the module docstring. Never
+    raises; on a database error ``available`` is False and ``error`` names the
+    exception class.
+    """
+    counters = get_connection_counters()
+    db_settings = settings.DATABASES[alias]
+    stats = {
+        'available': False,
+        'mode': get_connection_mode(),
+        'conn_max_age': db_settings.get('CONN_MAX_AGE', 0),
+        'health_checks': db_settings.get('CONN_HEALTH_CHECKS', False),
+        'opened_by_worker': counters['opened'],
+        'requests_by_worker': counters['requests'],
+        'probe_ms': None,
+        'probe_reused': None,
+        'server': None,
+        'pool': None,
+        'error': None,
+    }
+
+    connection = connections[alias]
+    try:
+        stats['probe_reused'] = connection.connection is not None
+        start_time = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            stats['probe_ms'] = round((time.perf_counter() - start_time) * 1000, 2)
+
+            cursor.execute(
+                "SELECT COALESCE(state, 'unknown'), count(*) FROM pg_stat_activity "
+                "WHERE datname = current_database() GROUP BY 1"
+            )
+            by_state = dict(cursor.fetchall())
+            cursor.execute("SHOW max_connections")
+            max_connections = int(cursor.fetchone()[0])
+
+        stats['server'] = {
+            'total': sum(by_state.values()),
+            'by_state': by_state,
+            'max_connections': max_connections,
+        }
+        stats['pool'] = _get_pool_stats(connection)
+        stats['available'] = True
+    except Exception as e:
+        # Deliberately broad: a stats failure must never break /version.json
+        logger.warning("Could not read database connection stats: %s", e)
+        stats['error'] = type(e).__name__
+    return stats
@@ -1,4 +1,6 @@
 from uuid import uuid4
+import hashlib
+import math
 import os
 from django.utils.deconstruct import deconstructible
 from django.conf import settings
@@ -57,13 +59,19 @@ def is_image(filename):
     return filename[filename.rfind(".") + 1:] in ext2conttype
 
 
+# Longest side pad_image_to_square outputs. Larger sources are decoded and
+# downsampled to fit, so a 50-megapixel phone photo never becomes a 7000x7000
+# canvas in a Gunicorn worker; badges render far smaller than this anyway.
+PAD_MAX_SIDE = 2048
+
 def pad_image_to_square(image_file):
     """Pad a non-square image to a centered square, returning a Django
     ``ContentFile`` of the padded image and the matching full-image crop box.
 
     Returns ``(ContentFile, "0,0,side,side")`` when padding was applied, or
     ``None`` when the image is already square or can't be read (so the caller
-    leaves the original upload untouched).
+    leaves the original upload untouched). A source whose longest side exceeds
+    ``PAD_MAX_SIDE`` is scaled down to fit before padding.
 
     Why this exists (#1410)
     -----------------------
@@ -113,11 +121,23 @@ def pad_image_to_square(image_file):
     name = getattr(image_file, "name", "") or "image"
     try:
         image_file.seek(0)
-        img = Image.open(image_file)
+        img = Image.open(image_file)  # reads the header only; pixels load lazily
+        if img.size[0] == img.size[1]:
+            # Already square (in any EXIF orientation) -> keep the original
+            # bytes untouched, without decoding a single pixel.
+            return None
         fmt = (img.format or "").upper()  # captured before transpose drops it
+        # Keep memory bounded whatever the source resolution: a JPEG is decoded
+        # straight at a 1/2..1/8 scale that still covers PAD_MAX_SIDE (draft()
+        # is a no-op for other formats), and reduce() below box-downsamples
+        # whatever is still larger before the square canvas is allocated.
+        img.draft("RGB", (PAD_MAX_SIDE, PAD_MAX_SIDE))
         # Respect EXIF orientation so a phone photo isn't padded sideways; this
         # also matches how the browser renders the <img> in the CSS preview.
         img = ImageOps.exif_transpose(img)
+        factor = math.ceil(max(img.size) / PAD_MAX_SIDE)
+        if factor > 1:
+            img = img.reduce(factor)
     except Exception:
         # Unreadable/corrupt image: let the normal upload path (and the upload
         # validator) handle it rather than crashing the save.
@@ -125,8 +145,6 @@ def pad_image_to_square(image_file):
         return None
 
     width, height = img.size
-    if width == height:
-        return None  # already square -> keep the original bytes untouched
 
     side = max(width, height)
     offset = ((side - width) // 2, (side - height) // 2)
@@ -344,6 +362,45 @@ def ensure_filename_is_unique(filename_with_full_path):
     # Returns a guaranteed-to-be-unique filename (with full path)
     return filename_with_full_path
 
+def get_unique_basename(basename, taken):
+    """
+    In-memory counterpart of ensure_filename_is_unique: returns basename, or
+    basename with the same "-<timestamp>" suffix, such that it isn't in taken
+    (the names already in its directory).
+    """
+    while basename in taken:
+        name_no_ext, ext = os.path.splitext(basename)
+        basename = name_no_ext + "-" + str(time.time()) + ext
+    return basename
+
+def get_renamed_basename(old_filename, new_filename):
+    """Returns the cleaned basename a file named old_filename gets when renamed to new_filename"""
+
+    # Ensure the new filename carries the original file's extension. We compare
+    # against the actual extension (endswith) rather than os.path.splitext():
+    # callers pass standardized names that legitimately contain dots (e.g.
+    # "...SciencesD.C.ArtScience...2014", "...Dr.SangMook2009"), and splitext
+    # would treat the text after the last dot as an "extension" and skip adding
+    # the real .pdf/.pptx — renaming the file extension-less on disk (#1390).
+    old_filename_ext = os.path.splitext(old_filename)[1]
+    if old_filename_ext and not new_filename.lower().endswith(old_filename_ext.lower()):
+        new_filename = new_filename + old_filename_ext
+
+    # Use Django helper function to ensure a clean filename
+    return get_valid_filename(new_filename)
+
+def rename_file_in_storage(storage, old_name, new_name):
+    """
+    Renames a stored file (names relative to the storage). The content-addressed
+    store (website/utils/content_store.py) re-points a hardlink and its
+    reference row; plain storage just renames on disk.
+    """
+    storage_rename = getattr(storage, 'rename', None)
+    if storage_rename is not None:
+        storage_rename(old_name, new_name)
+    else:
+        os.rename(storage.path(old_name), storage.path(new_name))
+
 def rename_artifact_on_filesystem(file_field, new_filename):
     """Renames the artifact.name to the new filename. Careful: does not save it back to the database"""
     rename_artifact_in_db_and_filesystem(None, file_field, new_filename, update_db=False)
@@ -361,19 +418,8 @@ def rename_artifact_in_db_and_filesystem(model, file_field, new_filename, update
     old_filename_with_local_path = file_field.name
     old_local_path = os.path.dirname(file_field.name)
     old_full_path = os.path.dirname(old_filename_with_full_path)
-    old_filename_ext = os.path.splitext(old_filename_with_full_path)[1]
-
-    # Ensure the new filename carries the original file's extension. We compare
-    # against the actual extension (endswith) rather than os.path.splitext():
-    # callers pass standardized names that legitimately contain dots (e.g.
-    # "...SciencesD.C.ArtScience...2014", "...Dr.SangMook2009"), and splitext
-    # would treat the text after the last dot as an "extension" and skip adding
-    # the real .pdf/.pptx — renaming the file extension-less on disk (#1390).
-    if old_filename_ext and not new_filename.lower().endswith(old_filename_ext.lower()):
-        new_filename = new_filename + old_filename_ext
 
-    # Use Django helper function to ensure a clean filename
-    new_filename = get_valid_filename(new_filename)
+    new_filename = get_renamed_basename(old_filename_with_full_path, new_filename)
 
     # Add in the media directory to ensure that the filename is unique
     new_filename_with_full_path = os.path.join(old_full_path, new_filename)
@@ -382,11 +428,19 @@ def rename_artifact_in_db_and_filesystem(model, file_field, new_filename, update
     # Actually rename the existing file (aka initial_path) but only if it exists (it should!)
     # We rename the file on the filesystem and in the database (these need to be in concordance!)
     if os.path.exists(old_filename_with_full_path):
-        os.rename(old_filename_with_full_path, new_filename_with_full_path)
+        new_filename_with_local_path = os.path.join(old_local_path, os.path.basename(new_filename_with_full_path))
+
+        # The content-addressed store (website/utils/content_store.py) renames by
+        # re-pointing a hardlink and its reference row; plain storage just renames
+        storage_rename = getattr(getattr(file_field, 'storage', None), 'rename', None)
+        if storage_rename is not None:
+            storage_rename(old_filename_with_local_path, new_filename_with_local_path)
+        else:
+            os.rename(old_filename_with_full_path, new_filename_with_full_path)
         _logger.debug(f"Renamed {old_filename_with_full_path} to {new_filename_with_full_path}")
 
         # Change the pdf_file path to point to the renamed file and save the artifact
-        file_field.name = os.path.join(old_local_path, os.path.basename(new_filename_with_full_path))
+        file_field.name = new_filename_with_local_path
 
         # Save it out to the database
         if update_db:
@@ -505,9 +559,47 @@ def get_pdf_page_count(pdf_file_field):
         _logger.debug(f"Cannot count pages; file not found in storage: {pdf_file_field.name}")
         return None
 
+    return read_pdf_page_count(pdf_file_field.path)
+
+
+def read_pdf_page_count(path):
+    """
+    Returns the number of pages in the PDF at the given filesystem path, or None
+    if it can't be read. The pypdf half of :func:`get_pdf_page_count`, for
+    callers that already have a path (and no FileField) in hand.
+    """
     try:
-        reader = PdfReader(pdf_file_field.path)
+        reader = PdfReader(path)
         return len(reader.pages)
     except (PdfReadError, OSError, ValueError) as e:
-        _logger.warning(f"Could not determine page count for {pdf_file_field.name}: {e}")
+        _logger.warning(f"Could not determine page count for {path}: {e}")
         return None
+
+
+def get_file_sha256(path, chunk_size=1024 * 1024):
+    """Returns the hex SHA-256 of the file at path, read in chunks so large PDFs don't load into memory."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def inspect_pdf(path, known_sha256=None):
+    """
+    Returns (sha256, page count) for the PDF at path, skipping the pypdf parse
+    when the file's hash is known_sha256 (the caller already has its count).
+    The page count is None if the PDF can't be read or wasn't parsed; sha256 is
+    None if the file can't be opened at all.
+
+    This is the per-file work of website/utils/pdf_page_cache.py, kept here,
+    free of model imports, so it can run in a freshly spawned worker process.
+    """
+    try:
+        sha256 = get_file_sha256(path)
+    except OSError as e:
+        _logger.warning(f"Could not hash {path}: {e}")
+        return None, None
+    if sha256 == known_sha256:
+        return sha256, None
+    return sha256, read_pdf_page_count(path)
@@ -60,6 +60,34 @@ def normalize_person_name(first_name, last_name):
     return re.sub('[^a-z]', '', cleaned)
 
 
+def fold_search_words(text):
+    """
+    Split text into accent-folded, lowercased, alpha-only words -- the
+    per-word version of :func:`normalize_person_name`, so a search for
+    ``Cláudio`` or ``o'brien`` folds exactly like the stored name does.
+
+    Example:
+        >>> fold_search_words("Renée  O'Brien")
+        ['renee', 'obrien']
+    """
+    words = (re.sub('[^a-z]', '', _ascii_fold(word.lower())) for word in (text or '').split())
+    return [word for word in words if word]
+
+
+def build_person_search_name(first_name, middle_name, last_name):
+    """
+    Return the text ``Person.search_name`` stores for the people search index:
+    the folded first/middle/last words followed by the bare name key, so both
+    ``jon froe`` and ``jonfroe`` prefix-match.
+
+    Example:
+        >>> build_person_search_name('Cláudio', 'T.', 'Silva')
+        'claudio t silva claudiosilva'
+    """
+    words = fold_search_words(f"{first_name or ''} {middle_name or ''} {last_name or ''}")
+    return ' '.join(words + [normalize_person_name(first_name, last_name)]).strip()
+
+
 def build_unique_url_name(first_name, middle_name, last_name, is_taken):
     """
     Derive a unique ``url_name`` for a person, preferring readable URLs.
@@ -78,7 +106,8 @@ def build_unique_url_name(first_name, middle_name, last_name, is_taken):
     ``url_name`` is already in use. The caller defines its semantics: when
     re-deriving for an existing row it should exclude that row's own pk (mirroring
     the ``.exclude(pk=self.pk)`` check in ``Person.save()``); when assigning in a
-    batch it should consult the names already handed out this pass.
+    batch it should consult the names already handed out this pass (which is
+    what :func:`assign_unique_url_names` does).
 
     The result is always non-empty and lowercase alpha (plus an optional trailing
     number), matching what ``Person.save()`` would store.
@@ -90,10 +119,38 @@ def build_unique_url_name(first_name, middle_name, last_name, is_taken):
         >>> build_unique_url_name('Jasmine', '', 'Zhang', taken)
         'jasminezhang2'
     """
-    base = normalize_person_name(first_name, last_name)
+    base, middle_initial_name = get_url_name_candidates(first_name, middle_name, last_name)
     if not is_taken(base):
         return base
 
+    if middle_initial_name and not is_taken(middle_initial_name):
+        return middle_initial_name
+
+    # Numeric-suffix fallback (matches the legacy Person.save() collision loop).
+    counter = 2
+    while is_taken(f"{base}{counter}"):
+        counter += 1
+    return f"{base}{counter}"
+
+
+def get_url_name_candidates(first_name, middle_name, last_name):
+    """
+    Return ``(base, middle_initial_name)``: the bare key and the middle-initial
+    differentiator :func:`build_unique_url_name` tries, in that order. The
+    differentiator is None when there is no usable middle initial (or it would
+    equal the base). Every numeric fallback starts with ``base``, so the names
+    that can collide with a person's candidates are exactly those equal to
+    ``middle_initial_name`` or starting with ``base`` -- which is what lets
+    ``Person.save()`` fetch them all in one query.
+
+    Example:
+        >>> get_url_name_candidates('Jasmine', 'Xin', 'Zhang')
+        ('jasminezhang', 'jasminexzhang')
+        >>> get_url_name_candidates('Jasmine', '', 'Zhang')
+        ('jasminezhang', None)
+    """
+    base = normalize_person_name(first_name, last_name)
+
     # Middle-initial differentiator: fold the first alpha char of the middle name
     # the same way url_name derivation folds accents, then drop anything non-alpha.
     middle = (middle_name or '').strip()
@@ -103,14 +160,42 @@ def build_unique_url_name(first_name, middle_name, last_name, is_taken):
             first_key = normalize_person_name(first_name, '')
             last_key = normalize_person_name('', last_name)
             candidate = f"{first_key}{initial}{last_key}"
-            if candidate != base and not is_taken(candidate):
-                return candidate
+            if candidate != base:
+                return base, candidate
+    return base, None
 
-    # Numeric-suffix fallback (matches the legacy Person.save() collision loop).
-    counter = 2
-    while is_taken(f"{base}{counter}"):
-        counter += 1
-    return f"{base}{counter}"
+
+def assign_unique_url_names(people, taken=()):
+    """
+    Derive a unique ``url_name`` for every person in ``people`` at once, entirely
+    in memory -- the bulk counterpart of :func:`build_unique_url_name`.
+
+    People are resolved in ascending pk order (unsaved people last, in the order
+    given), so within a same-name cluster the earliest record keeps the bare key
+    and later namesakes are differentiated; the result depends only on the
+    names and pks, which keeps ``recompute_url_names`` idempotent. ``taken`` is
+    an optional collection of url_names held by people *not* in ``people``.
+
+    Returns a dict of ``id(person) -> url_name``, so unsaved people work too.
+
+    Example:
+        >>> class P: pass
+        >>> a, b = P(), P()
+        >>> a.pk, a.first_name, a.middle_name, a.last_name = 1, 'Jiahao', '', 'Li'
+        >>> b.pk, b.first_name, b.middle_name, b.last_name = 2, 'Jiahao', '', 'Li'
+        >>> names = assign_unique_url_names([b, a])
+        >>> names[id(a)], names[id(b)]
+        ('jiahaoli', 'jiahaoli2')
+    """
+    assigned = set(taken)
+    url_names = {}
+    ordered = sorted(people, key=lambda person: (person.pk is None, person.pk or 0))
+    for person in ordered:
+        url_name = build_unique_url_name(person.first_name, person.middle_name, person.last_name,
+                                         is_taken=assigned.__contains__)
+        assigned.add(url_name)
+        url_names[id(person)] = url_name
+    return url_names
 
 
 def is_default_person_image(image_field):
@@ -0,0 +1,185 @@
+"""
+A generic, set-based merge of duplicate rows of one model (keywords, people)
+into a chosen target, used by the keyword admin's merge action and the
+``merge_duplicate_people`` management command.
+
+Every path to the model is found through ``_meta`` (see :func:`get_merge_relations`):
+
+* a plain foreign key (``Position.advisor``, ``News.author``) is repointed with one
+  ``UPDATE ... SET fk = target WHERE fk IN (sources)``;
+* a many-to-many link table (``Publication.authors``, ``Talk.keywords``) has its
+  source rows repointed the same way, after one ``DELETE`` drops the rows that
+  would duplicate a link the owner already has (to the target, or to an earlier
+  source). Rows are updated rather than re-inserted, so the ``sort_value`` of a
+  ``SortedManyToManyField`` is kept -- the target takes the source's place in an
+  author list -- and the legacy NOT-NULL ``sort_value`` column still present on
+  the deployed keyword link tables is never written.
+
+The sources are then deleted, all in one transaction. None of this goes through
+``save()``, ``add()`` or ``set()``, so no per-row ``m2m_changed`` fires (in
+particular ``authors_changed``, which can save an artifact and rename its files);
+instead :data:`objects_merged` is sent once, inside the transaction, with every
+change, and the receiver in ``website/signals.py`` refreshes what the per-row
+signals would have (search entries, citations, project similarity).
+
+:func:`preview_merge` runs the same reads without writing, for the dry-run diff.
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.dispatch import Signal
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+# Sent once per merge, inside its transaction, with sender=the merged model and
+# kwargs target, source_pks, and changes (a list of RelationChange).
+objects_merged = Signal()
+
+
+class RelationChange:
+    """What a merge does to one foreign key pointing at the merged model."""
+
+    def __init__(self, label, field, owner_model, owner_field=None):
+        self.label = label
+        # The concrete FK to the merged model (on a regular model or a link table)
+        self.field = field
+        # The model whose objects are affected: the FK's model, or for a link
+        # table, the model on its other side
+        self.owner_model = owner_model
+        # The link table's FK to owner_model; None for a plain foreign key
+        self.owner_field = owner_field
+        self.num_repointed = 0
+        self.num_dropped = 0
+        self.affected_ids = set()
+
+    @property
+    def is_link_table(self):
+        return self.owner_field is not None
+
+    @property
+    def num_rows(self):
+        return self.num_repointed + self.num_dropped
+
+    def __str__(self):
+        dropped = f", {self.num_dropped} duplicate(s) dropped" if self.num_dropped else ""
+        return f"{self.label}: {self.num_repointed} repointed{dropped}"
+
+
+class MergeResult:
+    """The outcome (or, from preview_merge, the plan) of merging sources into target."""
+
+    def __init__(self, target, source_pks, changes, applied):
+        self.target = target
+        self.source_pks = source_pks
+        self.changes = changes
+        self.applied = applied
+
+    @property
+    def summary(self):
+        """{relation label: rows changed} for the relations the merge touches."""
+        return {change.label: change.num_rows for change in self.changes}
+
+    def get_diff_lines(self):
+        """One line per touched relation, for the dry-run preview."""
+        return [str(change) for change in self.changes]
+
+
+def get_merge_relations(model):
+    """
+    Return a RelationChange (with nothing counted yet) for every concrete foreign
+    key to ``model``, including the hidden ones on many-to-many link tables, in a
+    stable order.
+    """
+    relations = []
+    for rel in model._meta.get_fields(include_hidden=True):
+        if not (rel.is_relation and rel.auto_created and not rel.concrete):
+            continue
+        if rel.many_to_many:
+            continue  # covered by the FK on its link table, which is hidden
+        field = rel.field
+        through = field.model
+        if through._meta.auto_created:
+            m2m, owner_field = _get_link_table_fields(through, field)
+            label = f"{m2m.model.__name__}.{m2m.name}"
+            relations.append(RelationChange(label, field, owner_field.related_model, owner_field))
+        else:
+            relations.append(RelationChange(f"{through.__name__}.{field.name}", field, through))
+    return sorted(relations, key=lambda change: (change.label, change.field.name))
+
+
+def _get_link_table_fields(through, field):
+    """The ManyToManyField a link table belongs to, and its FK to the other side."""
+    owner_field = next(fk for fk in through._meta.fields if fk.is_relation and fk is not field)
+    m2m = next(m2m for side in (owner_field.related_model, field.related_model)
+               for m2m in side._meta.many_to_many if m2m.remote_field.through is through)
+    return m2m, owner_field
+
+
+def preview_merge(target, sources):
+    """The changes merge_objects(target, sources) would make, without making them."""
+    return _merge(target, sources, apply=False)
+
+
+def merge_objects(target, sources):
+    """
+    Repoints every reference to ``sources`` onto ``target`` and deletes the
+    sources, in one transaction (see the module docstring). ``target`` is ignored
+    if present in ``sources``. Returns a MergeResult.
+    """
+    return _merge(target, sources, apply=True)
+
+
+def _merge(target, sources, apply):
+    model = type(target)
+    source_pks = sorted({source.pk for source in sources if source.pk != target.pk})
+    changes = []
+    with transaction.atomic():
+        if source_pks:
+            for change in get_merge_relations(model):
+                _rewrite_relation(change, target.pk, source_pks, apply)
+                if change.num_rows:
+                    changes.append(change)
+
+        result = MergeResult(target, source_pks, changes, applied=apply)
+        if apply and source_pks:
+            # Nothing refers to the sources any more, so this deletes just them
+            # (their own pre/post_delete receivers still run, e.g. a person's images).
+            model._default_manager.filter(pk__in=source_pks).delete()
+            objects_merged.send(sender=model, target=target, source_pks=source_pks, changes=changes)
+            _logger.info(f"Merged {model.__name__} {source_pks} into {target.pk}: "
+                         f"{', '.join(result.get_diff_lines()) or 'no related objects'}")
+    return result
+
+
+def _rewrite_relation(change, target_pk, source_pks, apply):
+    """Counts, and if apply, performs one relation's rewrite (a DELETE and an UPDATE at most)."""
+    field = change.field
+    rows = field.model._base_manager.filter(**{f"{field.attname}__in": source_pks})
+
+    if not change.is_link_table:
+        change.affected_ids = set(rows.values_list('pk', flat=True))
+        change.num_repointed = len(change.affected_ids)
+        if apply and change.num_repointed:
+            rows.update(**{field.attname: target_pk})
+        return
+
+    owner_attname = change.owner_field.attname
+    change.affected_ids = set(rows.values_list(owner_attname, flat=True))
+    if not change.affected_ids:
+        return
+    # A source row duplicates another when the same owner already links to the
+    # target, or to a source through a row with a lower pk (which is the one kept).
+    kept = field.model._base_manager.filter(
+        Q(**{field.attname: target_pk}) | Q(pk__lt=OuterRef('pk')),
+        **{owner_attname: OuterRef(owner_attname), f"{field.attname}__in": [target_pk, *source_pks]},
+    )
+    duplicates = rows.filter(Exists(kept))
+    if apply:
+        change.num_dropped, _ = duplicates.delete()
+        change.num_repointed = rows.update(**{field.attname: target_pk})
+    else:
+        change.num_dropped = duplicates.count()
+        change.num_repointed = rows.count() - change.num_dropped
@@ -0,0 +1,218 @@
+"""
+Query-count, latency, and memory measurements of every public page and API
+route, run by the ``benchmark_pages`` management command.
+
+Each :class:`BenchmarkTarget` is fetched through Django's test ``Client`` (the
+full middleware, view, and template stack, no network) three times:
+
+1. a warm-up request, so one-time work that isn't the page's (easy_thumbnails
+   recording a thumbnail it just generated, lazily compiled templates) is out
+   of the way;
+2. a timed request with the cache cleared, counting queries;
+3. the same under ``tracemalloc``, for the peak Python memory of the request.
+
+Timing and memory are taken on separate requests because tracemalloc slows
+Python down several-fold. The cache is cleared before each measured request, so
+the numbers are for a cold cache -- the worst case, and the only one that
+stays comparable between runs.
+
+The report (:func:`build_report`) is plain JSON keyed by page name and scale,
+so reports from two commits can be diffed or compared with
+:func:`find_baseline_regressions`. :func:`find_query_growth` lists the pages
+whose query count rises with data size: an N+1 that the small fixtures of the
+unit tests would never show.
+"""
+
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from website.models import Person, Project, Publication
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+
+
+class BenchmarkTarget:
+    """One page or API route: a stable ``name`` (the report key) and the URL fetched."""
+
+    def __init__(self, name, url):
+        self.name = name
+        self.url = url
+
+    def __repr__(self):
+        return f"<BenchmarkTarget {self.name} {self.url}>"
+
+
+# The pages (by name) get_benchmark_targets() returns, in report order
+BENCHMARK_PAGE_NAMES = [
+    'index', 'people', 'publications', 'project_listing', 'project', 'member', 'member_artifacts',
+    'news_listing', 'awards', 'view_project_people', 'sitemap',
+    'api_root', 'api_publications', 'api_publication', 'api_people', 'api_person', 'api_projects',
+    'api_project', 'api_project_publications', 'api_project_grants', 'api_project_people',
+    'api_project_leadership', 'api_grants', 'api_search',
+]
+
+
+def get_benchmark_targets():
+    """
+    Returns the BenchmarkTargets for the current data. Detail pages use the
+    oldest matching row (lowest pk), so data added for a larger scale doesn't
+    change which member or project is measured.
+    """
+    person = (Person.objects.filter(position__isnull=False, publication__isnull=False)
+              .order_by('pk').first())
+    project = Project.objects.filter(is_visible=True).order_by('pk').first()
+    publication = Publication.objects.order_by('pk').first()
+
+    targets = [
+        BenchmarkTarget('index', '/'),
+        BenchmarkTarget('people', '/people/'),
+        BenchmarkTarget('publications', '/publications/'),
+        BenchmarkTarget('project_listing', '/projects/'),
+        BenchmarkTarget('news_listing', '/news/'),
+        BenchmarkTarget('awards', '/awards/'),
+        BenchmarkTarget('view_project_people', '/view-project-people/'),
+        BenchmarkTarget('sitemap', '/sitemap.xml'),
+        BenchmarkTarget('api_root', '/api/v1/'),
+        BenchmarkTarget('api_publications', '/api/v1/publications/'),
+        BenchmarkTarget('api_people', '/api/v1/people/'),
+        BenchmarkTarget('api_projects', '/api/v1/projects/'),
+        BenchmarkTarget('api_grants', '/api/v1/grants/'),
+        BenchmarkTarget('api_search', '/api/v1/search/?q=synthetic'),
+    ]
+    if person is not None:
+        targets += [
+            BenchmarkTarget('member', f'/member/{person.url_name}/'),
+            BenchmarkTarget('member_artifacts', f'/member/{person.pk}/artifacts/publications/'),
+            BenchmarkTarget('api_person', f'/api/v1/people/{person.url_name}/'),
+        ]
+    if project is not None:
+        targets += [
+            BenchmarkTarget('project', f'/project/{project.short_name}/'),
+            BenchmarkTarget('api_project', f'/api/v1/projects/{project.short_name}/'),
+            BenchmarkTarget('api_project_publications', f'/api/v1/projects/{project.short_name}/publications/'),
+            BenchmarkTarget('api_project_grants', f'/api/v1/projects/{project.short_name}/grants/'),
+            BenchmarkTarget('api_project_people', f'/api/v1/projects/{project.short_name}/people/'),
+            BenchmarkTarget('api_project_leadership', f'/api/v1/projects/{project.short_name}/leadership/'),
+        ]
+    if publication is not None:
+        targets.append(BenchmarkTarget('api_publication', f'/api/v1/publications/{publication.pk}/'))
+    return sorted(targets, key=lambda target: BENCHMARK_PAGE_NAMES.index(target.name))
+
+
+def measure_target(client, target):
+    """Measures one target (see the module docstring) and returns its result dict."""
+    client.get(target.url)
+
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        start_time = time.perf_counter()
+        response = client.get(target.url)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+    cache.clear()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline_bytes = tracemalloc.get_traced_memory()[0]
+    client.get(target.url)
+    peak_bytes = tracemalloc.get_traced_memory()[1] - baseline_bytes
+    if not was_tracing:
+        tracemalloc.stop()
+
+    return {
+        'status': response.status_code,
+        'queries': len(queries.captured_queries),
+        'ms': round(elapsed_ms, 1),
+        'peak_kb': round(peak_bytes / 1024),
+    }
+
+
+def measure_targets(targets, names=None):
+    """Measures each target (or just ``names``) and returns ``{name: result dict}``."""
+    # Report a 500 as a status instead of letting the view's exception escape
+    client = Client(raise_request_exception=False)
+    results = {}
+    for target in targets:
+        if names and target.name not in names:
+            continue
+        results[target.name] = {'url': target.url, **measure_target(client, target)}
+        _logger.debug(f"Benchmarked {target.name}: {results[target.name]}")
+    return results
+
+
+def _get_git_sha():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+
+
+def build_report(results_by_scale, production_size, tolerance=0):
+    """
+    Assembles the JSON report from ``{scale: {name: result}}``::
+
+        {"version": 1, "git_sha": "...", "created_at": "...", "scales": [1, 10, 100],
+         "production_size": {...},
+         "pages": {"people": {"1": {"url": ..., "status": 200, "queries": 14, "ms": ..., "peak_kb": ...},
+                             "10": {...}}},
+         "query_growth": ["people"]}
+    """
+    pages = {}
+    for scale, results in results_by_scale.items():
+        for name, result in results.items():
+            pages.setdefault(name, {})[str(scale)] = result
+    report = {
+        'version': REPORT_VERSION,
+        'git_sha': _get_git_sha(),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'scales': list(results_by_scale),
+        'production_size': production_size,
+        'pages': pages,
+    }
+    report['query_growth'] = find_query_growth(report, tolerance=tolerance)
+    return report
+
+
+def find_query_growth(report, tolerance=0):
+    """
+    Returns the names of pages whose query count at some scale exceeds the count
+    at the smallest scale by more than ``tolerance``. Pages that didn't return
+    200 at every scale are skipped (a 500's query count means nothing).
+    """
+    growing = []
+    for name, by_scale in report['pages'].items():
+        results = [by_scale[str(scale)] for scale in report['scales'] if str(scale) in by_scale]
+        if len(results) < 2 or any(result['status'] != 200 for result in results):
+            continue
+        if max(result['queries'] for result in results) > results[0]['queries'] + tolerance:
+            growing.append(name)
+    return growing
+
+
+def find_baseline_regressions(report, baseline):
+    """
+    Compares ``report`` with an earlier ``baseline`` report and returns
+    ``[(page, scale, baseline queries, queries), ...]`` for every page whose
+    query count went up at a scale both reports measured.
+    """
+    regressions = []
+    for name, by_scale in report['pages'].items():
+        for scale, result in by_scale.items():
+            before = baseline.get('pages', {}).get(name, {}).get(scale)
+            if before and before['status'] == 200 == result['status'] and result['queries'] > before['queries']:
+                regressions.append((name, scale, before['queries'], result['queries']))
+    return regressions
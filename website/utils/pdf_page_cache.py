@@ -0,0 +1,121 @@
+"""
+Cached PDF page counts, backed by the PdfPageCount table.
+
+:func:`get_pdf_page_counts` counts the pages of many PDFs at once:
+
+1. ``os.stat`` each file (no opening) and load every cached row in one query;
+2. a row whose size and mtime still match is a hit, and the file isn't opened;
+3. every other file is hashed and, unless its SHA-256 matches the cached one
+   (same bytes, new mtime), parsed with pypdf -- across a process pool when
+   there's more than one;
+4. new and changed rows are written back in one batched upsert.
+
+``Publication.save`` goes through :func:`get_cached_pdf_page_count`, so
+re-saving a publication whose PDF hasn't changed never reopens it, and the
+``backfill_num_pages`` command goes through the batch version.
+
+Workers are spawned rather than forked: a forked child would inherit (and on
+exit, close) the parent's database connection. They run
+:func:`website.utils.fileutils.inspect_pdf`, which imports no models, so no
+Django setup is needed in the child.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from website.models.pdf_page_count import PdfPageCount
+from website.utils.fileutils import inspect_pdf
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = 500
+
+
+def _stat_pdf(pdf_file_field):
+    """Returns (storage name, path, size, mtime_ns) for a local PDF, or None if there's nothing to count."""
+    if not pdf_file_field or not pdf_file_field.name:
+        return None
+    if not pdf_file_field.name.lower().endswith('.pdf'):
+        _logger.debug(f"Not counting pages for non-PDF file: {pdf_file_field.name}")
+        return None
+    path = pdf_file_field.path
+    try:
+        stat = os.stat(path)
+    except OSError:
+        _logger.debug(f"Cannot count pages; file not found in storage: {pdf_file_field.name}")
+        return None
+    return pdf_file_field.name, path, stat.st_size, stat.st_mtime_ns
+
+
+def _inspect_all(jobs, workers):
+    """Runs inspect_pdf over [(path, known_sha256), ...], in a pool when it's worth one."""
+    if workers <= 1 or len(jobs) <= 1:
+        return [inspect_pdf(path, known_sha256) for path, known_sha256 in jobs]
+    paths, known = zip(*jobs)
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=get_context('spawn')) as pool:
+        return list(pool.map(inspect_pdf, paths, known, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def get_pdf_page_counts(pdf_file_fields, workers=1, update_cache=True):
+    """
+    Returns ``({storage name: page count or None}, number of PDFs parsed)`` for
+    the given PDF FileFields (see the module docstring). Files that aren't PDFs
+    or aren't on disk are left out of the dict. With ``update_cache=False``
+    nothing is written (for dry runs).
+    """
+    stats = {}
+    for pdf_file_field in pdf_file_fields:
+        stat = _stat_pdf(pdf_file_field)
+        if stat is not None:
+            stats[stat[0]] = stat
+    if not stats:
+        return {}, 0
+
+    cached = PdfPageCount.objects.in_bulk(list(stats), field_name='path')
+    counts = {}
+    misses = []
+    for name, (_, path, size, mtime_ns) in stats.items():
+        row = cached.get(name)
+        if row is not None and row.size == size and row.mtime_ns == mtime_ns:
+            counts[name] = row.num_pages
+        else:
+            misses.append(name)
+
+    to_save = []
+    num_parsed = 0
+    if misses:
+        jobs = [(stats[name][1], cached[name].sha256 if name in cached else None) for name in misses]
+        for name, (sha256, num_pages) in zip(misses, _inspect_all(jobs, workers)):
+            if sha256 is None:
+                continue
+            row = cached.get(name)
+            if row is not None and sha256 == row.sha256:
+                # Same bytes, new mtime: keep the count, just refresh the key
+                num_pages = row.num_pages
+            else:
+                num_parsed += 1
+            counts[name] = num_pages
+            _, _, size, mtime_ns = stats[name]
+            to_save.append(PdfPageCount(path=name, size=size, mtime_ns=mtime_ns, sha256=sha256, num_pages=num_pages))
+
+    if to_save and update_cache:
+        PdfPageCount.objects.bulk_create(
+            to_save, batch_size=_BATCH_SIZE, update_conflicts=True, unique_fields=['path'],
+            update_fields=['size', 'mtime_ns', 'sha256', 'num_pages'])
+
+    _logger.debug(f"PDF page counts: {len(stats) - len(misses)} cached, {len(misses) - num_parsed} "
+                  f"rehashed unchanged, {num_parsed} parsed")
+    return counts, num_parsed
+
+
+def get_cached_pdf_page_count(pdf_file_field):
+    """
+    Returns the page count of one PDF FileField, or None if it can't be
+    determined; the cached counterpart of fileutils.get_pdf_page_count.
+    """
+    counts, _ = get_pdf_page_counts([pdf_file_field])
+    return counts.get(pdf_file_field.name)
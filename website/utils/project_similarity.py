@@ -0,0 +1,250 @@
+"""
+Project-to-project similarity, precomputed into the ProjectSimilarity table.
+
+Two projects are similar when they share umbrellas, publications, grants,
+keywords, or people. We score a pair with a weighted Jaccard over those sparse
+sets:
+
+    score(a, b) = sum_f w_f * |A_f & B_f|  /  sum_f w_f * |A_f | B_f|
+
+where f ranges over the feature kinds in SIMILARITY_WEIGHTS. Feature kinds
+that are empty for both projects contribute nothing, so a project with no
+grants isn't penalized against another project with no grants. The score is
+symmetric and in [0, 1].
+
+Everything here works from the raw link tables via values_list(), so building
+the feature sets is one query per feature kind regardless of project count.
+With ~100 projects the full rebuild is a few milliseconds of Python. Updates
+after a link change are incremental: they load only the changed projects'
+features and those of the projects sharing an item with them (the only pairs
+whose score can have moved), and the changes of one transaction are coalesced
+into a single update when it commits.
+"""
+
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+
+from website.models import (Grant, Keyword, Project, ProjectRole, ProjectSimilarity, ProjectUmbrella,
+                            Publication)
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+# Relative weight of each kind of shared link. Umbrellas are the editor-curated
+# notion of "same research area" (what the page used to match on exclusively),
+# and shared publications are the strongest organic signal; keywords and people
+# overlap more loosely (everyone shares Jon, for instance).
+SIMILARITY_WEIGHTS = {
+    'umbrellas': 3.0,
+    'publications': 2.0,
+    'grants': 1.5,
+    'keywords': 1.0,
+    'people': 1.0,
+}
+
+
+# Where each feature kind comes from: the model holding (project_id, item) rows
+# and the name of its item column.
+_FEATURE_SOURCES = {
+    'umbrellas': (Project.project_umbrellas.through, 'projectumbrella_id'),
+    'publications': (Publication.projects.through, 'publication_id'),
+    'grants': (Grant.projects.through, 'grant_id'),
+    'keywords': (Project.keywords.through, 'keyword_id'),
+    'people': (ProjectRole, 'person_id'),
+}
+
+# The feature kind each linked model's rows are, for get_linked_project_ids()
+_FEATURE_KIND_BY_MODEL = {
+    ProjectUmbrella: 'umbrellas',
+    Publication: 'publications',
+    Grant: 'grants',
+    Keyword: 'keywords',
+}
+
+
+def get_project_feature_sets(project_ids=None):
+    """
+    Returns {project_id: {feature_kind: set(ids)}} for every project, or only
+    for project_ids when given, built from one values_list() query per feature
+    kind.
+    """
+    feature_sets = defaultdict(lambda: {kind: set() for kind in SIMILARITY_WEIGHTS})
+    for kind, (model, item_field) in _FEATURE_SOURCES.items():
+        rows = model.objects.all()
+        if project_ids is not None:
+            rows = rows.filter(project_id__in=project_ids)
+        for project_id, item_id in rows.values_list('project_id', item_field):
+            feature_sets[project_id][kind].add(item_id)
+
+    # Make sure projects with no links at all still appear (with empty sets)
+    projects = Project.objects.all()
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+    for project_id in projects.values_list('pk', flat=True):
+        feature_sets[project_id]
+
+    return dict(feature_sets)
+
+
+def _get_neighbor_project_ids(feature_sets):
+    """Returns the ids of every project sharing at least one item with a project in feature_sets."""
+    neighbor_ids = set()
+    for kind, (model, item_field) in _FEATURE_SOURCES.items():
+        item_ids = set().union(*(features[kind] for features in feature_sets.values()))
+        if item_ids:
+            neighbor_ids.update(model.objects.filter(**{f'{item_field}__in': item_ids})
+                                .values_list('project_id', flat=True).distinct())
+    return neighbor_ids - set(feature_sets)
+
+
+def get_linked_project_ids(instance):
+    """Returns the ids of the projects linked to an umbrella, publication, grant, or keyword."""
+    model, item_field = _FEATURE_SOURCES[_FEATURE_KIND_BY_MODEL[type(instance)]]
+    return set(model.objects.filter(**{item_field: instance.pk}).values_list('project_id', flat=True))
+
+
+def weighted_jaccard(features_a, features_b, weights=SIMILARITY_WEIGHTS):
+    """Returns the weighted Jaccard similarity of two feature-set dicts (0.0 if both are empty)."""
+    numerator = 0.0
+    denominator = 0.0
+    for kind, weight in weights.items():
+        a = features_a.get(kind, set())
+        b = features_b.get(kind, set())
+        if not a and not b:
+            continue
+        numerator += weight * len(a & b)
+        denominator += weight * len(a | b)
+    return numerator / denominator if denominator else 0.0
+
+
+def _build_inverted_index(feature_sets):
+    """Maps (feature_kind, item_id) -> set of project ids that have that item."""
+    inverted = defaultdict(set)
+    for project_id, features in feature_sets.items():
+        for kind, items in features.items():
+            for item_id in items:
+                inverted[(kind, item_id)].add(project_id)
+    return inverted
+
+
+def _compute_rows(project_ids, feature_sets, inverted):
+    """
+    Returns ProjectSimilarity rows (both directions) for every pair involving one
+    of project_ids. Candidates come from the inverted index, so we only score
+    pairs that share at least one item rather than all N^2 pairs.
+    """
+    rows = {}
+    for project_id in project_ids:
+        features = feature_sets.get(project_id)
+        if not features:
+            continue
+
+        candidates = set()
+        for kind, items in features.items():
+            for item_id in items:
+                candidates |= inverted[(kind, item_id)]
+        candidates.discard(project_id)
+
+        for other_id in candidates:
+            score = weighted_jaccard(features, feature_sets[other_id])
+            if score <= 0:
+                continue
+            rows[(project_id, other_id)] = ProjectSimilarity(
+                project_id=project_id, related_project_id=other_id, score=score)
+            rows[(other_id, project_id)] = ProjectSimilarity(
+                project_id=other_id, related_project_id=project_id, score=score)
+    return list(rows.values())
+
+
+def update_project_similarities(project_ids):
+    """
+    Recomputes every similarity row involving the given projects (in both
+    directions) and returns the number of rows written. Called after a link
+    involving these projects changes; pairs between two other projects are
+    unaffected by such a change, so they're left alone.
+    """
+    project_ids = set(project_ids)
+    if not project_ids:
+        return 0
+
+    # Only pairs involving one of project_ids can have changed, so only these
+    # projects and the ones sharing an item with them need their features
+    feature_sets = get_project_feature_sets(project_ids)
+    neighbor_ids = _get_neighbor_project_ids(feature_sets)
+    if neighbor_ids:
+        feature_sets.update(get_project_feature_sets(neighbor_ids))
+    inverted = _build_inverted_index(feature_sets)
+    rows = _compute_rows(project_ids & set(feature_sets), feature_sets, inverted)
+
+    with transaction.atomic():
+        ProjectSimilarity.objects.filter(project_id__in=project_ids).delete()
+        ProjectSimilarity.objects.filter(related_project_id__in=project_ids).delete()
+        ProjectSimilarity.objects.bulk_create(rows, batch_size=500)
+
+    _logger.debug(f"Recomputed {len(rows)} similarity rows for project(s) {sorted(project_ids)}")
+    return len(rows)
+
+
+def rebuild_project_similarities():
+    """Recomputes the whole ProjectSimilarity table and returns the number of rows written."""
+    feature_sets = get_project_feature_sets()
+    inverted = _build_inverted_index(feature_sets)
+    rows = _compute_rows(feature_sets.keys(), feature_sets, inverted)
+
+    with transaction.atomic():
+        ProjectSimilarity.objects.all().delete()
+        ProjectSimilarity.objects.bulk_create(rows, batch_size=500)
+
+    return len(rows)
+
+
+_pending = threading.local()
+
+
+def _get_pending():
+    if not hasattr(_pending, 'project_ids'):
+        _pending.project_ids = set()
+    return _pending.project_ids
+
+
+def _flush_pending():
+    pending = _get_pending()
+    if pending:
+        project_ids = set(pending)
+        pending.clear()
+        update_project_similarities(project_ids)
+
+
+def schedule_project_similarity_update(project_ids):
+    """
+    Queues a rescore of the given projects for when the current transaction
+    commits. An admin save fires a signal per m2m field (umbrellas, keywords,
+    roles, ...); ids queued in one transaction are merged and the first
+    on-commit callback rescores them all, so that save costs one
+    update_project_similarities() against the final state. A rolled-back edit
+    rescores nothing (its ids are picked up, harmlessly, by the next flush in
+    this thread).
+    """
+    project_ids = {project_id for project_id in project_ids if project_id is not None}
+    if not project_ids:
+        return
+    _get_pending().update(project_ids)
+    transaction.on_commit(_flush_pending)
+
+
+def get_related_projects(project, limit=5):
+    """
+    Returns up to ``limit`` publicly-visible projects with a thumbnail, most
+    similar first. One indexed query on ProjectSimilarity (project, -score).
+    """
+    similarities = (ProjectSimilarity.objects
+                    .filter(project=project, related_project__is_visible=True)
+                    .exclude(related_project__gallery_image__isnull=True)
+                    .exclude(related_project__gallery_image='')
+                    .select_related('related_project')
+                    .order_by('-score', 'related_project_id')[:limit])
+    return [similarity.related_project for similarity in similarities]
@@ -0,0 +1,161 @@
+"""
+A registry of the site's hot-path querysets and an ``EXPLAIN`` audit over them,
+run by the ``audit_query_plans`` management command.
+
+Each :class:`HotQuery` rebuilds the same queryset a page or view runs (the
+filter and ordering, with a real value from the database where one is needed),
+so the audit exercises the plans production actually gets. For each one we run
+``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` and walk the plan tree for
+``Seq Scan`` nodes.
+
+Our tables are small (hundreds to a few thousand rows), and on a small table
+Postgres rightly prefers a sequential scan even when a usable index exists, so
+a plain EXPLAIN flags everything. By default the audit therefore runs with
+``enable_seqscan = off`` (``SET LOCAL``, inside a transaction): the planner then
+only falls back to a sequential scan when *no* index can serve the query, which
+is exactly the regression we want to catch before the tables grow. Pass
+``disable_seqscan=False`` to see the plans the planner picks on its own.
+"""
+
+import json
+import logging
+from datetime import date
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from website.models import Banner, Person, Position, Project, ProjectRole, Publication
+from website.models.position import Role
+from website.models.publication import PubType
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+class HotQuery:
+    """
+    One audited queryset. ``build`` is a zero-argument callable returning the
+    queryset (called at audit time, so sample values come from the live data);
+    ``source`` names the code that runs it, for the report.
+    """
+
+    def __init__(self, name, source, build):
+        self.name = name
+        self.source = source
+        self.build = build
+
+    def __repr__(self):
+        return f"<HotQuery {self.name}>"
+
+
+def _sample(model, field, default):
+    """A real value of ``field`` (so the plan sees realistic selectivity), else ``default``."""
+    queryset = model.objects.all()
+    if field != 'pk':
+        queryset = queryset.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+    value = queryset.values_list(field, flat=True).first()
+    return default if value is None else value
+
+
+def _sample_pdf_basename():
+    pdf_file = _sample(Publication, 'pdf_file', 'Author_Title_CHI2024.pdf')
+    return str(pdf_file).rsplit('/', 1)[-1]
+
+
+def _current_member_positions():
+    today = date.today()
+    return (Position.objects.filter(Q(start_date__lte=today),
+                                    Q(end_date__isnull=True) | Q(end_date__gte=today),
+                                    Q(role=Role.MEMBER))
+            .order_by('start_date'))
+
+
+HOT_QUERIES = [
+    HotQuery('publications_by_date', 'views/publications.py',
+             lambda: Publication.objects.order_by('-date')[:50]),
+    HotQuery('publications_by_year', 'views/publications.py (year fragments)',
+             lambda: Publication.objects.filter(date__year=date.today().year).order_by('-date')),
+    HotQuery('dissertations', 'views/people.py',
+             lambda: Publication.objects.filter(pub_venue_type=PubType.PHD_DISSERTATION).order_by('-date')),
+    HotQuery('publications_by_venue_type', 'views/publications.py, api/views.py (?type=)',
+             lambda: Publication.objects.filter(pub_venue_type__iexact='conference').order_by('-date')),
+    HotQuery('publications_by_author', 'views/publications.py, api/views.py (?author=)',
+             lambda: Publication.objects.filter(
+                 authors__url_name__iexact=_sample(Person, 'url_name', 'jonfroehlich')).order_by('-date')),
+    HotQuery('current_member_positions', 'views/people.py',
+             _current_member_positions),
+    HotQuery('past_member_positions', 'views/people.py',
+             lambda: Position.objects.filter(start_date__lte=date.today(), end_date__lt=date.today(),
+                                             role=Role.MEMBER).order_by('-end_date')),
+    HotQuery('project_current_roles', 'Project.get_current_member_count()',
+             lambda: ProjectRole.objects.filter(project_id=_sample(Project, 'pk', 0), end_date__isnull=True)),
+    HotQuery('person_open_roles', 'Position.save(), Project.save()',
+             lambda: ProjectRole.objects.filter(person_id=_sample(Person, 'pk', 0), end_date__isnull=True)),
+    HotQuery('active_projects', 'views/index.py',
+             lambda: Project.objects.filter(is_visible=True, end_date__isnull=True)),
+    HotQuery('project_by_short_name', 'views/project.py',
+             lambda: Project.objects.filter(short_name__iexact=_sample(Project, 'short_name', 'sidewalk'))),
+    HotQuery('landing_page_banners', 'views/index.py get_landing_page_banners()',
+             lambda: (Banner.objects.filter(favorite=True, landing_page=True)
+                      .exclude(project__is_visible=False).order_by('-date_added'))),
+    HotQuery('member_by_url_name', 'views/member.py',
+             lambda: Person.objects.filter(url_name__iexact=_sample(Person, 'url_name', 'jonfroehlich'))),
+    HotQuery('serve_pdf_exact', 'views/serve_pdf.py',
+             lambda: Publication.objects.filter(pdf_file__iendswith=_sample_pdf_basename())[:1]),
+    HotQuery('serve_pdf_renamed', 'views/serve_pdf.py',
+             lambda: (Publication.objects
+                      .filter(original_pdf_filename__iexact=_sample(Publication, 'original_pdf_filename', 'old.pdf'))
+                      .exclude(pdf_file="").exclude(pdf_file__isnull=True)[:1])),
+]
+
+
+def find_seq_scans(plan):
+    """
+    Returns ``[(relation, actual rows), ...]`` for every ``Seq Scan`` node in an
+    EXPLAIN (FORMAT JSON) plan tree (the ``"Plan"`` dict), depth first.
+    """
+    scans = []
+    if plan.get('Node Type') == 'Seq Scan':
+        scans.append((plan.get('Relation Name'), plan.get('Actual Rows')))
+    for child in plan.get('Plans', []):
+        scans.extend(find_seq_scans(child))
+    return scans
+
+
+def explain_hot_query(hot_query, disable_seqscan=True):
+    """
+    Runs ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` on ``hot_query`` and returns
+    a dict with its sequential scans, execution time (ms), and shared buffer
+    hits/reads. ANALYZE really executes the query; every registered query is a
+    read, and the transaction is rolled back either way.
+    """
+    queryset = hot_query.build()
+    with transaction.atomic():
+        if disable_seqscan:
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        explain_output = queryset.explain(format='json', analyze=True, buffers=True)
+        transaction.set_rollback(True)
+
+    result = json.loads(explain_output)[0]
+    plan = result['Plan']
+    return {
+        'name': hot_query.name,
+        'source': hot_query.source,
+        'seq_scans': find_seq_scans(plan),
+        'execution_ms': result.get('Execution Time'),
+        # A node's buffer counts include its children's, so the root's are the query's
+        'shared_hit': plan.get('Shared Hit Blocks', 0),
+        'shared_read': plan.get('Shared Read Blocks', 0),
+    }
+
+
+def audit_hot_queries(names=None, disable_seqscan=True):
+    """Explains every registered hot query (or just ``names``) and returns their result dicts."""
+    results = []
+    for hot_query in HOT_QUERIES:
+        if names and hot_query.name not in names:
+            continue
+        results.append(explain_hot_query(hot_query, disable_seqscan=disable_seqscan))
+        _logger.debug(f"Explained {hot_query.name}: {results[-1]}")
+    return results
@@ -0,0 +1,283 @@
+"""
+Site-wide full-text search over publications, talks, public projects, and news.
+
+Each searchable object is flattened into one SearchEntry row (title, date,
+link, and its keyword / people / body text), and a weighted ``tsvector`` is
+built from those columns in SQL:
+
+    A  title
+    B  keywords and project names
+    C  people (authors, speakers, project members, news author + people)
+    D  body (forum / book title, project summary + about, news text)
+
+so a hit in a title outranks the same word in a venue name. A GIN index on the
+vector makes a search one indexed ``@@`` plus ``ts_rank`` over the matches.
+
+Rows are refreshed through :func:`schedule_search_index_update`, which the
+receivers in ``website/signals.py`` call on saves, deletes, and m2m changes;
+updates queued during one transaction are coalesced and run once it commits.
+``rebuild_search_index`` (a management command, run at container start)
+rebuilds everything.
+
+Highlights come from ``ts_headline`` with private-use sentinel characters as
+the start/stop markers; :func:`highlight_html` escapes the text and only then
+swaps the sentinels for ``<mark>``, so stored titles can never inject HTML.
+"""
+
+import threading
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import transaction
+from django.db.models import F, Q, TextField, Value
+from django.db.models.functions import Concat
+from django.urls import reverse
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+from website.models import Keyword, News, Person, Project, Publication, SearchEntry, Talk
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+# Text search configuration (stemming + stop words) for both indexing and queries
+SEARCH_CONFIG = 'english'
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_QUERY_LENGTH = 200
+
+# ts_headline markers; replaced by <mark> after escaping (see highlight_html)
+_HIGHLIGHT_START = '\ue000'
+_HIGHLIGHT_STOP = '\ue001'
+
+_BATCH_SIZE = 1000
+
+SEARCH_VECTOR = (SearchVector('title', weight='A', config=SEARCH_CONFIG)
+                 + SearchVector('keywords', weight='B', config=SEARCH_CONFIG)
+                 + SearchVector('people', weight='C', config=SEARCH_CONFIG)
+                 + SearchVector('body', weight='D', config=SEARCH_CONFIG))
+
+
+def _join(values):
+    return ' '.join(value for value in values if value)
+
+
+def _file_url(file_field):
+    return file_field.url if file_field else ''
+
+
+def _artifact_fields(artifact):
+    """The fields Publication and Talk share (their relations must be prefetched)."""
+    return {
+        'title': artifact.title or '',
+        'date': artifact.date,
+        'keywords': _join([keyword.keyword for keyword in artifact.keywords.all()]
+                          + [project.name for project in artifact.projects.all()]),
+        'people': _join(author.get_full_name() for author in artifact.authors.all()),
+    }
+
+
+def _publication_fields(publication):
+    fields = _artifact_fields(publication)
+    fields['body'] = _join([publication.forum_name, publication.book_title])
+    fields['url'] = (_file_url(publication.pdf_file) or publication.official_url
+                     or reverse('website:publications'))
+    return fields
+
+
+def _talk_fields(talk):
+    fields = _artifact_fields(talk)
+    fields['body'] = _join([talk.forum_name, talk.location])
+    fields['url'] = _file_url(talk.pdf_file) or talk.external_slides_url or ''
+    return fields
+
+
+def _project_fields(project):
+    return {
+        'title': project.name or '',
+        'date': project.start_date,
+        'keywords': _join(keyword.keyword for keyword in project.keywords.all()),
+        'people': _join(sorted({role.person.get_full_name() for role in project.projectrole_set.all()})),
+        'body': _join([strip_tags(project.summary or ''), strip_tags(project.about or '')]),
+        'url': reverse('website:project', args=[project.short_name]),
+    }
+
+
+def _news_fields(news):
+    people = [news.author] if news.author else []
+    people += list(news.people.all())
+    if news.slug:
+        url = reverse('website:news_item_by_slug', kwargs={'slug': news.slug})
+    else:
+        url = reverse('website:news_item_by_id', kwargs={'id': news.pk})
+    return {
+        'title': news.title or '',
+        'date': news.date,
+        'keywords': _join(project.name for project in news.project.all()),
+        'people': _join(person.get_full_name() for person in people),
+        'body': strip_tags(news.content or ''),
+        'url': url,
+    }
+
+
+def _get_sources():
+    """Maps each SearchEntry kind to (queryset of indexable objects, field builder)."""
+    return {
+        SearchEntry.Kind.PUBLICATION: (
+            Publication.objects.prefetch_related('authors', 'keywords', 'projects'), _publication_fields),
+        SearchEntry.Kind.TALK: (
+            Talk.objects.prefetch_related('authors', 'keywords', 'projects'), _talk_fields),
+        SearchEntry.Kind.PROJECT: (
+            Project.objects.filter(is_visible=True).prefetch_related('keywords', 'projectrole_set__person'),
+            _project_fields),
+        SearchEntry.Kind.NEWS: (
+            News.objects.select_related('author').prefetch_related('project', 'people'), _news_fields),
+    }
+
+
+def _build_entries(kind, queryset, build_fields):
+    for obj in queryset.iterator(chunk_size=_BATCH_SIZE):
+        yield SearchEntry(kind=kind, object_id=obj.pk, **build_fields(obj))
+
+
+def _bulk_insert(entries):
+    batch = []
+    count = 0
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= _BATCH_SIZE:
+            SearchEntry.objects.bulk_create(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        SearchEntry.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+def update_search_entries(kind, object_ids):
+    """
+    Re-indexes the given objects of one kind and returns the number of entries
+    written. Objects that no longer exist (or, for projects, are no longer
+    public) lose their entry.
+    """
+    object_ids = set(object_ids)
+    if not object_ids:
+        return 0
+
+    queryset, build_fields = _get_sources()[kind]
+    with transaction.atomic():
+        SearchEntry.objects.filter(kind=kind, object_id__in=object_ids).delete()
+        count = _bulk_insert(_build_entries(kind, queryset.filter(pk__in=object_ids), build_fields))
+        SearchEntry.objects.filter(kind=kind, object_id__in=object_ids).update(vector=SEARCH_VECTOR)
+
+    _logger.debug(f"Re-indexed {count} {kind} search entries for ids {sorted(object_ids)}")
+    return count
+
+
+def rebuild_search_index():
+    """Rebuilds every SearchEntry and returns {kind: entries written}."""
+    counts = {}
+    with transaction.atomic():
+        SearchEntry.objects.all().delete()
+        for kind, (queryset, build_fields) in _get_sources().items():
+            counts[kind] = _bulk_insert(_build_entries(kind, queryset, build_fields))
+        SearchEntry.objects.update(vector=SEARCH_VECTOR)
+    return counts
+
+
+_pending = threading.local()
+
+
+def _get_pending():
+    if not hasattr(_pending, 'ids'):
+        _pending.ids = {}
+    return _pending.ids
+
+
+def _flush_pending():
+    pending = _get_pending()
+    while pending:
+        kind, object_ids = pending.popitem()
+        update_search_entries(kind, object_ids)
+
+
+def schedule_search_index_update(kind, object_ids):
+    """
+    Queues a re-index of the given objects for when the current transaction
+    commits. An admin save fires several signals for the same object (the row,
+    then each m2m field in turn); ids queued in one transaction are merged and
+    the first on-commit callback re-indexes them all, so that save costs one
+    re-index against the final state. A rolled-back edit re-indexes nothing
+    (its ids are picked up, harmlessly, by the next flush in this thread).
+    """
+    object_ids = {object_id for object_id in object_ids if object_id is not None}
+    if not object_ids:
+        return
+    _get_pending().setdefault(kind, set()).update(object_ids)
+    transaction.on_commit(_flush_pending)
+
+
+def highlight_html(text):
+    """Escapes a ts_headline result and turns its sentinel markers into <mark> tags."""
+    escaped = escape(text or '')
+    return mark_safe(escaped.replace(_HIGHLIGHT_START, '<mark>').replace(_HIGHLIGHT_STOP, '</mark>'))
+
+
+def search(query_text, kinds=None):
+    """
+    Returns SearchEntry rows matching ``query_text`` (web-search syntax:
+    quoted phrases, ``or``, ``-word``), best first, annotated with ``rank`` and
+    the raw ``title_headline`` / ``snippet_headline`` (pass them through
+    :func:`highlight_html`). Headlines are computed by Postgres only for the
+    rows actually fetched, so slice or paginate before evaluating.
+    """
+    query_text = (query_text or '').strip()[:SEARCH_MAX_QUERY_LENGTH]
+    if not query_text:
+        return SearchEntry.objects.none()
+
+    query = SearchQuery(query_text, search_type='websearch', config=SEARCH_CONFIG)
+    headline_options = {'config': SEARCH_CONFIG, 'start_sel': _HIGHLIGHT_START, 'stop_sel': _HIGHLIGHT_STOP}
+    entries = SearchEntry.objects.filter(vector=query)
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    return (entries
+            .annotate(rank=SearchRank(F('vector'), query),
+                      title_headline=SearchHeadline('title', query, highlight_all=True, **headline_options),
+                      snippet_headline=SearchHeadline(
+                          Concat('people', Value(' · '), 'body', output_field=TextField()), query,
+                          max_fragments=2, max_words=25, min_words=10, **headline_options))
+            .order_by('-rank', F('date').desc(nulls_last=True), 'pk'))
+
+
+def schedule_related_search_updates(instance):
+    """
+    Queues re-indexing of the entries whose text includes ``instance``'s name:
+    a Person's artifacts, projects, and news; a Keyword's artifacts and
+    projects; a Project's artifacts and news (projects name-tag them). Call it
+    before a delete, while the links still exist.
+    """
+    if isinstance(instance, Person):
+        linked = {
+            SearchEntry.Kind.PUBLICATION: Publication.objects.filter(authors=instance),
+            SearchEntry.Kind.TALK: Talk.objects.filter(authors=instance),
+            SearchEntry.Kind.PROJECT: Project.objects.filter(projectrole__person=instance),
+            SearchEntry.Kind.NEWS: News.objects.filter(Q(author=instance) | Q(people=instance)),
+        }
+    elif isinstance(instance, Keyword):
+        linked = {
+            SearchEntry.Kind.PUBLICATION: Publication.objects.filter(keywords=instance),
+            SearchEntry.Kind.TALK: Talk.objects.filter(keywords=instance),
+            SearchEntry.Kind.PROJECT: Project.objects.filter(keywords=instance),
+        }
+    elif isinstance(instance, Project):
+        linked = {
+            SearchEntry.Kind.PUBLICATION: Publication.objects.filter(projects=instance),
+            SearchEntry.Kind.TALK: Talk.objects.filter(projects=instance),
+            SearchEntry.Kind.NEWS: News.objects.filter(project=instance),
+        }
+    else:
+        return
+    for kind, queryset in linked.items():
+        schedule_search_index_update(kind, set(queryset.values_list('pk', flat=True)))
@@ -0,0 +1,418 @@
+"""
+The container-startup maintenance steps, run by ``run_startup_maintenance``.
+
+docker-entrypoint.sh used to invoke each of these as its own
+``python manage.py <command>``: ~20 interpreter starts, each re-importing Django
+and re-opening a DB connection, strictly in series, and every one of them doing
+its full scan even though almost all are idempotent backfills that found nothing
+to do on the previous deploy. Here they run in one process instead:
+
+* Each :class:`StartupStep` declares a cheap *fingerprint* of what it reads:
+  per-model row count / max pk / max auto_now timestamp, the mtimes of the media
+  directories it scans, and a hash of the command's own source plus the whole
+  ``website`` package's Python source (so shipping a new version of a step
+  always re-runs it, including when the change is in a helper it calls, e.g.
+  ``Artifact.generate_filename`` or ``name_utils``). A step whose fingerprint matches
+  the one recorded after its last successful run (see
+  :class:`~website.models.StartupStepRun`) is skipped.
+* Steps name the steps they must run ``after``; everything else runs
+  concurrently on a small thread pool. Two steps may only run concurrently if
+  neither writes what the other reads -- otherwise one of them records a
+  fingerprint of a half-finished state -- so when adding a step, add an
+  ``after`` edge for every such overlap.
+* Every run (including skips and failures) records its duration, so the
+  ``StartupStepRun`` table shows where deploy time goes.
+
+As in the old shell script, a failing step is logged and recorded but doesn't
+stop the steps that come after it, and never blocks the server from starting.
+"""
+
+import hashlib
+import importlib
+import inspect
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command, get_commands
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from website.models import StartupStepRun
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+class StartupStep:
+    """
+    One management command run at container start, plus what its fingerprint
+    covers.
+
+    ``models`` are ``"app_label.ModelName"`` strings; ``media_dirs`` are paths
+    relative to MEDIA_ROOT. Most of our models have no auto_now field, so an edit
+    doesn't move a model's count/max pk: ``columns`` maps a model label to the
+    fields the step actually inspects, whose values are hashed too (one narrow
+    values_list() scan -- still far cheaper than the step itself). Set ``daily``
+    for steps whose outcome depends on today's date (e.g. closing roles that
+    ended yesterday), so they re-run at least once a day even when no row changed.
+    """
+
+    def __init__(self, command, models=(), columns=None, media_dirs=(), after=(), daily=False,
+                 args=(), options=None):
+        self.name = command
+        self.command = command
+        self.models = tuple(models)
+        self.columns = columns or {}
+        self.media_dirs = tuple(media_dirs)
+        self.after = tuple(after)
+        self.daily = daily
+        self.args = tuple(args)
+        self.options = options or {}
+
+    def __repr__(self):
+        return f"<StartupStep {self.name}>"
+
+    def get_fingerprint_parts(self):
+        """Returns the list of values hashed into this step's fingerprint. Override to add more."""
+        parts = [('source', _get_command_source_hash(self.command)), ('app_source', _get_app_source_hash())]
+        for label in self.models:
+            parts.append((label, _get_model_state(apps.get_model(label))))
+        for label, fields in self.columns.items():
+            parts.append((label, fields, _get_column_hash(apps.get_model(label), fields)))
+        for media_dir in self.media_dirs:
+            parts.append((media_dir, _get_dir_mtime(os.path.join(settings.MEDIA_ROOT, media_dir))))
+        if self.daily:
+            parts.append(('date', date.today().isoformat()))
+        return parts
+
+    def get_fingerprint(self):
+        """Returns a sha256 hex digest of :meth:`get_fingerprint_parts`."""
+        return hashlib.sha256(repr(self.get_fingerprint_parts()).encode('utf-8')).hexdigest()
+
+    def run(self):
+        call_command(self.command, *self.args, **self.options)
+
+
+class SchemaStep(StartupStep):
+    """A step that inspects the DB schema, so it only needs to re-run after a migration."""
+
+    def get_fingerprint_parts(self):
+        recorder = MigrationRecorder.Migration.objects.aggregate(count=Count('pk'), max_pk=Max('pk'))
+        return super().get_fingerprint_parts() + [('migrations', (recorder['count'], recorder['max_pk']))]
+
+
+def _get_model_state(model):
+    """
+    Returns (row count, max pk, max auto_now timestamp) for model in one
+    aggregate query. The count and max pk catch inserts and deletes; the
+    timestamp (for models that have an auto_now field) catches edits.
+    """
+    aggregates = {'count': Count('pk'), 'max_pk': Max('pk')}
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False):
+            aggregates[f'max_{field.name}'] = Max(field.name)
+    state = model.objects.aggregate(**aggregates)
+    return tuple(str(state[key]) for key in sorted(state))
+
+
+def _get_column_hash(model, fields):
+    """Returns a sha256 over the given fields of every row, in pk order."""
+    digest = hashlib.sha256()
+    for row in model.objects.order_by('pk').values_list('pk', *fields).iterator(chunk_size=2000):
+        digest.update(repr(row).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _get_dir_mtime(path):
+    """Returns the directory's mtime in ns (None if it doesn't exist). Changes when an entry is added, removed, or renamed."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+_command_source_hashes = {}
+
+
+def _get_command_source_hash(command):
+    """Returns a sha256 of the management command's source file, cached per process."""
+    if command not in _command_source_hashes:
+        app_name = get_commands().get(command)
+        digest = ''
+        if app_name:
+            module = importlib.import_module(f'{app_name}.management.commands.{command}')
+            with open(inspect.getsourcefile(module), 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        _command_source_hashes[command] = digest
+    return _command_source_hashes[command]
+
+
+_app_source_hash = None
+
+# Not code any step runs: the tests, and the migrations, which are regenerated per
+# environment here (SchemaStep fingerprints the applied migrations instead)
+_APP_SOURCE_EXCLUDED_DIRS = {'tests', 'migrations', '__pycache__'}
+
+
+def _get_app_source_hash():
+    """
+    Returns a sha256 over every .py file in the website package (paths and
+    contents, in sorted order), cached per process. Most steps' logic lives in
+    models and utils rather than in the command file, so any code change
+    re-runs every step once, the way every step used to run on every start.
+    """
+    global _app_source_hash
+    if _app_source_hash is None:
+        package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        digest = hashlib.sha256()
+        for dir_path, dir_names, filenames in os.walk(package_dir):
+            dir_names[:] = sorted(name for name in dir_names if name not in _APP_SOURCE_EXCLUDED_DIRS)
+            for filename in sorted(filenames):
+                if filename.endswith('.py'):
+                    path = os.path.join(dir_path, filename)
+                    digest.update(os.path.relpath(path, package_dir).encode('utf-8'))
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+        _app_source_hash = digest.hexdigest()
+    return _app_source_hash
+
+
+ARTIFACT_MODELS = ('website.Publication', 'website.Talk', 'website.Poster')
+ARTIFACT_MEDIA_DIRS = ('publications', 'publications/images', 'talks', 'talks/images',
+                       'posters', 'posters/images')
+# The sortedm2m author tables; a standardized filename needs a first author
+ARTIFACT_AUTHOR_MODELS = ('website.Publication_authors', 'website.Talk_authors', 'website.Poster_authors')
+# The file columns the artifact cleanups/backfills inspect
+ARTIFACT_FILE_COLUMNS = {
+    label: ('pdf_file', 'raw_file', 'thumbnail', 'original_pdf_filename', 'original_raw_filename')
+    for label in ARTIFACT_MODELS
+}
+# The standardized filename is also built from the title, date, and forum name
+ARTIFACT_NAMING_COLUMNS = {
+    label: ('title', 'date', 'forum_name') + columns
+    for label, columns in ARTIFACT_FILE_COLUMNS.items()
+}
+
+# Runs before everything else: the steps below read artifact authors through the
+# sortedm2m tables it repairs.
+SCHEMA_FIX_STEP = 'fix_sortedm2m_columns'
+
+# Ordered as they appeared in docker-entrypoint.sh; the order only matters as a
+# tie-break among steps that are ready at the same time.
+STARTUP_STEPS = [
+    SchemaStep(SCHEMA_FIX_STEP),
+    StartupStep('delete_unused_files',
+                models=ARTIFACT_MODELS, columns=ARTIFACT_FILE_COLUMNS, media_dirs=ARTIFACT_MEDIA_DIRS),
+    StartupStep('thumbnail_cleanup',
+                models=('easy_thumbnails.Source', 'easy_thumbnails.Thumbnail'),
+                after=('delete_unused_files',)),
+    StartupStep('generate_slugs_for_old_news_items', models=('website.News',),
+                columns={'website.News': ('slug',)}),
+    # Make legacy news images responsive (#1269)
+    StartupStep('normalize_news_image_styles', models=('website.News',),
+                columns={'website.News': ('content',)},
+                after=('generate_slugs_for_old_news_items',)),
+    StartupStep('auto_close_project_roles',
+                models=('website.Person', 'website.Position', 'website.ProjectRole'),
+                columns={'website.Position': ('end_date',), 'website.ProjectRole': ('end_date',)},
+                daily=True),
+    # Strip trailing years from Talk/Poster/Publication forum names (#1390)
+    StartupStep('remove_year_from_forum_name', models=ARTIFACT_MODELS,
+                columns={label: ('forum_name',) for label in ARTIFACT_MODELS}),
+    # Opens each Publication.pdf_file, so it waits for the steps that rename
+    # those files on disk and in the DB.
+    StartupStep('backfill_num_pages', models=('website.Publication',),
+                columns={'website.Publication': ('num_pages', 'pdf_file')},
+                after=('remove_year_from_forum_name', 'repair_diverged_artifact_filenames')),
+    # Only builds rows whose cache is still NULL. Runs after the forum-name and
+    # page-count backfills, which both feed into the citation text (and so,
+    # through backfill_num_pages, after the file renames too).
+    StartupStep('rebuild_citation_cache', models=('website.Publication',),
+                columns={'website.Publication': ('bibtex_cache',)},
+                after=('remove_year_from_forum_name', 'backfill_num_pages')),
+    StartupStep('backfill_project_visibility', models=('website.Project',),
+                columns={'website.Project': ('is_visible',)}),
+    # Recover original upload filenames for never-renamed artifacts (#1391)
+    StartupStep('backfill_original_filenames',
+                models=ARTIFACT_MODELS, columns=ARTIFACT_FILE_COLUMNS, media_dirs=ARTIFACT_MEDIA_DIRS,
+                after=('delete_unused_files',)),
+    # De-collide historical url_names (#1206) and fill the people search columns
+    StartupStep('recompute_url_names', models=('website.Person',),
+                columns={'website.Person': ('first_name', 'middle_name', 'last_name', 'url_name',
+                                            'name_key', 'search_name')}),
+    # Redirect renamed project slugs (#944)
+    StartupStep('seed_project_aliases', models=('website.Project', 'website.ProjectAlias'),
+                after=('backfill_project_visibility',)),
+    # Link talks/videos/posters to their publication's projects (#649)
+    # Only the publications logged in PublicationProjectsChange are looked at,
+    # so the log is part of its input.
+    StartupStep('propagate_publication_projects',
+                models=ARTIFACT_MODELS + ('website.Video', 'website.Project', 'website.PublicationProjectsChange')),
+    # Creates/refreshes the Editors and Contributors admin groups (#1125).
+    # Permissions change with the schema, so migrations are part of its input,
+    # and hashing the group<->permission rows means a permission hand-edited in
+    # the admin is still reverted on the next start.
+    SchemaStep('setup_admin_groups', models=('auth.Group', 'auth.Permission'),
+               columns={'auth.Group_permissions': ('group', 'permission')}),
+    # Renames legacy talk/poster/pub files to the standardized scheme
+    # (#1401/#1404). The #1404 type-suffix migration ran as a --dry-run first
+    # (2.29.0) so the scope could be reviewed in prod's debug.log (188 talks + 11
+    # posters, zero publications); the one-time corpus rename went live in
+    # 2.29.1. Idempotent -- on-scheme rows are skipped -- so it stays for future rows.
+    StartupStep('restandardize_artifact_filenames',
+                models=ARTIFACT_MODELS + ARTIFACT_AUTHOR_MODELS,
+                columns={**ARTIFACT_NAMING_COLUMNS, 'website.Person': ('last_name',)},
+                media_dirs=ARTIFACT_MEDIA_DIRS,
+                after=('backfill_original_filenames', 'remove_year_from_forum_name',
+                       'thumbnail_cleanup', 'seed_sidewalk_participants')),
+    # Recovers artifacts whose files were renamed on disk but not in the DB
+    # (#1390 dotted-name bug). Promoted from --dry-run in 2.29.1 after reviewing
+    # prod's inventory: 3 recoverable orphans; truly-missing files are logged as
+    # unrecoverable warnings for manual review. Divergence-gated and idempotent.
+    StartupStep('repair_diverged_artifact_filenames',
+                models=ARTIFACT_MODELS, columns=ARTIFACT_NAMING_COLUMNS, media_dirs=ARTIFACT_MEDIA_DIRS,
+                after=('restandardize_artifact_filenames',)),
+    # Backfills Project Sidewalk contributors from the NSF Crowd+AI annual reports
+    StartupStep('seed_sidewalk_participants',
+                models=('website.Person', 'website.Position', 'website.Project', 'website.ProjectRole'),
+                after=('auto_close_project_roles', 'recompute_url_names', 'backfill_project_visibility')),
+    # Precomputes the project page's related projects. Shared publications and
+    # people are similarity features, so it runs after the steps that add them.
+    StartupStep('rebuild_project_similarity',
+                models=('website.Project', 'website.ProjectRole', 'website.Publication', 'website.Grant',
+                        'website.ProjectUmbrella', 'website.Keyword'),
+                after=('propagate_publication_projects', 'seed_sidewalk_participants',
+                       'backfill_project_visibility')),
+    # Rebuilds the site search index. Indexed text includes author, keyword, and
+    # project names, so it runs after the steps that add or rename them.
+    StartupStep('rebuild_search_index',
+                models=('website.Publication', 'website.Talk', 'website.Project', 'website.News',
+                        'website.Person', 'website.Keyword', 'website.ProjectRole', 'website.SearchEntry'),
+                after=('propagate_publication_projects', 'seed_sidewalk_participants',
+                       'backfill_project_visibility', 'remove_year_from_forum_name',
+                       'generate_slugs_for_old_news_items')),
+    # Pre-generates the cropped thumbnails the public API serves (#1432). Without
+    # it, the first API request after a deploy generates every derivative inline.
+    StartupStep('warm_api_thumbnails',
+                models=('website.Person', 'website.Project'), media_dirs=('person', 'projects'),
+                after=('thumbnail_cleanup', 'backfill_project_visibility', 'recompute_url_names',
+                       'seed_sidewalk_participants')),
+]
+
+for _step in STARTUP_STEPS[1:]:
+    if SCHEMA_FIX_STEP not in _step.after:
+        _step.after = (SCHEMA_FIX_STEP,) + _step.after
+
+
+def _run_step(step, force=False, dry_run=False):
+    """
+    Runs (or skips) one step and records the outcome. Returns the StartupStepRun
+    status. Never raises: a failure is logged and recorded, like a non-zero
+    exit from the old per-command shell lines.
+    """
+    started_at = timezone.now()
+    start_time = time.perf_counter()
+    record = StartupStepRun.objects.filter(name=step.name).first()
+    error = ''
+
+    try:
+        fingerprint = step.get_fingerprint()
+        if not force and record and record.success_fingerprint == fingerprint:
+            status = StartupStepRun.STATUS_SKIPPED
+        elif dry_run:
+            _logger.info(f"[dry-run] Would run '{step.name}'")
+            return None
+        else:
+            _logger.info(f"Running '{step.name}'")
+            step.run()
+            status = StartupStepRun.STATUS_SUCCEEDED
+            # Fingerprint the state the step *left behind*, so its own writes
+            # (a backfill filling rows, a cleanup removing files) don't make the
+            # next start run it again.
+            fingerprint = step.get_fingerprint()
+    except Exception as e:
+        status = StartupStepRun.STATUS_FAILED
+        error = f"{type(e).__name__}: {e}"
+        _logger.exception(f"Startup step '{step.name}' failed")
+
+    if dry_run:
+        return status
+
+    duration = time.perf_counter() - start_time
+    defaults = {
+        'last_status': status,
+        'last_started_at': started_at,
+        'last_duration_seconds': duration,
+        'last_error': error,
+    }
+    if status == StartupStepRun.STATUS_SUCCEEDED:
+        defaults['success_fingerprint'] = fingerprint
+        defaults['last_success_at'] = timezone.now()
+    StartupStepRun.objects.update_or_create(name=step.name, defaults=defaults)
+
+    _logger.info(f"Startup step '{step.name}' {status} in {duration:0.2f}s")
+    return status
+
+
+def _run_step_in_thread(step, force, dry_run):
+    """Runs a step on a pool thread and closes that thread's DB connections afterwards."""
+    try:
+        return _run_step(step, force=force, dry_run=dry_run)
+    finally:
+        connections.close_all()
+
+
+def run_startup_steps(steps=None, workers=4, force=False, dry_run=False):
+    """
+    Runs steps (default: STARTUP_STEPS) respecting their ``after`` edges, with up
+    to ``workers`` steps at a time, and returns {step name: status}. A step
+    starts once every step it comes after has finished, whatever the outcome.
+    ``after`` names that aren't in ``steps`` (e.g. when running a subset) are
+    ignored. With workers <= 1 everything runs in order on the calling thread.
+    """
+    steps = list(STARTUP_STEPS if steps is None else steps)
+    names = {step.name for step in steps}
+    pending = {step.name: {dep for dep in step.after if dep in names} for step in steps}
+    by_name = {step.name: step for step in steps}
+    results = {}
+
+    def ready():
+        return [step for step in steps if step.name in pending and not pending[step.name]]
+
+    def finish(name, status):
+        results[name] = status
+        for deps in pending.values():
+            deps.discard(name)
+
+    if workers <= 1:
+        while pending:
+            batch = ready()
+            if not batch:
+                raise ValueError(f"Startup steps have a dependency cycle: {sorted(pending)}")
+            step = batch[0]
+            del pending[step.name]
+            finish(step.name, _run_step(step, force=force, dry_run=dry_run))
+        return results
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while pending or running:
+            for step in ready():
+                del pending[step.name]
+                running[executor.submit(_run_step_in_thread, step, force, dry_run)] = step.name
+            if not running:
+                raise ValueError(f"Startup steps have a dependency cycle: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(running.pop(future), future.result())
+
+    # Preserve declaration order in the summary
+    return {name: results[name] for name in by_name}
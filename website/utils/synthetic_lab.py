@@ -0,0 +1,356 @@
+"""
+Synthetic lab data at a multiple of production size, for benchmarks and local
+load testing (``seed_synthetic_lab``, ``benchmark_pages``).
+
+:func:`seed_synthetic_lab` adds ``scale`` x :data:`PRODUCTION_SIZE` rows of
+people and their positions, projects and project roles, publications, talks,
+videos, grants and sponsors, news, awards, keywords, and banners, wired up the
+way the public pages walk them: ordered author lists (sortedm2m through rows),
+project tags, keywords, news people, award recipients. Field values come from
+the factory_boy factories in ``website/tests/factories.py``; rows are written
+with ``bulk_create`` in batches, so 100x production takes seconds to minutes
+rather than the hours one ``save()`` per row would.
+
+Distributions follow the real data rather than being uniform: most papers have
+3-6 authors with a lab member first or last, most are conference papers,
+keyword use is long-tailed (a few keywords tag most artifacts), about a third of
+people are current members, and publication volume grows over the years.
+
+``bulk_create`` skips ``save()`` and its signals, so what ``save()`` would
+derive is set here instead (Person's url_name / name_key / search_name, News
+slugs, Project visibility, Publication num_pages). File fields all point at
+the shared placeholders written by :func:`write_placeholder_media` (a real
+JPEG and a real one-page PDF), so thumbnails, crops, and PDF links work without
+a file per row. Derived tables (search index, project similarity, citation
+caches) are left to their rebuild commands or to first render; cached pages
+are invalidated by bumping every ContentVersion scope at the end.
+
+Calls are additive: seeding scale 1 and then scale 9 leaves 10x production.
+factory_boy is a test dependency, so it is imported only when seeding.
+"""
+
+import io
+import random
+import string
+from datetime import date, timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.text import slugify
+from PIL import Image
+
+from website.models import (
+    Award,
+    Banner,
+    ContentVersion,
+    Grant,
+    Keyword,
+    News,
+    Person,
+    Position,
+    Project,
+    ProjectRole,
+    Publication,
+    Sponsor,
+    Talk,
+    Video,
+)
+from website.models.position import Role, Title
+from website.models.project_role import LeadProjectRoleTypes
+from website.models.publication import PubType
+from website.models.talk import TalkType
+from website.utils.name_utils import build_person_search_name, normalize_person_name
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+# Roughly the production row counts (2026); scale 1 seeds this much
+PRODUCTION_SIZE = {
+    'people': 450,
+    'projects': 90,
+    'publications': 320,
+    'talks': 180,
+    'videos': 60,
+    'sponsors': 25,
+    'grants': 70,
+    'news': 280,
+    'awards': 60,
+    'keywords': 300,
+    'banners': 40,
+}
+
+_BATCH_SIZE = 2000
+
+_FIRST_YEAR = 2012
+
+# Shared placeholder media (relative to MEDIA_ROOT), written once by
+# write_placeholder_media() and referenced by every synthetic row
+PLACEHOLDER_IMAGE = 'synthetic/placeholder.jpg'
+PLACEHOLDER_PORTRAIT = 'synthetic/placeholder_portrait.jpg'
+PLACEHOLDER_PDF = 'synthetic/placeholder.pdf'
+
+# (value, weight) distributions, loosely matching the production data
+_AUTHOR_COUNTS = [(1, 3), (2, 8), (3, 18), (4, 24), (5, 20), (6, 12), (7, 8), (8, 5), (12, 2)]
+_PUB_TYPES = [(PubType.CONFERENCE, 55), (PubType.JOURNAL, 12), (PubType.WORKSHOP, 8), (PubType.POSTER, 7),
+              (PubType.DEMO, 4), (PubType.WIP, 4), (PubType.LATE_BREAKING, 3), (PubType.ARTICLE, 2),
+              (PubType.BOOK_CHAPTER, 1), (PubType.PHD_DISSERTATION, 2), (PubType.MS_THESIS, 1),
+              (PubType.DOCTORAL_CONSORTIUM, 1)]
+_TALK_TYPES = [(TalkType.CONFERENCE_TALK, 60), (TalkType.INVITED_TALK, 20), (TalkType.GUEST_LECTURE, 8),
+               (TalkType.KEYNOTE_TALK, 4), (TalkType.QUALS_TALK, 4), (TalkType.MS_DEFENSE, 2),
+               (TalkType.PHD_DEFENSE, 2)]
+_TITLES = [(Title.UGRAD, 40), (Title.PHD_STUDENT, 20), (Title.MS_STUDENT, 12), (Title.HIGH_SCHOOL, 6),
+           (Title.SOFTWARE_DEVELOPER, 5), (Title.DESIGNER, 4), (Title.POST_DOC, 4),
+           (Title.RESEARCH_SCIENTIST, 3), (Title.ASSISTANT_PROF, 2), (Title.FULL_PROF, 1), (Title.UNKNOWN, 3)]
+
+
+def write_placeholder_media():
+    """
+    Writes the placeholder JPEGs and PDF to default storage, unless they're
+    already there, and returns the paths written. Pillow renders both, so the
+    PDF is a real one-page document that thumbnailing and page counting accept.
+    """
+    written = []
+    for path, size, image_format in ((PLACEHOLDER_IMAGE, (1600, 900), 'JPEG'),
+                                     (PLACEHOLDER_PORTRAIT, (600, 600), 'JPEG'),
+                                     (PLACEHOLDER_PDF, (850, 1100), 'PDF')):
+        if default_storage.exists(path):
+            continue
+        buffer = io.BytesIO()
+        Image.new('RGB', size, (75, 46, 131)).save(buffer, format=image_format)
+        default_storage.save(path, ContentFile(buffer.getvalue()))
+        written.append(path)
+    return written
+
+
+def _letters(number):
+    """A lowercase, letters-only serial (project URLs only allow letters and dashes)."""
+    letters = ''
+    while True:
+        number, remainder = divmod(number, 26)
+        letters = string.ascii_lowercase[remainder] + letters
+        if number == 0:
+            return letters
+
+
+def _choose(rng, distribution):
+    values, weights = zip(*distribution)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _random_date(rng, recent_bias=1.0):
+    """A date since _FIRST_YEAR; ``recent_bias`` > 1 skews toward recent years (growing output)."""
+    span = (date.today() - date(_FIRST_YEAR, 1, 1)).days
+    return date(_FIRST_YEAR, 1, 1) + timedelta(days=int(span * rng.random() ** (1 / recent_bias)))
+
+
+def _count(scale, key):
+    return max(1, round(PRODUCTION_SIZE[key] * scale))
+
+
+def _link(model, field_name, pairs):
+    """Bulk-inserts m2m rows for ``(source, target)`` pairs, keeping their order in sortedm2m fields."""
+    field = model._meta.get_field(field_name)
+    through = field.remote_field.through
+    source_column = f"{field.m2m_field_name()}_id"
+    target_column = f"{field.m2m_reverse_field_name()}_id"
+    sort_field = getattr(field, 'sort_value_field_name', None)
+
+    rows = []
+    position = {}
+    for source, target in pairs:
+        row = through(**{source_column: source.pk, target_column: target.pk})
+        if sort_field:
+            position[source.pk] = position.get(source.pk, 0) + 1
+            setattr(row, sort_field, position[source.pk])
+        rows.append(row)
+    through.objects.bulk_create(rows, batch_size=_BATCH_SIZE, ignore_conflicts=True)
+    return len(rows)
+
+
+def _pick(rng, population, low, high):
+    return rng.sample(population, min(len(population), rng.randint(low, high)))
+
+
+def _pick_keywords(rng, keywords, keyword_weights, low, high):
+    """Long-tailed keyword use: a keyword's weight falls off with its rank."""
+    picked = set(rng.choices(keywords, weights=keyword_weights, k=rng.randint(low, high)))
+    return sorted(picked, key=lambda keyword: keyword.pk)
+
+
+def _pick_authors(rng, members, people):
+    """An ordered author list: mostly outside collaborators, with a lab member first or last."""
+    num_others = _choose(rng, _AUTHOR_COUNTS) - 1
+    member = rng.choice(members)
+    authors = [person for person in _pick(rng, people, num_others + 1, num_others + 1) if person != member][:num_others]
+    authors.insert(0 if rng.random() < 0.6 else len(authors), member)
+    return authors
+
+
+def _seed_people(factories, rng, num_people, serial):
+    people = []
+    for index, person in enumerate(factories.PersonFactory.build_batch(
+            num_people, image=PLACEHOLDER_PORTRAIT, easter_egg=PLACEHOLDER_PORTRAIT)):
+        name_key = normalize_person_name(person.first_name, person.last_name)
+        person.url_name = f"{name_key}{serial + index}"
+        person.name_key = name_key
+        person.search_name = build_person_search_name(person.first_name, None, person.last_name)
+        people.append(person)
+    people = Person.objects.bulk_create(people, batch_size=_BATCH_SIZE)
+
+    positions = []
+    members = []
+    for person in people:
+        start_date = _random_date(rng, recent_bias=1.5)
+        # About a third are current members; the rest have moved on
+        end_date = None if rng.random() < 0.3 else min(date.today(), start_date + timedelta(days=rng.randint(90, 2000)))
+        role = Role.MEMBER if rng.random() < 0.8 else Role.COLLABORATOR
+        positions.append(Position(person=person, start_date=start_date, end_date=end_date, role=role,
+                                  title=_choose(rng, _TITLES)))
+        if role == Role.MEMBER:
+            members.append(person)
+    Position.objects.bulk_create(positions, batch_size=_BATCH_SIZE)
+    return people, members or people
+
+
+def _seed_projects(factories, rng, num_projects, serial, people, keywords, keyword_weights):
+    projects = []
+    for index, project in enumerate(factories.ProjectFactory.build_batch(num_projects)):
+        project.short_name = f"synthetic-{_letters(serial + index)}"
+        project.is_visible = rng.random() < 0.8
+        project.start_date = _random_date(rng)
+        project.end_date = None if rng.random() < 0.4 else project.start_date + timedelta(days=rng.randint(365, 2500))
+        project.gallery_image = PLACEHOLDER_IMAGE
+        project.summary = f"A synthetic project about {project.name.lower()}."
+        projects.append(project)
+    projects = Project.objects.bulk_create(projects, batch_size=_BATCH_SIZE)
+
+    roles = []
+    for project in projects:
+        for rank, person in enumerate(_pick(rng, people, 3, 15)):
+            start_date = project.start_date or _random_date(rng)
+            lead_role = (LeadProjectRoleTypes.PI if rank == 0
+                         else LeadProjectRoleTypes.STUDENT_LEAD if rank == 1 else None)
+            roles.append(ProjectRole(
+                person=person, project=project, start_date=start_date, lead_project_role=lead_role,
+                end_date=project.end_date or (None if rng.random() < 0.5 else start_date + timedelta(days=365))))
+    ProjectRole.objects.bulk_create(roles, batch_size=_BATCH_SIZE)
+    _link(Project, 'keywords', [(project, keyword) for project in projects
+                                for keyword in _pick_keywords(rng, keywords, keyword_weights, 1, 5)])
+    return projects
+
+
+def _seed_artifacts(factory_class, model, rng, num_artifacts, people, members, projects, keywords,
+                    keyword_weights, build_fields):
+    artifacts = factory_class.build_batch(num_artifacts, pdf_file=PLACEHOLDER_PDF, thumbnail=PLACEHOLDER_IMAGE)
+    for artifact in artifacts:
+        artifact.date = _random_date(rng, recent_bias=1.5)
+        for name, value in build_fields(rng).items():
+            setattr(artifact, name, value)
+    artifacts = model.objects.bulk_create(artifacts, batch_size=_BATCH_SIZE)
+    _link(model, 'authors', [(artifact, person) for artifact in artifacts
+                             for person in _pick_authors(rng, members, people)])
+    _link(model, 'projects', [(artifact, project) for artifact in artifacts for project in _pick(rng, projects, 1, 2)])
+    _link(model, 'keywords', [(artifact, keyword) for artifact in artifacts
+                              for keyword in _pick_keywords(rng, keywords, keyword_weights, 0, 5)])
+    return artifacts
+
+
+def _publication_fields(rng):
+    return {'pub_venue_type': _choose(rng, _PUB_TYPES), 'num_pages': rng.randint(4, 14)}
+
+
+def _talk_fields(rng):
+    return {'talk_type': _choose(rng, _TALK_TYPES)}
+
+
+def _grant_fields(rng):
+    return {'funding_amount': rng.randrange(50_000, 3_000_000, 1000), 'grant_id': str(rng.randint(1000000, 9999999))}
+
+
+@transaction.atomic
+def seed_synthetic_lab(scale=1, seed=1):
+    """
+    Adds ``scale`` x :data:`PRODUCTION_SIZE` rows (fractions allowed, at least
+    one row of each kind) and returns ``{kind: rows added}``. Call
+    :func:`write_placeholder_media` too if pages will render the rows' files.
+    """
+    import factory.random
+    from website.tests import factories
+
+    factory.random.reseed_random(seed)
+    rng = random.Random(seed)
+    serial = Person.objects.count() + Project.objects.count()
+
+    keywords = Keyword.objects.bulk_create(
+        [Keyword(keyword=f"synthetic keyword {serial + index}") for index in range(_count(scale, 'keywords'))],
+        batch_size=_BATCH_SIZE)
+    keyword_weights = [1 / (rank + 1) for rank in range(len(keywords))]
+    people, members = _seed_people(factories, rng, _count(scale, 'people'), serial)
+    projects = _seed_projects(factories, rng, _count(scale, 'projects'), serial, people, keywords, keyword_weights)
+
+    publications = _seed_artifacts(factories.PublicationFactory, Publication, rng, _count(scale, 'publications'),
+                                   people, members, projects, keywords, keyword_weights, _publication_fields)
+    talks = _seed_artifacts(factories.TalkFactory, Talk, rng, _count(scale, 'talks'),
+                            people, members, projects, keywords, keyword_weights, _talk_fields)
+
+    videos = Video.objects.bulk_create(factories.VideoFactory.build_batch(_count(scale, 'videos')),
+                                       batch_size=_BATCH_SIZE)
+    _link(Video, 'projects', [(video, project) for video in videos for project in _pick(rng, projects, 1, 2)])
+
+    sponsors = Sponsor.objects.bulk_create(
+        [Sponsor(name=f"Synthetic Foundation {serial + index}", short_name=f"SF{serial + index}",
+                 icon=PLACEHOLDER_IMAGE)
+         for index in range(_count(scale, 'sponsors'))],
+        batch_size=_BATCH_SIZE)
+    grants = Grant.objects.bulk_create(
+        [Grant(title=f"Synthetic grant {serial + index}", date=_random_date(rng), sponsor=rng.choice(sponsors),
+               end_date=None if rng.random() < 0.3 else _random_date(rng), pdf_file=PLACEHOLDER_PDF,
+               **_grant_fields(rng))
+         for index in range(_count(scale, 'grants'))],
+        batch_size=_BATCH_SIZE)
+    _link(Grant, 'projects', [(grant, project) for grant in grants for project in _pick(rng, projects, 1, 3)])
+    _link(Grant, 'authors', [(grant, person) for grant in grants for person in _pick(rng, members, 1, 3)])
+
+    news_items = factories.NewsItemFactory.build_batch(_count(scale, 'news'), image=PLACEHOLDER_IMAGE)
+    for index, news in enumerate(news_items):
+        news.slug = f"{slugify(news.title)[:200]}-{serial + index}"
+        news.author = rng.choice(members)
+        news.date = _random_date(rng, recent_bias=1.5)
+    news_items = News.objects.bulk_create(news_items, batch_size=_BATCH_SIZE)
+    _link(News, 'people', [(news, person) for news in news_items for person in _pick(rng, people, 0, 4)])
+    _link(News, 'project', [(news, project) for news in news_items for project in _pick(rng, projects, 0, 2)])
+
+    awards = Award.objects.bulk_create(factories.AwardFactory.build_batch(_count(scale, 'awards')),
+                                       batch_size=_BATCH_SIZE)
+    _link(Award, 'recipients', [(award, person) for award in awards for person in _pick(rng, members, 1, 3)])
+    _link(Award, 'projects', [(award, project) for award in awards for project in _pick(rng, projects, 0, 1)])
+
+    banners = Banner.objects.bulk_create(
+        [Banner(image=PLACEHOLDER_IMAGE, title=f"Synthetic banner {serial + index}",
+                project=rng.choice(projects), landing_page=rng.random() < 0.5, favorite=rng.random() < 0.2)
+         for index in range(_count(scale, 'banners'))],
+        batch_size=_BATCH_SIZE)
+
+    counts = {
+        'people': len(people),
+        'projects': len(projects),
+        'publications': len(publications),
+        'talks': len(talks),
+        'videos': len(videos),
+        'sponsors': len(sponsors),
+        'grants': len(grants),
+        'news': len(news_items),
+        'awards': len(awards),
+        'keywords': len(keywords),
+        'banners': len(banners),
+    }
+    # bulk_create sends no post_save, so none of the bump_*_content_version
+    # receivers ran: bump every scope here, or the cached project listing, footer
+    # news, and publication fragments keep serving the pre-seed content.
+    ContentVersion.bump(ContentVersion.PROJECTS, ContentVersion.NEWS, ContentVersion.PUBLICATIONS)
+
+    _logger.debug(f"Seeded synthetic lab data at scale {scale}: {counts}")
+    return counts
@@ -0,0 +1,92 @@
+"""
+The upload handler every multipart request goes through (``FILE_UPLOAD_HANDLERS``
+in settings.py).
+
+Django's defaults keep uploads under 2.5 MB in worker memory and spool larger
+ones to ``/tmp``, and nothing looks at the bytes until the form's validators run
+(website/utils/upload_validators.py) -- after the whole poster, ``.key`` deck or
+phone headshot has been received. ``StreamingUploadHandler`` instead:
+
+* checks the magic bytes of the first chunk (``get_header_error``), so a
+  mislabelled file is dropped before the rest of it is read;
+* enforces a per-field size limit (``UPLOAD_MAX_SIZE_MB`` and
+  ``UPLOAD_FIELD_MAX_SIZE_MB``), using the declared length when the browser
+  sends one and the running total otherwise;
+* streams every chunk straight to a temporary file in ``FILE_UPLOAD_TEMP_DIR``,
+  which lives inside MEDIA_ROOT, so when the storage saves the upload
+  (``FileSystemStorage._save`` -> ``file_move_safe``) it is a rename on the
+  same filesystem rather than a second copy.
+
+A rejected file is skipped (``SkipFile``): it never reaches ``request.FILES``,
+its temporary file is removed, and the admin shows an error message saying why.
+The model validators still run on whatever is accepted, so this is an early
+exit, not a replacement for them.
+"""
+
+import os
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+
+from website.utils.upload_validators import get_header_error
+
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+# How much of the first chunk the magic-byte check looks at (same as _read_header)
+_HEADER_SIZE = 1024
+
+
+def get_upload_max_size(field_name):
+    """
+    Returns the size limit in bytes for an upload posted as ``field_name``.
+
+    Admin inlines prefix their fields (``photo_set-0-picture``), so the limit is
+    looked up by the name after the last dash, falling back to
+    ``UPLOAD_MAX_SIZE_MB``.
+    """
+    base_name = field_name.rsplit('-', 1)[-1]
+    max_size_mb = settings.UPLOAD_FIELD_MAX_SIZE_MB.get(base_name, settings.UPLOAD_MAX_SIZE_MB)
+    return int(max_size_mb * 1024 * 1024)
+
+
+class StreamingUploadHandler(TemporaryFileUploadHandler):
+    """Validates and size-checks uploads while streaming them into MEDIA_ROOT (see the module docstring)."""
+
+    def new_file(self, field_name, file_name, content_type, content_length, *args, **kwargs):
+        # Let go of the previous file, which request.FILES now holds: on SkipFile
+        # the parser closes every handler's .file, and closing a temporary file
+        # deletes it, so an accepted upload would vanish with a rejected one
+        if hasattr(self, 'file'):
+            del self.file
+        self.max_size = get_upload_max_size(field_name)
+        if content_length and content_length > self.max_size:
+            # Set the names for the message; no temporary file has been made yet
+            self.field_name, self.file_name = field_name, file_name
+            self.reject_oversize()
+        os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
+        super().new_file(field_name, file_name, content_type, content_length, *args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0:
+            error = get_header_error(self.file_name, raw_data[:_HEADER_SIZE])
+            if error:
+                self.reject(error)
+        if start + len(raw_data) > self.max_size:
+            self.reject_oversize()
+        return super().receive_data_chunk(raw_data, start)
+
+    def reject_oversize(self):
+        self.reject(f"It is larger than the {self.max_size / (1024 * 1024):g} MB limit for this field.")
+
+    def reject(self, reason):
+        """Removes the partial file, tells the editor why, and skips the upload."""
+        if hasattr(self, 'file'):
+            self.upload_interrupted()
+        _logger.warning(f"Rejected upload {self.file_name!r} ({self.field_name}): {reason}")
+        if self.request is not None:
+            messages.error(self.request, f"{self.file_name} was not uploaded. {reason}", fail_silently=True)
+        raise SkipFile(reason)
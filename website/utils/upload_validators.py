@@ -149,6 +149,30 @@ def _extension(value):
     return os.path.splitext(value.name)[1].lower().lstrip(".")
 
 
+def get_header_error(file_name, header):
+    """
+    Return why ``header`` (the first bytes of an upload) can't be the content of
+    a file called ``file_name``, or ``None`` if it can.
+
+    The same content checks as the validators below, chosen by extension rather
+    than by field, so the streaming upload handler
+    (website/utils/upload_handlers.py) can run them on the first chunk before
+    the rest of the file is read. Extensions outside the image/PDF/video lists
+    (raw source files, or anything the field's allowlist will reject later) get
+    the web-executable denylist.
+    """
+    ext = os.path.splitext(file_name)[1].lower().lstrip(".")
+    if ext in IMAGE_EXTENSIONS and not _looks_like_image(header):
+        return "This file doesn't look like a valid image (expected PNG, JPEG, GIF, or WebP)."
+    if ext in PDF_EXTENSIONS and not _looks_like_pdf(header):
+        return "This file doesn't look like a valid PDF."
+    if ext in VIDEO_EXTENSIONS and not _looks_like_video(header):
+        return "This file doesn't look like a valid video (expected MP4, WebM, or MOV)."
+    if _looks_like_web_executable(header):
+        return "This file appears to contain web/HTML content, which isn't allowed."
+    return None
+
+
 # --- Validators ------------------------------------------------------------
 
 
@@ -7,6 +7,7 @@ from .people import *
 from .project import *
 from .project_listing import *
 from .publications import *
+from .search import search
 from .view_project_people import *
 from .serve_pdf import *
 from .awards import awards
@@ -47,6 +47,14 @@ ARTIFACT_MOBILE_PAGE_SIZES = {
     'talks': 4,
 }
 
+# How many best-ranked search hits get_closest_urlname_in_database compares
+# when a /member/<name>/ URL doesn't match exactly. Person.objects.search ranks
+# an exact name_key/url_name first and then by trigram similarity, so a
+# misspelled URL's person is among the first few hits; 20 is a round bound with
+# room for namesakes (url_names with a numeric suffix) and other people sharing a
+# name word, while keeping difflib to 20 comparisons instead of the whole table.
+CLOSEST_URLNAME_CANDIDATES = 20
+
 def member(request, member_name=None, member_id=None):
     func_start_time = time.perf_counter()
     _logger.debug(f"Starting views/member member_id={member_id} and member_name={member_name} at {func_start_time:0.4f}")
@@ -346,6 +354,9 @@ def get_closest_urlname_in_database(query_urlname, cutoff=0.8):
     Returns:
         str: The closest matching url_name from the database.
     """
-    
-    all_urlnames = Person.objects.values_list('url_name', flat=True)
-    return ml_utils.get_closest_match(query_urlname, all_urlnames, cutoff)
\ No newline at end of file
+    # Candidates come from the people search index (prefix + trigram matches)
+    # instead of every url_name in the table; difflib then applies the same
+    # cutoff as before to pick among them.
+    candidate_urlnames = (Person.objects.search(query_urlname)
+                          .values_list('url_name', flat=True)[:CLOSEST_URLNAME_CANDIDATES])
+    return ml_utils.get_closest_match(query_urlname, list(candidate_urlnames), cutoff)
\ No newline at end of file
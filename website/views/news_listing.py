@@ -1,9 +1,10 @@
 from django.conf import settings # for access to settings variables, see https://docs.djangoproject.com/en/4.0/topics/settings/#using-settings-in-python-code
-from website.models import News
+from website.models import ContentVersion, News
 import datetime
 import website.utils.ml_utils as ml_utils 
 from django.shortcuts import render
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from website.utils.cache import cached_view
 
 # For logging
 import time
@@ -12,6 +13,10 @@ import logging
 # This retrieves a Python logging instance (or creates it)
 _logger = logging.getLogger(__name__)
 
+# Cached per page number for anonymous visitors until a News save bumps the news
+# content version. Author names/links come from Person, which doesn't bump it,
+# so those catch up within the default five-minute timeout.
+@cached_view('news_listing', scopes=[ContentVersion.NEWS])
 def news_listing(request):
     """The news listing page. This page lists all news items in reverse chronological order."""
 
@@ -4,6 +4,7 @@ from website.models.project_role import LeadProjectRoleTypes
 from website.models.position import MemberClassification
 import website.utils.ml_utils as ml_utils
 from website.utils.metadata import meta_description
+from website.utils.project_similarity import get_related_projects
 from django.urls import reverse
 from django.shortcuts import render, redirect
 from operator import attrgetter
@@ -133,13 +134,12 @@ def project(request, project_name):
     # Former leads are collapsed behind the "+N former" disclosure on mobile.
     project_leads_former = _flatten_leads(_inactive_lead_groups, _seen_lead_person_ids)
 
-    # Query for related projects. Limit to top 5
-    # Get all candidates first
-    related_project_candidates = project.get_related_projects_by_umbrella(match_all_umbrellas=True)
-    
-    # Only surface related projects that are publicly visible (#1300) and have a
-    # thumbnail (the related-project cards render gallery_image).
-    related_projects = [p for p in related_project_candidates if p.is_visible and p.gallery_image][:5]
+    # Related projects come from the precomputed ProjectSimilarity table (a
+    # weighted Jaccard over shared umbrellas, publications, grants, keywords, and
+    # people; see website/utils/project_similarity.py). One indexed query returns
+    # the top 5 that are publicly visible (#1300) and have a thumbnail (the
+    # related-project cards render gallery_image).
+    related_projects = get_related_projects(project, limit=5)
 
     # related_projects_by_pub = project.get_related_projects_by_pub()
     # _logger.debug(f"Related projects by publication: {related_projects_by_pub}")
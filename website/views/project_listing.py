@@ -1,8 +1,8 @@
 from django.conf import settings # for access to settings variables, see https://docs.djangoproject.com/en/4.0/topics/settings/#using-settings-in-python-code
 from django.utils import timezone # for timezone-aware date operations
-from website.models import Project, ProjectUmbrella, Publication
-from django.db.models import Count, Q # see https://docs.djangoproject.com/en/4.2/topics/db/aggregation/
-from django.db.models import OuterRef, Subquery, F
+from website.models import ContentVersion, Project, Publication
+from website.utils.cache import cached
+from django.db.models import Exists, OuterRef, Subquery, F
 from django.shortcuts import render # for render https://docs.djangoproject.com/en/4.0/topics/http/shortcuts/#render
 
 # For logging
@@ -12,50 +12,81 @@ import logging
 # This retrieves a Python logging instance (or creates it)
 _logger = logging.getLogger(__name__)
 
-def project_listing(request):
-    func_start_time = time.perf_counter()
-    _logger.debug(f"Starting views/projects at {func_start_time:0.4f}")
+# The listing data only changes when an editor saves a project, umbrella, or
+# publication (which bumps the 'projects' ContentVersion), so the timeout is just
+# a backstop for cache hygiene.
+PROJECT_LISTING_CACHE_TIMEOUT = 60 * 60 * 24
 
-    # Get today's date for filtering completed projects
-    today = timezone.now().date()
 
-    # Get the most recent publication date for each project
+@cached('project_listing', scopes=[ContentVersion.PROJECTS], timeout=PROJECT_LISTING_CACHE_TIMEOUT)
+def get_project_listing_data(today):
+    """
+    Builds the data behind /projects/: the active and completed visible projects
+    (newest publication first) and a map of umbrella short_name -> project names.
+
+    This is ONE Project query (plus one prefetch for the umbrellas) partitioned in
+    Python. It used to be two separately-annotated Project queries plus a
+    project_set query per umbrella, which grew with the number of umbrellas.
+    ``most_recent_publication`` and ``has_award_publication`` are annotated so
+    neither the ordering nor the award banner in display_project_snippet.html
+    needs a per-project query.
+    """
     latest_publication_dates = Publication.objects.filter(projects=OuterRef('pk')).order_by('-date')
+    award_publications = (Publication.objects.filter(projects=OuterRef('pk'), award__isnull=False)
+                          .exclude(award__exact=''))
 
-    # Get all visible, active projects (i.e., marked is_visible and with no end
-    # date OR an end date today or in the future), ordered by most recent pub
-    # date. Visibility is governed solely by the is_visible flag (#1300).
+    # Visibility is governed solely by the is_visible flag (#1300), so private
+    # projects never reach the page or inflate the umbrella filter counts.
     # nulls_last keeps a visible project that has no publication yet from
     # sorting to the top.
-    active_projects = (Project.objects.filter(is_visible=True)
-                .filter(Q(end_date__isnull=True) | Q(end_date__gt=today))
-                .annotate(most_recent_publication=Subquery(latest_publication_dates.values('date')[:1]))
-                .order_by(F('most_recent_publication').desc(nulls_last=True), 'id').distinct())
-
-    # Get visible, completed projects (an end date before today),
-    # ordered by most recent pub date
-    completed_projects = (Project.objects.filter(is_visible=True, end_date__isnull=False, end_date__lte=today)
-                .annotate(most_recent_publication=Subquery(latest_publication_dates.values('date')[:1]))
-                .order_by(F('most_recent_publication').desc(nulls_last=True), 'id').distinct())
-    
-    # Now get all project umbrellas for interactive project filtering
-    map_project_umbrella_to_projects = {}
-
-    # Only count/list publicly-visible projects so private projects (#1300)
-    # don't inflate the filter counts or leak their names into the page.
-    project_umbrellas_with_projects = (ProjectUmbrella.objects.annotate(
-        num_projects=Count('project', filter=Q(project__is_visible=True)))
-        .filter(num_projects__gt=0)) # Get all project umbrellas with at least one visible project
-
-    # Iterate over the queryset
-    for project_umbrella in project_umbrellas_with_projects:
-        # Get the list of associated, publicly-visible Project instances
-        projects = project_umbrella.project_set.filter(is_visible=True)
-        map_project_umbrella_to_projects[project_umbrella.short_name] = [project.name for project in projects]
-
-    # Sort the dictionary by project count
-    sorted_map_project_umbrella_to_projects = {k: v for k, v in sorted(map_project_umbrella_to_projects.items(), 
-                                                                       key=lambda item: len(item[1]), reverse=True)}
+    projects = (Project.objects.filter(is_visible=True)
+                .annotate(most_recent_publication=Subquery(latest_publication_dates.values('date')[:1]),
+                          has_award_publication=Exists(award_publications))
+                .prefetch_related('project_umbrellas')
+                .order_by(F('most_recent_publication').desc(nulls_last=True), 'id'))
+
+    active_projects = []
+    completed_projects = []
+    umbrella_to_projects = {}
+    for project in projects:
+        # Active means no end date OR an end date in the future; completed means
+        # an end date today or earlier.
+        if project.end_date is None or project.end_date > today:
+            active_projects.append(project)
+        else:
+            completed_projects.append(project)
+
+        for project_umbrella in project.project_umbrellas.all():
+            umbrella_to_projects.setdefault(project_umbrella, []).append(project)
+
+    # Sort umbrellas by project count (ties in umbrella id order) and list each
+    # umbrella's projects in id order, as the per-umbrella queries used to.
+    sorted_umbrellas = sorted(umbrella_to_projects.items(), key=lambda item: (-len(item[1]), item[0].pk))
+    map_project_umbrella_to_projects = {
+        project_umbrella.short_name: [project.name for project in sorted(umbrella_projects, key=lambda p: p.pk)]
+        for project_umbrella, umbrella_projects in sorted_umbrellas
+    }
+
+    return {
+        'active_projects': active_projects,
+        'completed_projects': completed_projects,
+        'map_project_umbrella_to_projects': map_project_umbrella_to_projects,
+    }
+
+
+def project_listing(request):
+    func_start_time = time.perf_counter()
+    _logger.debug(f"Starting views/projects at {func_start_time:0.4f}")
+
+    # Get today's date for splitting active from completed projects. It's part of
+    # the cache key (as the argument) because a project moves to "completed" once
+    # its end date passes, without any model change to bump the content version.
+    today = timezone.now().date()
+    listing_data = get_project_listing_data(today)
+
+    active_projects = listing_data['active_projects']
+    completed_projects = listing_data['completed_projects']
+    sorted_map_project_umbrella_to_projects = listing_data['map_project_umbrella_to_projects']
 
     context = {'active_projects': active_projects,
                'completed_projects': completed_projects,
@@ -1,46 +1,109 @@
 from django.conf import settings # for access to settings variables, see https://docs.djangoproject.com/en/4.0/topics/settings/#using-settings-in-python-code
-from website.models import Publication
+from website.models import ContentVersion, Publication
 from django.shortcuts import render # for render https://docs.djangoproject.com/en/4.0/topics/http/shortcuts/#render
-import website.utils.fileutils as ml_fileutils
+from django.http import StreamingHttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from website.utils.cache import cached
+from datetime import date
 
 # For logging
 import time
 import logging
-import os
 
 # This retrieves a Python logging instance (or creates it)
 _logger = logging.getLogger(__name__)
 
-def publications(request):
-    func_start_time = time.perf_counter()
-    _logger.debug(f"Starting views/publications at {func_start_time:0.4f}")
+# How many of the newest publication years /publications/ renders server-side on
+# first paint. Older years are emitted as empty, headed <section>s (so the
+# tocbot year nav still lists every year) and filled in by
+# publications-lazy-load.js from website:publications_fragment as they scroll
+# into view. With ~250 papers the full page was several hundred KB of HTML; the
+# newest three years are a small fraction of that.
+INITIAL_YEARS_RENDERED = 3
+
+# Server-side filters shared by the page and the fragment endpoint, mapping a
+# GET param to the queryset lookup it drives. Mirrors the public API's
+# publication filters (author/project by slug) plus keyword and venue type, so a
+# link like /publications/?keyword=accessibility is shareable.
+PUBLICATION_FILTERS = {
+    'keyword': 'keywords__keyword__iexact',
+    'project': 'projects__short_name__iexact',
+    'venue_type': 'pub_venue_type__iexact',
+    'author': 'authors__url_name__iexact',
+}
+
 
+def _get_filtered_publications(request):
+    """
+    Returns (queryset, active_filters) for the publication listing, applying any
+    of the PUBLICATION_FILTERS (and ``?year=``) found in request.GET.
+
+    The queryset is ordered newest first and prefetches authors/projects/keywords,
+    which snippets/display_pub_snippet.html iterates per publication. The year
+    filter is expressed as a date range (Django turns ``date__year`` into a
+    BETWEEN), so it's served by the index on Publication.date.
+    """
     # We want all pubs after I joined as a professor. This was a group decision.
     # See https://stackoverflow.com/a/4668703
-    # sampledate__gte=datetime.date(2011, 1, 1),
-    # Old: Publication.objects.filter(date__range=["2012-01-01", date.today()]),
+    publications = Publication.objects.filter(date__gte=settings.DATE_MAKEABILITYLAB_FORMED)
+
+    active_filters = {}
+    for param, lookup in PUBLICATION_FILTERS.items():
+        value = request.GET.get(param, '').strip()
+        if value:
+            publications = publications.filter(**{lookup: value})
+            active_filters[param] = value
+
+    year = request.GET.get('year', '').strip()
+    if year.isdigit():
+        publications = publications.filter(date__year=int(year))
+        active_filters['year'] = year
+
+    # The m2m filters can match a publication more than once (e.g., two keywords
+    # that both equal the query case-insensitively), so de-duplicate.
+    if set(active_filters) - {'year'}:
+        publications = publications.distinct()
+
     # prefetch_related avoids N+1 over authors/projects/keywords, which are
     # iterated per-publication by snippets/display_pub_snippet.html.
-    publications = (Publication.objects
-                    .filter(date__gte=settings.DATE_MAKEABILITYLAB_FORMED)
+    publications = (publications
                     .prefetch_related('authors', 'projects', 'keywords')
                     .order_by('-date'))
+    return publications, active_filters
 
-    # Loop through pubs and store in a dict with year : list of pubs ordered by date
+
+def _group_by_year(publications):
+    """Returns an ordered dict of year -> list of pubs (newest year first)."""
     map_year_to_pub_list = dict()
     for pub in publications:
-        if pub.date.year not in map_year_to_pub_list:
-            map_year_to_pub_list[pub.date.year] = list()
+        map_year_to_pub_list.setdefault(pub.date.year, []).append(pub)
+    return map_year_to_pub_list
+
 
-        map_year_to_pub_list[pub.date.year].append(pub)
+def publications(request):
+    func_start_time = time.perf_counter()
+    _logger.debug(f"Starting views/publications at {func_start_time:0.4f}")
 
-        # add filename
-        pub.filename_no_ext = ml_fileutils.get_filename_no_ext(pub.pdf_file.name)
-        #pub.citation_bib_filename = f"{filename_no_ext}-Citation.bib"
-        #pub.citation_txt_filename = f"{filename_no_ext}-Citation.txt"
+    publications, active_filters = _get_filtered_publications(request)
+
+    # Unfiltered visits render only the newest INITIAL_YEARS_RENDERED years and
+    # defer the rest to the fragment endpoint. A filtered view is already a small
+    # slice, so it renders everything that matched in one response (which also
+    # keeps ?year=YYYY links fully functional without JavaScript).
+    deferred_years = []
+    if not active_filters:
+        all_years = [d.year for d in publications.dates('date', 'year', order='DESC')]
+        if len(all_years) > INITIAL_YEARS_RENDERED:
+            oldest_rendered_year = all_years[INITIAL_YEARS_RENDERED - 1]
+            deferred_years = all_years[INITIAL_YEARS_RENDERED:]
+            publications = publications.filter(date__year__gte=oldest_rendered_year)
+
+    map_year_to_pub_list = _group_by_year(publications)
 
     context = {'publications': publications,
                'map_year_to_pub_list': map_year_to_pub_list,
+               'deferred_years': deferred_years,
+               'active_filters': active_filters,
                'debug': settings.DEBUG,
                'navbar_white': True}
     
@@ -61,7 +124,114 @@ def publications(request):
     _logger.debug(f"Took {render_func_end_time - render_func_start_time:0.4f} seconds to create render_response")
 
     func_end_time = time.perf_counter()
-    _logger.debug(f"Prepared {publications.count()} publications in {func_end_time - func_start_time:0.4f} seconds")
+    num_rendered = sum(len(pub_list) for pub_list in map_year_to_pub_list.values())
+    _logger.debug(f"Prepared {num_rendered} publications ({len(deferred_years)} year(s) deferred) "
+                  f"in {func_end_time - func_start_time:0.4f} seconds")
     context['render_time'] = func_end_time - func_start_time
 
-    return render_response
\ No newline at end of file
+    return render_response
+
+
+def publications_fragment(request, format=None):
+    """
+    AJAX endpoint returning a slice of the publications listing as HTML, used by
+    publications-lazy-load.js to fill in the year sections that /publications/
+    defers (see INITIAL_YEARS_RENDERED). Same approach as
+    views/member.py::member_artifacts: we render the very same row template the
+    page uses on first paint, so lazily-loaded rows are byte-for-byte identical
+    to server-rendered ones.
+
+    Query params: ``year`` plus any of PUBLICATION_FILTERS (keyword, project,
+    venue_type, author). Returns JSON ``{html, count}``.
+
+    ``format`` is accepted (and ignored) because website/urls.py is wrapped in
+    DRF's format_suffix_patterns.
+    """
+    html, count = _render_publications_fragment(request)
+    return JsonResponse({'html': html, 'count': count})
+
+
+def _get_fragment_key(request):
+    """
+    The cache key parts for a fragment: each filter that is set, lower-cased
+    (every filter is case-insensitive), in a fixed order, so ?year=2019&keyword=AR
+    and ?keyword=ar&year=2019 share an entry and unrelated params don't split it.
+    Today's date is part of the key too, since the rows' "to appear" badges
+    compare each publication's date to it.
+    """
+    parts = [date.today().isoformat()]
+    for param in sorted(list(PUBLICATION_FILTERS) + ['year']):
+        value = request.GET.get(param, '').strip().lower()
+        if value:
+            parts.append(f"{param}={value}")
+    return tuple(parts)
+
+
+# Shared across workers (see website/utils/cache.py) until a publication, one of
+# its links, or a person/project/keyword/talk/poster its rows show changes (the
+# bump_publications_content_version receivers in signals.py). The rows render
+# nothing per-visitor, and are rendered without the request so they can't start to.
+@cached('publications_fragment', scopes=[ContentVersion.PUBLICATIONS], timeout=60 * 60 * 24,
+        key=_get_fragment_key)
+def _render_publications_fragment(request):
+    """Returns (html, count) for the slice of the listing request.GET selects."""
+    publications, _ = _get_filtered_publications(request)
+    pub_list = list(publications)
+
+    html = render_to_string('snippets/publication_listing_rows.html', {'pub_list': pub_list})
+    return html, len(pub_list)
+
+
+def publications_bibtex(request, format=None):
+    """
+    Streams the lab bibliography as a single .bib file (served at /publications.bib).
+
+    People used to scrape the publications page to assemble their BibTeX files;
+    this hands them the same entries straight from Publication.bibtex_cache, so a
+    full export is one narrow values_list() query rather than one author query
+    per paper. Optional filters mirror the public API's publication endpoint:
+
+      * ``?year=<yyyy>``          -- pubs in a calendar year.
+      * ``?project=<short_name>`` -- pubs attached to a project.
+      * ``?author=<url_name>``    -- pubs by a person.
+
+    ``format`` is accepted (and ignored) because website/urls.py is wrapped in
+    DRF's format_suffix_patterns.
+    """
+    publications = Publication.objects.filter(date__gte=settings.DATE_MAKEABILITYLAB_FORMED)
+
+    year = request.GET.get('year')
+    if year and year.isdigit():
+        publications = publications.filter(date__year=int(year))
+
+    project = request.GET.get('project')
+    if project:
+        publications = publications.filter(projects__short_name__iexact=project)
+
+    author = request.GET.get('author')
+    if author:
+        publications = publications.filter(authors__url_name__iexact=author)
+
+    publications = publications.distinct().order_by('-date', 'pk')
+
+    def stream_bibtex_entries():
+        # Rows without a cache (e.g. added by a raw update before
+        # rebuild_citation_cache ran) are built on the fly at the end.
+        missing_pub_ids = []
+        for pub_id, bibtex in publications.values_list('pk', 'bibtex_cache').iterator():
+            if bibtex is None:
+                missing_pub_ids.append(pub_id)
+                continue
+            yield bibtex + "\n\n"
+
+        if missing_pub_ids:
+            _logger.debug(f"Building BibTeX on the fly for {len(missing_pub_ids)} uncached publication(s)")
+            uncached = (Publication.objects.filter(pk__in=missing_pub_ids)
+                        .prefetch_related('authors').order_by('-date', 'pk'))
+            for pub in uncached:
+                yield pub.get_cached_citation_as_bibtex(newline="\n", use_hyperlinks=False) + "\n\n"
+
+    response = StreamingHttpResponse(stream_bibtex_entries(),
+                                     content_type='application/x-bibtex; charset=utf-8')
+    response['Content-Disposition'] = 'inline; filename="makeabilitylab-publications.bib"'
+    return response
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.shortcuts import render
+
+from website.models import SearchEntry
+from website.utils.search_index import SEARCH_PAGE_SIZE, highlight_html, search as search_entries
+
+# For logging
+import time
+import logging
+
+# This retrieves a Python logging instance (or creates it)
+_logger = logging.getLogger(__name__)
+
+
+def search(request):
+    """
+    Site search over publications, talks, projects, and news (?q=, optional
+    ?kind=, ?page=). Results are ranked by Postgres full-text search against
+    the SearchEntry index; see website/utils/search_index.py.
+    """
+    func_start_time = time.perf_counter()
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('kind', '')
+    kinds = [kind] if kind in SearchEntry.Kind.values else None
+
+    page = None
+    if query:
+        paginator = Paginator(search_entries(query, kinds), SEARCH_PAGE_SIZE)
+        page = paginator.get_page(request.GET.get('page'))
+        for entry in page.object_list:
+            entry.title_html = highlight_html(entry.title_headline)
+            entry.snippet_html = highlight_html(entry.snippet_headline)
+
+    context = {
+        'query': query,
+        'kind': kind if kinds else '',
+        'kinds': SearchEntry.Kind.choices,
+        'page': page,
+        'debug': settings.DEBUG,
+        'navbar_white': True,
+    }
+
+    # Per-page SEO / social metadata (see base.html). #1142/#1324.
+    context['page_meta'] = {
+        'title': f"Search: {query}" if query else 'Search',
+        'description': "Search Makeability Lab publications, talks, projects, and news.",
+    }
+
+    render_response = render(request, 'website/search.html', context)
+    _logger.debug(f"Prepared views/search for q={query!r} in {time.perf_counter() - func_start_time:0.4f} seconds")
+    return render_response
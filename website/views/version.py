@@ -50,6 +50,15 @@ anything else means the multiprocess-safe handler degraded (package missing from
 the image, or no usable lock directory) and workers can clobber each other's
 rotated files again.
 
+``db_connections`` reports how database connections are being reused (persistent
+per worker, pooled through psycopg or pgbouncer, or -- the old behavior -- one
+per request), this worker's connections-opened vs. requests-served counters, the
+time this request waited for a usable connection, and the server-side connection
+counts from ``pg_stat_activity``. See ``website/utils/db_connections.py``.
+
+``cache`` names the live cache backend (``db``, ``redis``, ``file``, or
+``locmem``) and this worker's hit/miss counters per cached namespace.
+
 Note that ``log_to_file: true`` only means the log *directory* was writable at
 startup. To confirm records are really landing, tail the file over SSH at
 ``/cse/web/research/makelab/www[-test]/debug.log`` -- there is no web path to the
@@ -64,6 +73,8 @@ from django.conf import settings
 from django.http import JsonResponse
 
 from website.utils.backup_status import get_backup_status
+from website.utils.cache import get_cache_stats
+from website.utils.db_connections import get_connection_stats
 
 # Module logger (configured in settings.LOGGING).
 _logger = logging.getLogger(__name__)
@@ -137,6 +148,12 @@ def version(request, format=None):
         ),
         "backup_age_hours": backup["age_hours"],
         "backup_count": backup["backup_count"],
+        # Connection reuse: mode, per-worker opened/served counters, wait time
+        # for a connection, and server-side counts. Never raises.
+        "db_connections": get_connection_stats(),
+        # Live cache backend and this worker's per-namespace hit/miss counters
+        # (website/utils/cache.py).
+        "cache": get_cache_stats(),
     }
     response = JsonResponse(payload)
     response["Cache-Control"] = "no-store"